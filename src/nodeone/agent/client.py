@@ -0,0 +1,100 @@
+import asyncio
+from typing import List, Optional, Tuple
+from nodeone.agent.protocol import (
+    DEFAULT_PORT,
+    VERSION,
+    FrameReader,
+    FrameType,
+    FrameWriter,
+    Hello,
+    ProtocolError,
+    Sample,
+    SampleCodec,
+    decode_welcome,
+    encode_hello,
+)
+from nodeone.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AgentStream:
+    """
+    Client side of one agent subscription.
+
+    `connect` opens the connection and performs the handshake; `read`
+    then returns samples as the agent pushes them. The session id and the
+    last sequence number survive `close`, so connecting again resumes the
+    stream where it stopped, and samples the agent still holds are not
+    lost. `Sample.missed` counts those that were.
+    """
+
+    def __init__(self, host: str, port: int = DEFAULT_PORT, compress: bool = True):
+        self.host = host
+        self.port = port
+        self.compress = compress
+        self.session = 0
+        self.interval = 0.0
+        self.schema: List[Tuple[str, int]] = []
+        self.bytes_read = 0
+        self._codec: Optional[SampleCodec] = None
+        self._frames: Optional[FrameReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    @property
+    def last_seq(self) -> int:
+        if self._codec is None:
+            return 0
+        return self._codec.last_seq or 0
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None
+
+    async def connect(self):
+        self.close()
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        self._writer = writer
+        try:
+            hello = Hello(VERSION, self.compress, self.session, self.last_seq)
+            writer.write(FrameWriter().pack(FrameType.HELLO, encode_hello(hello)))
+            await writer.drain()
+            frames = FrameReader(reader)
+            frame_type, payload = await frames.read()
+            if frame_type != FrameType.WELCOME:
+                raise ProtocolError(f"expected WELCOME, got frame type {frame_type}")
+            welcome = decode_welcome(payload)
+        except BaseException:
+            self.close()
+            raise
+        if welcome.session != self.session or welcome.schema != self.schema:
+            # A new run of the agent numbers its samples from scratch
+            self._codec = SampleCodec(welcome.schema)
+        self.session = welcome.session
+        self.schema = welcome.schema
+        self.interval = welcome.interval
+        self._frames = frames
+
+    async def read(self) -> Sample:
+        if self._frames is None:
+            raise ConnectionError("not connected")
+        before = self._frames.bytes_read
+        try:
+            frame_type, payload = await self._frames.read()
+        except asyncio.IncompleteReadError:
+            self.close()
+            raise ConnectionResetError("connection closed by agent") from None
+        self.bytes_read += self._frames.bytes_read - before
+        return self._codec.decode(frame_type, payload)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self._frames = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Sample:
+        return await self.read()
@@ -0,0 +1,278 @@
+import asyncio
+import struct
+import zlib
+from enum import IntEnum
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# Wire format shared by the node agent daemon and its client.
+#
+# Every frame is a 6-byte header, followed by `length` payload bytes:
+#
+#     uint32 length | uint8 type | uint8 flags        (network byte order)
+#
+# Integers inside payloads are unsigned LEB128 varints; signed ones are
+# zigzag-encoded first, so small magnitudes of either sign take one byte.
+#
+#   HELLO    client -> agent   version, flags, session, last seq
+#   WELCOME  agent -> client   version, session, interval (ms), schema
+#   KEYFRAME agent -> client   seq, timestamp (ms), every value
+#   DELTA    agent -> client   seq, timestamp and every value as the
+#                              difference from sample seq - 1
+#
+# Metric values travel as integers: each schema entry names a metric and
+# the decimal places it is kept to. With FLAG_ZLIB set, the payload was
+# compressed with the connection's zlib stream and a sync flush, so frames
+# must be decompressed in the order they were sent.
+
+VERSION = 1
+DEFAULT_PORT = 7070
+
+HEADER = struct.Struct("!IBB")
+MAX_PAYLOAD = 1 << 20
+
+FLAG_ZLIB = 0x01
+HELLO_COMPRESS = 0x01  # HELLO flag: client accepts compressed frames
+
+# Payloads shorter than this gain nothing from compression
+COMPRESS_MIN = 48
+
+
+class FrameType(IntEnum):
+    HELLO = 1
+    WELCOME = 2
+    KEYFRAME = 3
+    DELTA = 4
+
+
+class ProtocolError(ValueError):
+    """The peer sent something that is not a valid frame."""
+
+
+class Hello(NamedTuple):
+    version: int
+    compress: bool
+    session: int  # 0 for a new subscription
+    last_seq: int  # last sample received in that session
+
+
+class Welcome(NamedTuple):
+    version: int
+    session: int
+    interval: float
+    schema: List[Tuple[str, int]]  # (metric name, decimal places)
+
+
+class Sample(NamedTuple):
+    seq: int
+    timestamp: float
+    values: Dict[str, float]
+    missed: int = 0  # samples lost before this one
+
+
+# ----------------------------------------------------------------------
+# Varints
+# ----------------------------------------------------------------------
+def write_uvarint(out: bytearray, value: int):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_uvarint(data: bytes, pos: int) -> Tuple[int, int]:
+    """Returns the varint at `pos` and the position after it."""
+    result = shift = 0
+    while True:
+        try:
+            byte = data[pos]
+        except IndexError:
+            raise ProtocolError("truncated varint") from None
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+        if shift > 70:
+            raise ProtocolError("varint too long")
+
+
+def zigzag(value: int) -> int:
+    return value << 1 if value >= 0 else (-value << 1) - 1
+
+
+def unzigzag(value: int) -> int:
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+def _write_string(out: bytearray, text: str):
+    raw = text.encode("utf-8")
+    write_uvarint(out, len(raw))
+    out += raw
+
+
+def _read_string(data: bytes, pos: int) -> Tuple[str, int]:
+    size, pos = read_uvarint(data, pos)
+    if pos + size > len(data):
+        raise ProtocolError("truncated string")
+    return data[pos : pos + size].decode("utf-8"), pos + size
+
+
+# ----------------------------------------------------------------------
+# Handshake
+# ----------------------------------------------------------------------
+def encode_hello(hello: Hello) -> bytes:
+    out = bytearray((hello.version, HELLO_COMPRESS if hello.compress else 0))
+    write_uvarint(out, hello.session)
+    write_uvarint(out, hello.last_seq)
+    return bytes(out)
+
+
+def decode_hello(payload: bytes) -> Hello:
+    if len(payload) < 2:
+        raise ProtocolError("truncated HELLO")
+    session, pos = read_uvarint(payload, 2)
+    last_seq, _ = read_uvarint(payload, pos)
+    return Hello(payload[0], bool(payload[1] & HELLO_COMPRESS), session, last_seq)
+
+
+def encode_welcome(welcome: Welcome) -> bytes:
+    out = bytearray((welcome.version,))
+    write_uvarint(out, welcome.session)
+    write_uvarint(out, round(welcome.interval * 1000))
+    write_uvarint(out, len(welcome.schema))
+    for name, decimals in welcome.schema:
+        _write_string(out, name)
+        out.append(decimals)
+    return bytes(out)
+
+
+def decode_welcome(payload: bytes) -> Welcome:
+    if not payload:
+        raise ProtocolError("truncated WELCOME")
+    session, pos = read_uvarint(payload, 1)
+    interval, pos = read_uvarint(payload, pos)
+    count, pos = read_uvarint(payload, pos)
+    schema = []
+    for _ in range(count):
+        name, pos = _read_string(payload, pos)
+        if pos >= len(payload):
+            raise ProtocolError("truncated schema")
+        schema.append((name, payload[pos]))
+        pos += 1
+    return Welcome(payload[0], session, interval / 1000, schema)
+
+
+# ----------------------------------------------------------------------
+# Samples
+# ----------------------------------------------------------------------
+class SampleCodec:
+    """
+    Converts samples to and from KEYFRAME and DELTA payloads.
+
+    Values are scaled by their schema's decimal places and rounded to
+    integers, so deltas between consecutive samples of slowly moving
+    metrics are small and mostly fit in one byte each. Decoding keeps the
+    previous sample, which every DELTA is relative to.
+    """
+
+    def __init__(self, schema: Sequence[Tuple[str, int]]):
+        self.schema = list(schema)
+        self.names = [name for name, _ in self.schema]
+        self.scales = [10 ** decimals for _, decimals in self.schema]
+        self._seq: Optional[int] = None
+        self._timestamp = 0
+        self._values: List[int] = []
+
+    @property
+    def last_seq(self) -> Optional[int]:
+        return self._seq
+
+    def quantize(self, values: Dict[str, float]) -> List[int]:
+        return [round(values.get(name, 0.0) * scale) for name, scale in zip(self.names, self.scales)]
+
+    @staticmethod
+    def encode_keyframe(seq: int, timestamp_ms: int, values: Sequence[int]) -> bytes:
+        out = bytearray()
+        write_uvarint(out, seq)
+        write_uvarint(out, timestamp_ms)
+        for value in values:
+            write_uvarint(out, zigzag(value))
+        return bytes(out)
+
+    @staticmethod
+    def encode_delta(
+        seq: int, timestamp_ms: int, values: Sequence[int], previous_ms: int, previous: Sequence[int]
+    ) -> bytes:
+        out = bytearray()
+        write_uvarint(out, seq)
+        write_uvarint(out, zigzag(timestamp_ms - previous_ms))
+        for value, before in zip(values, previous):
+            write_uvarint(out, zigzag(value - before))
+        return bytes(out)
+
+    def decode(self, frame_type: int, payload: bytes) -> Sample:
+        seq, pos = read_uvarint(payload, 0)
+        stamp, pos = read_uvarint(payload, pos)
+        values = []
+        for _ in self.names:
+            value, pos = read_uvarint(payload, pos)
+            values.append(unzigzag(value))
+
+        if frame_type == FrameType.KEYFRAME:
+            timestamp = stamp
+        elif frame_type == FrameType.DELTA:
+            if self._seq is None or seq != self._seq + 1:
+                raise ProtocolError(f"delta for sample {seq} does not follow {self._seq}")
+            timestamp = self._timestamp + unzigzag(stamp)
+            values = [before + delta for before, delta in zip(self._values, values)]
+        else:
+            raise ProtocolError(f"unexpected frame type {frame_type}")
+
+        missed = 0 if self._seq is None else max(0, seq - self._seq - 1)
+        self._seq, self._timestamp, self._values = seq, timestamp, values
+        return Sample(
+            seq,
+            timestamp / 1000,
+            {name: value / scale for name, value, scale in zip(self.names, values, self.scales)},
+            missed,
+        )
+
+
+# ----------------------------------------------------------------------
+# Framing
+# ----------------------------------------------------------------------
+class FrameWriter:
+    """Frames payloads for one connection, compressing the larger ones."""
+
+    def __init__(self, compress: bool = False):
+        self._compressor = zlib.compressobj(6) if compress else None
+
+    def pack(self, frame_type: int, payload: bytes) -> bytes:
+        flags = 0
+        if self._compressor is not None and len(payload) >= COMPRESS_MIN:
+            payload = self._compressor.compress(payload) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+            flags |= FLAG_ZLIB
+        return HEADER.pack(len(payload), frame_type, flags) + payload
+
+
+class FrameReader:
+    """Reads frames from one connection, in order."""
+
+    def __init__(self, reader: asyncio.StreamReader):
+        self.reader = reader
+        self._decompressor = zlib.decompressobj()
+        self.bytes_read = 0
+
+    async def read(self) -> Tuple[int, bytes]:
+        header = await self.reader.readexactly(HEADER.size)
+        length, frame_type, flags = HEADER.unpack(header)
+        if length > MAX_PAYLOAD:
+            raise ProtocolError(f"frame of {length} bytes exceeds the limit")
+        payload = await self.reader.readexactly(length)
+        self.bytes_read += HEADER.size + length
+        if flags & FLAG_ZLIB:
+            try:
+                payload = self._decompressor.decompress(payload, MAX_PAYLOAD)
+            except zlib.error as e:
+                raise ProtocolError(f"bad compressed frame: {e}") from None
+        return frame_type, payload
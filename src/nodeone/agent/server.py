@@ -0,0 +1,239 @@
+import argparse
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Sequence, Tuple
+from nodeone.agent.protocol import (
+    DEFAULT_PORT,
+    VERSION,
+    FrameReader,
+    FrameType,
+    FrameWriter,
+    ProtocolError,
+    SampleCodec,
+    Welcome,
+    decode_hello,
+    encode_welcome,
+)
+from nodeone.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Samples kept for clients that reconnect; ten minutes at one per second
+RESUME_SAMPLES = 600
+HELLO_TIMEOUT = 5.0
+
+Sampler = Callable[[], Dict[str, float]]
+
+
+class _Entry:
+    """One sample in the history, with its encoded frames."""
+
+    __slots__ = ("seq", "timestamp", "values", "keyframe", "delta")
+
+    def __init__(self, seq: int, timestamp: int, values: List[int]):
+        self.seq = seq
+        self.timestamp = timestamp  # ms
+        self.values = values
+        self.keyframe: Optional[bytes] = None  # encoded on first use
+        self.delta: Optional[bytes] = None  # relative to sample seq - 1
+
+
+class AgentServer:
+    """
+    Streams metric samples to subscribed clients.
+
+    `sampler` is called every `interval` seconds on the event loop and
+    returns ``{metric: value}`` for the metrics in `schema`. Each sample is
+    pushed to every connected client over its one connection: a KEYFRAME
+    first, then DELTA frames. A delta always relates a sample to the one
+    before it, so it is encoded once, when the sample is taken, and shared
+    by all clients.
+
+    The last `history` samples are kept. A client that reconnects with the
+    session id and the last sequence number it saw gets the samples it
+    missed as deltas; one whose position has left the history, or which
+    belongs to an earlier run of the agent, starts over with a keyframe.
+    """
+
+    def __init__(
+        self,
+        sampler: Sampler,
+        schema: Sequence[Tuple[str, int]],
+        interval: float = 1.0,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        history: int = RESUME_SAMPLES,
+    ):
+        self.sampler = sampler
+        self.codec = SampleCodec(schema)
+        self.interval = interval
+        self.host = host
+        self.port = port
+        # Tells this run's sequence numbers apart from an earlier run's
+        self.session = random.getrandbits(63) or 1
+        self.history: Deque[_Entry] = deque(maxlen=history)
+        self.bytes_sent = 0
+
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._sampling: Optional[asyncio.Task] = None
+        # Set and replaced whenever a sample is taken
+        self._new_sample: Optional[asyncio.Event] = None
+        self._connections: Dict[asyncio.StreamWriter, asyncio.Task] = {}
+        self._welcome = encode_welcome(Welcome(VERSION, self.session, interval, self.codec.schema))
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._server.sockets[0].getsockname()[:2]
+
+    @property
+    def clients(self) -> int:
+        return len(self._connections)
+
+    async def start(self):
+        self._new_sample = asyncio.Event()
+        self.sample()  # clients get a keyframe as soon as they connect
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self._sampling = asyncio.create_task(self._sample_loop())
+
+    async def close(self):
+        if self._sampling is not None:
+            self._sampling.cancel()
+            self._sampling = None
+        if self._server is not None:
+            self._server.close()
+            tasks = list(self._connections.values())
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    def sample(self) -> _Entry:
+        """Takes a sample, adds it to the history and sends it to the clients."""
+        try:
+            values = self.sampler()
+        except Exception:
+            logger.exception("Sampling failed")
+            values = {}
+        previous = self.history[-1] if self.history else None
+        entry = _Entry(previous.seq + 1 if previous else 1, int(time.time() * 1000), self.codec.quantize(values))
+        if previous is not None:
+            # Encoded now, while the previous sample is certainly still held
+            entry.delta = SampleCodec.encode_delta(
+                entry.seq, entry.timestamp, entry.values, previous.timestamp, previous.values
+            )
+        self.history.append(entry)
+        if self._new_sample is not None:
+            self._new_sample.set()
+            self._new_sample = asyncio.Event()
+        return entry
+
+    async def _sample_loop(self):
+        next_due = time.monotonic()
+        while True:
+            next_due += self.interval
+            await asyncio.sleep(max(0.0, next_due - time.monotonic()))
+            self.sample()
+
+    # ------------------------------------------------------------------
+    # Connections
+    # ------------------------------------------------------------------
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        peer = writer.get_extra_info("peername")
+        self._connections[writer] = asyncio.current_task()
+        try:
+            frame_type, payload = await asyncio.wait_for(FrameReader(reader).read(), HELLO_TIMEOUT)
+            if frame_type != FrameType.HELLO:
+                raise ProtocolError(f"expected HELLO, got frame type {frame_type}")
+            hello = decode_hello(payload)
+            if hello.version != VERSION:
+                raise ProtocolError(f"unsupported protocol version {hello.version}")
+            frames = FrameWriter(compress=hello.compress)
+            await self._send(writer, frames.pack(FrameType.WELCOME, self._welcome))
+            resume = hello.last_seq if hello.session == self.session else 0
+            await self._stream(writer, frames, resume)
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            pass
+        except ProtocolError as e:
+            logger.warning("Dropping client %s: %s", peer, e)
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
+
+    async def _stream(self, writer: asyncio.StreamWriter, frames: FrameWriter, last_seq: int):
+        """Sends every sample after `last_seq`, then each new one as it is taken."""
+        history = self.history
+        while True:
+            oldest, newest = history[0].seq, history[-1].seq
+            if not oldest <= last_seq <= newest:
+                # Unknown position or already dropped: start from the newest sample
+                entry = history[-1]
+                await self._send(writer, frames.pack(FrameType.KEYFRAME, self._keyframe(entry)))
+                last_seq = entry.seq
+                continue
+            # Taken before sending; the sampler may append while a send waits
+            pending = [history[i - oldest] for i in range(last_seq + 1, newest + 1)]
+            for entry in pending:
+                await self._send(writer, frames.pack(FrameType.DELTA, entry.delta))
+                last_seq = entry.seq
+            if last_seq == history[-1].seq:
+                await self._new_sample.wait()
+
+    async def _send(self, writer: asyncio.StreamWriter, frame: bytes):
+        writer.write(frame)
+        self.bytes_sent += len(frame)
+        # Back-pressure: a slow client only delays itself
+        await writer.drain()
+
+    def _keyframe(self, entry: _Entry) -> bytes:
+        if entry.keyframe is None:
+            entry.keyframe = SampleCodec.encode_keyframe(entry.seq, entry.timestamp, entry.values)
+        return entry.keyframe
+
+
+def system_sampler() -> Tuple[Sampler, List[Tuple[str, int]]]:
+    """Returns a sampler of this host's system metrics and its schema."""
+    from nodeone.services.metrics_collector import _PRECISION, SYSTEM_METRICS, MetricsCollector
+
+    collector = MetricsCollector(history=2)
+    collector.sample_once()  # sets the references for CPU use and I/O rates
+
+    def sample() -> Dict[str, float]:
+        collector.sample_once()
+        return collector.history.latest() or {}
+
+    return sample, [(name, _PRECISION.get(name, 0)) for name in SYSTEM_METRICS]
+
+
+def main(argv: Optional[List[str]] = None):
+    """Entry point of the ``nodeone-agent`` daemon."""
+    from nodeone.utils.logger import setup_logging
+
+    parser = argparse.ArgumentParser(prog="nodeone-agent", description="Streams this node's metrics")
+    parser.add_argument("--host", default="0.0.0.0", help="address to listen on (default: all)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between samples")
+    parser.add_argument("--history", type=int, default=RESUME_SAMPLES, help="samples kept for resuming clients")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    sampler, schema = system_sampler()
+    server = AgentServer(sampler, schema, args.interval, args.host, args.port, args.history)
+    logger.info("Streaming metrics on %s:%s every %ss", args.host, args.port, args.interval)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
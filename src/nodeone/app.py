@@ -1,14 +1,45 @@
 import sys
-from PyQt6.QtWidgets import QApplication
-from nodeone.utils.logger import setup_logging
-from nodeone.views.main_window import MainWindow
+from nodeone.utils import startup_profiler
+from nodeone.utils.startup_profiler import StartupProfiler
+
+PROFILE_FLAG = "--profile-startup"
+
 
 def main():
+    # Only the profiler is imported before it starts; everything else is timed
+    profile = PROFILE_FLAG in sys.argv
+    argv = [arg for arg in sys.argv if arg != PROFILE_FLAG]
+    profiler = StartupProfiler(trace_imports=profile)
+    startup_profiler.set_active(profiler)
+
+    with profiler.phase("imports"):
+        from PyQt6.QtCore import QTimer
+        from PyQt6.QtWidgets import QApplication
+        from nodeone.services.theme_manager import STYLE
+        from nodeone.utils.logger import setup_logging
+        from nodeone.views.main_window import MainWindow
+
     setup_logging()
-    app = QApplication(sys.argv)
-    window = MainWindow()
-    window.show()
+    with profiler.phase("QApplication"):
+        app = QApplication(argv)
+        app.setStyle(STYLE)
+    with profiler.phase("main window"):
+        window = MainWindow()
+    with profiler.phase("show"):
+        window.show()
+
+    if profile:
+        def finish():
+            # Queued behind the window's deferred startup, so it is included
+            profiler.stop()
+            history = profiler.load_history()
+            print(profiler.report(history))
+            profiler.save()
+            app.quit()
+
+        window.first_frame.connect(lambda: QTimer.singleShot(0, finish))
+
     sys.exit(app.exec())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
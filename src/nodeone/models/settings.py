@@ -1,24 +1,90 @@
 import json
-from typing import Any, Dict, List
+import os
+import threading
+from contextvars import ContextVar
 from pathlib import Path
-from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+from pydantic import BaseModel, Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from nodeone.models.settings_cache import read_snapshot, write_snapshot
+from nodeone.utils.paths import config_file
+
+# Config file contents already read by the caller of `load_settings`
+_config_data: ContextVar[Optional[Dict[str, Any]]] = ContextVar("config_data", default=None)
+
+def read_config_file(strict: bool = False, path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Reads ~/config.json, or `path` if given. Unreadable JSON is reported
+    and ignored, unless `strict` is set, in which case the ValueError is
+    raised.
+    """
+    config_path = Path(path) if path else config_file()
+    if config_path.is_file():
+        try:
+            with open(config_path, 'r') as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            if strict:
+                raise
+            print(f"Warning: Could not decode JSON from {config_path}")
+    return {}
 
 class UIConfig(BaseModel):
     theme: str = "light"
     name: str = "NodeOne"
     width: int = 1000
     height: int = 700
-    enabled_tabs: List[str] = ["dashboard", "plugins"]
+    enabled_tabs: List[str] = ["dashboard", "processes", "logs", "plugins"]
+    show_fps: bool = False  # frame-clock FPS and paint-time overlay
+    stall_threshold_ms: int = 50  # GUI stall detector; 0 disables it
     
+class MetricsConfig(BaseModel):
+    interval: float = 1.0
+    history: int = 3600
+
 class AgentConfig(BaseModel):
-    pass
+    url: str
+    name: str = ""
+    labels: List[str] = []
+    interval: Optional[float] = None  # overrides poller.interval
+
+    @model_validator(mode="before")
+    @classmethod
+    def _from_url(cls, value: Any) -> Any:
+        # Plain strings in `agents` are agent URLs
+        if isinstance(value, str):
+            return {"url": value}
+        return value
+
+    @model_validator(mode="after")
+    def _default_name(self) -> "AgentConfig":
+        if not self.name:
+            self.name = urlsplit(self.url).netloc or self.url
+        return self
+
+class PollerConfig(BaseModel):
+    interval: float = 5.0
+    concurrency: int = 64
+    timeout: float = 3.0
+    max_backoff: float = 60.0
+
+class AlertRule(BaseModel):
+    name: str
+    expr: str  # e.g. "avg(cpu_percent, '5m') > 90", see services.alerts
+    labels: List[str] = []  # only nodes whose agent carries all of these
+    selector: str = ""  # and matches this label selector, e.g. "role=db AND region!=eu"
+    hysteresis: float = 0.0  # how far past its threshold a firing alert must fall back to resolve
+    pending: float = 0.0  # seconds the condition must hold before the alert fires
 
 class AppSettings(BaseSettings):
     debug_mode: bool = False
-    server_port: int = 8000
+    server_port: int = 8000  # local Prometheus metrics endpoint; 0 disables it
     ui: UIConfig = Field(default_factory=UIConfig)
-    agents: List[str] = []
+    metrics: MetricsConfig = Field(default_factory=MetricsConfig)
+    agents: List[AgentConfig] = []
+    poller: PollerConfig = Field(default_factory=PollerConfig)
+    alerts: List[AlertRule] = []
     
     model_config = SettingsConfigDict(
         env_nested_delimiter='__',
@@ -37,17 +103,7 @@ class AppSettings(BaseSettings):
         """
         Defines the order of configuration sources (from lowest to highest priority).
         """
-        def load_home_config_dict() -> Dict[str, Any]:
-            config_path = Path.home() / "config.json"
-            if config_path.is_file():
-                try:
-                    with open(config_path, 'r') as f:
-                        return json.load(f)
-                except json.JSONDecodeError:
-                    print(f"Warning: Could not decode JSON from {config_path}")
-            return {}
-
-        json_source_callable = lambda: load_home_config_dict()
+        json_source_callable = lambda: _config_data.get() if _config_data.get() is not None else read_config_file()
         
         return (
             init_settings,
@@ -56,5 +112,80 @@ class AppSettings(BaseSettings):
             env_settings,
             file_secret_settings, # (highest priority)
         )
-        
-settings = AppSettings()
\ No newline at end of file
+
+
+def load_settings(data: Optional[Dict[str, Any]] = None) -> AppSettings:
+    """Builds the settings, taking the config file contents from `data` if given."""
+    token = _config_data.set(data)
+    try:
+        return AppSettings()
+    finally:
+        _config_data.reset(token)
+
+
+_settings: Optional[AppSettings] = None
+_settings_lock = threading.Lock()
+
+
+def get_settings() -> AppSettings:
+    """Returns the application settings, reading ~/config.json on first use."""
+    global _settings
+    if _settings is None:
+        with _settings_lock:
+            if _settings is None:
+                _settings = AppSettings()
+                _refresh_snapshot(_settings)
+    return _settings
+
+
+def set_settings(settings: AppSettings):
+    """Replaces the settings returned by `get_settings`, e.g. after a reload."""
+    global _settings
+    with _settings_lock:
+        _settings = settings
+    _refresh_snapshot(settings)
+
+
+def _refresh_snapshot(settings: AppSettings):
+    # Lets the next start build its first frame without importing pydantic
+    data = settings.model_dump(mode="json")
+    if read_snapshot() != data:
+        write_snapshot(data, list(AppSettings.model_fields))
+
+
+def save_agent_labels(name: str, labels: List[str]) -> bool:
+    """
+    Writes the labels of the agent called `name` back to ~/config.json.
+    Returns False if no agent of that name is configured there; the
+    settings watcher picks the change up like any other edit.
+    """
+    config_path = config_file()
+    data = read_config_file(strict=True)
+    agents = data.get("agents")
+    if not isinstance(agents, list):
+        return False
+    for i, entry in enumerate(agents):
+        try:
+            agent = AgentConfig.model_validate(entry)
+        except ValueError:
+            continue
+        if agent.name == name:
+            entry = dict(entry) if isinstance(entry, dict) else {"url": entry}
+            entry["labels"] = list(labels)
+            agents[i] = entry
+            break
+    else:
+        return False
+    tmp = f"{config_path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, config_path)
+    return True
+
+
+def __getattr__(name: str) -> Any:
+    # `from nodeone.models.settings import settings` still works, but the
+    # settings are only loaded and validated when first asked for
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,78 @@
+import json
+import os
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, List, Optional
+from nodeone.utils.logger import get_logger
+from nodeone.utils.paths import cache_dir, config_file
+
+logger = get_logger(__name__)
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_FILE = "settings_snapshot.json"
+
+
+def _stamp(fields: Iterable[str]) -> Dict[str, Any]:
+    """Identifies the inputs settings were built from: the file and env vars."""
+    fields = {f.lower() for f in fields}
+    try:
+        st = os.stat(config_file())
+        source = [st.st_mtime_ns, st.st_size]
+    except OSError:
+        source = None
+    env = sorted(
+        [k, v] for k, v in os.environ.items() if k.lower().split("__", 1)[0] in fields
+    )
+    return {"config": source, "env": env}
+
+
+def read_snapshot(path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Returns the last validated settings as plain data, or None when
+    ~/config.json or the relevant environment changed since it was written.
+
+    This module does not import pydantic, so the startup path can read the
+    settings it needs before the full model is loaded.
+    """
+    path = path or str(cache_dir() / SNAPSHOT_FILE)
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("version") != SNAPSHOT_VERSION:
+        return None
+    if data.get("stamp") != _stamp(data.get("fields", [])):
+        return None
+    return data.get("settings")
+
+
+def write_snapshot(settings: Dict[str, Any], fields: List[str], path: Optional[str] = None):
+    path = path or str(cache_dir() / SNAPSHOT_FILE)
+    tmp = f"{path}.tmp"
+    data = {
+        "version": SNAPSHOT_VERSION,
+        "fields": fields,
+        "stamp": _stamp(fields),
+        "settings": settings,
+    }
+    try:
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning("Could not write settings snapshot %s: %s", path, e)
+
+
+def startup_ui() -> Any:
+    """
+    The `ui` settings for building the first frame.
+
+    Served from the snapshot when it is current; otherwise the settings are
+    loaded and validated normally.
+    """
+    snapshot = read_snapshot()
+    if snapshot is not None and isinstance(snapshot.get("ui"), dict):
+        return SimpleNamespace(**snapshot["ui"])
+    from nodeone.models.settings import get_settings
+
+    return get_settings().ui
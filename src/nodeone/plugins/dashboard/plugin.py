@@ -1,11 +1,29 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton
+import time
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QComboBox, QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton
 from nodeone.services.event_bus import EventBus
+from nodeone.services.theme_manager import set_style_property
+from nodeone.views.components.tag_input import TagInputWidget
+from nodeone.views.components.time_chart import TimeSeriesChart
+
+TAB_TITLE = "Dashboard"
+TOPICS = ["pong", "metrics.system"]
+# Seconds of history shown by the live chart
+CHART_WINDOW = 600
+# Chart series and the metrics they plot
+CHART_SERIES = {"CPU": "cpu_percent", "Memory": "mem_percent"}
+# Selected node names listed before the rest is summarized
+SELECTION_SHOWN = 10
 
 
 class DashboardWidget(QWidget):
-    def __init__(self, event_bus: EventBus):
+    def __init__(self, event_bus: EventBus, services=None):
         super().__init__()
         self.event_bus = event_bus
+        self.store = services.get("timeseries") if services is not None else None
+        self.labels = services.get("labels") if services is not None else None
+        self._chart_loaded = False
+        self.tag_editor = None
 
         self._setup_ui()
         self._connect_signals()
@@ -20,18 +38,142 @@ class DashboardWidget(QWidget):
         self.last_msg = QLabel("No messages yet")
         layout.addWidget(self.last_msg)
 
+        self.cpu_label = QLabel("CPU: -")
+        self.mem_label = QLabel("Memory: -")
+        layout.addWidget(self.cpu_label)
+        layout.addWidget(self.mem_label)
+
+        self.history_label = QLabel("CPU last hour: -")
+        layout.addWidget(self.history_label)
+
+        if self.labels is not None:
+            self.selector_edit = QLineEdit()
+            self.selector_edit.setPlaceholderText("Select nodes, e.g. role=db AND region!=eu")
+            self.selector_edit.setClearButtonEnabled(True)
+            layout.addWidget(self.selector_edit)
+            self.selection_label = QLabel(f"{len(self.labels)} nodes")
+            layout.addWidget(self.selection_label)
+            # Labels of one node; edits go to the index and the agent settings
+            self.node_combo = QComboBox()
+            self.node_combo.addItems(self.labels.nodes)
+            layout.addWidget(self.node_combo)
+            self.tag_layout = QVBoxLayout()
+            layout.addLayout(self.tag_layout)
+
+        self.chart = TimeSeriesChart(window=CHART_WINDOW, y_range=(0, 100))
+        for name in CHART_SERIES:
+            self.chart.add_series(name)
+        layout.addWidget(self.chart, 1)
+
         self.setLayout(layout)
 
     def _connect_signals(self):
         self.ping_btn.clicked.connect(self._send_ping)
+        self.event_bus.subscribe("pong", self._on_event)
+        self.event_bus.subscribe("metrics.system", self._on_metrics)
+        if self.labels is not None:
+            self.selector_edit.textChanged.connect(self._on_selector)
+            self.node_combo.currentTextChanged.connect(self._edit_node)
+            self.event_bus.subscribe("settings.agents", self._on_agents)
+            self._edit_node(self.node_combo.currentText())
+
+        if self.store is not None:
+            self.history_timer = QTimer(self)
+            self.history_timer.setInterval(60_000)
+            self.history_timer.timeout.connect(self._refresh_history)
+            self.history_timer.start()
+            QTimer.singleShot(0, self._refresh_history)
 
     def _send_ping(self):
         self.event_bus.emit("ping", {"from": "dashboard"})
 
+    def _on_selector(self, text: str):
+        text = text.strip()
+        set_style_property(self.selector_edit, "invalid", False)
+        if not text:
+            self.selection_label.setText(f"{len(self.labels)} nodes")
+            return
+        try:
+            nodes = self.labels.select(text)
+        except ValueError:
+            set_style_property(self.selector_edit, "invalid", True)
+            return
+        shown = ", ".join(nodes[:SELECTION_SHOWN])
+        if len(nodes) > SELECTION_SHOWN:
+            shown += f" and {len(nodes) - SELECTION_SHOWN} more"
+        self.selection_label.setText(f"{len(nodes)} of {len(self.labels)} nodes: {shown}" if nodes else "No nodes selected")
+
+    def _edit_node(self, node: str):
+        # A fresh editor per node, so bindings never pile up on one widget
+        if self.tag_editor is not None:
+            self.tag_editor.deleteLater()
+            self.tag_editor = None
+        if not node:
+            return
+        self.tag_editor = TagInputWidget()
+        self.tag_editor.set_completions(self.labels.labels())
+        self.labels.bind(self.tag_editor, node)
+        self.tag_layout.addWidget(self.tag_editor)
+
+    def _on_agents(self, topic, change):
+        # The index was synced with the reloaded agents before this runs.
+        # Tag edits come back here too, so the editor being typed in is
+        # only replaced when its node is gone
+        current = self.node_combo.currentText()
+        nodes = self.labels.nodes
+        if nodes != [self.node_combo.itemText(i) for i in range(self.node_combo.count())]:
+            self.node_combo.blockSignals(True)
+            self.node_combo.clear()
+            self.node_combo.addItems(nodes)
+            self.node_combo.setCurrentText(current)
+            self.node_combo.blockSignals(False)
+        node = self.node_combo.currentText()
+        if node != current or self.tag_editor is None:
+            self._edit_node(node)
+        elif set(self.tag_editor.get_all_tags()) != set(self.labels.labels(node)):
+            # Edited elsewhere; the index already holds the new labels
+            self.tag_editor.blockSignals(True)
+            self.tag_editor.set_tags(self.labels.labels(node))
+            self.tag_editor.blockSignals(False)
+            self.tag_editor.set_completions(self.labels.labels())
+        self._on_selector(self.selector_edit.text())
+
     def _on_event(self, name, payload):
-        if name == "pong":
-            self.last_msg.setText(f"Got pong: {payload}")
+        self.last_msg.setText(f"Got pong: {payload}")
+
+    def _on_metrics(self, name, changed):
+        # Only changed values are published
+        if "cpu_percent" in changed:
+            self.cpu_label.setText(f"CPU: {changed['cpu_percent']:.1f}%")
+        if "mem_percent" in changed:
+            self.mem_label.setText(f"Memory: {changed['mem_percent']:.1f}%")
+        now = time.time()
+        for series, metric in CHART_SERIES.items():
+            if metric in changed:
+                self.chart.append(series, now, changed[metric])
+
+    def _refresh_history(self):
+        now = time.time()
+        if not self._chart_loaded:
+            self._load_chart(now)
+        records = self.store.query("local", "cpu_percent", now - 3600, now)
+        if not len(records):
+            return
+        if "v" in records.dtype.names:
+            avg, peak = records["v"].mean(), records["v"].max()
+        else:
+            avg, peak = records["avg"].mean(), records["max"].max()
+        self.history_label.setText(f"CPU last hour: avg {avg:.1f}%, max {peak:.1f}%")
+
+    def _load_chart(self, now: float):
+        # Backfill once from the store; live samples are appended after it
+        self._chart_loaded = True
+        for series, metric in CHART_SERIES.items():
+            records = self.store.query("local", metric, now - CHART_WINDOW, now)
+            if len(records):
+                values = records["v"] if "v" in records.dtype.names else records["avg"]
+                self.chart.set_data(series, records["t"], values)
 
 
-def create_plugin(event_bus):
-    return DashboardWidget(event_bus)
+def create_plugin(event_bus, services=None):
+    return DashboardWidget(event_bus, services)
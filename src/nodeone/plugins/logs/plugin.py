@@ -0,0 +1,8 @@
+from nodeone.utils.logger import log_file_path
+from nodeone.views.components.log_view import LogViewer
+
+TAB_TITLE = "Logs"
+
+
+def create_plugin(event_bus):
+    return LogViewer(log_file_path())
@@ -0,0 +1,93 @@
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+from PyQt6.QtWidgets import QLabel, QLineEdit, QVBoxLayout, QWidget
+from nodeone.services.process_scanner import TOPIC, ProcessDelta, ProcessScanner
+from nodeone.views.components.process_table import (
+    ProcessFilterProxyModel,
+    ProcessTableModel,
+    ProcessTableView,
+)
+from nodeone.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+TAB_TITLE = "Processes"
+
+REFRESH_MS = 2000
+
+
+class _ScanSignals(QObject):
+    ready = pyqtSignal(object)
+
+
+class _ScanTask(QRunnable):
+    def __init__(self, scanner: ProcessScanner, signals: _ScanSignals):
+        super().__init__()
+        self.scanner = scanner
+        self.signals = signals
+
+    def run(self):
+        try:
+            delta = self.scanner.scan()
+        except Exception:
+            # Always report back, or the widget would never scan again
+            logger.exception("Process scan failed")
+            delta = ProcessDelta({}, {}, [], 0, 0)
+        self.signals.ready.emit(delta)
+
+
+class ProcessesWidget(QWidget):
+    def __init__(self, event_bus):
+        super().__init__()
+        self.event_bus = event_bus
+        self.scanner = ProcessScanner()
+        self._busy = False
+
+        self._setup_ui()
+        self._connect_signals()
+        self.timer.start()
+        self.refresh()
+
+    def _setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter by name, user or PID")
+        layout.addWidget(self.filter_edit)
+
+        self.model = ProcessTableModel(parent=self)
+        self.proxy = ProcessFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.table = ProcessTableView()
+        self.table.setModel(self.proxy)
+        layout.addWidget(self.table)
+
+        self.status = QLabel()
+        layout.addWidget(self.status)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(REFRESH_MS)
+        self._signals = _ScanSignals(self)
+
+    def _connect_signals(self):
+        self.filter_edit.textChanged.connect(self.proxy.set_filter_text)
+        self.timer.timeout.connect(self.refresh)
+        self._signals.ready.connect(self._on_delta)
+
+    def refresh(self):
+        # Skip a tick rather than queueing scans behind a slow one; the
+        # scanner also keeps state that only one scan may touch at a time
+        if self._busy:
+            return
+        self._busy = True
+        QThreadPool.globalInstance().start(_ScanTask(self.scanner, self._signals))
+
+    def _on_delta(self, delta: ProcessDelta):
+        self._busy = False
+        if delta:
+            self.model.apply_delta(delta.removed, delta.changed, delta.added)
+            self.event_bus.emit(TOPIC, delta)
+        self.status.setText(f"{self.model.rowCount()} processes")
+
+
+def create_plugin(event_bus):
+    return ProcessesWidget(event_bus)
@@ -0,0 +1,636 @@
+import ast
+import math
+import re
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+import numpy as np
+from nodeone.services.label_index import matches, parse_selector
+from nodeone.services.telemetry import REGISTRY
+from nodeone.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Transitions are published on "alerts.<rule name>"
+TOPIC_PREFIX = "alerts"
+FIRING = "firing"
+RESOLVED = "resolved"
+
+# Running sums are recomputed from their window after this many samples,
+# so rounding errors from removing old samples cannot build up
+RESUM_EVERY = 4096
+_INITIAL_NODES = 64
+
+EVALUATION_SECONDS = REGISTRY.histogram(
+    "nodeone_alert_evaluation_seconds", "Time taken to evaluate the alert rules once"
+)
+ALERTS_FIRING = REGISTRY.gauge("nodeone_alerts_firing", "Alerts currently firing")
+
+Source = Callable[[], Iterable[Tuple[str, float, Dict[str, float]]]]
+Term = Callable[[np.ndarray], np.ndarray]
+
+
+class AlertEvent(NamedTuple):
+    """Payload of an ``alerts.<rule>`` event."""
+
+    rule: str
+    node: str
+    state: str  # FIRING or RESOLVED
+    value: float  # of the first aggregate in the rule's expression
+    timestamp: float
+
+
+# ----------------------------------------------------------------------
+# Sliding windows
+# ----------------------------------------------------------------------
+class _Window:
+    """
+    Sum, count, min, max and last value of one metric over the last
+    `seconds`, for every node.
+
+    Samples sit in a deque per node and leave it as they age, updating the
+    running sum; min and max come from monotonic deques, and only when a
+    rule asks for them. Each sample costs O(1) amortized. The aggregates
+    live in arrays indexed by node, so rules read them for many nodes at
+    once. A window of 0 seconds keeps only the last value.
+    """
+
+    def __init__(self, metric: str, seconds: float, capacity: int):
+        self.metric = metric
+        self.seconds = seconds
+        self.minmax = False
+        self.samples: List[Optional[deque]] = []
+        self.lows: List[Optional[deque]] = []
+        self.highs: List[Optional[deque]] = []
+        self.added: List[int] = []
+        self.sum = np.zeros(capacity)
+        self.count = np.zeros(capacity)
+        self.min = np.full(capacity, np.nan)
+        self.max = np.full(capacity, np.nan)
+        self.last = np.full(capacity, np.nan)
+
+    def grow(self, capacity: int):
+        for name, fill in (("sum", 0.0), ("count", 0.0), ("min", np.nan), ("max", np.nan), ("last", np.nan)):
+            old = getattr(self, name)
+            new = np.full(capacity, fill)
+            new[: len(old)] = old
+            setattr(self, name, new)
+
+    def add(self, i: int, t: float, v: float):
+        self.last[i] = v
+        if not self.seconds:
+            return
+        while len(self.samples) <= i:
+            self.samples.append(None)
+            self.lows.append(None)
+            self.highs.append(None)
+            self.added.append(0)
+        samples = self.samples[i]
+        if samples is None:
+            samples = self.samples[i] = deque()
+            if self.minmax:
+                self.lows[i], self.highs[i] = deque(), deque()
+
+        horizon = t - self.seconds
+        samples.append((t, v))
+        total = self.sum[i] + v
+        while samples[0][0] <= horizon:
+            total -= samples.popleft()[1]
+        self.added[i] += 1
+        if self.added[i] >= RESUM_EVERY:
+            self.added[i] = 0
+            total = math.fsum(value for _, value in samples)
+        self.sum[i] = total
+        self.count[i] = len(samples)
+
+        if self.minmax:
+            lows, highs = self.lows[i], self.highs[i]
+            while lows and lows[-1][1] >= v:
+                lows.pop()
+            lows.append((t, v))
+            while lows[0][0] <= horizon:
+                lows.popleft()
+            while highs and highs[-1][1] <= v:
+                highs.pop()
+            highs.append((t, v))
+            while highs[0][0] <= horizon:
+                highs.popleft()
+            self.min[i] = lows[0][1]
+            self.max[i] = highs[0][1]
+
+
+# ----------------------------------------------------------------------
+# Rule expressions
+# ----------------------------------------------------------------------
+_AGGREGATES = ("avg", "sum", "count", "min", "max", "last")
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+_DURATION = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([smhd]?)\s*$")
+# Comparison, and which way its threshold moves to keep a firing alert firing
+_COMPARISONS = {
+    ast.Gt: (np.greater, -1),
+    ast.GtE: (np.greater_equal, -1),
+    ast.Lt: (np.less, 1),
+    ast.LtE: (np.less_equal, 1),
+}
+_FLIPPED = {ast.Gt: ast.Lt, ast.GtE: ast.LtE, ast.Lt: ast.Gt, ast.LtE: ast.GtE}
+
+
+def parse_duration(value) -> float:
+    """Seconds from a number or a string such as ``"90s"``, ``"5m"`` or ``"1h"``."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    match = _DURATION.match(value) if isinstance(value, str) else None
+    if match is None:
+        raise ValueError(f"invalid window {value!r}")
+    return float(match.group(1)) * _UNITS[match.group(2) or "s"]
+
+
+class _Compiler:
+    """
+    Compiles a rule expression into closures over node index arrays.
+
+    The grammar is a Python expression made of comparisons between an
+    aggregate and a number, combined with ``and``, ``or`` and ``not``::
+
+        avg(cpu_percent, '5m') > 90 and max(mem_percent, 60) >= 95
+        not last(disk_free) > 10e9
+        cpu_percent > 99            # a bare metric is its last value
+
+    Aggregates are avg, sum, count, min, max and last. Each comparison is
+    compiled twice: as written, to decide when an alert fires, and with
+    its threshold moved by the hysteresis, to decide how long a firing
+    alert keeps firing.
+    """
+
+    def __init__(self, window: Callable[[str, float, bool], _Window]):
+        self.window = window
+        self.metrics: Set[str] = set()
+        self.first: Optional[Term] = None
+
+    def compile(self, expr: str, hysteresis: float) -> Tuple[Term, Term]:
+        try:
+            tree = ast.parse(expr.strip(), mode="eval").body
+        except SyntaxError as e:
+            raise ValueError(f"invalid expression {expr!r}: {e.msg}") from None
+        return self._build(tree, 0.0), self._build(tree, hysteresis)
+
+    def _build(self, node, relax: float) -> Term:
+        if isinstance(node, ast.BoolOp):
+            parts = [self._build(value, relax) for value in node.values]
+            combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+
+            def boolean(idx, parts=parts, combine=combine):
+                result = parts[0](idx)
+                for part in parts[1:]:
+                    result = combine(result, part(idx))
+                return result
+
+            return boolean
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            # Keeping a negated condition true moves its threshold the other way
+            inner = self._build(node.operand, -relax)
+            return lambda idx: ~inner(idx)
+        if isinstance(node, ast.Compare) and len(node.ops) == 1:
+            return self._compare(node.left, node.ops[0], node.comparators[0], relax)
+        raise ValueError(f"unsupported expression: {ast.unparse(node)}")
+
+    def _compare(self, left, op, right, relax: float) -> Term:
+        if type(op) not in _COMPARISONS:
+            raise ValueError(f"unsupported comparison: {type(op).__name__}")
+        if _number(left) is not None:
+            left, right, op = right, left, _FLIPPED[type(op)]()
+        threshold = _number(right)
+        if threshold is None:
+            raise ValueError(f"{ast.unparse(right)} is not a number")
+        value = self._term(left)
+        compare, direction = _COMPARISONS[type(op)]
+        threshold += direction * relax
+        return lambda idx: compare(value(idx), threshold)
+
+    def _term(self, node) -> Term:
+        if isinstance(node, ast.Name):
+            aggregate, metric, seconds = "last", node.id, 0.0
+        elif (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Name)
+            and node.func.id in _AGGREGATES
+            and not node.keywords
+            and node.args
+            and isinstance(node.args[0], ast.Name)
+        ):
+            aggregate, metric = node.func.id, node.args[0].id
+            if aggregate == "last":
+                seconds = 0.0
+            elif len(node.args) == 2 and isinstance(node.args[1], ast.Constant):
+                seconds = parse_duration(node.args[1].value)
+                if seconds <= 0:
+                    raise ValueError(f"window of {ast.unparse(node)} must be positive")
+            else:
+                raise ValueError(f"{ast.unparse(node)} needs a metric and a window")
+        else:
+            raise ValueError(f"unsupported term: {ast.unparse(node)}")
+
+        window = self.window(metric, seconds, aggregate in ("min", "max"))
+        self.metrics.add(metric)
+        if aggregate == "avg":
+            term = lambda idx: window.sum[idx] / window.count[idx]
+        else:
+            term = lambda idx, name=aggregate: getattr(window, name)[idx]
+        if self.first is None:
+            self.first = term
+        return term
+
+
+def _number(node) -> Optional[float]:
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        value = _number(node.operand)
+        return None if value is None else (-value if isinstance(node.op, ast.USub) else value)
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        return float(node.value)
+    return None
+
+
+_UNSCOPED = (frozenset(), "")
+
+
+def _in_scope(scope: tuple, labels: frozenset) -> bool:
+    required, selector = scope
+    return required <= labels and (not selector or matches(selector, labels))
+
+
+class _Rule:
+    def __init__(self, config, fire: Term, hold: Term, first: Term, metrics: Set[str], capacity: int):
+        self.config = config
+        self.name = config.name
+        # Nodes in scope carry all of `labels` and match `selector`
+        self.scope = (frozenset(config.labels), config.selector.strip())
+        self.pending = float(config.pending)
+        self.fire = fire
+        self.hold = hold
+        self.first = first
+        self.metrics = sorted(metrics)
+        self.firing = np.zeros(capacity, dtype=bool)
+        self.since = np.full(capacity, np.nan)  # when the condition last became true
+
+    @property
+    def key(self) -> tuple:
+        c = self.config
+        return (c.name, c.expr, tuple(sorted(c.labels)), c.selector, c.hysteresis, c.pending)
+
+    def grow(self, capacity: int):
+        firing = np.zeros(capacity, dtype=bool)
+        firing[: len(self.firing)] = self.firing
+        since = np.full(capacity, np.nan)
+        since[: len(self.since)] = self.since
+        self.firing, self.since = firing, since
+
+
+# ----------------------------------------------------------------------
+# Engine
+# ----------------------------------------------------------------------
+class AlertEngine:
+    """
+    Streaming evaluation of alert rules over many nodes.
+
+    `ingest` folds each sample into the sliding windows its metric feeds,
+    in O(1) per window, and marks the node dirty for that metric.
+    `evaluate` then runs only the rules that read a dirty metric, and only
+    for the nodes that were sampled and are in the rule's label scope; each
+    rule is a compiled closure that works on all of those nodes at once
+    with NumPy. It returns the alerts that changed state: an alert fires once
+    its condition has held for the rule's `pending` seconds, and resolves
+    once the condition, with thresholds moved back by the rule's
+    `hysteresis`, no longer holds. Staying in a state reports nothing.
+    Alerts of a rule that is edited or removed resolve on the next
+    `evaluate`.
+
+    A node's windows only move when it is sampled, so a node that stops
+    reporting keeps its last state. Not thread-safe.
+    """
+
+    def __init__(self, rules: Sequence = (), labels: Optional[Dict[str, Sequence[str]]] = None):
+        self._capacity = _INITIAL_NODES
+        self._index: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._labels: Dict[str, frozenset] = {name: frozenset(v) for name, v in (labels or {}).items()}
+        self._node_labels: List[frozenset] = []
+        self._masks: Dict[frozenset, np.ndarray] = {}
+        self._windows: Dict[Tuple[str, float], _Window] = {}
+        self._by_metric: Dict[str, List[_Window]] = {}
+        self._rules: List[_Rule] = []
+        self._rules_by_metric: Dict[str, List[_Rule]] = {}
+        self._dirty: Dict[str, Set[int]] = {}
+        self._resolved: List[AlertEvent] = []  # of rules replaced by `set_rules`
+        self.errors: Dict[str, str] = {}  # rule name -> why it was not compiled
+        self.set_rules(rules)
+
+    @property
+    def rules(self) -> List[str]:
+        return [rule.name for rule in self._rules]
+
+    @property
+    def nodes(self) -> List[str]:
+        return list(self._names)
+
+    def firing(self) -> List[Tuple[str, str]]:
+        """(rule, node) of every alert currently firing."""
+        result = []
+        for rule in self._rules:
+            for i in np.flatnonzero(rule.firing[: len(self._names)]):
+                result.append((rule.name, self._names[i]))
+        return result
+
+    # ------------------------------------------------------------------
+    # Configuration
+    # ------------------------------------------------------------------
+    def set_rules(self, rules: Sequence):
+        """
+        Compiles `rules` (AlertRule settings). Rules that did not change
+        keep their state and windows; invalid ones are skipped and listed
+        in `errors`. The alerts of the other previous rules are resolved.
+        """
+        previous = {rule.key: rule for rule in self._rules}
+        windows, self._windows = self._windows, {}
+        self._rules, self.errors = [], {}
+        for config in rules:
+            try:
+                rule = self._compile(config, windows)
+            except ValueError as e:
+                self.errors[config.name] = str(e)
+                logger.warning("Skipping alert rule %s: %s", config.name, e)
+                continue
+            old = previous.pop(rule.key, None)
+            if old is not None:
+                rule.firing, rule.since = old.firing, old.since
+            self._rules.append(rule)
+            if rule.scope != _UNSCOPED:
+                self._mask(rule.scope)
+        now = time.time()
+        for old in previous.values():
+            idx = np.flatnonzero(old.firing[: len(self._names)])
+            if not len(idx):
+                continue
+            with np.errstate(invalid="ignore", divide="ignore"):
+                values = old.first(idx)
+            for i, value in zip(idx.tolist(), values.tolist()):
+                self._resolved.append(AlertEvent(old.name, self._names[i], RESOLVED, value, now))
+
+        self._by_metric = {}
+        for window in self._windows.values():
+            self._by_metric.setdefault(window.metric, []).append(window)
+        self._rules_by_metric = {}
+        for rule in self._rules:
+            for metric in rule.metrics:
+                self._rules_by_metric.setdefault(metric, []).append(rule)
+        self._masks = {scope: mask for scope, mask in self._masks.items() if any(r.scope == scope for r in self._rules)}
+
+    def set_labels(self, node: str, labels: Sequence[str]):
+        labels = frozenset(labels)
+        self._labels[node] = labels
+        i = self._index.get(node)
+        if i is not None:
+            self._node_labels[i] = labels
+            for scope, mask in self._masks.items():
+                mask[i] = _in_scope(scope, labels)
+
+    def _compile(self, config, windows: Dict[Tuple[str, float], _Window]) -> _Rule:
+        def window(metric: str, seconds: float, minmax: bool) -> _Window:
+            key = (metric, seconds)
+            found = self._windows.get(key)
+            if found is None:
+                found = windows.get(key) or _Window(metric, seconds, self._capacity)
+                self._windows[key] = found
+            if minmax and not found.minmax:
+                # Monotonic deques only see samples from now on
+                found.minmax = True
+                found.lows = [deque() if s is not None else None for s in found.samples]
+                found.highs = [deque() if s is not None else None for s in found.samples]
+            return found
+
+        if config.selector.strip():
+            parse_selector(config.selector.strip())  # raises ValueError
+        compiler = _Compiler(window)
+        fire, hold = compiler.compile(config.expr, float(config.hysteresis))
+        return _Rule(config, fire, hold, compiler.first, compiler.metrics, self._capacity)
+
+    def _mask(self, scope: tuple) -> np.ndarray:
+        mask = self._masks.get(scope)
+        if mask is None:
+            mask = np.zeros(self._capacity, dtype=bool)
+            for i, node_labels in enumerate(self._node_labels):
+                mask[i] = _in_scope(scope, node_labels)
+            self._masks[scope] = mask
+        return mask
+
+    def _node(self, name: str) -> int:
+        i = self._index.get(name)
+        if i is not None:
+            return i
+        i = self._index[name] = len(self._names)
+        self._names.append(name)
+        labels = self._labels.get(name, frozenset())
+        self._node_labels.append(labels)
+        if i >= self._capacity:
+            self._grow(self._capacity * 2)
+        for scope, mask in self._masks.items():
+            mask[i] = _in_scope(scope, labels)
+        return i
+
+    def _grow(self, capacity: int):
+        self._capacity = capacity
+        for window in self._windows.values():
+            window.grow(capacity)
+        for rule in self._rules:
+            rule.grow(capacity)
+        for scope, mask in self._masks.items():
+            grown = np.zeros(capacity, dtype=bool)
+            grown[: len(mask)] = mask
+            self._masks[scope] = grown
+
+    # ------------------------------------------------------------------
+    # Samples
+    # ------------------------------------------------------------------
+    def ingest(self, node: str, t: float, values: Dict[str, float]):
+        """Adds one sample of `node`; metrics no rule reads are ignored."""
+        i = None
+        for metric, value in values.items():
+            windows = self._by_metric.get(metric)
+            if windows is None:
+                continue
+            if i is None:
+                i = self._node(node)
+            for window in windows:
+                window.add(i, t, value)
+            dirty = self._dirty.get(metric)
+            if dirty is None:
+                dirty = self._dirty[metric] = set()
+            dirty.add(i)
+
+    def evaluate(self, now: Optional[float] = None) -> List[AlertEvent]:
+        """Runs the rules affected by the samples since the last call."""
+        now = time.time() if now is None else now
+        started = time.perf_counter()
+        dirty, self._dirty = self._dirty, {}
+        events, self._resolved = self._resolved, []
+        if not dirty:
+            if events:
+                ALERTS_FIRING.set(sum(int(rule.firing.sum()) for rule in self._rules))
+            return events
+        nodes = {metric: np.fromiter(sorted(indices), dtype=np.intp, count=len(indices)) for metric, indices in dirty.items()}
+        seen: Set[int] = set()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            for metric in dirty:
+                for rule in self._rules_by_metric.get(metric, ()):
+                    if id(rule) in seen:
+                        continue
+                    seen.add(id(rule))
+                    if len(rule.metrics) == 1:
+                        idx = nodes[metric]
+                    else:
+                        key = tuple(rule.metrics)
+                        idx = nodes.get(key)
+                        if idx is None:
+                            idx = nodes[key] = np.unique(np.concatenate([nodes[m] for m in key if m in dirty]))
+                    if rule.scope != _UNSCOPED:
+                        idx = idx[self._masks[rule.scope][idx]]
+                    if len(idx):
+                        self._step(rule, idx, now, events)
+        EVALUATION_SECONDS.observe(time.perf_counter() - started)
+        ALERTS_FIRING.set(sum(int(rule.firing.sum()) for rule in self._rules))
+        return events
+
+    def _step(self, rule: _Rule, idx: np.ndarray, now: float, events: List[AlertEvent]):
+        firing = rule.firing[idx]
+        active = rule.fire(idx)
+        if firing.any():
+            active = np.where(firing, rule.hold(idx), active)
+        if rule.pending > 0:
+            since = rule.since[idx]
+            since = np.where(active, np.where(np.isnan(since), now, since), np.nan)
+            rule.since[idx] = since
+            active = active & (now - since >= rule.pending)
+        changed = np.flatnonzero(active != firing)
+        if not len(changed):
+            return
+        idx = idx[changed]
+        states = active[changed]
+        rule.firing[idx] = states
+        values = rule.first(idx)
+        for i, state, value in zip(idx.tolist(), states.tolist(), values.tolist()):
+            events.append(AlertEvent(rule.name, self._names[i], FIRING if state else RESOLVED, value, now))
+
+
+# ----------------------------------------------------------------------
+# Service
+# ----------------------------------------------------------------------
+def collector_source(collector, node: str = "local") -> Source:
+    """Reads the newest sample of a MetricsCollector."""
+    last = [0.0]
+
+    def read():
+        row = collector.history.latest()
+        if row is None or row["timestamp"] <= last[0]:
+            return ()
+        t = last[0] = row.pop("timestamp")
+        return [(node, t, row)]
+
+    return read
+
+
+def fleet_source(poller) -> Source:
+    """Reads the nodes of a FleetPoller whose snapshot changed since the last call."""
+    seen: Dict[str, float] = {}
+
+    def read():
+        samples = []
+        for name, snapshot in poller.store.snapshot().items():
+            if not snapshot.ok or seen.get(name) == snapshot.updated or not isinstance(snapshot.data, dict):
+                continue
+            seen[name] = snapshot.updated
+            values = {
+                k: v for k, v in snapshot.data.items()
+                if isinstance(v, (int, float)) and not isinstance(v, bool)
+            }
+            samples.append((name, snapshot.updated, values))
+        return samples
+
+    return read
+
+
+class AlertService:
+    """
+    Runs an `AlertEngine` on its own thread.
+
+    Every `interval` seconds the thread reads new samples from its sources
+    (callables returning ``(node, timestamp, {metric: value})`` tuples),
+    evaluates the rules and publishes each transition as an `AlertEvent`
+    on ``alerts.<rule name>``. Rule and label changes are handed to the
+    thread and applied before its next evaluation.
+    """
+
+    def __init__(self, rules: Sequence = (), event_bus=None, interval: float = 1.0,
+                 sources: Sequence[Source] = (), labels: Optional[Dict[str, Sequence[str]]] = None):
+        self.engine = AlertEngine(rules, labels)
+        self.event_bus = event_bus
+        self.interval = interval
+        self.sources = list(sources)
+        self._changes: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def set_rules(self, rules: Sequence):
+        rules = list(rules)
+        self._apply(lambda: self.engine.set_rules(rules))
+
+    def set_labels(self, labels: Dict[str, Sequence[str]]):
+        labels = dict(labels)
+        self._apply(lambda: [self.engine.set_labels(node, v) for node, v in labels.items()])
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="alerts", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _apply(self, change: Callable[[], None]):
+        if not self.running:
+            change()
+            return
+        with self._lock:
+            self._changes.append(change)
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Alert evaluation failed")
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def run_once(self) -> List[AlertEvent]:
+        with self._lock:
+            changes, self._changes = self._changes, []
+        for change in changes:
+            change()
+        for source in self.sources:
+            for node, t, values in source():
+                self.engine.ingest(node, t, values)
+        events = self.engine.evaluate()
+        if self.event_bus is not None:
+            for event in events:
+                self.event_bus.emit(f"{TOPIC_PREFIX}.{event.rule}", event)
+        return events
@@ -1,17 +1,226 @@
-from PyQt6.QtCore import QObject, pyqtSignal
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+from nodeone.services.telemetry import REGISTRY, WORKER_QUEUE_DEPTH
+from nodeone.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Labelled by the first segment of the topic ("metrics" for "metrics.cpu"),
+# so topics carrying node or rule names do not add a series each
+DISPATCH_SECONDS = REGISTRY.histogram(
+    "nodeone_event_dispatch_seconds", "Time to deliver one event to its handlers", ["prefix"]
+)
+
+Handler = Callable[[str, object], None]
+
+WILDCARD = "*"
+
+
+class Subscription:
+    """Handle returned by `EventBus.subscribe`, pass it to `unsubscribe`."""
+
+    __slots__ = ("pattern", "handler", "active")
+
+    def __init__(self, pattern: str, handler: Handler):
+        self.pattern = pattern
+        self.handler = handler
+        self.active = True
+
+
+def _prefixes(topic: str):
+    """Yield the wildcard keys that can match `topic`, most specific first.
+
+    ``"a.b.c"`` yields ``"a.b"``, ``"a"`` and ``""`` (the bare ``"*"``).
+    """
+    end = topic.rfind(".")
+    while end != -1:
+        yield topic[:end]
+        end = topic.rfind(".", 0, end)
+    yield ""
+
+
+def _wildcard_key(pattern: str) -> Optional[str]:
+    """Return the prefix key for a wildcard pattern, or None if it is exact."""
+    if pattern == WILDCARD:
+        return ""
+    if pattern.endswith("." + WILDCARD):
+        return pattern[:-2]
+    return None
 
 
 class EventBus(QObject):
     """
-    A simple event bus based on Qt signals.
-    Plugins and the shell can connect to these signals to communicate.
+    A topic-routed event bus based on Qt signals.
+
+    Handlers subscribe to an exact topic (``"metrics.cpu"``), to everything
+    below a prefix (``"metrics.*"``) or to every event (``"*"``). Topics are
+    resolved once through a dispatch table, so an event only wakes up the
+    handlers that asked for it.
+
+    Bursty topics can be marked with `set_coalesced`; only their latest
+    payload is kept and delivered on the next event-loop turn. Events
+    emitted from other threads are queued and delivered to the bus thread
+    in one batch per event-loop turn.
+
+    `event_signal` still carries every event for listeners that connect
+    to it directly.
     """
 
     event_signal = pyqtSignal(str, object)
+    _flush_requested = pyqtSignal()
 
     def __init__(self):
         super().__init__()
+        self._exact: Dict[str, List[Subscription]] = {}
+        self._wildcards: Dict[str, List[Subscription]] = {}
+        self._routes: Dict[str, Tuple[Subscription, ...]] = {}
+        self._latency: Dict[str, object] = {}  # topic -> dispatch histogram
 
+        self._coalesced_patterns: set = set()
+        self._coalesced: Dict[str, bool] = {}
+
+        # State shared with emitting threads
+        self._lock = threading.Lock()
+        self._pending: Deque[Tuple[str, object]] = deque()
+        self._latest: Dict[str, object] = {}
+        self._flush_scheduled = False
+        self._owner_ident = threading.get_ident()
+
+        self._flush_requested.connect(
+            self.flush, Qt.ConnectionType.QueuedConnection
+        )
+
+    # ------------------------------------------------------------------
+    # Subscriptions
+    # ------------------------------------------------------------------
+    def subscribe(
+        self, pattern: str, handler: Handler, owner: Optional[QObject] = None
+    ) -> Subscription:
+        """Call `handler(topic, payload)` for every event matching `pattern`.
+
+        If `owner` is given, or `handler` is a bound method of a QObject,
+        the subscription is dropped when that object is destroyed.
+        Subscriptions must be made from the bus thread.
+        """
+        sub = Subscription(pattern, handler)
+        key = _wildcard_key(pattern)
+        table = self._exact if key is None else self._wildcards
+        table.setdefault(pattern if key is None else key, []).append(sub)
+        self._routes.clear()
+
+        if owner is None and isinstance(getattr(handler, "__self__", None), QObject):
+            owner = handler.__self__  # type: ignore[attr-defined]
+        if owner is not None:
+            # The bus may be torn down first, e.g. when the owner also owns it
+            bus = weakref.ref(self)
+            owner.destroyed.connect(lambda *_: bus() is not None and bus().unsubscribe(sub))
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        if not sub.active:
+            return
+        sub.active = False
+        key = _wildcard_key(sub.pattern)
+        table = self._exact if key is None else self._wildcards
+        subs = table.get(sub.pattern if key is None else key)
+        if subs and sub in subs:
+            subs.remove(sub)
+            if not subs:
+                del table[sub.pattern if key is None else key]
+        self._routes.clear()
+
+    def set_coalesced(self, pattern: str, enabled: bool = True):
+        """Keep only the latest payload of matching topics per event-loop turn."""
+        if enabled:
+            self._coalesced_patterns.add(pattern)
+        else:
+            self._coalesced_patterns.discard(pattern)
+        self._coalesced.clear()
+
+    def has_subscribers(self, topic: str) -> bool:
+        return bool(self._route(topic)) or self.receivers(self.event_signal) > 0
+
+    # ------------------------------------------------------------------
+    # Emitting
+    # ------------------------------------------------------------------
     def emit(self, name: str, payload: object = None):
-        # convenience wrapper
-        self.event_signal.emit(name, payload)
+        """Publish `payload` on topic `name`. Safe to call from any thread."""
+        coalesced = self._coalesced.get(name)
+        if coalesced is None:
+            coalesced = self._is_coalesced(name)
+
+        if not coalesced and threading.get_ident() == self._owner_ident:
+            self._dispatch(name, payload)
+            return
+
+        with self._lock:
+            if coalesced:
+                self._latest[name] = payload
+            else:
+                self._pending.append((name, payload))
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        self._flush_requested.emit()
+
+    def flush(self):
+        """Deliver queued and coalesced events. Runs on the bus thread."""
+        with self._lock:
+            pending, self._pending = self._pending, deque()
+            latest, self._latest = self._latest, {}
+            self._flush_scheduled = False
+
+        WORKER_QUEUE_DEPTH.labels("event_bus").set(len(pending) + len(latest))
+        for name, payload in pending:
+            self._dispatch(name, payload)
+        for name, payload in latest.items():
+            self._dispatch(name, payload)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _dispatch(self, name: str, payload: object):
+        route = self._routes.get(name)
+        if route is None:
+            route = self._route(name)
+        if route:
+            started = time.perf_counter()
+            for sub in route:
+                if not sub.active:
+                    continue
+                try:
+                    sub.handler(name, payload)
+                except Exception:
+                    logger.exception("Event handler for %r failed", name)
+            latency = self._latency.get(name)
+            if latency is None:
+                latency = self._latency[name] = DISPATCH_SECONDS.labels(name.split(".", 1)[0])
+            latency.observe(time.perf_counter() - started)
+
+        if self.receivers(self.event_signal) > 0:
+            self.event_signal.emit(name, payload)
+
+    def _route(self, topic: str) -> Tuple[Subscription, ...]:
+        route = self._routes.get(topic)
+        if route is not None:
+            return route
+        subs: List[Subscription] = list(self._exact.get(topic, ()))
+        if self._wildcards:
+            for prefix in _prefixes(topic):
+                subs.extend(self._wildcards.get(prefix, ()))
+        route = tuple(subs)
+        self._routes[topic] = route
+        return route
+
+    def _is_coalesced(self, topic: str) -> bool:
+        patterns = self._coalesced_patterns
+        result = topic in patterns or WILDCARD in patterns or any(
+            prefix and f"{prefix}.{WILDCARD}" in patterns
+            for prefix in _prefixes(topic)
+        )
+        self._coalesced[topic] = result
+        return result
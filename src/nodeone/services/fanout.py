@@ -0,0 +1,291 @@
+import asyncio
+import threading
+import time
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional, Sequence, Union
+import numpy as np
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from nodeone.services.telemetry import REGISTRY
+from nodeone.utils.logger import get_logger
+from nodeone.utils.output_buffer import MAX_LINE, OutputBuffer
+
+logger = get_logger(__name__)
+
+# Output reaches the GUI in batches at most this often (one 60 Hz frame)
+FLUSH_MS = 16
+DEFAULT_CONCURRENCY = 32
+DEFAULT_TIMEOUT = 60.0
+READ_SIZE = 64 * 1024
+
+PENDING = "pending"
+RUNNING = "running"
+OK = "ok"
+FAILED = "failed"
+TIMEOUT = "timeout"
+CANCELLED = "cancelled"
+
+NODE_RUNS = REGISTRY.counter("nodeone_fanout_node_runs", "Operations run on nodes by result", ["state"])
+
+# Runs an operation on one node: gets the node name and a function taking
+# each output line (bytes, without its line ending) and returns an exit
+# code, None meaning success
+Operation = Callable[[str, Callable[[bytes], None]], Awaitable[Optional[int]]]
+
+
+class NodeResult(NamedTuple):
+    node: str
+    state: str  # OK, FAILED, TIMEOUT or CANCELLED
+    exit_code: Optional[int]
+    duration: float
+    error: Optional[str]
+
+
+def command_operation(argv: Sequence[str]) -> Operation:
+    """
+    Operation running a local program, with ``{node}`` in its arguments
+    replaced by the node name, e.g. ``["ssh", "{node}", "uptime"]``.
+    Standard error is merged into the output.
+    """
+
+    async def run(node: str, emit: Callable[[bytes], None]) -> Optional[int]:
+        process = await asyncio.create_subprocess_exec(
+            *(arg.replace("{node}", node) for arg in argv),
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+        )
+        try:
+            await read_lines(process.stdout, emit)
+            return await process.wait()
+        finally:
+            # Cancelled or timed out
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+
+    return run
+
+
+async def read_lines(reader: asyncio.StreamReader, emit: Callable[[bytes], None]):
+    """
+    Splits a stream into lines, reading it in large blocks. Lines are cut
+    to MAX_LINE bytes, as the output buffer stores them; the rest of a
+    longer line is dropped as it arrives, so no line is held whole.
+    """
+    partial = b""
+    while True:
+        data = await reader.read(READ_SIZE)
+        if not data:
+            break
+        lines = (partial + data).split(b"\n")
+        partial = lines.pop()[:MAX_LINE]
+        for line in lines:
+            emit((line[:-1] if line.endswith(b"\r") else line)[:MAX_LINE])
+    if partial:
+        emit(partial)
+
+
+class FanOutRun(QObject):
+    """
+    One operation running on many nodes, as seen from the GUI thread.
+
+    Output lines and results arrive from the executor's thread into a
+    locked list; a FLUSH_MS timer moves them into `buffer` and announces
+    them, so the GUI handles one batch per frame however fast the nodes
+    write.
+    """
+
+    output = pyqtSignal(int, int)  # first and last (exclusive) new line
+    node_finished = pyqtSignal(object)  # NodeResult
+    finished = pyqtSignal()
+
+    def __init__(self, nodes: Sequence[str], parent=None):
+        super().__init__(parent)
+        self.nodes = list(dict.fromkeys(nodes))
+        self.buffer = OutputBuffer()
+        self.states: Dict[str, str] = {node: PENDING for node in self.nodes}
+        self.results: Dict[str, NodeResult] = {}
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+        self._lines: Dict[int, List[bytes]] = {}  # node number -> lines not yet flushed
+        self._events: List[tuple] = []
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._cancelled = False
+        self._timer = QTimer(self)
+        self._timer.setInterval(FLUSH_MS)
+        self._timer.timeout.connect(self.flush)
+        self._timer.start()
+
+    @property
+    def done(self) -> bool:
+        return len(self.results) == len(self.nodes)
+
+    def counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for state in self.states.values():
+            counts[state] = counts.get(state, 0) + 1
+        return counts
+
+    def cancel(self, node: Optional[str] = None):
+        """Cancels the whole run, or one node of it."""
+        loop = self._loop
+        if loop is None or not loop.is_running():
+            return
+        if node is None:
+            self._cancelled = True
+        loop.call_soon_threadsafe(self._cancel, node)
+
+    def flush(self):
+        """Moves output and results received so far into the GUI thread."""
+        with self._lock:
+            lines, self._lines = self._lines, {}
+            events, self._events = self._events, []
+        if lines:
+            first = len(self.buffer)
+            # One append per batch; lines of a node stay in order
+            nodes = np.repeat(np.fromiter(lines, dtype=np.int32), [len(batch) for batch in lines.values()])
+            self.buffer.append(nodes, [line for batch in lines.values() for line in batch])
+            self.output.emit(first, len(self.buffer))
+        for node, value in events:
+            if isinstance(value, NodeResult):
+                self.states[node] = value.state
+                self.results[node] = value
+                self.node_finished.emit(value)
+            else:
+                self.states[node] = value
+        if self.done and self._timer.isActive():
+            self._timer.stop()
+            self.finished.emit()
+
+    # ------------------------------------------------------------------
+    # Executor thread
+    # ------------------------------------------------------------------
+    def _cancel(self, node: Optional[str]):
+        for name, task in list(self._tasks.items()):
+            if node is None or name == node:
+                task.cancel()
+
+    def _post_line(self, index: int, line: bytes):
+        with self._lock:
+            lines = self._lines.get(index)
+            if lines is None:
+                self._lines[index] = [line]
+            else:
+                lines.append(line)
+
+    def _post_event(self, node: str, value):
+        with self._lock:
+            self._events.append((node, value))
+
+    async def _run_node(self, index: int, operation: Operation, timeout: float, semaphore: asyncio.Semaphore):
+        node = self.nodes[index]
+        started = time.monotonic()
+        exit_code = error = None
+
+        def emit(line: bytes):
+            self._post_line(index, line)
+
+        try:
+            async with semaphore:
+                if self._cancelled:
+                    raise asyncio.CancelledError
+                started = time.monotonic()
+                self._post_event(node, RUNNING)
+                exit_code = await asyncio.wait_for(operation(node, emit), timeout)
+            state = OK if not exit_code else FAILED
+        except asyncio.CancelledError:
+            state = CANCELLED
+        except asyncio.TimeoutError:
+            state, error = TIMEOUT, f"no result after {timeout:g} s"
+        except Exception as e:
+            state, error = FAILED, str(e) or type(e).__name__
+        NODE_RUNS.labels(state).inc()
+        self._tasks.pop(node, None)
+        self._post_event(node, NodeResult(node, state, exit_code, time.monotonic() - started, error))
+
+
+class FanOutExecutor:
+    """
+    Runs an operation on many nodes at once from one asyncio loop on its
+    own thread.
+
+    At most `concurrency` nodes of a run execute at the same time, each
+    within `timeout` seconds; a node over its time, or cancelled, has its
+    operation cancelled (a command's process is killed). Output streams
+    back line by line into the run's `OutputBuffer`.
+    """
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, timeout: float = DEFAULT_TIMEOUT, labels=None):
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.labels = labels  # LabelIndex resolving node selectors
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,), name="fanout", daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    def stop(self, timeout: float = 5.0):
+        """Stops the loop; operations still running are cancelled."""
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run(
+        self,
+        nodes: Union[str, Sequence[str]],
+        operation: Union[Operation, Sequence[str]],
+        timeout: Optional[float] = None,
+        concurrency: Optional[int] = None,
+        parent=None,
+    ) -> FanOutRun:
+        """
+        Starts `operation` (or a command line, see `command_operation`)
+        on every node. `nodes` may also be a label selector such as
+        ``"role=db AND region!=eu"``. Must be called on the GUI thread.
+        """
+        if isinstance(nodes, str):
+            if self.labels is None:
+                raise ValueError("node selectors need a label index")
+            nodes = self.labels.select(nodes)
+        if not callable(operation):
+            operation = command_operation(operation)
+        self.start()
+        run = FanOutRun(nodes, parent)
+        run._loop = self._loop
+        timeout = self.timeout if timeout is None else timeout
+        concurrency = concurrency or self.concurrency
+        self._loop.call_soon_threadsafe(self._start_run, run, operation, timeout, concurrency)
+        return run
+
+    def _start_run(self, run: FanOutRun, operation: Operation, timeout: float, concurrency: int):
+        semaphore = asyncio.Semaphore(concurrency)
+        for index, node in enumerate(run.nodes):
+            run._tasks[node] = asyncio.ensure_future(run._run_node(index, operation, timeout, semaphore))
+
+    def _run(self, ready: threading.Event):
+        loop = asyncio.new_event_loop()
+        self._loop = loop
+        asyncio.set_event_loop(loop)
+        ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.close()
+            self._loop = None
@@ -0,0 +1,407 @@
+import asyncio
+import heapq
+import itertools
+import json
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional
+from urllib.parse import urlsplit
+from nodeone.models.settings import AgentConfig
+from nodeone.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+TOPIC = "fleet.updated"
+# Agents with URLs of this scheme push samples over the binary protocol
+STREAM_SCHEME = "nodeone"
+
+Fetch = Callable[[AgentConfig], Awaitable[Any]]
+
+
+class NodeSnapshot(NamedTuple):
+    name: str
+    ok: bool
+    data: Any
+    latency: float
+    error: Optional[str]
+    updated: float
+
+
+class SnapshotStore:
+    """
+    Latest poll result per node, shared by the poller thread and the UI.
+
+    Writers replace whole entries, so readers always see a consistent
+    `NodeSnapshot`. `version` increases with every update and lets the UI
+    skip work when nothing changed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._nodes: Dict[str, NodeSnapshot] = {}
+        self.version = 0
+
+    def update(self, snapshot: NodeSnapshot):
+        with self._lock:
+            self._nodes[snapshot.name] = snapshot
+            self.version += 1
+
+    def remove(self, name: str):
+        with self._lock:
+            if self._nodes.pop(name, None) is not None:
+                self.version += 1
+
+    def get(self, name: str) -> Optional[NodeSnapshot]:
+        return self._nodes.get(name)
+
+    def snapshot(self) -> Dict[str, NodeSnapshot]:
+        with self._lock:
+            return dict(self._nodes)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+
+class _Node:
+    __slots__ = ("config", "interval", "failures", "conn", "latency", "generation", "stream")
+
+    def __init__(self, config: AgentConfig, interval: float):
+        self.config = config
+        self.interval = config.interval or interval
+        self.failures = 0
+        self.conn: Optional[tuple] = None
+        self.latency = 0.0
+        self.generation = 0
+        self.stream: Optional[asyncio.Task] = None
+
+
+class FleetPoller:
+    """
+    Polls many agents concurrently from one asyncio loop on its own thread.
+
+    Each node has its own jittered schedule, with exponential backoff on
+    failure, and a global semaphore bounds the number of polls in flight.
+    Agents at ``nodeone://host:port`` URLs are not polled: each keeps one
+    connection open over which the agent daemon pushes its samples, and
+    which is reopened with backoff, resuming the stream, when it drops.
+    Results go into a `SnapshotStore`; a coalesced `fleet.updated` event
+    tells the UI that the store changed.
+    """
+
+    def __init__(
+        self,
+        agents: List[AgentConfig],
+        store: Optional[SnapshotStore] = None,
+        event_bus=None,
+        interval: float = 5.0,
+        concurrency: int = 64,
+        timeout: float = 3.0,
+        max_backoff: float = 60.0,
+        fetch: Optional[Fetch] = None,
+    ):
+        self.store = store or SnapshotStore()
+        self.event_bus = event_bus
+        self.interval = interval
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.max_backoff = max_backoff
+        self.cycle_duration = 0.0
+
+        self._agents = list(agents)
+        self._fetch = fetch
+        self._nodes: Dict[str, _Node] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._schedule: List[tuple] = []
+        self._generations = itertools.count(1)
+        self._cycle_pending: set = set()
+        self._cycle_started = 0.0
+
+        if event_bus is not None:
+            event_bus.set_coalesced(TOPIC)
+
+    # ------------------------------------------------------------------
+    # Public API (any thread)
+    # ------------------------------------------------------------------
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        ready = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(ready,), name="fleet-poller", daemon=True
+        )
+        self._thread.start()
+        ready.wait()
+
+    def stop(self, timeout: float = 5.0):
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def set_agents(self, agents: List[AgentConfig]):
+        """Replaces the polled agents; unchanged nodes keep their schedule."""
+        self._agents = list(agents)
+        if self._loop is not None and self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._sync_nodes)
+
+    def reconfigure(
+        self,
+        interval: Optional[float] = None,
+        concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        max_backoff: Optional[float] = None,
+    ):
+        """
+        Changes polling parameters without restarting. A new interval
+        applies to nodes without their own from their next poll; polls
+        already in flight finish under the old concurrency limit.
+        """
+        if timeout is not None:
+            self.timeout = timeout
+        if max_backoff is not None:
+            self.max_backoff = max_backoff
+        if interval is not None:
+            self.interval = interval
+        if concurrency is not None:
+            self.concurrency = concurrency
+        if self._loop is not None and self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._apply_config)
+
+    def latencies(self) -> Dict[str, float]:
+        return {name: node.latency for name, node in list(self._nodes.items())}
+
+    # ------------------------------------------------------------------
+    # Event loop
+    # ------------------------------------------------------------------
+    def _run(self, ready: threading.Event):
+        loop = asyncio.new_event_loop()
+        self._loop = loop
+        asyncio.set_event_loop(loop)
+        self._wakeup = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._semaphore_size = self.concurrency
+        self._sync_nodes()
+        main = loop.create_task(self._scheduler())
+        ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            main.cancel()
+            for node in self._nodes.values():
+                self._close(node)
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.close()
+            self._loop = None
+
+    def _sync_nodes(self):
+        now = time.monotonic()
+        wanted = {agent.name: agent for agent in self._agents}
+        for name in list(self._nodes):
+            node = self._nodes[name]
+            if name not in wanted or wanted[name] != node.config:
+                self._close(node)
+                del self._nodes[name]
+                self.store.remove(name)
+        for name, agent in wanted.items():
+            if name not in self._nodes:
+                node = _Node(agent, self.interval)
+                self._nodes[name] = node
+                if urlsplit(agent.url).scheme == STREAM_SCHEME:
+                    node.stream = asyncio.ensure_future(self._stream(name, node))
+                    continue
+                # Spread first polls across one interval to avoid a thundering herd
+                self._push(now + random.uniform(0, node.interval), name, node)
+        self._cycle_pending = set(self._nodes)
+        self._cycle_started = now
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _apply_config(self):
+        if self._semaphore_size != self.concurrency:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._semaphore_size = self.concurrency
+        for node in self._nodes.values():
+            node.interval = node.config.interval or self.interval
+
+    def _push(self, due: float, name: str, node: _Node):
+        node.generation = next(self._generations)
+        heapq.heappush(self._schedule, (due, name, node.generation))
+
+    async def _scheduler(self):
+        while True:
+            now = time.monotonic()
+            while self._schedule and self._schedule[0][0] <= now:
+                _, name, generation = heapq.heappop(self._schedule)
+                node = self._nodes.get(name)
+                if node is not None and node.generation == generation:
+                    asyncio.ensure_future(self._poll(name, node))
+            delay = self._schedule[0][0] - now if self._schedule else 3600.0
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _poll(self, name: str, node: _Node):
+        async with self._semaphore:
+            started = time.monotonic()
+            try:
+                if self._fetch is None:
+                    request = self._http_get_json(node)
+                else:
+                    request = self._fetch(node.config)
+                data = await asyncio.wait_for(request, self.timeout)
+                error = None
+            except Exception as e:
+                data = None
+                error = str(e) or type(e).__name__
+                self._close(node)
+            finished = time.monotonic()
+
+        if self._nodes.get(name) is not node:
+            return  # removed while polling
+
+        node.latency = finished - started
+        if error is None:
+            node.failures = 0
+            delay = node.interval * random.uniform(0.9, 1.1)
+        else:
+            node.failures += 1
+            backoff = min(node.interval * (2 ** node.failures), self.max_backoff)
+            delay = backoff * random.uniform(0.5, 1.0)
+        self._push(finished + delay, name, node)
+        self._wakeup.set()
+        self._publish(NodeSnapshot(name, error is None, data, node.latency, error, time.time()))
+
+    def _publish(self, snapshot: NodeSnapshot):
+        self.store.update(snapshot)
+        self._cycle_pending.discard(snapshot.name)
+        if not self._cycle_pending:
+            now = time.monotonic()
+            self.cycle_duration = now - self._cycle_started
+            self._cycle_pending = set(self._nodes)
+            self._cycle_started = now
+        if self.event_bus is not None:
+            self.event_bus.emit(TOPIC, {"version": self.store.version})
+
+    # ------------------------------------------------------------------
+    # Streaming agents
+    # ------------------------------------------------------------------
+    async def _stream(self, name: str, node: _Node):
+        from nodeone.agent.client import AgentStream
+        from nodeone.agent.protocol import DEFAULT_PORT
+
+        parts = urlsplit(node.config.url)
+        stream = AgentStream(parts.hostname, parts.port or DEFAULT_PORT)
+        try:
+            while True:
+                started = time.monotonic()
+                try:
+                    await asyncio.wait_for(stream.connect(), self.timeout)
+                    node.latency = time.monotonic() - started
+                    node.failures = 0
+                    # A silent agent is as good as gone
+                    quiet = max(self.timeout, 3 * stream.interval)
+                    while True:
+                        sample = await asyncio.wait_for(stream.read(), quiet)
+                        if sample.missed:
+                            logger.debug("Lost %d samples from %s", sample.missed, name)
+                        self._publish(
+                            NodeSnapshot(name, True, sample.values, node.latency, None, sample.timestamp)
+                        )
+                except Exception as e:
+                    stream.close()
+                    node.failures += 1
+                    error = str(e) or type(e).__name__
+                    self._publish(NodeSnapshot(name, False, None, node.latency, error, time.time()))
+                    backoff = min(node.interval * (2 ** node.failures), self.max_backoff)
+                    await asyncio.sleep(backoff * random.uniform(0.5, 1.0))
+        finally:
+            stream.close()
+
+    # ------------------------------------------------------------------
+    # Minimal keep-alive HTTP/1.1 JSON client
+    # ------------------------------------------------------------------
+    async def _http_get_json(self, node: _Node):
+        parts = urlsplit(node.config.url)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        request = (
+            f"GET {path} HTTP/1.1\r\nHost: {parts.netloc}\r\n"
+            "Accept: application/json\r\nConnection: keep-alive\r\n\r\n"
+        ).encode()
+
+        reused = node.conn is not None
+        try:
+            return await self._exchange(node, parts, request)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            if not reused:
+                raise
+            # The kept-alive connection went stale; retry once on a new one
+            self._close(node)
+            return await self._exchange(node, parts, request)
+
+    async def _exchange(self, node: _Node, parts, request: bytes):
+        if node.conn is None:
+            secure = parts.scheme == "https"
+            node.conn = await asyncio.open_connection(
+                parts.hostname, parts.port or (443 if secure else 80), ssl=secure or None
+            )
+        reader, writer = node.conn
+        writer.write(request)
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed by agent")
+        status = int(status_line.split(None, 2)[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            headers[key.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            body = bytearray()
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                body += await reader.readexactly(size)
+                await reader.readexactly(2)
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await reader.read()
+            self._close(node)
+
+        if headers.get("connection", "").lower() == "close":
+            self._close(node)
+        if status >= 400:
+            raise RuntimeError(f"HTTP {status}")
+        return json.loads(body) if body else None
+
+    @staticmethod
+    def _close(node: _Node):
+        if node.stream is not None:
+            node.stream.cancel()
+            node.stream = None
+        if node.conn is not None:
+            node.conn[1].close()
+            node.conn = None
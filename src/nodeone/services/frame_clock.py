@@ -0,0 +1,202 @@
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional, Tuple
+from PyQt6 import sip
+from PyQt6.QtCore import QEasingCurve, QObject, QRect, Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QColor, QPainter
+from PyQt6.QtWidgets import QWidget
+from nodeone.services.telemetry import REGISTRY
+from nodeone.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+FRAME_INTERVAL_MS = 16
+
+PAINT_SECONDS = REGISTRY.histogram(
+    "nodeone_paint_seconds", "Time spent in instrumented paint handlers"
+)
+
+
+class _Tween:
+    __slots__ = ("widget", "setter", "start", "end", "duration", "easing", "started", "region")
+
+    def __init__(self, widget, setter, start, end, duration, easing, started, region):
+        self.widget = widget
+        self.setter = setter
+        self.start = start
+        self.end = end
+        self.duration = duration
+        self.easing = easing
+        self.started = started
+        self.region = region
+
+    def value_at(self, now: float) -> Tuple[float, bool]:
+        progress = (now - self.started) / self.duration if self.duration > 0 else 1.0
+        if progress >= 1.0:
+            return self.end, True
+        eased = self.easing.valueForProgress(progress)
+        return self.start + (self.end - self.start) * eased, False
+
+
+class FrameClock(QObject):
+    """
+    One timer that drives every widget animation in the application.
+
+    Widgets register tweens with `animate`; the clock advances them all on
+    each frame and then asks each affected widget for one repaint of its
+    dirty region, which Qt folds into the next paint of the window. The
+    timer only runs while something is animating. Tweens on widgets that
+    are not visible (a hidden or minimized window) jump straight to their
+    end value without scheduling frames.
+    """
+
+    frame = pyqtSignal(float)
+
+    _instance: Optional["FrameClock"] = None
+
+    def __init__(self, interval_ms: int = FRAME_INTERVAL_MS, parent=None):
+        super().__init__(parent)
+        self._tweens: Dict[Tuple[int, str], _Tween] = {}
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._tick)
+
+        self.stats_enabled = False
+        self._frame_times: deque = deque(maxlen=120)
+        self._paint_times: deque = deque(maxlen=120)
+
+    @classmethod
+    def instance(cls) -> "FrameClock":
+        if cls._instance is None:
+            cls._instance = FrameClock()
+        return cls._instance
+
+    @property
+    def running(self) -> bool:
+        return self._timer.isActive()
+
+    def animate(
+        self,
+        widget: QWidget,
+        key: str,
+        start: float,
+        end: float,
+        duration_ms: int,
+        setter: Callable[[float], None],
+        easing: QEasingCurve.Type = QEasingCurve.Type.OutQuad,
+        region: Optional[QRect] = None,
+    ):
+        """
+        Animates a value from `start` to `end`, calling `setter` each frame.
+
+        A new animation with the same `widget` and `key` replaces the
+        running one. `region` limits the repaint to part of the widget.
+        """
+        tween = _Tween(
+            widget, setter, start, end, duration_ms / 1000.0,
+            QEasingCurve(easing), time.monotonic(), region,
+        )
+        self._tweens[(id(widget), key)] = tween
+        if not widget.isVisible():
+            self._finish(tween)
+            del self._tweens[(id(widget), key)]
+            return
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def stop(self, widget: QWidget, key: str):
+        self._tweens.pop((id(widget), key), None)
+
+    def _tick(self):
+        now = time.monotonic()
+        dirty: Dict[int, Tuple[QWidget, Optional[QRect]]] = {}
+        for key, tween in list(self._tweens.items()):
+            widget = tween.widget
+            if sip.isdeleted(widget):
+                del self._tweens[key]
+                continue
+            if not widget.isVisible():
+                self._finish(tween)
+                del self._tweens[key]
+                continue
+            value, done = tween.value_at(now)
+            tween.setter(value)
+            if done:
+                del self._tweens[key]
+            # Several tweens on one widget share a single repaint
+            entry = dirty.get(id(widget))
+            region = tween.region
+            if entry is not None:
+                region = None if entry[1] is None or region is None else entry[1].united(region)
+            dirty[id(widget)] = (widget, region)
+
+        for widget, region in dirty.values():
+            if region is None:
+                widget.update()
+            else:
+                widget.update(region)
+
+        if self.stats_enabled:
+            self._frame_times.append(now)
+        self.frame.emit(now)
+        if not self._tweens:
+            self._timer.stop()
+
+    @staticmethod
+    def _finish(tween: _Tween):
+        if not sip.isdeleted(tween.widget):
+            tween.setter(tween.end)
+            tween.widget.update()
+
+    # ------------------------------------------------------------------
+    # Statistics for the frame overlay
+    # ------------------------------------------------------------------
+    @contextmanager
+    def measure_paint(self):
+        """Records the duration of the enclosed paint code."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            PAINT_SECONDS.observe(elapsed)
+            if self.stats_enabled:
+                self._paint_times.append(elapsed)
+
+    def fps(self) -> float:
+        times = self._frame_times
+        if len(times) < 2 or time.monotonic() - times[-1] > 0.5:
+            return 0.0
+        return (len(times) - 1) / (times[-1] - times[0])
+
+    def paint_time(self) -> float:
+        """Average recorded paint duration in seconds."""
+        times = self._paint_times
+        return sum(times) / len(times) if times else 0.0
+
+
+class FrameStatsOverlay(QWidget):
+    """Small corner overlay showing animation FPS and average paint time."""
+
+    def __init__(self, parent: QWidget, clock: Optional[FrameClock] = None):
+        super().__init__(parent)
+        self.clock = clock or FrameClock.instance()
+        self.clock.stats_enabled = True
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.resize(180, 22)
+
+        self._refresh = QTimer(self)
+        self._refresh.setInterval(500)
+        self._refresh.timeout.connect(self.update)
+        self._refresh.start()
+        self.raise_()
+
+    def paintEvent(self, a0):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(0, 0, 0, 160))
+        painter.setPen(QColor("#ffffff"))
+        text = f"{self.clock.fps():.0f} fps · paint {self.clock.paint_time() * 1000:.2f} ms"
+        painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, text)
+        painter.end()
@@ -0,0 +1,290 @@
+import json
+import re
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from nodeone.services.telemetry import REGISTRY, WORKER_QUEUE_DEPTH
+from nodeone.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+HTTP_SECONDS = REGISTRY.histogram(
+    "nodeone_http_request_seconds", "HTTP request latency by outcome", ["outcome"]
+)
+
+# Method, URL, sorted query parameters and sorted request headers
+RequestKey = Tuple[str, str, Tuple[Tuple[str, str], ...], Tuple[Tuple[str, str], ...]]
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class HttpResponse:
+    """An immutable response as delivered to callers and kept in the cache."""
+
+    __slots__ = ("status", "headers", "content", "etag", "expires", "_json")
+
+    def __init__(self, status: int, headers: Mapping[str, str], content: bytes,
+                 etag: Optional[str] = None, expires: float = 0.0):
+        self.status = status
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.etag = etag
+        self.expires = expires
+        self._json = None
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        if self._json is None:
+            self._json = json.loads(self.content)
+        return self._json
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.expires
+
+
+class HttpRequest(QObject):
+    """
+    Handle for a single caller's request.
+
+    Exactly one of `finished` or `failed` is emitted on the GUI thread,
+    unless the request was cancelled first.
+    """
+
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, key: RequestKey):
+        super().__init__()
+        self.key = key
+        self.cancelled = False
+        self.done = False
+        self._owner: Optional[QObject] = None
+        self._owner_connection = None
+
+    def cancel(self):
+        self.cancelled = True
+        self._release_owner()
+
+    def _watch_owner(self, owner: QObject, on_destroyed):
+        self._owner = owner
+        self._owner_connection = owner.destroyed.connect(on_destroyed)
+
+    def _release_owner(self):
+        """Drops the owner's destroyed connection once it can no longer matter."""
+        owner, self._owner = self._owner, None
+        if owner is None:
+            return
+        try:
+            owner.destroyed.disconnect(self._owner_connection)
+        except (TypeError, RuntimeError):
+            pass  # Already disconnected, or the owner is being deleted
+        self._owner_connection = None
+
+    def _deliver(self, response: Optional[HttpResponse], error: Optional[str]):
+        if self.cancelled or self.done:
+            return
+        self.done = True
+        self._release_owner()
+        if error is not None:
+            self.failed.emit(error)
+        else:
+            self.finished.emit(response)
+
+
+class HttpClient(QObject):
+    """
+    Shared HTTP service for the GUI.
+
+    Requests run on a bounded worker pool over a keep-alive connection pool.
+    Identical in-flight GETs are collapsed into one network call, and
+    responses are kept in an LRU cache that honours TTLs, `Cache-Control:
+    max-age` and ETag revalidation. Results are delivered through Qt
+    signals on the thread that owns the client.
+    """
+
+    _completed = pyqtSignal(object, object, object)
+
+    def __init__(
+        self,
+        max_in_flight: int = 8,
+        pool_size: int = 16,
+        cache_size: int = 256,
+        default_ttl: float = 0.0,
+        timeout: float = 10.0,
+    ):
+        super().__init__()
+        self.timeout = timeout
+        self.default_ttl = default_ttl
+        self.cache_size = cache_size
+
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_in_flight, thread_name_prefix="http"
+        )
+
+        self._cache: "OrderedDict[RequestKey, HttpResponse]" = OrderedDict()
+        self._waiters: Dict[RequestKey, List[HttpRequest]] = {}
+        self._futures: Dict[RequestKey, Future] = {}
+        self._ttls: Dict[RequestKey, float] = {}
+        self._refetched: set = set()  # keys re-sent after a 304 lost its cache entry
+
+        self._completed.connect(self._on_completed)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._futures)
+
+    def get(
+        self,
+        url: str,
+        params: Optional[Mapping[str, Any]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        ttl: Optional[float] = None,
+        owner: Optional[QObject] = None,
+    ) -> HttpRequest:
+        """
+        Starts (or joins) a GET request and returns its handle.
+
+        If `owner` is given, the request is cancelled when it is destroyed.
+        Requests are only shared (in flight and in the cache) when their
+        parameters and headers are the same.
+        """
+        key: RequestKey = (
+            "GET",
+            url,
+            tuple(sorted((str(k), str(v)) for k, v in (params or {}).items())),
+            tuple(sorted((str(k).lower(), str(v)) for k, v in (headers or {}).items())),
+        )
+        handle = HttpRequest(key)
+        if owner is not None:
+            handle._watch_owner(owner, lambda *_: self._cancel(handle))
+
+        cached = self._cache.get(key)
+        if cached is not None and cached.is_fresh(time.monotonic()):
+            self._cache.move_to_end(key)
+            QTimer.singleShot(0, lambda: handle._deliver(cached, None))
+            return handle
+
+        waiters = self._waiters.get(key)
+        if waiters is not None:
+            waiters.append(handle)
+            return handle
+
+        self._waiters[key] = [handle]
+        self._ttls[key] = self.default_ttl if ttl is None else ttl
+        self._submit(key, cached.etag if cached is not None else None)
+        return handle
+
+    def cancel(self, handle: HttpRequest):
+        self._cancel(handle)
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    def shutdown(self):
+        for handles in self._waiters.values():
+            for handle in handles:
+                handle.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._session.close()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _submit(self, key: RequestKey, etag: Optional[str]):
+        _, url, params, headers = key
+        request_headers = dict(headers)
+        if etag:
+            request_headers["If-None-Match"] = etag
+        self._futures[key] = self._executor.submit(
+            self._fetch, key, url, dict(params), request_headers
+        )
+        WORKER_QUEUE_DEPTH.labels("http").set(len(self._futures))
+
+    def _fetch(self, key: RequestKey, url: str, params, headers):
+        """Runs on a worker thread; reports back through `_completed`."""
+        started = time.perf_counter()
+        try:
+            resp = self._session.get(url, params=params, headers=headers, timeout=self.timeout)
+            if resp.status_code != 304:
+                resp.raise_for_status()
+            result = HttpResponse(
+                resp.status_code, resp.headers, resp.content, resp.headers.get("ETag")
+            )
+        except Exception as e:
+            HTTP_SECONDS.labels("error").observe(time.perf_counter() - started)
+            self._completed.emit(key, None, str(e))
+            return
+        outcome = "not_modified" if result.status == 304 else "ok"
+        HTTP_SECONDS.labels(outcome).observe(time.perf_counter() - started)
+        self._completed.emit(key, result, None)
+
+    def _on_completed(self, key: RequestKey, response: Optional[HttpResponse], error: Optional[str]):
+        if response is not None and response.status == 304 and key not in self._cache:
+            # The entry was evicted while it was being revalidated: there is
+            # nothing to reuse, so ask once more without If-None-Match.
+            if key not in self._refetched and key in self._waiters:
+                self._refetched.add(key)
+                self._submit(key, None)
+                return
+            response, error = None, "304 Not Modified without a cached response"
+        self._refetched.discard(key)
+
+        handles = self._waiters.pop(key, [])
+        self._futures.pop(key, None)
+        WORKER_QUEUE_DEPTH.labels("http").set(len(self._futures))
+        ttl = self._ttls.pop(key, self.default_ttl)
+
+        if response is not None:
+            response = self._store(key, response, ttl)
+
+        for handle in handles:
+            handle._deliver(response, error)
+
+    def _store(self, key: RequestKey, response: HttpResponse, ttl: float) -> HttpResponse:
+        now = time.monotonic()
+        if response.status == 304:
+            cached = self._cache[key]
+            response = HttpResponse(
+                cached.status, cached.headers, cached.content, cached.etag
+            )
+
+        cache_control = response.headers.get("Cache-Control", "")
+        if "no-store" in cache_control:
+            self._cache.pop(key, None)
+            return response
+        match = _MAX_AGE.search(cache_control)
+        if match:
+            ttl = float(match.group(1))
+        response.expires = now + ttl
+
+        if ttl > 0 or response.etag:
+            self._cache[key] = response
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return response
+
+    def _cancel(self, handle: HttpRequest):
+        handle.cancel()
+        handles = self._waiters.get(handle.key)
+        if handles is None or not all(h.cancelled for h in handles):
+            return
+        future = self._futures.get(handle.key)
+        if future is not None and future.cancel():
+            # Never started; nobody will report back for this key.
+            del self._waiters[handle.key]
+            del self._futures[handle.key]
+            self._ttls.pop(handle.key, None)
+            self._refetched.discard(handle.key)
@@ -0,0 +1,538 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, Sequence, Union
+from PyQt6.QtCore import QObject, QProcess, QRunnable, QThreadPool, QTimer
+from nodeone.services.telemetry import REGISTRY, WORKER_QUEUE_DEPTH
+from nodeone.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+TOPIC_PREFIX = "manager.agent"
+TICK_MS = 50
+# Health is checked on every tick that is at least this far from the last check
+HEALTH_INTERVAL = 0.5
+BACKOFF_BASE = 1.0
+MAX_BACKOFF = 60.0
+# Consecutive failures after which an agent is left failed until started again
+MAX_FAILURES = 10
+
+AGENT_RESTARTS = REGISTRY.counter("nodeone_agent_restarts", "Agents restarted after a failure")
+STEP_SECONDS = REGISTRY.histogram("nodeone_agent_step_seconds", "Time taken by one agent step")
+
+
+class AgentState:
+    STOPPED = "stopped"
+    STARTING = "starting"
+    RUNNING = "running"
+    UNHEALTHY = "unhealthy"  # no heartbeat within the timeout
+    BACKOFF = "backoff"  # failed, waiting to restart
+    STOPPING = "stopping"
+    FAILED = "failed"  # gave up after MAX_FAILURES
+
+
+ACTIVE_STATES = (AgentState.STARTING, AgentState.RUNNING, AgentState.UNHEALTHY, AgentState.BACKOFF)
+
+
+class AgentStatus(NamedTuple):
+    """Payload of a ``manager.agent.<name>`` event."""
+
+    name: str
+    state: str
+    restarts: int
+    last_heartbeat: float  # time.monotonic(), 0 before the first one
+    error: Optional[str]
+
+
+class Agent:
+    """
+    Base class for agents run as tasks on the thread pool.
+
+    The manager calls `setup` before the first step, `step` every
+    `interval` seconds and `teardown` when the agent stops or fails. None
+    of them is ever run concurrently with another for the same agent, and
+    each occupies a pool thread only while it runs. A finished step counts
+    as a heartbeat; steps that take long should call `heartbeat` as they
+    go, or they are reported unhealthy after `heartbeat_timeout` seconds.
+    """
+
+    interval = 1.0
+    heartbeat_timeout = 30.0
+
+    def __init__(self):
+        self.last_heartbeat = 0.0
+
+    def setup(self):
+        pass
+
+    def step(self) -> Any:
+        raise NotImplementedError
+
+    def teardown(self):
+        pass
+
+    def heartbeat(self):
+        self.last_heartbeat = time.monotonic()
+
+
+class ProcessAgent:
+    """
+    A heavy agent run as a child process.
+
+    Every line the process writes to stdout is a heartbeat and the last one
+    is kept as its result. A process that exits, or stays silent for
+    `heartbeat_timeout` seconds, is killed and restarted with backoff.
+    """
+
+    def __init__(self, program: str, args: Sequence[str] = (), heartbeat_timeout: float = 10.0):
+        self.program = program
+        self.args = list(args)
+        self.heartbeat_timeout = heartbeat_timeout
+
+
+class LocalAgent(Agent):
+    """Samples this host's CPU and memory use."""
+
+    def setup(self):
+        import psutil
+
+        self._psutil = psutil
+        psutil.cpu_percent(None)  # the first reading only sets the reference
+
+    def step(self) -> Dict[str, float]:
+        return {
+            "cpu_percent": self._psutil.cpu_percent(None),
+            "mem_percent": self._psutil.virtual_memory().percent,
+        }
+
+
+class SupervisedAgent:
+    """The manager's record of one agent; only touched on the manager's thread."""
+
+    def __init__(self, name: str, agent: Union[Agent, ProcessAgent]):
+        self.name = name
+        self.agent = agent
+        self.state = AgentState.STOPPED
+        self.restarts = 0
+        self.failures = 0
+        self.error: Optional[str] = None
+        self.result: Any = None
+        self.last_heartbeat = 0.0
+        self.in_flight = False
+        self.started_at = 0.0  # of the task in flight
+        self.ready = False  # set up and not torn down since
+        self.due_seq = 0  # schedule entry that is current
+        self.process: Optional[QProcess] = None
+
+    @property
+    def is_process(self) -> bool:
+        return isinstance(self.agent, ProcessAgent)
+
+    @property
+    def heartbeat_timeout(self) -> float:
+        return self.agent.heartbeat_timeout
+
+    def status(self) -> AgentStatus:
+        return AgentStatus(self.name, self.state, self.restarts, self.last_heartbeat, self.error)
+
+
+class _Outcome(NamedTuple):
+    name: str
+    action: str
+    ok: bool
+    result: Any
+    error: Optional[str]
+    ready: bool
+
+
+class _AgentTask(QRunnable):
+    """Runs one step (setting the agent up first if needed) or its teardown."""
+
+    def __init__(self, supervised: SupervisedAgent, action: str, manager: "ManagerService"):
+        super().__init__()
+        self.name = supervised.name
+        self.agent: Agent = supervised.agent  # type: ignore[assignment]
+        self.ready = supervised.ready
+        self.action = action
+        # Only the thread-safe parts of the manager are reached from here
+        self.completed = manager._completed
+        self.idle = manager._idle
+
+    def run(self):
+        ok, result, error = True, None, None
+        started = time.perf_counter()
+        try:
+            if self.action == "teardown":
+                if self.ready:
+                    self.ready = False
+                    self.agent.teardown()
+            else:
+                if not self.ready:
+                    self.agent.setup()
+                    self.ready = True
+                result = self.agent.step()
+                self.agent.heartbeat()
+                STEP_SECONDS.observe(time.perf_counter() - started)
+        except Exception as e:
+            ok, error = False, f"{type(e).__name__}: {e}"
+            logger.debug("Agent %s %s failed", self.name, self.action, exc_info=True)
+            if self.ready:
+                # Restarting means setting up again from scratch
+                self.ready = False
+                try:
+                    self.agent.teardown()
+                except Exception:
+                    logger.debug("Agent %s teardown failed", self.name, exc_info=True)
+        self.completed.append(_Outcome(self.name, self.action, ok, result, error, self.ready))
+        with self.idle:
+            self.idle.in_flight -= 1
+            self.idle.notify_all()
+
+
+class _InFlight(threading.Condition):
+    def __init__(self):
+        super().__init__()
+        self.in_flight = 0
+
+
+class ManagerService(QObject):
+    """
+    Supervises local agents.
+
+    Agents are either `Agent` tasks, whose steps run on the shared thread
+    pool, or `ProcessAgent` child processes for heavy work. At most
+    `max_concurrency` steps run at once; agents that fall due while the
+    limit is reached wait their turn. A single timer on the manager's
+    thread schedules steps from a heap ordered by due time, collects the
+    finished ones from a queue and checks heartbeats every HEALTH_INTERVAL,
+    so no signal is emitted per step and the GUI thread only does
+    bookkeeping for the agents that finished or fell due since the last
+    tick.
+
+    Failed agents are restarted after an exponential, jittered backoff.
+    Every state change is published as an `AgentStatus` on
+    ``manager.agent.<name>``. A step that never returns cannot be
+    interrupted; it is reported unhealthy and keeps its pool thread, so
+    agents that may hang belong in a child process, which is killed.
+    """
+
+    def __init__(
+        self,
+        event_bus=None,
+        pool: Optional[QThreadPool] = None,
+        max_concurrency: Optional[int] = None,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.event_bus = event_bus
+        self.pool = pool or QThreadPool.globalInstance()
+        # Leave room in a shared pool for everything else that uses it
+        self.max_concurrency = max_concurrency or max(1, self.pool.maxThreadCount() // 2)
+        self.agents: Dict[str, SupervisedAgent] = {}
+
+        self._schedule: List[tuple] = []  # (due, seq, name)
+        self._seq = itertools.count(1)
+        self._completed: Deque[_Outcome] = deque()
+        self._idle = _InFlight()
+        self._last_health = 0.0
+        self._queue_depth = WORKER_QUEUE_DEPTH.labels("manager")
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(TICK_MS)
+        self._timer.timeout.connect(self._tick)
+
+        self.register("local", LocalAgent())
+
+    # ------------------------------------------------------------------
+    # Public API (manager thread)
+    # ------------------------------------------------------------------
+    @property
+    def in_flight(self) -> int:
+        return self._idle.in_flight
+
+    def register(self, name: str, agent: Union[Agent, ProcessAgent]) -> SupervisedAgent:
+        if name in self.agents:
+            raise ValueError(f"Agent {name!r} is already registered")
+        supervised = self.agents[name] = SupervisedAgent(name, agent)
+        return supervised
+
+    def unregister(self, name: str):
+        supervised = self.agents.get(name)
+        if supervised is None:
+            return
+        if supervised.state not in (AgentState.STOPPED, AgentState.FAILED):
+            raise RuntimeError(f"Agent {name!r} must be stopped first")
+        del self.agents[name]
+
+    def status(self, name: str) -> AgentStatus:
+        return self.agents[name].status()
+
+    def start_agent(self, name: str):
+        supervised = self._get(name)
+        if supervised.state in ACTIVE_STATES:
+            return
+        supervised.failures = 0
+        supervised.error = None
+        self._set_state(supervised, AgentState.STARTING)
+        if supervised.in_flight:
+            # Still tearing down from a stop; runs once that finishes
+            self._schedule_at(supervised, time.monotonic())
+        else:
+            self._run(supervised)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def stop_agent(self, name: str):
+        supervised = self._get(name)
+        if supervised.state in (AgentState.STOPPED, AgentState.STOPPING):
+            return
+        supervised.due_seq = 0  # drop the pending schedule entry
+        if supervised.is_process:
+            process = supervised.process
+            if process is None:
+                self._set_state(supervised, AgentState.STOPPED)
+            else:
+                self._set_state(supervised, AgentState.STOPPING)
+                process.terminate()
+        elif supervised.in_flight:
+            # The teardown follows when the step in flight finishes
+            self._set_state(supervised, AgentState.STOPPING)
+        elif supervised.ready:
+            self._set_state(supervised, AgentState.STOPPING)
+            self._submit(supervised, "teardown")
+        else:
+            self._set_state(supervised, AgentState.STOPPED)
+
+    def start_all(self):
+        for name in list(self.agents):
+            self.start_agent(name)
+
+    def shutdown(self, deadline: float = 5.0) -> bool:
+        """
+        Stops every agent, waiting at most `deadline` seconds for steps in
+        flight to finish, teardowns to run and processes to exit. Processes
+        still running at the deadline are killed. Returns True when
+        everything stopped in time.
+        """
+        end = time.monotonic() + deadline
+        self._timer.stop()
+        self._collect()
+        for name in list(self.agents):
+            self.stop_agent(name)
+
+        # Finished steps may still need their teardown submitted
+        while True:
+            self._collect()
+            remaining = end - time.monotonic()
+            with self._idle:
+                if not self._idle.in_flight or remaining <= 0:
+                    break
+                self._idle.wait(remaining)
+        clean = self._idle.in_flight == 0
+        for supervised in self.agents.values():
+            process = supervised.process
+            if process is None:
+                continue
+            remaining = int(max(0.0, end - time.monotonic()) * 1000)
+            if not process.waitForFinished(remaining):
+                clean = False
+                process.kill()
+                process.waitForFinished(1000)
+        self._collect()
+        if not clean:
+            logger.warning("Agents still running after the %.1fs shutdown deadline", deadline)
+        return clean
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+    def _get(self, name: str) -> SupervisedAgent:
+        try:
+            return self.agents[name]
+        except KeyError:
+            raise KeyError(f"Unknown agent {name!r}") from None
+
+    def _tick(self):
+        self._collect()
+        now = time.monotonic()
+        if now - self._last_health >= HEALTH_INTERVAL:
+            self._last_health = now
+            self._check_health(now)
+        self._dispatch(now)
+        # Tasks queue their outcome before leaving in_flight, so test in this order
+        if not self._schedule and not self._idle.in_flight and not self._completed and not self._has_processes():
+            self._timer.stop()
+
+    def _schedule_at(self, supervised: SupervisedAgent, due: float):
+        seq = next(self._seq)
+        supervised.due_seq = seq
+        heapq.heappush(self._schedule, (due, seq, supervised.name))
+
+    def _dispatch(self, now: float):
+        schedule = self._schedule
+        waiting = 0
+        while schedule and schedule[0][0] <= now:
+            due, seq, name = schedule[0]
+            supervised = self.agents.get(name)
+            if supervised is None or supervised.due_seq != seq:
+                heapq.heappop(schedule)  # superseded or stopped
+                continue
+            if supervised.in_flight:
+                heapq.heappop(schedule)
+                self._schedule_at(supervised, now + TICK_MS / 1000)
+                continue
+            if not supervised.is_process and self._idle.in_flight >= self.max_concurrency:
+                waiting = sum(1 for entry in schedule if entry[0] <= now)
+                break
+            heapq.heappop(schedule)
+            supervised.due_seq = 0
+            self._run(supervised)
+        self._queue_depth.set(waiting + self._idle.in_flight)
+
+    def _run(self, supervised: SupervisedAgent):
+        if supervised.is_process:
+            self._launch(supervised)
+        elif self._idle.in_flight >= self.max_concurrency:
+            self._schedule_at(supervised, time.monotonic())
+        else:
+            self._submit(supervised, "step")
+
+    def _submit(self, supervised: SupervisedAgent, action: str):
+        supervised.in_flight = True
+        supervised.started_at = time.monotonic()
+        with self._idle:
+            self._idle.in_flight += 1
+        self.pool.start(_AgentTask(supervised, action, self))
+
+    def _collect(self):
+        completed = self._completed
+        while completed:
+            outcome = completed.popleft()
+            supervised = self.agents.get(outcome.name)
+            if supervised is not None:
+                self._on_finished(supervised, outcome)
+
+    def _on_finished(self, supervised: SupervisedAgent, outcome: _Outcome):
+        supervised.in_flight = False
+        supervised.ready = outcome.ready
+        if outcome.action == "teardown":
+            if supervised.state == AgentState.STOPPING:
+                self._set_state(supervised, AgentState.STOPPED)
+            return
+
+        now = time.monotonic()
+        if outcome.ok:
+            supervised.result = outcome.result
+            supervised.last_heartbeat = now
+            supervised.failures = 0
+            supervised.error = None
+        if supervised.state == AgentState.STOPPING:
+            if supervised.ready:
+                self._submit(supervised, "teardown")
+            else:
+                self._set_state(supervised, AgentState.STOPPED)
+        elif outcome.ok:
+            self._set_state(supervised, AgentState.RUNNING)
+            if supervised.due_seq == 0:
+                self._schedule_at(supervised, now + supervised.agent.interval)
+        else:
+            self._fail(supervised, outcome.error, now)
+
+    def _fail(self, supervised: SupervisedAgent, error: Optional[str], now: float):
+        supervised.failures += 1
+        supervised.error = error
+        if supervised.failures >= MAX_FAILURES:
+            logger.error("Agent %s failed %d times, giving up: %s", supervised.name, supervised.failures, error)
+            supervised.due_seq = 0
+            self._set_state(supervised, AgentState.FAILED)
+            return
+        delay = min(MAX_BACKOFF, BACKOFF_BASE * 2 ** (supervised.failures - 1))
+        # Jitter keeps agents that failed together from restarting together
+        delay *= random.uniform(0.9, 1.1)
+        logger.warning("Agent %s failed, restarting in %.1fs: %s", supervised.name, delay, error)
+        supervised.restarts += 1
+        AGENT_RESTARTS.inc()
+        self._set_state(supervised, AgentState.BACKOFF)
+        self._schedule_at(supervised, now + delay)
+
+    def _check_health(self, now: float):
+        for supervised in self.agents.values():
+            if supervised.state not in (AgentState.RUNNING, AgentState.STARTING, AgentState.UNHEALTHY):
+                continue
+            if supervised.is_process:
+                if supervised.process is not None and now - supervised.last_heartbeat > supervised.heartbeat_timeout:
+                    logger.warning("Agent %s missed its heartbeat, killing it", supervised.name)
+                    supervised.error = "heartbeat timeout"
+                    supervised.process.kill()
+                continue
+            if not supervised.in_flight:
+                continue
+            beat = max(supervised.started_at, supervised.agent.last_heartbeat)
+            if now - beat > supervised.heartbeat_timeout and supervised.state != AgentState.UNHEALTHY:
+                supervised.error = "heartbeat timeout"
+                self._set_state(supervised, AgentState.UNHEALTHY)
+
+    def _set_state(self, supervised: SupervisedAgent, state: str):
+        if supervised.state == state:
+            return
+        supervised.state = state
+        if self.event_bus is not None:
+            self.event_bus.emit(f"{TOPIC_PREFIX}.{supervised.name}", supervised.status())
+
+    # ------------------------------------------------------------------
+    # Child processes
+    # ------------------------------------------------------------------
+    def _has_processes(self) -> bool:
+        return any(s.process is not None for s in self.agents.values())
+
+    def _launch(self, supervised: SupervisedAgent):
+        spec: ProcessAgent = supervised.agent  # type: ignore[assignment]
+        process = QProcess(self)
+        process.setProcessChannelMode(QProcess.ProcessChannelMode.ForwardedErrorChannel)
+        process.readyReadStandardOutput.connect(lambda: self._on_output(supervised))
+        process.finished.connect(lambda code, status: self._on_exit(supervised, code, status))
+        process.errorOccurred.connect(lambda error: self._on_process_error(supervised, error))
+        supervised.process = process
+        # The launch itself counts as the first heartbeat
+        supervised.last_heartbeat = time.monotonic()
+        process.start(spec.program, spec.args)
+        self._set_state(supervised, AgentState.RUNNING)
+
+    def _on_output(self, supervised: SupervisedAgent):
+        process = supervised.process
+        if process is None:
+            return
+        last = None
+        while process.canReadLine():
+            last = bytes(process.readLine()).rstrip(b"\r\n")
+        if last is not None:
+            supervised.last_heartbeat = time.monotonic()
+            supervised.result = last.decode("utf-8", "replace")
+            supervised.failures = 0
+            supervised.error = None
+            if supervised.state == AgentState.UNHEALTHY:
+                self._set_state(supervised, AgentState.RUNNING)
+
+    def _on_exit(self, supervised: SupervisedAgent, code: int, status):
+        process, supervised.process = supervised.process, None
+        if process is not None:
+            process.deleteLater()
+        if supervised.state == AgentState.STOPPING:
+            self._set_state(supervised, AgentState.STOPPED)
+            return
+        error = supervised.error if supervised.error == "heartbeat timeout" else f"exited with code {code}"
+        self._fail(supervised, error, time.monotonic())
+
+    def _on_process_error(self, supervised: SupervisedAgent, error):
+        if error == QProcess.ProcessError.FailedToStart:
+            # No finished signal follows a failed start
+            process, supervised.process = supervised.process, None
+            if process is not None:
+                process.deleteLater()
+            if supervised.state == AgentState.STOPPING:
+                self._set_state(supervised, AgentState.STOPPED)
+            else:
+                self._fail(supervised, f"failed to start {supervised.agent.program}", time.monotonic())
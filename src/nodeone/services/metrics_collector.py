@@ -0,0 +1,140 @@
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+import psutil
+from nodeone.utils.logger import get_logger
+from nodeone.utils.ring_buffer import RingTable
+
+logger = get_logger(__name__)
+
+SYSTEM_METRICS: Tuple[str, ...] = (
+    "cpu_percent",
+    "mem_percent",
+    "mem_used",
+    "disk_read_bps",
+    "disk_write_bps",
+    "net_sent_bps",
+    "net_recv_bps",
+    "proc_cpu_percent",
+    "proc_rss",
+)
+
+# Values are compared at this precision to decide whether they changed
+_PRECISION = {"cpu_percent": 1, "mem_percent": 1, "proc_cpu_percent": 1}
+
+TOPIC = "metrics.system"
+OVERHEAD_TOPIC = "metrics.collector"
+
+
+class MetricsCollector:
+    """
+    Samples system and process metrics on a background thread.
+
+    History is kept in a fixed-size `RingTable`, so memory stays flat.
+    Only metrics that changed since the last sample are published on the
+    event bus, as a ``{name: value}`` dict on `TOPIC`. The CPU time spent
+    sampling, as a fraction of one core, is published on `OVERHEAD_TOPIC`.
+    If a `TimeSeriesStore` is given, every sample is also written to it
+    under `node`.
+    """
+
+    def __init__(self, event_bus=None, interval: float = 1.0, history: int = 3600,
+                 store=None, node: str = "local"):
+        self.event_bus = event_bus
+        self.store = store
+        self.node = node
+        self.interval = interval
+        self.history = RingTable(SYSTEM_METRICS, history)
+        self.overhead = 0.0
+
+        self._process = psutil.Process(os.getpid())
+        self._published: Dict[str, float] = {}
+        self._last_counters: Optional[Tuple[float, tuple, tuple]] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # Deltas must all arrive, only the overhead figure can be coalesced
+        if event_bus is not None:
+            event_bus.set_coalesced(OVERHEAD_TOPIC)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        # Prime the cpu_percent baselines so the first sample is meaningful
+        psutil.cpu_percent(None)
+        self._process.cpu_percent(None)
+        self._thread = threading.Thread(
+            target=self._run, name="metrics-collector", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        cpu_spent = 0.0
+        started = time.monotonic()
+        while not self._stop.is_set():
+            t0 = time.thread_time()
+            try:
+                self.sample_once()
+            except Exception:
+                logger.exception("Metrics sample failed")
+            cpu_spent += time.thread_time() - t0
+
+            elapsed = time.monotonic() - started
+            if elapsed >= 10 * self.interval:
+                self.overhead = cpu_spent / elapsed
+                if self.event_bus is not None:
+                    self.event_bus.emit(OVERHEAD_TOPIC, {"overhead": self.overhead})
+                logger.debug("Metrics collector overhead: %.3f%% of a core", self.overhead * 100)
+                cpu_spent = 0.0
+                started = time.monotonic()
+            self._stop.wait(self.interval)
+
+    def sample_once(self) -> Dict[str, float]:
+        """Takes one sample, stores it and publishes what changed."""
+        now = time.time()
+        with self._process.oneshot():
+            proc_cpu = self._process.cpu_percent(None)
+            proc_rss = self._process.memory_info().rss
+        cpu = psutil.cpu_percent(None)
+        vm = psutil.virtual_memory()
+        disk = psutil.disk_io_counters()
+        net = psutil.net_io_counters()
+        disk_counters = (disk.read_bytes, disk.write_bytes) if disk else (0, 0)
+        net_counters = (net.bytes_sent, net.bytes_recv) if net else (0, 0)
+
+        rates = (0.0, 0.0, 0.0, 0.0)
+        if self._last_counters is not None:
+            last_time, last_disk, last_net = self._last_counters
+            dt = max(now - last_time, 1e-6)
+            rates = tuple(
+                max(cur - prev, 0) / dt
+                for cur, prev in zip(disk_counters + net_counters, last_disk + last_net)
+            )
+        self._last_counters = (now, disk_counters, net_counters)
+
+        values = (cpu, vm.percent, vm.used, *rates, proc_cpu, proc_rss)
+        self.history.append(now, values)
+        if self.store is not None:
+            self.store.append_many(self.node, now, dict(zip(SYSTEM_METRICS, values)))
+
+        changed = {}
+        for name, value in zip(SYSTEM_METRICS, values):
+            value = round(value, _PRECISION.get(name, 0))
+            if self._published.get(name) != value:
+                changed[name] = value
+        self._published.update(changed)
+        if changed and self.event_bus is not None:
+            self.event_bus.emit(TOPIC, changed)
+        return changed
@@ -0,0 +1,520 @@
+import itertools
+import os
+import pickle
+import signal
+import struct
+import sys
+import time
+import traceback
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtNetwork import QLocalServer, QLocalSocket
+from nodeone.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Plugin hosts are registered with the ManagerService under this prefix
+AGENT_PREFIX = "plugin."
+# Backend module looked up next to an isolated plugin's plugin.py
+BACKEND_FILE = "backend.py"
+# A host that prints no heartbeat for this long is killed and restarted
+HEARTBEAT_TIMEOUT = 30.0
+HEARTBEAT_INTERVAL = 1.0
+CONNECT_TIMEOUT_MS = 5000
+# Shared memory segments kept per published array name
+MAX_SLOTS = 4
+
+# Messages are pickled tuples behind a 4-byte length. Bulk arrays do not
+# travel in them; they are copied into shared memory and announced.
+#
+#   host -> GUI   ("hello", plugin, pid)
+#                 ("result", call id, ok, value or error text)
+#                 ("event", topic, payload)
+#                 ("subscribe", pattern)
+#                 ("array", name, slot, segment, dtype, shape)
+#   GUI -> host   ("call", call id, method, args, kwargs)
+#                 ("event", topic, payload)
+#                 ("release", name, slot)
+#                 ("stop",)
+_LENGTH = struct.Struct("!I")
+
+
+def _pack(message: tuple) -> bytes:
+    data = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+    return _LENGTH.pack(len(data)) + data
+
+
+def _unpack(buffer: bytearray) -> List[tuple]:
+    """Removes and returns the complete messages at the start of `buffer`."""
+    messages = []
+    pos = 0
+    while len(buffer) - pos >= _LENGTH.size:
+        (size,) = _LENGTH.unpack_from(buffer, pos)
+        if len(buffer) - pos - _LENGTH.size < size:
+            break
+        start = pos + _LENGTH.size
+        messages.append(pickle.loads(buffer[start : start + size]))
+        pos = start + size
+    del buffer[:pos]
+    return messages
+
+
+def _attach(segment: str) -> SharedMemory:
+    """Opens a segment created by a host without taking over its cleanup."""
+    try:
+        return SharedMemory(segment, track=False)  # type: ignore[call-arg]
+    except TypeError:
+        # Before Python 3.13 every attach is tracked, and the tracker would
+        # unlink the host's segment when this process exits
+        shm = SharedMemory(segment)
+        resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+        return shm
+
+
+# ----------------------------------------------------------------------
+# GUI side
+# ----------------------------------------------------------------------
+class PluginProxy(QObject):
+    """
+    The GUI's handle on one isolated plugin's backend process.
+
+    `call` runs a backend method in the host process; the result arrives
+    later through the callback and `result`. Calls made while the host is
+    (re)starting are queued and sent once it connects, and calls that were
+    in flight when a host died fail with an error. Events the backend
+    emits are published on the event bus, and bus events matching the
+    patterns it subscribed to are forwarded to it. Arrays the backend
+    publishes arrive through `array_ready` as read-only views of shared
+    memory, valid until the next array of the same name arrives; copy
+    them to keep them longer.
+    """
+
+    connected = pyqtSignal()
+    disconnected = pyqtSignal()
+    result = pyqtSignal(int, bool, object)  # call id, ok, value or error text
+    array_ready = pyqtSignal(str, object)
+
+    def __init__(self, name: str, event_bus=None, parent=None):
+        super().__init__(parent)
+        self.name = name
+        self.event_bus = event_bus
+        self.pid: Optional[int] = None
+        self._socket: Optional[QLocalSocket] = None
+        self._buffer = bytearray()
+        self._outbox: List[bytes] = []
+        self._ids = itertools.count(1)
+        self._callbacks: Dict[int, Optional[Callable[[bool, Any], None]]] = {}
+        self._subscriptions: list = []
+        self._relaying = False  # publishing an event that came from the host
+        self._arrays: Dict[str, Tuple[int, np.ndarray]] = {}  # name -> (slot, view)
+        self._segments: Dict[str, SharedMemory] = {}
+
+    @property
+    def is_connected(self) -> bool:
+        return self._socket is not None
+
+    def call(self, method: str, *args, callback: Optional[Callable[[bool, Any], None]] = None, **kwargs) -> int:
+        """Calls `method` on the backend; returns the call id."""
+        call_id = next(self._ids)
+        self._callbacks[call_id] = callback
+        self._send(("call", call_id, method, args, kwargs))
+        return call_id
+
+    def array(self, name: str) -> Optional[np.ndarray]:
+        """The latest array published under `name`, as a read-only view."""
+        entry = self._arrays.get(name)
+        return None if entry is None else entry[1]
+
+    # ------------------------------------------------------------------
+    # Connection
+    # ------------------------------------------------------------------
+    def attach(self, socket: QLocalSocket, pid: int, pending: bytearray):
+        self.detach()
+        self._socket = socket
+        self.pid = pid
+        self._buffer = pending
+        socket.readyRead.connect(self._on_ready_read)
+        socket.disconnected.connect(self.detach)
+        outbox, self._outbox = self._outbox, []
+        for data in outbox:
+            socket.write(data)
+        self.connected.emit()
+        if self._buffer:
+            self._handle(_unpack(self._buffer))
+
+    def detach(self):
+        socket, self._socket = self._socket, None
+        if socket is None:
+            return
+        socket.readyRead.disconnect(self._on_ready_read)
+        socket.disconnected.disconnect(self.detach)
+        socket.abort()
+        socket.deleteLater()
+        self.pid = None
+        self._buffer = bytearray()
+        for sub in self._subscriptions:
+            self.event_bus.unsubscribe(sub)
+        self._subscriptions.clear()
+        self._arrays.clear()
+        for segment in self._segments.values():
+            self._close_segment(segment)
+        self._segments.clear()
+        callbacks, self._callbacks = self._callbacks, {}
+        for call_id, callback in callbacks.items():
+            self._deliver(call_id, callback, False, "plugin host exited")
+        self.disconnected.emit()
+
+    def _send(self, message: tuple):
+        try:
+            data = _pack(message)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            logger.debug("Cannot send %s to plugin %s: %s", message[0], self.name, e)
+            return
+        if self._socket is None:
+            # Only calls are meant for the next host; the rest refer to the last one
+            if message[0] == "call":
+                self._outbox.append(data)
+        else:
+            self._socket.write(data)
+
+    def _on_ready_read(self):
+        self._buffer += bytes(self._socket.readAll())
+        self._handle(_unpack(self._buffer))
+
+    # ------------------------------------------------------------------
+    # Messages from the host
+    # ------------------------------------------------------------------
+    def _handle(self, messages: List[tuple]):
+        for message in messages:
+            kind = message[0]
+            if kind == "result":
+                _, call_id, ok, value = message
+                self._deliver(call_id, self._callbacks.pop(call_id, None), ok, value)
+            elif kind == "event":
+                self._publish(message[1], message[2])
+            elif kind == "subscribe" and self.event_bus is not None:
+                self._subscriptions.append(self.event_bus.subscribe(message[1], self._forward))
+            elif kind == "array":
+                self._on_array(*message[1:])
+
+    def _deliver(self, call_id: int, callback, ok: bool, value):
+        if callback is not None:
+            try:
+                callback(ok, value)
+            except Exception:
+                logger.exception("Result callback of plugin %s failed", self.name)
+        self.result.emit(call_id, ok, value)
+
+    def _publish(self, topic: str, payload):
+        if self.event_bus is None:
+            return
+        self._relaying = True
+        try:
+            self.event_bus.emit(topic, payload)
+        finally:
+            self._relaying = False
+
+    def _forward(self, topic: str, payload):
+        # Events the host itself emitted are not sent back to it
+        if not self._relaying:
+            self._send(("event", topic, payload))
+
+    def _on_array(self, name: str, slot: int, segment: str, dtype: str, shape: tuple):
+        shm = self._segments.get(segment)
+        if shm is None:
+            try:
+                shm = self._segments[segment] = _attach(segment)
+            except OSError as e:
+                logger.warning("Cannot open array %s of plugin %s: %s", name, self.name, e)
+                self._send(("release", name, slot))
+                return
+        view = np.ndarray(shape, np.dtype(dtype), buffer=shm.buf)
+        view.flags.writeable = False
+        previous = self._arrays.get(name)
+        self._arrays[name] = (slot, view)
+        if previous is not None and previous[0] != slot:
+            self._send(("release", name, previous[0]))
+        self.array_ready.emit(name, view)
+
+    @staticmethod
+    def _close_segment(shm: SharedMemory):
+        try:
+            shm.close()
+        except BufferError:
+            pass  # a view is still held somewhere; closed when it is collected
+
+
+class PluginHostService(QObject):
+    """
+    Runs isolated plugins' backends in child processes.
+
+    Each isolated plugin gets a host process that imports its backend and
+    connects back over a `QLocalServer`; the GUI keeps only the plugin's
+    widgets and a `PluginProxy`. Hosts are `ProcessAgent`s of the
+    ManagerService, so one that crashes or stops sending heartbeats is
+    killed and restarted with backoff, and its proxy reconnects to the new
+    process.
+    """
+
+    def __init__(self, manager, event_bus=None, parent=None):
+        super().__init__(parent)
+        self.manager = manager
+        self.event_bus = event_bus
+        self.proxies: Dict[str, PluginProxy] = {}
+        self._pending: Dict[QLocalSocket, bytearray] = {}
+        self._server = QLocalServer(self)
+        self._server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        self._server.newConnection.connect(self._on_connection)
+        self.server_name = f"nodeone-plugins-{os.getpid()}-{id(self):x}"
+        if not self._server.listen(self.server_name):
+            raise OSError(f"Cannot listen on {self.server_name}: {self._server.errorString()}")
+
+    def start(self, spec) -> PluginProxy:
+        """Starts the host of `spec` (a PluginSpec) and returns its proxy."""
+        from nodeone.services.manager import ProcessAgent
+
+        proxy = self.proxies.get(spec.name)
+        if proxy is None:
+            proxy = self.proxies[spec.name] = PluginProxy(spec.name, self.event_bus, self)
+            agent = ProcessAgent(
+                sys.executable,
+                ["-m", __name__, self.server_name, spec.name, spec.path],
+                heartbeat_timeout=HEARTBEAT_TIMEOUT,
+            )
+            self.manager.register(AGENT_PREFIX + spec.name, agent)
+        self.manager.start_agent(AGENT_PREFIX + spec.name)
+        return proxy
+
+    def stop(self, name: str):
+        agent = AGENT_PREFIX + name
+        if agent in self.manager.agents:
+            self.manager.stop_agent(agent)
+
+    def close(self):
+        """Stops every host; the manager's shutdown waits for them to exit."""
+        for name in list(self.proxies):
+            self.stop(name)
+        self._server.close()
+
+    def _on_connection(self):
+        while self._server.hasPendingConnections():
+            socket = self._server.nextPendingConnection()
+            self._pending[socket] = bytearray()
+            socket.readyRead.connect(lambda s=socket: self._on_hello(s))
+            socket.disconnected.connect(lambda s=socket: self._pending.pop(s, None))
+
+    def _on_hello(self, socket: QLocalSocket):
+        buffer = self._pending.get(socket)
+        if buffer is None:
+            return
+        buffer += bytes(socket.readAll())
+        if len(buffer) < _LENGTH.size or len(buffer) < _LENGTH.size + _LENGTH.unpack_from(buffer)[0]:
+            return
+        del self._pending[socket]
+        socket.readyRead.disconnect()
+        socket.disconnected.disconnect()
+        size = _LENGTH.unpack_from(buffer)[0]
+        try:
+            kind, name, pid = pickle.loads(buffer[_LENGTH.size : _LENGTH.size + size])
+        except Exception:
+            kind = name = pid = None
+        proxy = self.proxies.get(name) if kind == "hello" else None
+        if proxy is None:
+            logger.warning("Rejecting plugin host connection: %r", name)
+            socket.abort()
+            socket.deleteLater()
+            return
+        del buffer[: _LENGTH.size + size]
+        proxy.attach(socket, pid, buffer)
+
+
+# ----------------------------------------------------------------------
+# Host process
+# ----------------------------------------------------------------------
+class _Slot:
+    __slots__ = ("shm", "busy")
+
+    def __init__(self):
+        self.shm: Optional[SharedMemory] = None
+        self.busy = False
+
+
+class PluginHost:
+    """
+    Runs one plugin backend in the host process; passed to its
+    ``create_backend(host)``.
+
+    The backend's public methods can be called from the GUI through the
+    plugin's proxy. A backend with an ``interval`` attribute also has its
+    ``tick()`` called that often, and its optional ``close()`` runs when
+    the host stops. Calls and ticks run one at a time on the host's only
+    thread; work that takes longer than the heartbeat timeout should call
+    `heartbeat` as it goes.
+    """
+
+    def __init__(self, server: str, name: str, path: str):
+        self.server = server
+        self.name = name
+        self.path = path
+        self.backend: Any = None
+        self._socket = QLocalSocket()
+        self._buffer = bytearray()
+        self._slots: Dict[str, List[_Slot]] = {}
+        self._last_heartbeat = 0.0
+        self._stopping = False
+
+    # ------------------------------------------------------------------
+    # Backend API
+    # ------------------------------------------------------------------
+    def emit(self, topic: str, payload: object = None):
+        """Publishes an event on the GUI's event bus."""
+        self._send(("event", topic, payload))
+
+    def subscribe(self, pattern: str):
+        """Asks for bus events matching `pattern`, delivered to ``on_event``."""
+        self._send(("subscribe", pattern))
+
+    def publish(self, name: str, array) -> bool:
+        """
+        Shares an array with the GUI through shared memory.
+
+        Returns False, dropping the array, while the GUI still holds
+        MAX_SLOTS earlier arrays of the same name.
+        """
+        array = np.ascontiguousarray(array)
+        if array.dtype.hasobject:
+            raise ValueError("arrays of Python objects cannot be shared")
+        slots = self._slots.setdefault(name, [])
+        index = next((i for i, slot in enumerate(slots) if not slot.busy), None)
+        if index is None:
+            if len(slots) >= MAX_SLOTS:
+                return False
+            slots.append(_Slot())
+            index = len(slots) - 1
+        slot = slots[index]
+        if slot.shm is None or slot.shm.size < array.nbytes:
+            self._unlink(slot)
+            slot.shm = SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, array.dtype, buffer=slot.shm.buf)[...] = array
+        slot.busy = True
+        self._send(("array", name, index, slot.shm.name, array.dtype.str, array.shape))
+        return True
+
+    def heartbeat(self):
+        self._last_heartbeat = time.monotonic()
+        sys.stdout.write("alive\n")
+        sys.stdout.flush()
+
+    # ------------------------------------------------------------------
+    # Main loop
+    # ------------------------------------------------------------------
+    def run(self) -> int:
+        self._socket.connectToServer(self.server)
+        if not self._socket.waitForConnected(CONNECT_TIMEOUT_MS):
+            print(f"Cannot connect to {self.server}: {self._socket.errorString()}", file=sys.stderr)
+            return 2
+        self._send(("hello", self.name, os.getpid()))
+        self.backend = self._create_backend()
+        self.heartbeat()
+
+        interval = getattr(self.backend, "interval", None)
+        next_tick = time.monotonic() if interval else None
+        try:
+            while not self._stopping:
+                now = time.monotonic()
+                if next_tick is not None and now >= next_tick:
+                    self._guarded(self.backend.tick)
+                    next_tick = max(next_tick + interval, time.monotonic())
+                if time.monotonic() - self._last_heartbeat >= HEARTBEAT_INTERVAL:
+                    self.heartbeat()
+                wait = self._last_heartbeat + HEARTBEAT_INTERVAL - time.monotonic()
+                if next_tick is not None:
+                    wait = min(wait, next_tick - time.monotonic())
+                if self._socket.bytesToWrite():
+                    self._socket.waitForBytesWritten(0)
+                if self._socket.waitForReadyRead(max(0, int(wait * 1000))):
+                    self._buffer += bytes(self._socket.readAll())
+                    for message in _unpack(self._buffer):
+                        self._handle(message)
+                elif self._socket.state() != QLocalSocket.LocalSocketState.ConnectedState:
+                    break  # the GUI went away
+        finally:
+            close = getattr(self.backend, "close", None)
+            if close is not None:
+                self._guarded(close)
+            for slots in self._slots.values():
+                for slot in slots:
+                    self._unlink(slot)
+            self._socket.waitForBytesWritten(1000)
+        return 0
+
+    def stop(self, *_):
+        self._stopping = True
+
+    def _create_backend(self):
+        from nodeone.services.plugin_manager import _load_module_from_path
+
+        backend = os.path.join(os.path.dirname(self.path), BACKEND_FILE)
+        path = backend if os.path.isfile(backend) else self.path
+        module = _load_module_from_path(f"{self.name}_backend", path)
+        return module.create_backend(self)
+
+    def _handle(self, message: tuple):
+        kind = message[0]
+        if kind == "call":
+            _, call_id, method, args, kwargs = message
+            try:
+                if method.startswith("_"):
+                    raise AttributeError(f"{method} is private")
+                value, ok = getattr(self.backend, method)(*args, **kwargs), True
+            except Exception as e:
+                value, ok = f"{type(e).__name__}: {e}", False
+            self._send(("result", call_id, ok, value))
+        elif kind == "event":
+            handler = getattr(self.backend, "on_event", None)
+            if handler is not None:
+                self._guarded(handler, message[1], message[2])
+        elif kind == "release":
+            slots = self._slots.get(message[1], ())
+            if message[2] < len(slots):
+                slots[message[2]].busy = False
+        elif kind == "stop":
+            self._stopping = True
+
+    def _send(self, message: tuple):
+        try:
+            data = _pack(message)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            if message[0] != "result":
+                raise
+            data = _pack(("result", message[1], False, f"result cannot be sent: {e}"))
+        self._socket.write(data)
+        self._socket.flush()
+
+    @staticmethod
+    def _guarded(fn, *args):
+        try:
+            fn(*args)
+        except Exception:
+            traceback.print_exc()
+
+    @staticmethod
+    def _unlink(slot: _Slot):
+        if slot.shm is not None:
+            slot.shm.close()
+            slot.shm.unlink()
+            slot.shm = None
+
+
+def main(argv=None) -> int:
+    server, name, path = (sys.argv[1:] if argv is None else argv)[:3]
+    host = PluginHost(server, name, path)
+    signal.signal(signal.SIGTERM, host.stop)
+    return host.run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
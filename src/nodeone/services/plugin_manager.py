@@ -1,71 +1,265 @@
+import ast
 import importlib.util
+import inspect
+import json
 import os
+import threading
+import time
 import traceback
+from pathlib import Path
 from types import ModuleType
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 from PyQt6.QtWidgets import QWidget
+from nodeone.services.telemetry import REGISTRY
+from nodeone.utils.logger import get_logger
+from nodeone.utils.paths import cache_dir
+
+logger = get_logger(__name__)
+
+PLUGIN_LOAD_SECONDS = REGISTRY.gauge(
+    "nodeone_plugin_load_seconds", "Time taken to import each plugin module", ["plugin"]
+)
+
+BUILTIN_PLUGINS_DIR = str(Path(__file__).resolve().parent.parent / "plugins")
+
+INDEX_VERSION = 2
+
+# Module-level constants a plugin may declare; they are read without importing it.
+MANIFEST_FIELDS = {
+    "PLUGIN_NAME": "name",
+    "TAB_TITLE": "title",
+    "TOPICS": "topics",
+    "ISOLATED": "isolated",
+}
+ENTRY_POINTS = ("create_plugin", "Plugin")
+
+
+def read_manifest(path: str) -> dict:
+    """
+    Extracts plugin metadata from a plugin source file without executing it.
+
+    Only literal module-level assignments listed in MANIFEST_FIELDS are
+    evaluated; the entry point is the first of ENTRY_POINTS defined at
+    module level.
+    """
+    with open(path, "rb") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    manifest: dict = {"entry_point": None}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1:
+            target = node.targets[0]
+            if isinstance(target, ast.Name) and target.id in MANIFEST_FIELDS:
+                try:
+                    manifest[MANIFEST_FIELDS[target.id]] = ast.literal_eval(node.value)
+                except ValueError:
+                    logger.warning("Ignoring non-literal %s in %s", target.id, path)
+        elif isinstance(node, (ast.FunctionDef, ast.ClassDef)) and node.name in ENTRY_POINTS:
+            current = manifest["entry_point"]
+            if current is None or ENTRY_POINTS.index(node.name) < ENTRY_POINTS.index(current):
+                manifest["entry_point"] = node.name
+    return manifest
+
 
 class PluginSpec:
-    def __init__(self, name: str, module: ModuleType, path: str):
+    """
+    Describes a discovered plugin. The module itself is only imported when
+    it is first needed, either by `create_widget` or by `load`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        path: str,
+        title: Optional[str] = None,
+        topics: Optional[List[str]] = None,
+        entry_point: Optional[str] = None,
+        loader=None,
+        isolated: bool = False,
+    ):
         self.name = name
-        self.module = module
         self.path = path
+        self.title = title or name.replace("_", " ").title()
+        self.topics = list(topics or [])
+        self.entry_point = entry_point
+        # Backend runs in a child process; see services.plugin_host
+        self.isolated = isolated
+        self._loader = loader or _load_module_from_path
+        self._module: Optional[ModuleType] = None
+        self._lock = threading.Lock()
+
+    @property
+    def module(self) -> ModuleType:
+        return self.load()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._module is not None
 
-    def create_widget(self, event_bus) -> QWidget:
-        """Expect plugin module to expose `create_plugin(event_bus)` returning QWidget"""
-        if hasattr(self.module, "create_plugin"):
-            return self.module.create_plugin(event_bus)
+    def load(self) -> ModuleType:
+        """Imports the plugin module once; safe to call from any thread."""
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    started = time.perf_counter()
+                    self._module = self._loader(self.name, self.path)
+                    PLUGIN_LOAD_SECONDS.labels(self.name).set(time.perf_counter() - started)
+        return self._module
+
+    def create_widget(self, event_bus, services=None) -> QWidget:
+        """
+        Expect plugin module to expose `create_plugin(event_bus)` returning QWidget.
+
+        Factories with a `services` parameter also receive the service
+        registry, and isolated plugins' factories with a `backend` parameter
+        the `PluginProxy` of their backend process, which is started first
+        by the registry's "plugin_host" service.
+        """
+        extras = {"services": services}
+        if self.isolated:
+            host = services.get("plugin_host") if services is not None else None
+            if host is None:
+                raise RuntimeError(f"Plugin {self.name} is isolated but no plugin host is running")
+            extras["backend"] = host.start(self)
+        module = self.load()
+        if hasattr(module, "create_plugin"):
+            return _call_factory(module.create_plugin, event_bus, extras)
         # fallback: try class `Plugin`
-        if hasattr(self.module, "Plugin"):
-            cls = getattr(self.module, "Plugin")
-            return cls(event_bus)
+        if hasattr(module, "Plugin"):
+            cls = getattr(module, "Plugin")
+            return _call_factory(cls, event_bus, extras)
         raise RuntimeError(
             "Plugin module does not expose a create_plugin/event-compatible interface"
         )
 
+
 class PluginManager:
-    def __init__(self, plugins_dir: str = "plugins") -> None:
+    def __init__(self, plugins_dir: str = "plugins", index_path: Optional[str] = None) -> None:
         self.plugins_dir = plugins_dir
+        self.index_path = index_path or str(cache_dir() / "plugin_index.json")
         self._specs: Dict[str, PluginSpec] = {}
+        self._warm_thread: Optional[threading.Thread] = None
 
     def discover(self) -> List[str]:
+        """
+        Finds plugins and reads their manifests, without importing them.
+
+        Manifests are cached in an on-disk index keyed by file path, mtime
+        and size, so unchanged plugins are never parsed again.
+        """
         found = []
         if not os.path.isdir(self.plugins_dir):
             return found
-        for entry in os.listdir(self.plugins_dir):
+
+        index = self._read_index()
+        fresh: Dict[str, dict] = {}
+        for entry in sorted(os.listdir(self.plugins_dir)):
             full = os.path.join(self.plugins_dir, entry)
             # plugin may be a directory with plugin.py, or a single .py file
             if os.path.isdir(full):
-                candidate = os.path.join(full, "plugin.py")
-                if os.path.isfile(candidate):
-                    try:
-                        spec = self._load_module_from_path(entry, candidate)
-                        self._specs[entry] = PluginSpec(entry, spec, candidate)
-                        found.append(entry)
-                    except Exception:
-                        traceback.print_exc()
+                name, candidate = entry, os.path.join(full, "plugin.py")
+                if not os.path.isfile(candidate):
+                    continue
             elif entry.endswith(".py"):
-                name = entry[:-3]
+                name, candidate = entry[:-3], full
+            else:
+                continue
+
+            candidate = os.path.abspath(candidate)
+            try:
+                manifest = self._manifest_for(candidate, index)
+            except Exception:
+                traceback.print_exc()
+                continue
+            fresh[candidate] = manifest
+
+            name = manifest.get("name") or name
+            self._specs[name] = PluginSpec(
+                name,
+                candidate,
+                title=manifest.get("title"),
+                topics=manifest.get("topics"),
+                entry_point=manifest.get("entry_point"),
+                isolated=bool(manifest.get("isolated")),
+            )
+            found.append(name)
+
+        if fresh != index:
+            self._write_index(fresh)
+        return found
+
+    def warm(self, names: Iterable[str]) -> threading.Thread:
+        """Imports the given plugins on a background thread."""
+        specs = [self._specs[n] for n in names if n in self._specs]
+
+        def run():
+            for spec in specs:
                 try:
-                    spec = self._load_module_from_path(name, full)
-                    self._specs[name] = PluginSpec(name, spec, full)
-                    found.append(name)
+                    spec.load()
                 except Exception:
-                    traceback.print_exc()
-        return found
+                    logger.exception("Failed to pre-load plugin %s", spec.name)
 
-    def _load_module_from_path(self, name: str, path: str) -> ModuleType:
-        spec = importlib.util.spec_from_file_location(
-            f"microfrontend.plugins.{name}", path
+        self._warm_thread = threading.Thread(
+            target=run, name="plugin-warmup", daemon=True
         )
-        if spec is None or spec.loader is None:
-            raise ImportError(f"Could not load plugin {name} at {path}")
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-        return module
+        self._warm_thread.start()
+        return self._warm_thread
+
+    def _manifest_for(self, path: str, index: Dict[str, dict]) -> dict:
+        st = os.stat(path)
+        cached = index.get(path)
+        if cached and cached.get("mtime_ns") == st.st_mtime_ns and cached.get("size") == st.st_size:
+            return cached
+        manifest = read_manifest(path)
+        manifest["mtime_ns"] = st.st_mtime_ns
+        manifest["size"] = st.st_size
+        return manifest
+
+    def _read_index(self) -> Dict[str, dict]:
+        try:
+            with open(self.index_path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != INDEX_VERSION:
+            return {}
+        return data.get("plugins", {})
+
+    def _write_index(self, plugins: Dict[str, dict]):
+        tmp = f"{self.index_path}.tmp"
+        try:
+            with open(tmp, "w") as f:
+                json.dump({"version": INDEX_VERSION, "plugins": plugins}, f)
+            os.replace(tmp, self.index_path)
+        except OSError as e:
+            logger.warning("Could not write plugin index %s: %s", self.index_path, e)
+
+    def _load_module_from_path(self, name: str, path: str) -> ModuleType:
+        return _load_module_from_path(name, path)
 
     def get_spec(self, name: str) -> Optional[PluginSpec]:
         return self._specs.get(name)
 
     def list_plugins(self) -> List[str]:
         return list(self._specs.keys())
+
+
+def _call_factory(factory, event_bus, extras: Dict[str, object]):
+    """Calls `factory(event_bus)`, passing the `extras` it names by keyword."""
+    try:
+        params = inspect.signature(factory).parameters
+    except (TypeError, ValueError):
+        return factory(event_bus)
+    kwargs = {name: value for name, value in extras.items() if name in params}
+    return factory(event_bus, **kwargs)
+
+
+def _load_module_from_path(name: str, path: str) -> ModuleType:
+    spec = importlib.util.spec_from_file_location(
+        f"microfrontend.plugins.{name}", path
+    )
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Could not load plugin {name} at {path}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,285 @@
+import os
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from nodeone.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+TOPIC = "processes.delta"
+
+# A process using less CPU than this (percent of one core) counts as idle
+IDLE_CPU = 0.5
+# Idle processes are sampled every 2, 4, ... up to this many scans
+MAX_SKIP = 8
+
+_STATUS = {
+    "R": "running",
+    "S": "sleeping",
+    "D": "disk-sleep",
+    "Z": "zombie",
+    "T": "stopped",
+    "t": "tracing-stop",
+    "X": "dead",
+    "I": "idle",
+    "P": "parked",
+    "W": "waking",
+}
+
+# Row layout shared with ProcessTableModel's COLUMNS
+ProcessRow = Tuple[int, str, str, float, int, int, str]
+
+
+class ProcessInfo(NamedTuple):
+    """Attributes that do not change during a process's lifetime."""
+
+    pid: int
+    name: str
+    cmdline: List[str]
+    exe: str
+    user: str
+    create_time: float
+
+
+class ProcessDelta(NamedTuple):
+    """Payload of a ``processes.delta`` event; rows are {pid: row}."""
+
+    added: Dict[int, ProcessRow]
+    changed: Dict[int, ProcessRow]
+    removed: List[int]  # a reused PID is both removed and added
+    sampled: int  # processes whose counters were read in this scan
+    total: int
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+
+class _Proc:
+    __slots__ = ("info", "start", "cpu_time", "sampled_at", "row", "skip", "due")
+
+    def __init__(self, info: ProcessInfo, start: int):
+        self.info = info
+        self.start = start  # clock ticks after boot; identifies this process
+        self.cpu_time = 0.0
+        self.sampled_at = 0.0
+        self.row: Optional[ProcessRow] = None
+        self.skip = 1  # scans between samples
+        self.due = 0  # scan number of the next sample
+
+
+class ProcessScanner:
+    """
+    Incremental process table scanner.
+
+    Each scan lists the PIDs and reads ``/proc/<pid>/stat`` for the
+    processes that are due: one small file with the state, CPU time,
+    thread count, RSS and start time. Command line, executable, user and
+    create time are read once per process and cached by PID; a PID whose
+    start time changed belongs to a new process and is reported as removed
+    and added again. Processes that stay idle are sampled every 2, 4, up
+    to MAX_SKIP scans, and again every scan once they use CPU or memory
+    changes; a reused PID of an idle process is noticed at its next sample.
+
+    `scan` returns only the rows that appeared, changed or went away.
+    Where ``/proc`` is not available, psutil is used for every process on
+    every scan and the results are diffed the same way.
+
+    Not thread-safe: run one scan at a time.
+    """
+
+    def __init__(self, proc_root: str = "/proc", clock: Callable[[], float] = time.monotonic):
+        self.proc_root = proc_root
+        self.clock = clock
+        self._procs: Dict[int, _Proc] = {}
+        self._users: Dict[int, str] = {}
+        self._scans = 0
+        self._use_proc = os.path.isfile(os.path.join(proc_root, "stat"))
+        self._ticks = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+        self._page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+        self._boot_time = self._read_boot_time() if self._use_proc else 0.0
+
+    def __len__(self) -> int:
+        return len(self._procs)
+
+    def info(self, pid: int) -> Optional[ProcessInfo]:
+        proc = self._procs.get(pid)
+        return None if proc is None else proc.info
+
+    def rows(self) -> Dict[int, ProcessRow]:
+        return {pid: proc.row for pid, proc in self._procs.items() if proc.row is not None}
+
+    def scan(self, full: bool = False) -> ProcessDelta:
+        """Scans once; `full` samples every process regardless of activity."""
+        self._scans += 1
+        if not self._use_proc:
+            return self._scan_psutil()
+
+        try:
+            pids = [int(name) for name in os.listdir(self.proc_root) if name.isdigit()]
+        except OSError as e:
+            logger.warning("Cannot list %s: %s", self.proc_root, e)
+            return ProcessDelta({}, {}, [], 0, len(self._procs))
+
+        alive = set(pids)
+        removed = [pid for pid in self._procs if pid not in alive]
+        for pid in removed:
+            del self._procs[pid]
+
+        added: Dict[int, ProcessRow] = {}
+        changed: Dict[int, ProcessRow] = {}
+        sampled = 0
+        now = self.clock()
+        for pid in pids:
+            proc = self._procs.get(pid)
+            if proc is not None and not full and proc.due > self._scans:
+                continue
+            stat = self._read_stat(pid)
+            sampled += 1
+            if stat is None:
+                # Exited since the listing; the next scan reports it
+                continue
+            start = stat[5]
+            if proc is not None and proc.start != start:
+                removed.append(pid)
+                proc = None
+            if proc is None:
+                info = self._read_info(pid, stat[0], start)
+                proc = self._procs[pid] = _Proc(info, start)
+            row = self._update(proc, stat, now)
+            if proc.row is None:
+                added[pid] = row
+            elif row != proc.row:
+                changed[pid] = row
+            proc.row = row
+        return ProcessDelta(added, changed, removed, sampled, len(self._procs))
+
+    # ------------------------------------------------------------------
+    # /proc
+    # ------------------------------------------------------------------
+    def _read_boot_time(self) -> float:
+        try:
+            with open(os.path.join(self.proc_root, "stat"), "rb") as f:
+                for line in f:
+                    if line.startswith(b"btime "):
+                        return float(line.split()[1])
+        except OSError:
+            pass
+        return time.time() - time.monotonic()
+
+    def _read_stat(self, pid: int) -> Optional[Tuple[str, str, float, int, int, int]]:
+        """Returns (comm, state, cpu seconds, threads, rss bytes, start ticks)."""
+        try:
+            with open(f"{self.proc_root}/{pid}/stat", "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        # The command name is in parentheses and may itself contain them
+        close = data.rfind(b")")
+        comm = data[data.find(b"(") + 1 : close].decode("utf-8", "replace")
+        fields = data[close + 2 :].split()
+        try:
+            return (
+                comm,
+                fields[0].decode(),
+                (int(fields[11]) + int(fields[12])) / self._ticks,
+                int(fields[17]),
+                int(fields[21]) * self._page_size,
+                int(fields[19]),
+            )
+        except (IndexError, ValueError):
+            return None
+
+    def _read_info(self, pid: int, comm: str, start: int) -> ProcessInfo:
+        base = f"{self.proc_root}/{pid}"
+        try:
+            with open(f"{base}/cmdline", "rb") as f:
+                cmdline = [arg.decode("utf-8", "replace") for arg in f.read().split(b"\0") if arg]
+        except OSError:
+            cmdline = []
+        try:
+            exe = os.readlink(f"{base}/exe")
+        except OSError:
+            exe = ""  # kernel threads, or another user's process
+        try:
+            uid = os.stat(base).st_uid
+        except OSError:
+            uid = -1
+        name = comm
+        # The kernel cuts names at 15 characters; recover the rest if we can
+        if len(comm) == 15 and cmdline:
+            full = os.path.basename(cmdline[0])
+            if full.startswith(comm):
+                name = full
+        create_time = self._boot_time + start / self._ticks
+        return ProcessInfo(pid, name, cmdline, exe, self._user(uid), create_time)
+
+    def _user(self, uid: int) -> str:
+        user = self._users.get(uid)
+        if user is None:
+            try:
+                import pwd
+
+                user = pwd.getpwuid(uid).pw_name
+            except (ImportError, KeyError):
+                user = str(uid) if uid >= 0 else ""
+            self._users[uid] = user
+        return user
+
+    def _update(self, proc: _Proc, stat, now: float) -> ProcessRow:
+        _, state, cpu_time, threads, rss, _ = stat
+        cpu = 0.0
+        if proc.sampled_at and now > proc.sampled_at:
+            cpu = max(0.0, cpu_time - proc.cpu_time) / (now - proc.sampled_at) * 100
+        proc.cpu_time = cpu_time
+        proc.sampled_at = now
+
+        info = proc.info
+        row = (info.pid, info.name, info.user, round(cpu, 1), rss, threads, _STATUS.get(state, state))
+        previous = proc.row
+        if cpu >= IDLE_CPU or previous is None or previous[4:] != row[4:]:
+            proc.skip = 1
+        else:
+            proc.skip = min(proc.skip * 2, MAX_SKIP)
+        # Shift by PID so idle processes do not all fall due in the same scan
+        proc.due = self._scans + proc.skip - (info.pid % proc.skip) // 2
+        return row
+
+    # ------------------------------------------------------------------
+    # psutil fallback
+    # ------------------------------------------------------------------
+    def _scan_psutil(self) -> ProcessDelta:
+        import psutil
+
+        attrs = ["pid", "name", "username", "cpu_percent", "memory_info", "num_threads", "status", "create_time"]
+        added: Dict[int, ProcessRow] = {}
+        changed: Dict[int, ProcessRow] = {}
+        removed: List[int] = []
+        seen = set()
+        for p in psutil.process_iter(attrs):
+            i = p.info
+            pid = i["pid"]
+            seen.add(pid)
+            memory = i["memory_info"]
+            row = (
+                pid,
+                i["name"] or "",
+                i["username"] or "",
+                i["cpu_percent"] or 0.0,
+                memory.rss if memory else 0,
+                i["num_threads"] or 0,
+                i["status"] or "",
+            )
+            proc = self._procs.get(pid)
+            if proc is not None and proc.info.create_time != i["create_time"]:
+                removed.append(pid)
+                proc = None
+            if proc is None:
+                info = ProcessInfo(pid, row[1], [], "", row[2], i["create_time"] or 0.0)
+                proc = self._procs[pid] = _Proc(info, 0)
+                added[pid] = row
+            elif row != proc.row:
+                changed[pid] = row
+            proc.row = row
+        for pid in [pid for pid in self._procs if pid not in seen]:
+            del self._procs[pid]
+            removed.append(pid)
+        return ProcessDelta(added, changed, removed, len(seen), len(self._procs))
@@ -0,0 +1,26 @@
+from typing import Any, Dict, Iterator
+
+
+class ServiceRegistry:
+    """
+    Named long-lived services shared between the shell and plugins.
+
+    Plugins whose factory accepts a second argument receive the registry
+    and look services up by name, e.g. ``services.get("timeseries")``.
+    """
+
+    def __init__(self) -> None:
+        self._services: Dict[str, Any] = {}
+
+    def register(self, name: str, service: Any) -> Any:
+        self._services[name] = service
+        return service
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self._services.get(name, default)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._services
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._services)
@@ -0,0 +1,166 @@
+import os
+from typing import Any, Dict, List, NamedTuple, Optional
+from pydantic import BaseModel, ValidationError
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+from nodeone.models.settings import AppSettings, get_settings, load_settings, read_config_file, set_settings
+from nodeone.utils.logger import get_logger
+from nodeone.utils.paths import config_file
+
+logger = get_logger(__name__)
+
+TOPIC_PREFIX = "settings"
+DEBOUNCE_MS = 300
+
+
+class SettingsChange(NamedTuple):
+    """Payload of a ``settings.<section>`` event."""
+
+    section: str
+    old: Any
+    new: Any
+    changed: List[str]  # dotted paths of the changed values within the section
+
+
+def diff_settings(old: AppSettings, new: AppSettings) -> Dict[str, List[str]]:
+    """
+    Compares two settings objects field by field.
+
+    Returns ``{section: [changed paths]}`` for the top-level fields that
+    differ; nested models are compared recursively, lists as a whole.
+    """
+    changes: Dict[str, List[str]] = {}
+    for name in AppSettings.model_fields:
+        paths = _diff(getattr(old, name), getattr(new, name), name)
+        if paths:
+            changes[name] = paths
+    return changes
+
+
+def _diff(old: Any, new: Any, path: str) -> List[str]:
+    if isinstance(old, BaseModel) and type(old) is type(new):
+        paths: List[str] = []
+        for name in type(old).model_fields:
+            paths.extend(_diff(getattr(old, name), getattr(new, name), f"{path}.{name}"))
+        return paths
+    return [] if old == new else [path]
+
+
+class _LoadSignals(QObject):
+    loaded = pyqtSignal(int, object)  # generation, AppSettings
+    failed = pyqtSignal(int, str)
+
+
+class _LoadTask(QRunnable):
+    def __init__(self, generation: int, path: str, signals: _LoadSignals):
+        super().__init__()
+        self.generation = generation
+        self.path = path
+        self.signals = signals
+
+    def run(self):
+        try:
+            # A half-written file is not valid JSON; wait for the next change
+            # instead of falling back to the defaults
+            settings = load_settings(read_config_file(strict=True, path=self.path))
+        except (ValueError, ValidationError) as e:
+            self.signals.failed.emit(self.generation, str(e))
+            return
+        self.signals.loaded.emit(self.generation, settings)
+
+
+class SettingsWatcher(QObject):
+    """
+    Reloads the settings when ~/config.json, or the file at `path`, changes.
+
+    Change notifications are debounced, and the file is parsed and
+    validated on the thread pool. The result is diffed against the current
+    settings, which it then replaces, and one `SettingsChange` event is
+    published per changed section on ``settings.<section>`` (for example
+    ``settings.ui`` or ``settings.agents``). Invalid files are logged and
+    leave the current settings in place.
+
+    The directory is watched as well as the file, so editors that save by
+    replacing the file, and a file created after startup, are picked up.
+    """
+
+    reloaded = pyqtSignal(object)  # {section: [changed paths]}
+
+    def __init__(self, event_bus, path: Optional[str] = None, debounce_ms: int = DEBOUNCE_MS, parent=None):
+        super().__init__(parent)
+        self.event_bus = event_bus
+        self.path = os.path.abspath(path or str(config_file()))
+        self._generation = 0
+        self._stamp = None
+
+        self._watcher = QFileSystemWatcher(self)
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(debounce_ms)
+        self._signals = _LoadSignals(self)
+
+        self._watcher.fileChanged.connect(self._on_changed)
+        self._watcher.directoryChanged.connect(self._on_changed)
+        self._debounce.timeout.connect(self.reload)
+        self._signals.loaded.connect(self._on_loaded)
+        self._signals.failed.connect(self._on_failed)
+
+    def start(self):
+        directory = os.path.dirname(self.path)
+        if os.path.isdir(directory) and directory not in self._watcher.directories():
+            self._watcher.addPath(directory)
+        self._watch_file()
+        self._stamp_changed()
+
+    def stop(self):
+        self._debounce.stop()
+        paths = self._watcher.files() + self._watcher.directories()
+        if paths:
+            self._watcher.removePaths(paths)
+        self._generation += 1  # drop a reload still in flight
+
+    def reload(self):
+        """Re-reads and validates the settings in the background."""
+        self._generation += 1
+        QThreadPool.globalInstance().start(_LoadTask(self._generation, self.path, self._signals))
+
+    def _watch_file(self):
+        # A file replaced on save drops out of the watch list; add it back
+        if os.path.isfile(self.path) and self.path not in self._watcher.files():
+            self._watcher.addPath(self.path)
+
+    def _on_changed(self, path: str):
+        changed = self._stamp_changed()
+        if path != self.path and not changed:
+            return  # something else in the directory changed
+        self._watch_file()
+        self._debounce.start()
+
+    def _stamp_changed(self) -> bool:
+        try:
+            st = os.stat(self.path)
+            stamp = (st.st_mtime_ns, st.st_size, st.st_ino)
+        except OSError:
+            stamp = None
+        changed = stamp != self._stamp
+        self._stamp = stamp
+        return changed
+
+    def _on_loaded(self, generation: int, settings: AppSettings):
+        if generation != self._generation:
+            return
+        current = get_settings()
+        changes = diff_settings(current, settings)
+        if not changes:
+            return
+        set_settings(settings)
+        logger.info("Settings reloaded; changed: %s", ", ".join(sorted(changes)))
+        for section, paths in changes.items():
+            self.event_bus.emit(
+                f"{TOPIC_PREFIX}.{section}",
+                SettingsChange(section, getattr(current, section), getattr(settings, section), paths),
+            )
+        self.reloaded.emit(changes)
+
+    def _on_failed(self, generation: int, error: str):
+        if generation == self._generation:
+            logger.warning("Ignoring invalid settings in %s: %s", self.path, error)
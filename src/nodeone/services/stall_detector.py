@@ -0,0 +1,159 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from typing import Deque, List, NamedTuple, Optional
+from PyQt6.QtCore import QObject, pyqtSignal
+from nodeone.services.telemetry import REGISTRY
+from nodeone.utils.logger import get_logger
+from nodeone.utils.paths import cache_dir
+
+logger = get_logger(__name__)
+
+DEFAULT_THRESHOLD = 0.05
+# Seconds between stack samples while the GUI thread is stalled
+SAMPLE_INTERVAL = 0.005
+# Frames kept from the innermost end of each sampled stack
+MAX_DEPTH = 64
+STALLS_FILE = "stalls.folded"
+
+STALLS = REGISTRY.counter("nodeone_gui_stalls", "GUI event-loop stalls longer than the threshold")
+STALL_SECONDS = REGISTRY.histogram(
+    "nodeone_gui_stall_seconds",
+    "Duration of GUI event-loop stalls",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+
+class Stall(NamedTuple):
+    started: float  # time.time() of the last ping answered before it
+    duration: float
+    samples: int
+    stack: str  # the most sampled stack, collapsed, innermost frame last
+
+
+def collapse(frame, depth: int = MAX_DEPTH) -> str:
+    """Formats a stack as ``outer;...;inner`` with one ``function (file:line)`` per frame."""
+    names: List[str] = []
+    while frame is not None and len(names) < depth:
+        code = frame.f_code
+        filename = os.path.basename(code.co_filename).replace(";", "_")
+        names.append(f"{code.co_name} ({filename}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class StallDetector(QObject):
+    """
+    Watchdog for the GUI event loop.
+
+    A background thread posts a ping to the GUI thread through a queued
+    signal every `threshold` / 2 seconds and waits that long for the
+    answer. While it is late, the thread samples the GUI thread's stack
+    with ``sys._current_frames()`` every SAMPLE_INTERVAL. Once the answer
+    arrives, a stall longer than the threshold is counted in the metrics,
+    logged with its most sampled stack and its samples are added to a
+    collapsed-stack file (``stack count`` per line) that flame graph tools
+    read directly.
+
+    When nothing stalls the cost is two pings per `threshold` seconds.
+    A stall is measured from the last ping answered before it, which is
+    at most half a threshold before the stall began; so every stall
+    longer than the threshold keeps a ping waiting for more than half a
+    threshold and is caught, at a duration up to half a threshold long.
+    """
+
+    _ping = pyqtSignal()
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, path: Optional[str] = None, parent=None):
+        super().__init__(parent)
+        self.threshold = threshold
+        self.path = path or str(cache_dir() / STALLS_FILE)
+        self.stalls: Deque[Stall] = deque(maxlen=100)
+        self.stacks: Counter = Counter()  # collapsed stack -> samples, since start
+        self._main_ident = threading.get_ident()
+        self._pong = threading.Event()
+        self._answered = 0.0  # time.monotonic() of the last answer
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._ping.connect(self._on_ping)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._answered = time.monotonic()
+        self._thread = threading.Thread(target=self._watch, name="stall-detector", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._stop.set()
+        self._pong.set()
+        thread.join(1.0)
+
+    def _on_ping(self):
+        # Runs on the GUI thread
+        self._answered = time.monotonic()
+        self._pong.set()
+
+    # ------------------------------------------------------------------
+    # Watchdog thread
+    # ------------------------------------------------------------------
+    def _watch(self):
+        interval = self.threshold / 2
+        while not self._stop.is_set():
+            self._pong.clear()
+            answered = self._answered
+            sent = time.monotonic()
+            self._ping.emit()
+            if not self._pong.wait(interval):
+                samples = self._sample()
+                if self._stop.is_set():
+                    break
+                duration = self._answered - answered
+                if duration > self.threshold:
+                    self._record(answered, duration, samples)
+            self._stop.wait(max(0.0, sent + interval - time.monotonic()))
+
+    def _sample(self) -> Counter:
+        """Samples the GUI thread's stack until it answers the ping."""
+        samples: Counter = Counter()
+        while True:
+            frame = sys._current_frames().get(self._main_ident)
+            if frame is not None:
+                samples[collapse(frame)] += 1
+            del frame
+            if self._pong.wait(SAMPLE_INTERVAL):
+                return samples
+
+    def _record(self, started: float, duration: float, samples: Counter):
+        STALLS.inc()
+        STALL_SECONDS.observe(duration)
+        stack = samples.most_common(1)[0][0] if samples else ""
+        stall = Stall(time.time() - (time.monotonic() - started), duration, sum(samples.values()), stack)
+        self.stalls.append(stall)
+        logger.warning(
+            "GUI thread stalled for %.0f ms in %s", duration * 1000, stack.rsplit(";", 1)[-1] or "?"
+        )
+        if samples:
+            self.stacks.update(samples)
+            self._write()
+
+    def _write(self):
+        # Stalls are rare; rewriting the aggregate keeps the file free of duplicates
+        tmp = f"{self.path}.tmp"
+        try:
+            with open(tmp, "w") as f:
+                for stack, count in self.stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning("Could not write stall stacks to %s: %s", self.path, e)
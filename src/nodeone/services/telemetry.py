@@ -0,0 +1,317 @@
+import bisect
+import math
+import threading
+import weakref
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from nodeone.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Seconds; suits everything from event dispatch to HTTP requests
+DEFAULT_BUCKETS = (
+    0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+# Observations a thread buffers before folding them into its buckets
+FOLD_BATCH = 512
+
+
+class _ThreadToken:
+    """Kept in a thread-local; collected when its thread exits."""
+
+    __slots__ = ("__weakref__",)
+
+
+def _on_thread_exit(local: threading.local, callback: Callable[..., None], *args):
+    # Thread-local values are released when their thread ends, which
+    # lets the metric fold that thread's cell away
+    token = local.token = _ThreadToken()
+    weakref.finalize(token, callback, *args)
+
+
+class Counter:
+    """
+    Monotonic counter.
+
+    Each thread adds to a cell of its own, reached through a thread-local,
+    so `inc` takes no lock and no update is lost; readers sum the cells.
+    When a thread exits its cell is added to a base value and dropped.
+    """
+
+    __slots__ = ("_local", "_cells", "_base", "_lock")
+    kind = "counter"
+
+    def __init__(self):
+        self._local = threading.local()
+        self._cells: List[List[float]] = []
+        self._base = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        try:
+            self._local.cell[0] += amount
+        except AttributeError:
+            cell = self._local.cell = [amount]
+            with self._lock:
+                self._cells.append(cell)
+            # No closure here: one would make `inc` allocate on every call
+            _on_thread_exit(self._local, self._retire, cell)
+
+    def _retire(self, cell: List[float]):
+        with self._lock:
+            self._cells.remove(cell)
+            self._base += cell[0]
+
+    @property
+    def value(self) -> float:
+        with self._lock:
+            return self._base + sum(cell[0] for cell in self._cells)
+
+    def samples(self, name: str, labels: str) -> Iterator[str]:
+        yield f"{name}_total{labels} {_format(self.value)}"
+
+
+class Gauge:
+    """A value that goes up and down, set directly or read from a function at scrape time."""
+
+    __slots__ = ("_value", "_function")
+    kind = "gauge"
+
+    def __init__(self):
+        self._value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float):
+        # A single attribute store; the last writer wins
+        self._value = value
+
+    def set_function(self, function: Optional[Callable[[], float]]):
+        self._function = function
+
+    @property
+    def value(self) -> float:
+        if self._function is not None:
+            try:
+                return float(self._function())
+            except Exception:
+                logger.debug("Gauge function failed", exc_info=True)
+                return math.nan
+        return self._value
+
+    def samples(self, name: str, labels: str) -> Iterator[str]:
+        yield f"{name}{labels} {_format(self.value)}"
+
+
+class _HistogramCell:
+    """One thread's share of a histogram: folded totals and a pending buffer."""
+
+    __slots__ = ("pending", "cumulative", "sum", "count", "lock")
+
+    def __init__(self, buckets: int):
+        self.pending: List[float] = []
+        self.cumulative = [0] * buckets  # observations <= each bound
+        self.sum = 0.0
+        self.count = 0
+        # Only taken to fold or to read, never per observation
+        self.lock = threading.Lock()
+
+
+class Histogram:
+    """
+    Distribution over fixed bucket bounds.
+
+    `observe` only appends to a buffer owned by the calling thread. Every
+    FOLD_BATCH observations the thread sorts its buffer and counts it into
+    the buckets with one binary search per bound, which costs far less per
+    observation than bucketing each value as it arrives. Readers add the
+    unfolded buffers in, so nothing recorded is missing from a scrape.
+    The cell of a thread that exits is folded into a base cell and dropped.
+    """
+
+    __slots__ = ("bounds", "_local", "_cells", "_base", "_lock")
+    kind = "histogram"
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.bounds = tuple(sorted(buckets))
+        self._local = threading.local()
+        self._cells: List[_HistogramCell] = []
+        self._base = _HistogramCell(len(self.bounds))
+        # Guards the list of cells and the base; never taken per observation
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        try:
+            pending = self._local.pending
+        except AttributeError:
+            cell = _HistogramCell(len(self.bounds))
+            with self._lock:
+                self._cells.append(cell)
+            self._local.cell = cell
+            pending = self._local.pending = cell.pending
+            _on_thread_exit(self._local, self._retire, cell)
+        pending.append(value)
+        if len(pending) >= FOLD_BATCH:
+            self._fold(self._local.cell)
+
+    def _retire(self, cell: _HistogramCell):
+        self._fold(cell)
+        with self._lock:
+            self._cells.remove(cell)
+            base = self._base
+            for i, n in enumerate(cell.cumulative):
+                base.cumulative[i] += n
+            base.sum += cell.sum
+            base.count += cell.count
+
+    def _fold(self, cell: _HistogramCell):
+        with cell.lock:
+            self._count_into(cell.cumulative, cell.pending)
+            cell.sum += math.fsum(cell.pending)
+            cell.count += len(cell.pending)
+            cell.pending.clear()
+
+    def _count_into(self, cumulative: List[int], values: List[float]):
+        ordered = sorted(values)
+        for i, bound in enumerate(self.bounds):
+            cumulative[i] += bisect.bisect_right(ordered, bound)
+
+    def snapshot(self) -> Tuple[List[int], float, int]:
+        """Returns (cumulative count per bound, sum, count) across all threads."""
+        with self._lock:
+            cumulative = list(self._base.cumulative)
+            total, count = self._base.sum, self._base.count
+            for cell in self._cells:
+                with cell.lock:
+                    pending = list(cell.pending)
+                    for i, n in enumerate(cell.cumulative):
+                        cumulative[i] += n
+                    total += cell.sum
+                    count += cell.count
+                self._count_into(cumulative, pending)
+                total += math.fsum(pending)
+                count += len(pending)
+        return cumulative, total, count
+
+    def samples(self, name: str, labels: str) -> Iterator[str]:
+        cumulative, total, count = self.snapshot()
+        inner = labels[1:-1] + "," if labels else ""
+        for bound, n in zip(self.bounds + (math.inf,), cumulative + [count]):
+            yield f'{name}_bucket{{{inner}le="{_format(bound)}"}} {n}'
+        yield f"{name}_sum{labels} {_format(total)}"
+        yield f"{name}_count{labels} {count}"
+
+
+Metric = Union[Counter, Gauge, Histogram]
+
+
+class MetricFamily:
+    """
+    A named metric, optionally split by labels.
+
+    Without label names the family records directly (`inc`, `set`,
+    `observe` are forwarded). With label names, `labels(...)` returns the
+    child for those values; children are created once and cached, so
+    callers may keep them.
+    """
+
+    def __init__(self, name: str, help: str, factory: Callable[[], Metric], labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._factory = factory
+        self._children: Dict[object, Metric] = {}
+        self._lock = threading.Lock()
+        self.kind = factory().kind
+        if not self.labelnames:
+            self._unlabelled = self._children[()] = factory()
+            # Bind the recording method straight to the metric
+            for method in ("inc", "set", "set_function", "observe"):
+                if hasattr(self._unlabelled, method):
+                    setattr(self, method, getattr(self._unlabelled, method))
+
+    def labels(self, *values) -> Metric:
+        # One label is looked up by its value, several by their tuple
+        key = values[0] if len(values) == 1 else values
+        child = self._children.get(key)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            with self._lock:
+                child = self._children.setdefault(key, self._factory())
+        return child
+
+    @property
+    def value(self) -> float:
+        return self._unlabelled.value
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for key, child in sorted(list(self._children.items()), key=lambda item: str(item[0])):
+            values = (key,) if len(self.labelnames) == 1 else key
+            labels = ",".join(f'{n}="{_escape(str(v))}"' for n, v in zip(self.labelnames, values))
+            yield from child.samples(self.name, f"{{{labels}}}" if labels else "")
+
+
+class MetricsRegistry:
+    """
+    Collection of the application's internal metrics.
+
+    Metrics are created on first request and returned from then on, so a
+    module can declare the metrics it records at import time.
+    """
+
+    def __init__(self):
+        self._families: Dict[str, MetricFamily] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> MetricFamily:
+        return self._family(name, help, Counter, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> MetricFamily:
+        return self._family(name, help, Gauge, labelnames)
+
+    def histogram(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> MetricFamily:
+        return self._family(name, help, lambda: Histogram(buckets), labelnames)
+
+    def get(self, name: str) -> Optional[MetricFamily]:
+        return self._families.get(name)
+
+    def render(self) -> str:
+        """Returns every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for name in sorted(self._families):
+            lines.extend(self._families[name].render())
+        return "\n".join(lines) + "\n"
+
+    def _family(self, name, help, factory, labelnames) -> MetricFamily:
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = self._families[name] = MetricFamily(name, help, factory, labelnames)
+            return family
+
+
+REGISTRY = MetricsRegistry()
+
+# Shared by the services that queue work
+WORKER_QUEUE_DEPTH = REGISTRY.gauge(
+    "nodeone_worker_queue_depth", "Work items queued or in flight", ["queue"]
+)
+
+
+def _format(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value != value:
+        return "NaN"
+    if float(value).is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
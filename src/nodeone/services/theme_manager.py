@@ -1,16 +1,157 @@
+import json
+import re
+from importlib import resources
+from typing import Dict, List, NamedTuple, Optional
+from PyQt6.QtGui import QColor, QPalette
+from PyQt6.QtWidgets import QWidget
+from nodeone.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+THEMES_PACKAGE = "nodeone"
+THEMES_DIR = ("resources", "themes")
+TEMPLATE = "base.qss"
+
+# Theme palette tokens and the QPalette roles they set
+PALETTE_ROLES = {
+    "window": QPalette.ColorRole.Window,
+    "window_text": QPalette.ColorRole.WindowText,
+    "base": QPalette.ColorRole.Base,
+    "alternate_base": QPalette.ColorRole.AlternateBase,
+    "text": QPalette.ColorRole.Text,
+    "button": QPalette.ColorRole.Button,
+    "button_text": QPalette.ColorRole.ButtonText,
+    "highlight": QPalette.ColorRole.Highlight,
+    "highlighted_text": QPalette.ColorRole.HighlightedText,
+    "tool_tip_base": QPalette.ColorRole.ToolTipBase,
+    "tool_tip_text": QPalette.ColorRole.ToolTipText,
+    "placeholder_text": QPalette.ColorRole.PlaceholderText,
+    "link": QPalette.ColorRole.Link,
+}
+
+# Widget style used with themes; it draws everything from the QPalette
+STYLE = "Fusion"
+
+_REFERENCE = re.compile(r"@([A-Za-z_][A-Za-z0-9_]*)")
+_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+
+
+class CompiledTheme(NamedTuple):
+    name: str
+    stylesheet: str
+    palette: QPalette
+    tokens: Dict[str, str]
+
+
+def _themes_dir():
+    return resources.files(THEMES_PACKAGE).joinpath(*THEMES_DIR)
+
+
+def _resolve(tokens: Dict[str, str]) -> Dict[str, str]:
+    """Expands `@name` references between tokens; rejects cycles."""
+    resolved: Dict[str, str] = {}
+
+    def value_of(name: str, chain: tuple) -> str:
+        if name in resolved:
+            return resolved[name]
+        if name in chain:
+            raise ValueError(f"Theme variable cycle: {' -> '.join(chain + (name,))}")
+        if name not in tokens:
+            raise KeyError(f"Unknown theme variable @{name}")
+        value = _REFERENCE.sub(lambda m: value_of(m.group(1), chain + (name,)), tokens[name])
+        resolved[name] = value
+        return value
+
+    for name in tokens:
+        value_of(name, ())
+    return resolved
+
+
+def compile_theme(name: str, definition: dict, template: str) -> CompiledTheme:
+    """Substitutes the theme's tokens into `template` and builds its QPalette."""
+    palette_tokens = definition.get("palette", {})
+    tokens = _resolve({**palette_tokens, **definition.get("variables", {})})
+
+    def substitute(match: re.Match) -> str:
+        try:
+            return tokens[match.group(1)]
+        except KeyError:
+            raise KeyError(f"Theme {name!r} does not define @{match.group(1)}") from None
+
+    # Derive bevel and disabled colors from the button and window colors,
+    # then override the active and inactive groups with the theme's tokens
+    palette = QPalette(
+        QColor(tokens.get("button", "#e1e1e1")), QColor(tokens.get("window", "#f0f0f0"))
+    )
+    for token in palette_tokens:
+        role = PALETTE_ROLES.get(token)
+        if role is None:
+            logger.warning("Theme %s: unknown palette token %s", name, token)
+            continue
+        for group in (QPalette.ColorGroup.Active, QPalette.ColorGroup.Inactive):
+            palette.setColor(group, role, QColor(tokens[token]))
+    stylesheet = _REFERENCE.sub(substitute, _COMMENT.sub("", template))
+    return CompiledTheme(name, stylesheet, palette, tokens)
+
+
+def set_style_property(widget: QWidget, name: str, value) -> bool:
+    """
+    Sets a dynamic property used by stylesheet selectors and re-polishes
+    only `widget`. Returns False when the value did not change.
+    """
+    if widget.property(name) == value:
+        return False
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    widget.update()
+    return True
+
+
 class ThemeManager:
+    """
+    Loads themes from package resources and applies them.
+
+    A theme is a JSON file of palette tokens and variables; all themes share
+    the `base.qss` template. Each theme is compiled once into a stylesheet
+    and a QPalette. Colors travel through the palette, which reaches every
+    widget as a repaint; the stylesheet, whose replacement re-polishes the
+    whole widget tree, is only set when its compiled text differs.
+    """
+
     def __init__(self):
-        theme_path = "src/nodeone/resources/themes"
-        self.themes = {
-            "dark": f"{theme_path}/dark.qss",
-            "light": f"{theme_path}/light.qss",
-        }
         self.current_theme = "dark"
+        self._template: Optional[str] = None
+        self._compiled: Dict[str, CompiledTheme] = {}
+
+    @property
+    def themes(self) -> List[str]:
+        return sorted(
+            entry.name[:-5] for entry in _themes_dir().iterdir() if entry.name.endswith(".json")
+        )
+
+    def compiled(self, theme_name: str) -> CompiledTheme:
+        theme = self._compiled.get(theme_name)
+        if theme is None:
+            if self._template is None:
+                self._template = _themes_dir().joinpath(TEMPLATE).read_text(encoding="utf-8")
+            definition = json.loads(
+                _themes_dir().joinpath(f"{theme_name}.json").read_text(encoding="utf-8")
+            )
+            theme = compile_theme(theme_name, definition, self._template)
+            self._compiled[theme_name] = theme
+        return theme
 
     def apply_theme(self, app, theme_name=None):
         if not theme_name:
             theme_name = self.current_theme
-        if theme_name in self.themes:
-            with open(self.themes[theme_name], "r") as f:
-                app.setStyleSheet(f.read())
-            self.current_theme = theme_name
+        try:
+            theme = self.compiled(theme_name)
+        except FileNotFoundError:
+            logger.warning("Unknown theme %s", theme_name)
+            return
+        if app.styleSheet() != theme.stylesheet:
+            app.setStyleSheet(theme.stylesheet)
+        app.setPalette(theme.palette)
+        self.current_theme = theme_name
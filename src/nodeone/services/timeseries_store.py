@@ -0,0 +1,297 @@
+import mmap
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Mapping, NamedTuple, Optional, Tuple
+import numpy as np
+from nodeone.utils.logger import get_logger
+from nodeone.utils.paths import data_dir
+
+logger = get_logger(__name__)
+
+MAGIC = b"N1TS"
+FORMAT_VERSION = 1
+
+HEADER_DTYPE = np.dtype([
+    ("magic", "S4"),
+    ("version", "<u2"),
+    ("tier", "<u2"),
+    ("capacity", "<u8"),
+    ("head", "<u8"),
+    ("count", "<u8"),
+    ("bucket", "<f8"),
+])
+HEADER_SIZE = 64
+
+RAW_DTYPE = np.dtype([("t", "<f8"), ("v", "<f8")])
+ROLLUP_DTYPE = np.dtype([
+    ("t", "<f8"), ("min", "<f8"), ("max", "<f8"), ("avg", "<f8"), ("n", "<f8"),
+])
+
+
+class Tier(NamedTuple):
+    name: str
+    bucket: float  # seconds per record, 0 for raw samples
+    capacity: int  # records kept before the ring wraps
+
+
+# raw at 1 Hz for a day, 1-minute rollups for a week, 1-hour rollups for 90 days
+DEFAULT_TIERS: Tuple[Tier, ...] = (
+    Tier("raw", 0, 86_400),
+    Tier("1m", 60, 10_080),
+    Tier("1h", 3600, 2_160),
+)
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9._-]")
+
+
+class RingFile:
+    """
+    A fixed-size ring of fixed-width records in a memory-mapped file.
+
+    Records are appended in time order; once the ring is full the oldest
+    record is overwritten. The header keeps the write position, so a
+    reopened file continues where it left off.
+    """
+
+    def __init__(self, path: Path, dtype: np.dtype, capacity: int, tier: int = 0, bucket: float = 0.0):
+        self.path = path
+        self.dtype = dtype
+        size = HEADER_SIZE + capacity * dtype.itemsize
+        fresh = not path.exists() or path.stat().st_size < HEADER_SIZE
+
+        with open(path, "a+b") as f:
+            if fresh:
+                f.truncate(size)
+            self._mm = mmap.mmap(f.fileno(), 0)
+
+        self._header = np.ndarray((), HEADER_DTYPE, buffer=self._mm)
+        if fresh:
+            self._header["magic"] = MAGIC
+            self._header["version"] = FORMAT_VERSION
+            self._header["tier"] = tier
+            self._header["capacity"] = capacity
+            self._header["bucket"] = bucket
+        elif self._header["magic"] != MAGIC or self._header["version"] != FORMAT_VERSION:
+            self._mm.close()
+            raise ValueError(f"{path} is not a NodeOne time-series file")
+
+        # An existing file keeps the capacity it was created with
+        self.capacity = int(self._header["capacity"])
+        self.records = np.ndarray(
+            (self.capacity,), dtype, buffer=self._mm, offset=HEADER_SIZE
+        )
+
+    def __len__(self) -> int:
+        return int(self._header["count"])
+
+    def append(self, record: tuple):
+        head = int(self._header["head"])
+        self.records[head] = record
+        self._header["head"] = (head + 1) % self.capacity
+        if self._header["count"] < self.capacity:
+            self._header["count"] += 1
+
+    def last(self) -> Optional[np.void]:
+        if not len(self):
+            return None
+        return self.records[(int(self._header["head"]) - 1) % self.capacity]
+
+    def segments(self) -> Tuple[np.ndarray, ...]:
+        """Returns the stored records oldest-first as one or two views."""
+        count, head = len(self), int(self._header["head"])
+        if count < self.capacity:
+            return (self.records[:count],)
+        if head == 0:
+            return (self.records,)
+        return (self.records[head:], self.records[:head])
+
+    def query(self, start: float, end: float) -> np.ndarray:
+        """
+        Returns the records with ``start <= t < end``.
+
+        The result is a view into the mapped file unless the range straddles
+        the ring's wrap point, in which case the two parts are concatenated.
+        """
+        parts = []
+        for segment in self.segments():
+            times = segment["t"]
+            lo = np.searchsorted(times, start, side="left")
+            hi = np.searchsorted(times, end, side="left")
+            if hi > lo:
+                parts.append(segment[lo:hi])
+        if not parts:
+            return self.records[:0]
+        if len(parts) == 1:
+            return parts[0]
+        return np.concatenate(parts)
+
+    def flush(self):
+        self._mm.flush()
+
+    def close(self):
+        self._header = None
+        self.records = None
+        try:
+            self._mm.close()
+        except BufferError:
+            # Views returned by query() are still alive; the map is released with them
+            pass
+
+
+class _Accumulator:
+    __slots__ = ("bucket", "min", "max", "sum", "n")
+
+    def __init__(self):
+        self.reset(None)
+
+    def reset(self, bucket: Optional[float]):
+        self.bucket = bucket
+        self.min = self.max = self.sum = 0.0
+        self.n = 0
+
+    def add(self, value: float):
+        if self.n == 0:
+            self.min = self.max = value
+        else:
+            self.min = min(self.min, value)
+            self.max = max(self.max, value)
+        self.sum += value
+        self.n += 1
+
+    def record(self) -> tuple:
+        return (self.bucket, self.min, self.max, self.sum / self.n, self.n)
+
+
+class Series:
+    """One metric of one node: a raw ring plus its rollup rings."""
+
+    def __init__(self, directory: Path, metric: str, tiers: Tuple[Tier, ...]):
+        self.tiers = tiers
+        self.rings: Dict[str, RingFile] = {}
+        for i, tier in enumerate(tiers):
+            dtype = RAW_DTYPE if tier.bucket == 0 else ROLLUP_DTYPE
+            path = directory / f"{metric}.{tier.name}.ring"
+            self.rings[tier.name] = RingFile(path, dtype, tier.capacity, i, tier.bucket)
+        self._lock = threading.Lock()
+        self._accumulators = {t.name: _Accumulator() for t in tiers if t.bucket}
+        self._restore_accumulators()
+
+    def append(self, t: float, value: float):
+        with self._lock:
+            for tier in self.tiers:
+                if tier.bucket == 0:
+                    self.rings[tier.name].append((t, value))
+                    continue
+                acc = self._accumulators[tier.name]
+                bucket = t - (t % tier.bucket)
+                if acc.bucket != bucket:
+                    if acc.n:
+                        self.rings[tier.name].append(acc.record())
+                    acc.reset(bucket)
+                acc.add(value)
+
+    def query(self, start: float, end: float, tier: str) -> np.ndarray:
+        with self._lock:
+            return self.rings[tier].query(start, end)
+
+    def _restore_accumulators(self):
+        # Rebuild the open rollup buckets from raw samples written after them
+        raw = next((t for t in self.tiers if t.bucket == 0), None)
+        if raw is None:
+            return
+        last = self.rings[raw.name].last()
+        if last is None:
+            return
+        for tier in self.tiers:
+            if not tier.bucket:
+                continue
+            acc = self._accumulators[tier.name]
+            acc.bucket = float(last["t"]) - (float(last["t"]) % tier.bucket)
+            samples = self.rings[raw.name].query(acc.bucket, float("inf"))
+            for value in samples["v"]:
+                acc.add(float(value))
+
+    def flush(self):
+        for ring in self.rings.values():
+            ring.flush()
+
+    def close(self):
+        for ring in self.rings.values():
+            ring.close()
+
+
+class TimeSeriesStore:
+    """
+    Disk-backed metric history, one set of ring files per node and metric.
+
+    Raw samples are rolled up into 1-minute and 1-hour min/max/avg tiers as
+    they arrive. Range queries return NumPy record arrays that are views
+    onto the memory-mapped files, so reading history does not copy it into
+    the Python heap. Views see later writes once the ring wraps; copy them
+    to keep them.
+    """
+
+    def __init__(self, root: Optional[str] = None, tiers: Tuple[Tier, ...] = DEFAULT_TIERS):
+        self.root = Path(root) if root else data_dir() / "timeseries"
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.tiers = tiers
+        self._series: Dict[Tuple[str, str], Series] = {}
+        self._lock = threading.Lock()
+
+    def series(self, node: str, metric: str) -> Series:
+        key = (node, metric)
+        series = self._series.get(key)
+        if series is None:
+            with self._lock:
+                series = self._series.get(key)
+                if series is None:
+                    directory = self.root / _UNSAFE.sub("_", node)
+                    directory.mkdir(exist_ok=True)
+                    series = Series(directory, _UNSAFE.sub("_", metric), self.tiers)
+                    self._series[key] = series
+        return series
+
+    def append(self, node: str, metric: str, t: float, value: float):
+        self.series(node, metric).append(t, value)
+
+    def append_many(self, node: str, t: float, values: Mapping[str, float]):
+        for metric, value in values.items():
+            self.series(node, metric).append(t, value)
+
+    def query(self, node: str, metric: str, start: float, end: float,
+              tier: Optional[str] = None) -> np.ndarray:
+        """
+        Returns records for ``start <= t < end``.
+
+        Without an explicit `tier`, the finest tier that still covers
+        `start` is used.
+        """
+        series = self.series(node, metric)
+        if tier is None:
+            tier = self._pick_tier(series, start)
+        return series.query(start, end, tier)
+
+    def _pick_tier(self, series: Series, start: float) -> str:
+        best, oldest = self.tiers[0].name, float("inf")
+        for tier in self.tiers:
+            first = series.rings[tier.name].segments()[0]
+            if not first.size:
+                continue
+            t0 = float(first["t"][0])
+            if t0 <= start:
+                return tier.name
+            if t0 < oldest:
+                best, oldest = tier.name, t0
+        # Nothing reaches back far enough; use the tier with the longest reach
+        return best
+
+    def flush(self):
+        for series in list(self._series.values()):
+            series.flush()
+
+    def close(self):
+        with self._lock:
+            for series in self._series.values():
+                series.close()
+            self._series.clear()
@@ -0,0 +1,25 @@
+from typing import Tuple
+import numpy as np
+
+
+def column_minmax(
+    t: np.ndarray, y: np.ndarray, t0: float, width: float, columns: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Reduces a series to the minimum and maximum of each pixel column.
+
+    Column ``c`` covers ``t0 + c * width <= t < t0 + (c + 1) * width``;
+    `t` must be sorted. Returns ``(columns, mins, maxs)`` for the columns
+    that hold at least one sample. Only the column edges are looked up in
+    `t`, so the cost is one pass over the samples inside the range plus
+    ``columns * log(len(t))``, however many samples lie outside it.
+    """
+    edges = np.searchsorted(t, t0 + width * np.arange(columns + 1))
+    first, last = edges[0], edges[-1]
+    if first == last:
+        empty = np.empty(0)
+        return np.empty(0, dtype=np.int64), empty, empty
+    filled = np.flatnonzero(edges[1:] > edges[:-1])
+    starts = edges[filled] - first
+    values = y[first:last]
+    return filled, np.minimum.reduceat(values, starts), np.maximum.reduceat(values, starts)
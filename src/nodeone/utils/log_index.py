@@ -0,0 +1,166 @@
+import mmap
+import os
+import re
+from typing import Iterable, Optional, Union
+import numpy as np
+from nodeone.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Line-end offsets are kept in a growable int64 buffer starting at this size
+_INITIAL_CAPACITY = 4096
+# Bytes scanned for newlines at a time, bounding the temporary arrays
+_SCAN_CHUNK = 8 * 1024 * 1024
+
+
+class LogFileIndex:
+    """
+    Line index over a log file that is read through a memory map.
+
+    Only the offsets of line ends are kept in memory (8 bytes per line);
+    line text is sliced from the map on demand, so the page cache rather
+    than the process holds the file. `refresh` indexes whatever has been
+    appended since the last call, and starts over when the file was
+    truncated or replaced by rotation. A trailing line without its newline
+    is not indexed until the writer finishes it.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._map: Optional[mmap.mmap] = None
+        self._identity = None
+        self._ends = np.empty(_INITIAL_CAPACITY, dtype=np.int64)
+        self._count = 0
+        self._indexed = 0  # bytes covered by complete lines
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self):
+        self._map = None
+        self._identity = None
+        self._count = 0
+        self._indexed = 0
+
+    def refresh(self) -> bool:
+        """
+        Indexes newly appended lines. Returns True when the index was
+        rebuilt from scratch because the file was truncated or rotated.
+        """
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            rebuilt = self._count > 0
+            self.close()
+            return rebuilt
+
+        identity = (stat.st_dev, stat.st_ino)
+        rebuilt = False
+        if identity != self._identity or stat.st_size < self._indexed:
+            rebuilt = self._count > 0
+            self.close()
+            self._identity = identity
+        if stat.st_size == self._indexed or stat.st_size == 0:
+            return rebuilt
+
+        # A map has a fixed length; map the file again to see appended data.
+        # The old map is only dropped, never closed, as a filter running on
+        # another thread may still be reading it.
+        try:
+            with open(self.path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            logger.warning("Could not map log file %s: %s", self.path, e)
+            return rebuilt
+
+        size = len(self._map)
+        for offset in range(self._indexed, size, _SCAN_CHUNK):
+            chunk = np.frombuffer(self._map, dtype=np.uint8, count=min(_SCAN_CHUNK, size - offset), offset=offset)
+            ends = np.flatnonzero(chunk == 10) + (offset + 1)
+            del chunk  # release the buffer export before the map may be dropped
+            if len(ends):
+                self._append(ends)
+                self._indexed = int(ends[-1])
+        return rebuilt
+
+    def _append(self, ends: np.ndarray):
+        needed = self._count + len(ends)
+        if needed > len(self._ends):
+            # Grow into a new buffer; views handed out earlier keep the old one
+            grown = np.empty(max(needed, 2 * len(self._ends)), dtype=np.int64)
+            grown[: self._count] = self._ends[: self._count]
+            self._ends = grown
+        self._ends[self._count : needed] = ends
+        self._count = needed
+
+    def line(self, i: int) -> bytes:
+        """Returns line `i` without its line ending."""
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        start = int(self._ends[i - 1]) if i else 0
+        end = int(self._ends[i]) - 1
+        if end > start and self._map[end - 1] == 13:
+            end -= 1
+        return self._map[start:end]
+
+    def search(
+        self,
+        patterns: Iterable[Union[bytes, "re.Pattern[bytes]"]],
+        first: int = 0,
+        last: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Returns the numbers of lines in [first, last) matching every pattern.
+
+        Each pattern is a regex over the raw bytes of the file; it is run
+        against the map directly, and match offsets are turned into line
+        numbers with a binary search over the index. Safe to call from a
+        worker thread while the GUI thread refreshes the index.
+        """
+        data, ends = self._map, self._ends[: self._count]
+        last = len(ends) if last is None else min(last, len(ends))
+        if data is None or first >= last:
+            return np.empty(0, dtype=np.int64)
+
+        lines: Optional[np.ndarray] = None
+        for pattern in patterns:
+            found = _search_lines(_compile(pattern), data, ends, first, last)
+            if lines is None:
+                lines = found
+            else:
+                hit = np.zeros(last - first, dtype=bool)
+                hit[found - first] = True
+                lines = lines[hit[lines - first]]
+            if not len(lines):
+                break
+        if lines is None:
+            return np.arange(first, last, dtype=np.int64)
+        return lines
+
+
+def _compile(pattern) -> "re.Pattern[bytes]":
+    return pattern if isinstance(pattern, re.Pattern) else re.compile(pattern)
+
+
+def _search_lines(pattern: "re.Pattern[bytes]", data, ends: np.ndarray, first: int, last: int) -> np.ndarray:
+    pos = int(ends[first - 1]) if first else 0
+    stop = int(ends[last - 1])
+    starts = [m.start() for m in pattern.finditer(data, pos, stop)]
+    if not starts:
+        return np.empty(0, dtype=np.int64)
+    lines = np.searchsorted(ends, np.array(starts, dtype=np.int64), side="right")
+    # Hits come in file order; several on one line count once
+    keep = np.empty(len(lines), dtype=bool)
+    keep[0] = True
+    np.not_equal(lines[1:], lines[:-1], out=keep[1:])
+    return lines[keep]
+
+
+def level_pattern(level: str) -> bytes:
+    """Pattern matching JSON log lines written at `level`."""
+    return rb'"level":\s*"' + re.escape(level.upper().encode()) + b'"'
+
+
+def text_pattern(text: str) -> "re.Pattern[bytes]":
+    """Pattern for a literal substring of a line, ignoring ASCII case."""
+    return re.compile(re.escape(text.encode("utf-8")), re.IGNORECASE)
@@ -1,21 +1,167 @@
+import atexit
+import json
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Callable, Dict, Optional
+from nodeone.utils.paths import data_dir
 
 # Define default configuration constants
 LOG_LEVEL_DEFAULT = os.environ.get("LOG_LEVEL", "info").upper()
-LOG_FILE_ENABLED = os.environ.get("LOG_FILE_ENABLED", "false").lower() in ('true', 'yes', '1')
-LOG_FILE_PATH = os.environ.get("LOG_FILE_PATH", "application.log")
+LOG_FILE_ENABLED = os.environ.get("LOG_FILE_ENABLED", "true").lower() in ('true', 'yes', '1')
+LOG_FILE_PATH = os.environ.get("LOG_FILE_PATH")  # default: <data dir>/nodeone.log.jsonl
 MAX_BYTES = 10 * 1024 * 1024  # 10 MB
 BACKUP_COUNT = 5
 
+# Per-logger token bucket: sustained records per second and burst size
+RATE_LIMIT = float(os.environ.get("LOG_RATE_LIMIT", "50"))
+RATE_BURST = int(os.environ.get("LOG_RATE_BURST", "200"))
+# Identical consecutive records within this many seconds are collapsed
+DEDUP_WINDOW = 5.0
+
+_listener: Optional[QueueListener] = None
+
+
+def log_file_path() -> str:
+    """Returns the JSONL log file written when file logging is enabled."""
+    if LOG_FILE_PATH:
+        return LOG_FILE_PATH
+    return str(data_dir() / "nodeone.log.jsonl")
+
+
+class Lazy:
+    """
+    Defers building a log payload until a handler actually formats it.
+
+    ``logger.debug("payload: %s", Lazy(json.dumps, data))`` costs nothing
+    when DEBUG is disabled, and otherwise runs `json.dumps` on the logging
+    thread rather than the caller's.
+    """
+
+    __slots__ = ("fn", "args")
+
+    def __init__(self, fn: Callable[..., Any], *args: Any):
+        self.fn = fn
+        self.args = args
+
+    def __str__(self) -> str:
+        return str(self.fn(*self.args))
+
+    __repr__ = __str__
+
+
+class JsonFormatter(logging.Formatter):
+    """One compact JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "thread": record.threadName,
+        }
+        for key in ("repeated", "rate_limited"):
+            value = getattr(record, key, 0)
+            if value:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket per logger name. Records over the limit are dropped; the
+    next record let through carries the number dropped as `rate_limited`.
+    """
+
+    def __init__(self, rate: float = RATE_LIMIT, burst: int = RATE_BURST):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[str, list] = {}  # name -> [tokens, last refill, dropped]
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(record.name)
+            if bucket is None:
+                bucket = self._buckets[record.name] = [float(self.burst), now, 0]
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if bucket[0] < 1.0:
+                bucket[2] += 1
+                return False
+            bucket[0] -= 1.0
+            if bucket[2]:
+                record.rate_limited = bucket[2]
+                bucket[2] = 0
+        return True
+
+
+class DedupFilter(logging.Filter):
+    """
+    Drops a record identical to the previous one from the same logger
+    (same level, call site, message template and arguments) within
+    `window` seconds. The next different record carries the number of
+    repeats dropped as `repeated`. Records with unhashable arguments are
+    never dropped, since comparing them would mean formatting them here.
+    """
+
+    def __init__(self, window: float = DEDUP_WINDOW):
+        super().__init__()
+        self.window = window
+        self._last: Dict[str, list] = {}  # name -> [key, first seen, repeats]
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key: Optional[tuple] = (record.levelno, record.pathname, record.lineno, record.msg, record.args)
+        try:
+            hash(key)
+        except TypeError:
+            # Unhashable arguments (dicts, lists) match nothing
+            key = None
+        now = time.monotonic()
+        with self._lock:
+            last = self._last.get(record.name)
+            if last is not None and key is not None and last[0] == key and now - last[1] < self.window:
+                last[2] += 1
+                return False
+            if last is not None and last[2]:
+                record.repeated = last[2]
+            self._last[record.name] = [key, now, 0]
+        return True
+
+
+class _LazyQueueHandler(QueueHandler):
+    """
+    Enqueues records as they are, without formatting them first.
+
+    The stock QueueHandler renders the message in the calling thread so the
+    record can be pickled; an in-process queue does not need that, so the
+    message and its arguments are only formatted by the listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
 def setup_logging():
     """
     Sets up the root logger configuration for the application.
 
-    This function configures a console handler and a rotating file handler.
-    It should be called once at the start of the application.
+    Log calls only run the filters and enqueue the record; a background
+    listener thread formats it and writes to the console and, unless
+    disabled, to a rotating JSONL file. It should be called once at the
+    start of the application; importing this module does not configure
+    logging by itself.
     """
+    global _listener
     root_logger = logging.getLogger()
     root_logger.setLevel(LOG_LEVEL_DEFAULT)
 
@@ -30,37 +176,61 @@ def setup_logging():
     # Setup Console Handler (for development/monitoring)
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+    handlers = [console_handler]
 
+    file_error = None
     if LOG_FILE_ENABLED:
         try:
             file_handler = RotatingFileHandler(
-                LOG_FILE_PATH,
+                log_file_path(),
                 maxBytes=MAX_BYTES,
-                backupCount=BACKUP_COUNT
+                backupCount=BACKUP_COUNT,
+                encoding="utf-8",
             )
-            file_handler.setFormatter(formatter)
-            root_logger.addHandler(file_handler)
+            file_handler.setFormatter(JsonFormatter())
+            handlers.append(file_handler)
         except IOError as e:
-            # Log to console if we can't write to the file system (e.g., permissions error)
-            logging.error(f"Failed to set up file logger: {e}")
-    else:
+            file_error = e
+
+    records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = _LazyQueueHandler(records)
+    queue_handler.addFilter(DedupFilter())
+    queue_handler.addFilter(RateLimitFilter())
+    root_logger.addHandler(queue_handler)
+
+    _listener = QueueListener(records, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+    if file_error is not None:
+        # Log to console if we can't write to the file system (e.g., permissions error)
+        logging.error("Failed to set up file logger: %s", file_error)
+    elif not LOG_FILE_ENABLED:
         logging.info("File logging is disabled via configuration.")
 
+
+def shutdown_logging():
+    """Flushes queued records and stops the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Provides a standardized way for other modules to get their specific logger.
     """
     return logging.getLogger(name)
 
-# Call setup automatically when the module is imported
-setup_logging()
-
 # Example of using the logger from within this module
 if __name__ == "__main__":
     # This block runs only when you execute logger.py directly
+    setup_logging()
     logger = get_logger(__name__)
     logger.info("Logger system initialized and tested.")
-    logger.debug(f"Default log level set to: {LOG_LEVEL_DEFAULT}")
+    logger.debug("Default log level set to: %s", LOG_LEVEL_DEFAULT)
     logger.warning("This is a warning message.")
     logger.error("This is an error message.")
@@ -0,0 +1,98 @@
+from typing import Iterable, List, Union
+import numpy as np
+
+# Line bytes are packed into chunks of this size; a line never spans two
+CHUNK_SIZE = 1024 * 1024
+# Longer lines are cut, so any line fits in a chunk
+MAX_LINE = 64 * 1024
+_INITIAL_CAPACITY = 4096
+
+
+class OutputBuffer:
+    """
+    Append-only store for lines of command output from many nodes.
+
+    Line bytes are packed into fixed-size bytearray chunks, and three
+    arrays index them: where each line starts (as an offset into the
+    concatenated chunks), its length and the node it came from. A line
+    costs its bytes plus 16 bytes of index, with no Python object kept
+    per line, so millions of lines stay cheap; `line` slices one out on
+    demand. Appending is not synchronized with reading: use one thread.
+    """
+
+    def __init__(self, chunk_size: int = CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.max_line = min(MAX_LINE, chunk_size)
+        self._chunks: List[bytearray] = [bytearray()]
+        self._starts = np.empty(_INITIAL_CAPACITY, dtype=np.int64)
+        self._lengths = np.empty(_INITIAL_CAPACITY, dtype=np.int32)
+        self._nodes = np.empty(_INITIAL_CAPACITY, dtype=np.int32)
+        self._count = 0
+        self.nbytes = 0  # line bytes stored
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, node: Union[int, np.ndarray], lines: Iterable[bytes]):
+        """
+        Adds `lines` (without line endings) from node number `node`, or
+        from the node numbers in an array with one per line.
+        """
+        lines = lines if isinstance(lines, list) else list(lines)
+        if not lines:
+            return
+        chunk = self._chunks[-1]
+        base = (len(self._chunks) - 1) * self.chunk_size
+        lengths = np.fromiter(map(len, lines), dtype=np.int64, count=len(lines))
+        total = int(lengths.sum())
+        if len(chunk) + total <= self.chunk_size and lengths.max() <= self.max_line:
+            # Usual case: the whole batch fits the current chunk
+            starts = np.cumsum(lengths) - lengths + (base + len(chunk))
+            chunk += b"".join(lines)
+            self._index(node, starts, lengths)
+            return
+        starts, lengths = [], []
+        for line in lines:
+            if len(line) > self.max_line:
+                line = line[: self.max_line]
+            if len(chunk) + len(line) > self.chunk_size:
+                chunk = bytearray()
+                self._chunks.append(chunk)
+                base += self.chunk_size
+            starts.append(base + len(chunk))
+            lengths.append(len(line))
+            chunk += line
+        self._index(node, starts, lengths)
+
+    def _index(self, node, starts, lengths):
+        count = self._count
+        needed = count + len(starts)
+        if needed > len(self._starts):
+            self._grow(max(needed, 2 * len(self._starts)))
+        self._starts[count:needed] = starts
+        self._lengths[count:needed] = lengths
+        self._nodes[count:needed] = node
+        self._count = needed
+        self.nbytes += int(np.sum(lengths))
+
+    def _grow(self, capacity: int):
+        for name in ("_starts", "_lengths", "_nodes"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[: self._count] = old[: self._count]
+            setattr(self, name, new)
+
+    def line(self, i: int) -> bytes:
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        chunk, start = divmod(int(self._starts[i]), self.chunk_size)
+        return bytes(self._chunks[chunk][start : start + int(self._lengths[i])])
+
+    def node(self, i: int) -> int:
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        return int(self._nodes[i])
+
+    def rows(self, node: int, first: int = 0) -> np.ndarray:
+        """Numbers of the lines from `node`, from line `first` on."""
+        return np.flatnonzero(self._nodes[first : self._count] == node) + first
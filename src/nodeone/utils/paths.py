@@ -0,0 +1,39 @@
+import os
+from pathlib import Path
+
+
+def cache_dir() -> Path:
+    """
+    Returns the per-user cache directory for NodeOne, creating it if needed.
+
+    Honours `NODEONE_CACHE_DIR`, then `XDG_CACHE_HOME`, then `~/.cache`.
+    """
+    base = os.environ.get("NODEONE_CACHE_DIR")
+    if base:
+        path = Path(base)
+    else:
+        xdg = os.environ.get("XDG_CACHE_HOME")
+        path = (Path(xdg) if xdg else Path.home() / ".cache") / "nodeone"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def config_file() -> Path:
+    """Returns the path of the user's settings file, ~/config.json."""
+    return Path.home() / "config.json"
+
+
+def data_dir() -> Path:
+    """
+    Returns the per-user data directory for NodeOne, creating it if needed.
+
+    Honours `NODEONE_DATA_DIR`, then `XDG_DATA_HOME`, then `~/.local/share`.
+    """
+    base = os.environ.get("NODEONE_DATA_DIR")
+    if base:
+        path = Path(base)
+    else:
+        xdg = os.environ.get("XDG_DATA_HOME")
+        path = (Path(xdg) if xdg else Path.home() / ".local" / "share") / "nodeone"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
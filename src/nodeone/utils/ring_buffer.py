@@ -0,0 +1,75 @@
+import threading
+from array import array
+from typing import Dict, Optional, Sequence
+
+
+class RingTable:
+    """
+    Fixed-capacity history of rows with a shared timestamp column.
+
+    Each column is a preallocated `array` of doubles, so memory use is
+    fixed at ``(len(columns) + 1) * capacity * 8`` bytes no matter how long
+    the table is written to. Once full, new rows overwrite the oldest ones.
+    """
+
+    def __init__(self, columns: Sequence[str], capacity: int, typecode: str = "d"):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.columns = tuple(columns)
+        self.capacity = capacity
+        self._index = {name: i for i, name in enumerate(self.columns)}
+        self._times = array(typecode, bytes(array(typecode).itemsize * capacity))
+        self._data = [
+            array(typecode, bytes(array(typecode).itemsize * capacity))
+            for _ in self.columns
+        ]
+        self._head = 0  # next slot to write
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, timestamp: float, values: Sequence[float]):
+        """Writes one row; `values` follow the order of `columns`."""
+        with self._lock:
+            head = self._head
+            self._times[head] = timestamp
+            for column, value in zip(self._data, values):
+                column[head] = value
+            self._head = (head + 1) % self.capacity
+            if self._size < self.capacity:
+                self._size += 1
+
+    def latest(self) -> Optional[Dict[str, float]]:
+        with self._lock:
+            if not self._size:
+                return None
+            i = (self._head - 1) % self.capacity
+            row = {name: self._data[c][i] for c, name in enumerate(self.columns)}
+            row["timestamp"] = self._times[i]
+            return row
+
+    def times(self, last: Optional[int] = None) -> array:
+        with self._lock:
+            return self._ordered(self._times, last)
+
+    def column(self, name: str, last: Optional[int] = None) -> array:
+        """Returns the column oldest-first as a new array, optionally the last N."""
+        data = self._data[self._index[name]]
+        with self._lock:
+            return self._ordered(data, last)
+
+    def _ordered(self, data: array, last: Optional[int]) -> array:
+        size = self._size if last is None else min(last, self._size)
+        start = (self._head - size) % self.capacity
+        end = start + size
+        if end <= self.capacity:
+            return data[start:end]
+        return data[start:] + data[: end - self.capacity]
+
+    def clear(self):
+        with self._lock:
+            self._head = 0
+            self._size = 0
+
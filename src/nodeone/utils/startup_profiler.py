@@ -0,0 +1,230 @@
+import json
+import os
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+from importlib.abc import MetaPathFinder
+from typing import Dict, List, Optional, Tuple
+
+# Imported before the timed phases begin, so this module only needs the
+# standard library; the logger and paths are imported where they are used
+
+HISTORY_FILE = "startup_history.jsonl"
+# First-frame target on the offscreen platform
+TARGET_MS = 300.0
+
+
+class _TimedLoader:
+    """Wraps a module loader and records how long the module body takes."""
+
+    def __init__(self, loader, timer: "_ImportTimer"):
+        self._loader = loader
+        self._timer = timer
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        # Timing starts here: extension modules do their work while created
+        self._timer.enter(spec.name)
+        try:
+            return self._loader.create_module(spec)
+        except BaseException:
+            self._timer.leave()
+            raise
+
+    def exec_module(self, module):
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer.leave()
+            # Leave no trace of the wrapper on the imported module
+            module.__loader__ = self._loader
+            if module.__spec__ is not None:
+                module.__spec__.loader = self._loader
+
+
+class _ImportTimer(MetaPathFinder):
+    """
+    Meta path hook that times every module imported while it is installed.
+
+    Self time excludes the modules a module imports itself, like
+    ``python -X importtime``.
+    """
+
+    def __init__(self):
+        # (name, self seconds, cumulative seconds, perf_counter at completion)
+        self.records: List[Tuple[str, float, float, float]] = []
+        self._stack: List[List] = []
+        self._finding = False
+
+    def find_spec(self, fullname, path, target=None):
+        if self._finding:
+            return None
+        self._finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._finding = False
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self)
+        return spec
+
+    def enter(self, name: str):
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def leave(self):
+        name, started, children = self._stack.pop()
+        now = time.perf_counter()
+        total = now - started
+        if self._stack:
+            self._stack[-1][2] += total
+        self.records.append((name, total - children, total, now))
+
+    def install(self):
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+
+class StartupProfiler:
+    """
+    Records named startup phases and, optionally, per-module import cost.
+
+    Phases are wall-clock intervals measured from the profiler's creation.
+    The report lists them with the time to first frame and the slowest
+    imports, and `save` appends the run to a history file so the startup
+    time can be followed from one release to the next.
+    """
+
+    def __init__(self, trace_imports: bool = False):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.marks: Dict[str, float] = {}
+        self._imports = _ImportTimer() if trace_imports else None
+        if self._imports is not None:
+            self._imports.install()
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - started
+
+    def mark(self, name: str):
+        """Records the time elapsed since startup under `name`."""
+        self.marks.setdefault(name, time.perf_counter() - self.started)
+
+    def stop(self):
+        if self._imports is not None:
+            self._imports.uninstall()
+
+    def slowest_imports(self, limit: int = 15, before: Optional[str] = None) -> List[Tuple[str, float, float]]:
+        """Imports by self time, optionally only those finished before mark `before`."""
+        if self._imports is None:
+            return []
+        records = self._imports.records
+        if before is not None and before in self.marks:
+            deadline = self.started + self.marks[before]
+            records = [r for r in records if r[3] <= deadline]
+        ranked = sorted(records, key=lambda r: r[1], reverse=True)[:limit]
+        return [(name, own, total) for name, own, total, _ in ranked]
+
+    def report(self, history: Optional[List[dict]] = None) -> str:
+        lines = [f"Startup profile ({os.environ.get('QT_QPA_PLATFORM', 'native')} platform)"]
+        first_frame = self.marks.get("first_frame")
+        if first_frame is not None:
+            line = f"  time to first frame  {first_frame * 1000:8.1f} ms (target {TARGET_MS:.0f} ms)"
+            previous = [h["first_frame_ms"] for h in history or () if h.get("first_frame_ms")]
+            if previous:
+                line += f", median of last {len(previous)}: {statistics.median(previous):.1f} ms"
+            lines.append(line)
+
+        lines.append("  phases:")
+        for name, seconds in self.phases.items():
+            lines.append(f"    {name:<24}{seconds * 1000:8.1f} ms")
+        lines.append("  marks (since start):")
+        for name, seconds in sorted(self.marks.items(), key=lambda m: m[1]):
+            lines.append(f"    {name:<24}{seconds * 1000:8.1f} ms")
+
+        imports = self.slowest_imports(before="first_frame")
+        if imports:
+            lines.append("  slowest imports before first frame (self / cumulative):")
+            for name, own, total in imports:
+                lines.append(f"    {name:<40}{own * 1000:8.1f} ms {total * 1000:8.1f} ms")
+        return "\n".join(lines)
+
+    def as_record(self) -> dict:
+        return {
+            "time": time.time(),
+            "platform": os.environ.get("QT_QPA_PLATFORM", "native"),
+            "first_frame_ms": round(self.marks.get("first_frame", 0.0) * 1000, 1),
+            "phases_ms": {k: round(v * 1000, 1) for k, v in self.phases.items()},
+        }
+
+    def load_history(self, path: Optional[str] = None, last: int = 10) -> List[dict]:
+        path = path or _history_path()
+        try:
+            with open(path, "r") as f:
+                lines = f.readlines()[-last:]
+        except OSError:
+            return []
+        history = []
+        for line in lines:
+            try:
+                history.append(json.loads(line))
+            except ValueError:
+                continue
+        return history
+
+    def save(self, path: Optional[str] = None):
+        path = path or _history_path()
+        try:
+            with open(path, "a") as f:
+                f.write(json.dumps(self.as_record()) + "\n")
+        except OSError as e:
+            from nodeone.utils.logger import get_logger
+
+            get_logger(__name__).warning("Could not write startup history %s: %s", path, e)
+
+
+def _history_path() -> str:
+    from nodeone.utils.paths import cache_dir
+
+    return str(cache_dir() / HISTORY_FILE)
+
+
+_active: Optional[StartupProfiler] = None
+
+
+def set_active(profiler: Optional[StartupProfiler]):
+    global _active
+    _active = profiler
+
+
+@contextmanager
+def phase(name: str):
+    """Times a phase on the active profiler; a no-op when none is active."""
+    if _active is None:
+        yield
+    else:
+        with _active.phase(name):
+            yield
+
+
+def mark(name: str):
+    if _active is not None:
+        _active.mark(name)
@@ -0,0 +1,140 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class _Node:
+    __slots__ = ("label", "value", "edges")
+
+    def __init__(self, label: str = "", value: Optional[str] = None):
+        self.label = label
+        self.value = value
+        # first character of the child's label -> child
+        self.edges: Dict[str, "_Node"] = {}
+
+
+def _common_prefix(a: str, b: str) -> int:
+    n = min(len(a), len(b))
+    i = 0
+    while i < n and a[i] == b[i]:
+        i += 1
+    return i
+
+
+class PrefixTrie:
+    """
+    Case-insensitive prefix index over a set of strings.
+
+    Implemented as a radix tree: runs of single-child nodes are collapsed
+    into one edge, so 100k labels need roughly 2 nodes per label instead
+    of one per character. Completions are returned in case-folded
+    lexicographic order and keep the original spelling of each entry.
+    """
+
+    def __init__(self, words: Iterable[str] = ()):
+        self._root = _Node()
+        self._size = 0
+        self.update(words)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, word: str) -> bool:
+        node = self._find(word.casefold())
+        return node is not None and node.value is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return self._walk(self._root)
+
+    def update(self, words: Iterable[str]):
+        for word in words:
+            self.add(word)
+
+    def add(self, word: str) -> bool:
+        """Adds `word`; returns False if it (ignoring case) was present."""
+        node, rest = self._root, word.casefold()
+        while True:
+            if not rest:
+                if node.value is not None:
+                    return False
+                node.value = word
+                self._size += 1
+                return True
+            child = node.edges.get(rest[0])
+            if child is None:
+                node.edges[rest[0]] = _Node(rest, word)
+                self._size += 1
+                return True
+            common = _common_prefix(child.label, rest)
+            if common < len(child.label):
+                # Split the edge at the point where the labels diverge
+                middle = _Node(child.label[:common])
+                child.label = child.label[common:]
+                middle.edges[child.label[0]] = child
+                node.edges[rest[0]] = middle
+                child = middle
+            node, rest = child, rest[common:]
+
+    def discard(self, word: str) -> bool:
+        """Removes `word`; returns False if it was not present."""
+        path: List[Tuple[_Node, _Node]] = []
+        node, rest = self._root, word.casefold()
+        while rest:
+            child = node.edges.get(rest[0])
+            if child is None or not rest.startswith(child.label):
+                return False
+            path.append((node, child))
+            node, rest = child, rest[len(child.label):]
+        if node.value is None:
+            return False
+        node.value = None
+        self._size -= 1
+
+        # Prune the emptied leaf and re-merge a parent left with one child
+        if path and not node.edges:
+            parent, _ = path.pop()
+            del parent.edges[node.label[0]]
+            node = parent
+        if path and node.value is None and len(node.edges) == 1:
+            parent, _ = path[-1]
+            (child,) = node.edges.values()
+            child.label = node.label + child.label
+            parent.edges[child.label[0]] = child
+        return True
+
+    def complete(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """Returns up to `limit` entries starting with `prefix`."""
+        node, rest = self._root, prefix.casefold()
+        while rest:
+            child = node.edges.get(rest[0])
+            if child is None:
+                return []
+            if child.label.startswith(rest):
+                node = child
+                break
+            if not rest.startswith(child.label):
+                return []
+            node, rest = child, rest[len(child.label):]
+
+        results = []
+        for word in self._walk(node):
+            if limit is not None and len(results) >= limit:
+                break
+            results.append(word)
+        return results
+
+    def _find(self, key: str) -> Optional[_Node]:
+        node, rest = self._root, key
+        while rest:
+            child = node.edges.get(rest[0])
+            if child is None or not rest.startswith(child.label):
+                return None
+            node, rest = child, rest[len(child.label):]
+        return node
+
+    @staticmethod
+    def _walk(node: _Node) -> Iterator[str]:
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.value is not None:
+                yield node.value
+            stack.extend(node.edges[c] for c in sorted(node.edges, reverse=True))
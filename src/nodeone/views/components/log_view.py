@@ -0,0 +1,316 @@
+import json
+import time
+from collections import OrderedDict
+from typing import List, Optional
+import numpy as np
+from PyQt6.QtCore import (
+    QAbstractTableModel,
+    QModelIndex,
+    QObject,
+    QRunnable,
+    QThreadPool,
+    QTimer,
+    Qt,
+    pyqtSignal,
+)
+from PyQt6.QtWidgets import (
+    QAbstractItemView,
+    QComboBox,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QLineEdit,
+    QTableView,
+    QVBoxLayout,
+    QWidget,
+)
+from nodeone.utils.log_index import LogFileIndex, level_pattern, text_pattern
+from nodeone.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+HEADERS = ("Time", "Level", "Logger", "Message")
+LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+TAIL_MS = 500
+FILTER_DELAY_MS = 250
+# Parsed lines kept around; enough for a few screens of scrolling
+CACHE_SIZE = 2048
+
+
+class _FilterSignals(QObject):
+    done = pyqtSignal(int, int, object)  # generation, lines searched, matches
+
+
+class _FilterTask(QRunnable):
+    def __init__(self, index: LogFileIndex, patterns: list, generation: int, signals: _FilterSignals):
+        super().__init__()
+        self.log_index = index
+        self.patterns = patterns
+        self.generation = generation
+        self.signals = signals
+
+    def run(self):
+        last = len(self.log_index)
+        matches = self.log_index.search(self.patterns, 0, last)
+        self.signals.done.emit(self.generation, last, matches)
+
+
+class LogTableModel(QAbstractTableModel):
+    """
+    Table over a JSONL log file, one row per line.
+
+    Rows are read from a LogFileIndex and parsed only when displayed, with
+    a small cache of parsed lines. `tail` picks up appended lines. With a
+    filter set, rows map to the matching line numbers; the full file is
+    searched on the thread pool, and lines appended meanwhile are searched
+    when the result arrives.
+    """
+
+    filtering = pyqtSignal(bool)
+
+    def __init__(self, index: LogFileIndex, parent=None):
+        super().__init__(parent)
+        self.log_index = index
+        self._rows: Optional[np.ndarray] = None  # matching line numbers when filtered
+        self._searched = 0  # lines covered by _rows
+        self._patterns: list = []
+        self._generation = 0
+        self._pending = False
+        self._cache: "OrderedDict[int, dict]" = OrderedDict()
+        self._signals = _FilterSignals(self)
+        self._signals.done.connect(self._on_filtered)
+
+    # ------------------------------------------------------------------
+    # Qt model interface
+    # ------------------------------------------------------------------
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.log_index) if self._rows is None else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return HEADERS[section]
+        return None
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return None
+        entry = self.entry(index.row())
+        column = index.column()
+        if role == Qt.ItemDataRole.ToolTipRole:
+            if column != 3:
+                return None
+            return "\n".join(filter(None, (entry.get("msg"), entry.get("exc"))))
+        if column == 0:
+            ts = entry.get("ts")
+            if not isinstance(ts, (int, float)):
+                return ""
+            return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts)) + f".{int(ts * 1000) % 1000:03d}"
+        if column == 1:
+            return entry.get("level", "")
+        if column == 2:
+            return entry.get("logger", "")
+        msg = str(entry.get("msg", "")).split("\n", 1)[0]
+        # Both counts refer to records dropped before this one
+        if entry.get("repeated"):
+            msg += f"  [previous message repeated {entry['repeated']} more times]"
+        if entry.get("rate_limited"):
+            msg += f"  [{entry['rate_limited']} records dropped by rate limit]"
+        return msg
+
+    # ------------------------------------------------------------------
+    # Rows
+    # ------------------------------------------------------------------
+    def line_number(self, row: int) -> int:
+        return row if self._rows is None else int(self._rows[row])
+
+    def entry(self, row: int) -> dict:
+        line = self.line_number(row)
+        entry = self._cache.get(line)
+        if entry is not None:
+            self._cache.move_to_end(line)
+            return entry
+        raw = self.log_index.line(line)
+        try:
+            entry = json.loads(raw)
+            if not isinstance(entry, dict):
+                raise ValueError
+        except ValueError:
+            # Not one of ours (or a partial write); show it as it is
+            entry = {"msg": raw.decode("utf-8", "replace")}
+        self._cache[line] = entry
+        if len(self._cache) > CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return entry
+
+    @property
+    def total_lines(self) -> int:
+        return len(self.log_index)
+
+    @property
+    def is_filtering(self) -> bool:
+        return self._pending
+
+    def set_filter(self, text: str = "", level: Optional[str] = None):
+        """Shows only lines containing `text` (any case) and written at `level`."""
+        patterns: List = []
+        if level:
+            patterns.append(level_pattern(level))
+        if text:
+            patterns.append(text_pattern(text))
+        self._patterns = patterns
+        if patterns:
+            self._start_filter()
+        else:
+            self._generation += 1
+            self._pending = False
+            self._set_rows(None, 0)
+            self.filtering.emit(False)
+
+    def tail(self):
+        """Indexes lines appended to the file and adds their rows."""
+        before = len(self.log_index)
+        if self.log_index.refresh():
+            self._cache.clear()
+            if self._patterns:
+                self._set_rows(np.empty(0, dtype=np.int64), 0)
+                self._start_filter()
+            else:
+                self.beginResetModel()
+                self.endResetModel()
+            return
+        after = len(self.log_index)
+        if after == before:
+            return
+        if self._rows is None:
+            self.beginInsertRows(QModelIndex(), before, after - 1)
+            self.endInsertRows()
+        elif not self._pending:
+            self._append_matches(after)
+
+    def _start_filter(self):
+        self._generation += 1
+        self._pending = True
+        self.filtering.emit(True)
+        QThreadPool.globalInstance().start(
+            _FilterTask(self.log_index, self._patterns, self._generation, self._signals)
+        )
+
+    def _append_matches(self, last: int):
+        matches = self.log_index.search(self._patterns, self._searched, last)
+        self._searched = last
+        if len(matches):
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(matches) - 1)
+            self._rows = np.concatenate((self._rows, matches))
+            self.endInsertRows()
+
+    def _set_rows(self, rows: Optional[np.ndarray], searched: int):
+        self.beginResetModel()
+        self._rows = rows
+        self._searched = searched
+        self.endResetModel()
+
+    def _on_filtered(self, generation: int, searched: int, matches: np.ndarray):
+        if generation != self._generation:
+            return  # superseded by a newer filter
+        self._pending = False
+        self._set_rows(matches, searched)
+        # Catch up with lines appended while the search ran
+        if len(self.log_index) > searched:
+            self._append_matches(len(self.log_index))
+        self.filtering.emit(False)
+
+
+class LogViewer(QWidget):
+    """Tails the application's JSONL log with text and level filters."""
+
+    def __init__(self, path: str, parent=None):
+        super().__init__(parent)
+        self.index = LogFileIndex(path)
+        self._setup_ui()
+        self._connect_signals()
+        self.model.tail()
+        self._update_status()
+
+    def _setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        controls = QHBoxLayout()
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter log lines")
+        self.filter_edit.setClearButtonEnabled(True)
+        controls.addWidget(self.filter_edit)
+        self.level_combo = QComboBox()
+        self.level_combo.addItem("All levels", None)
+        for level in LEVELS:
+            self.level_combo.addItem(level.title(), level)
+        controls.addWidget(self.level_combo)
+        layout.addLayout(controls)
+
+        self.model = LogTableModel(self.index, self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setWordWrap(False)
+        vertical = self.table.verticalHeader()
+        vertical.hide()
+        # Fixed row heights keep scrolling independent of the line count
+        vertical.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical.setDefaultSectionSize(self.fontMetrics().height() + 6)
+        horizontal = self.table.horizontalHeader()
+        horizontal.setStretchLastSection(True)
+        self.table.setColumnWidth(0, 190)
+        self.table.setColumnWidth(1, 80)
+        self.table.setColumnWidth(2, 200)
+        layout.addWidget(self.table)
+
+        self.status = QLabel()
+        layout.addWidget(self.status)
+
+        self.tail_timer = QTimer(self)
+        self.tail_timer.setInterval(TAIL_MS)
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(FILTER_DELAY_MS)
+
+    def _connect_signals(self):
+        self.filter_edit.textChanged.connect(self.filter_timer.start)
+        self.level_combo.currentIndexChanged.connect(self._apply_filter)
+        self.filter_timer.timeout.connect(self._apply_filter)
+        self.tail_timer.timeout.connect(self.tail)
+        self.model.filtering.connect(self._update_status)
+        self.model.rowsInserted.connect(self._update_status)
+        self.model.modelReset.connect(self._update_status)
+
+    def showEvent(self, a0):
+        super().showEvent(a0)
+        self.tail()
+        self.tail_timer.start()
+
+    def hideEvent(self, a0):
+        super().hideEvent(a0)
+        self.tail_timer.stop()
+
+    def tail(self):
+        # Keep following the end of the log unless the user scrolled away
+        scrollbar = self.table.verticalScrollBar()
+        following = scrollbar.value() >= scrollbar.maximum()
+        self.model.tail()
+        if following:
+            self.table.scrollToBottom()
+
+    def _apply_filter(self):
+        self.filter_timer.stop()
+        self.model.set_filter(self.filter_edit.text(), self.level_combo.currentData())
+
+    def _update_status(self, *args):
+        if self.model.is_filtering:
+            text = f"Filtering {self.model.total_lines} lines..."
+        else:
+            text = f"{self.model.rowCount()} of {self.model.total_lines} lines"
+        self.status.setText(text)
@@ -5,11 +5,14 @@ from PyQt6.QtWidgets import (
     QSizePolicy,
 )
 from PyQt6.QtGui import QColor, QPainter, QFont
-from PyQt6.QtCore import QPropertyAnimation, QEasingCurve, QRect, Qt, pyqtProperty # type: ignore
+from PyQt6.QtCore import QEvent, QRect, Qt, pyqtProperty # type: ignore
+from nodeone.services.frame_clock import FrameClock
 
 class NavButton(QPushButton):
     """Theme-aware navbar button with automatic hover color."""
 
+    HOVER_MS = 200
+
     def __init__(self, text="", parent=None):
         super().__init__(text, parent)
         self._hover_progress = 0.0
@@ -20,51 +23,51 @@ class NavButton(QPushButton):
         self.setMinimumHeight(40)
         self.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
 
-        # Smooth hover animation
-        self.hover_anim = QPropertyAnimation(self, b"hover_progress", parent)
-        self.hover_anim.setEasingCurve(QEasingCurve.Type.OutQuad)
+        # Hover fades are driven by the shared frame clock
+        self.clock = FrameClock.instance()
 
         self.setAttribute(Qt.WidgetAttribute.WA_Hover)
-        self.setStyleSheet("border: none; padding: 6px 14px;")
+        # Styled by the theme's QPushButton[role="nav"] rule
+        self.setProperty("role", "nav")
 
     def enterEvent(self, event):
         super().enterEvent(event)
-        self.hover_anim.stop()
-        self.hover_anim.setDuration(200)
-        self.hover_anim.setStartValue(self._hover_progress)
-        self.hover_anim.setEndValue(1.0)
-        self.hover_anim.start()
+        self._animate_hover(1.0)
 
     def leaveEvent(self, a0):
         super().leaveEvent(a0)
-        self.hover_anim.stop()
-        self.hover_anim.setDuration(200)
-        self.hover_anim.setStartValue(self._hover_progress)
-        self.hover_anim.setEndValue(0.0)
-        self.hover_anim.start()
+        self._animate_hover(0.0)
+
+    def _animate_hover(self, target: float):
+        self.clock.animate(
+            self, "hover", self._hover_progress, target, self.HOVER_MS, self._set_hover_progress
+        )
+
+    def _set_hover_progress(self, value: float):
+        # The clock repaints once per frame after all tweens have stepped
+        self._hover_progress = value
 
     def paintEvent(self, a0):
-        super().paintEvent(a0)
-        
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-
-        # Theme foreground
-        fg = self.palette().color(self.palette().ColorRole.WindowText)
-
-        # Hover/press overlay
-        bg = fg
-        bg.setAlpha(int(30 * self._hover_progress))
-
-        painter.fillRect(self.rect(), bg)
-        painter.setPen(fg)
-        painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, self.text())
-        painter.end()
-        
+        # Single pass: overlay and text only, no QPushButton bevel underneath
+        with self.clock.measure_paint():
+            painter = QPainter(self)
+            fg = self.palette().color(self.palette().ColorRole.WindowText)
+
+            # Hover/press overlay
+            alpha = 30 * self._hover_progress + (30 if self.isDown() else 0)
+            if alpha:
+                bg = QColor(fg)
+                bg.setAlpha(int(alpha))
+                painter.fillRect(self.rect(), bg)
+
+            painter.setPen(fg)
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, self.text())
+            painter.end()
+
     @pyqtProperty(float)
     def hover_progress(self) -> float: # type: ignore
         return self._hover_progress
-        
+
     @hover_progress.setter # type: ignore
     def hover_progress(self, value: float):
         self._hover_progress = value
@@ -77,6 +80,7 @@ class Navbar(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
 
+        self.setObjectName("navbar")
         self.setFixedHeight(56)
 
         # Entire row layout
@@ -103,11 +107,17 @@ class Navbar(QWidget):
         palette = self.palette()
         self.bg = palette.color(palette.ColorRole.Window)
         self.fg = palette.color(palette.ColorRole.WindowText)
-
-        # Apply theme-aware text color to child widgets
-        self.setStyleSheet(
-            f"background-color: {self.bg.name()}; color: {self.fg.name()};"
-        )
+        self._glass = QColor(self.bg)
+        self._glass.setAlpha(200)  # semi-transparent for modern effect
+        self._divider = QColor(self.fg)
+        self._divider.setAlpha(60)
+
+    def changeEvent(self, a0):
+        super().changeEvent(a0)
+        # Theme switches arrive as palette changes; only a repaint is needed
+        if a0.type() == QEvent.Type.PaletteChange:
+            self._updatePaletteColors()
+            self.update()
 
     def addLeft(self, widget: QWidget):
         self.left.addWidget(widget)
@@ -119,19 +129,20 @@ class Navbar(QWidget):
         self.right.addWidget(widget)
 
     def paintEvent(self, a0):
-        super().paintEvent(a0)
-        painter = QPainter(self)
-
-        # ===========================
-        #   Modern Glass Background
-        # ===========================
-        glass = QColor(self.bg)
-        glass.setAlpha(200)  # semi-transparent for modern effect
-        painter.fillRect(self.rect(), glass)
-
-        # ===========================
-        #   Bottom Divider Line
-        # ===========================
-        shadow = QColor(self.fg)
-        shadow.setAlpha(60)
-        painter.fillRect(QRect(0, self.height() - 1, self.width(), 1), shadow)
+        # Hovering a button only dirties that button's rect; repaint just that
+        with FrameClock.instance().measure_paint():
+            painter = QPainter(self)
+            dirty = a0.rect()
+
+            # ===========================
+            #   Modern Glass Background
+            # ===========================
+            painter.fillRect(dirty, self._glass)
+
+            # ===========================
+            #   Bottom Divider Line
+            # ===========================
+            divider = QRect(0, self.height() - 1, self.width(), 1)
+            if divider.intersects(dirty):
+                painter.fillRect(divider, self._divider)
+            painter.end()
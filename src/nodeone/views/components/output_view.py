@@ -0,0 +1,165 @@
+from typing import Optional
+import numpy as np
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import (
+    QAbstractItemView,
+    QComboBox,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QPushButton,
+    QTableView,
+    QVBoxLayout,
+    QWidget,
+)
+from nodeone.services.fanout import CANCELLED, FAILED, OK, PENDING, RUNNING, TIMEOUT, FanOutRun, NodeResult
+from nodeone.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+HEADERS = ("Node", "Output")
+STATE_COLORS = {FAILED: "#d9534f", TIMEOUT: "#f0ad4e", CANCELLED: "#888888"}
+
+
+class OutputModel(QAbstractTableModel):
+    """
+    Table over the `OutputBuffer` of a fan-out run, one row per line.
+
+    Rows are sliced from the buffer only when displayed. Batches of new
+    lines from the run become one row insertion each. With a node
+    selected, rows map to that node's line numbers.
+    """
+
+    def __init__(self, run: FanOutRun, parent=None):
+        super().__init__(parent)
+        self.run = run
+        self.buffer = run.buffer
+        self._node: Optional[int] = None
+        self._rows: Optional[np.ndarray] = None  # line numbers of the node shown
+        run.output.connect(self._on_output)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.buffer) if self._rows is None else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return HEADERS[section]
+        return None
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        line = self.line_number(index.row())
+        node = self.run.nodes[self.buffer.node(line)]
+        if role == Qt.ItemDataRole.DisplayRole:
+            if index.column() == 0:
+                return node
+            return self.buffer.line(line).decode("utf-8", "replace")
+        if role == Qt.ItemDataRole.ForegroundRole and index.column() == 0:
+            color = STATE_COLORS.get(self.run.states[node])
+            return QColor(color) if color else None
+        return None
+
+    def line_number(self, row: int) -> int:
+        return row if self._rows is None else int(self._rows[row])
+
+    def set_node(self, node: Optional[str]):
+        """Shows only the lines of `node`, or of every node with None."""
+        self.beginResetModel()
+        if node is None:
+            self._node = self._rows = None
+        else:
+            self._node = self.run.nodes.index(node)
+            self._rows = self.buffer.rows(self._node)
+        self.endResetModel()
+
+    def _on_output(self, first: int, last: int):
+        if self._rows is None:
+            self.beginInsertRows(QModelIndex(), first, last - 1)
+            self.endInsertRows()
+            return
+        rows = self.buffer.rows(self._node, first)
+        if len(rows):
+            count = len(self._rows)
+            self.beginInsertRows(QModelIndex(), count, count + len(rows) - 1)
+            self._rows = np.concatenate((self._rows, rows))
+            self.endInsertRows()
+
+
+class FanOutOutputView(QWidget):
+    """Output of a fan-out run, filterable by node, with its progress."""
+
+    def __init__(self, run: FanOutRun, parent=None):
+        super().__init__(parent)
+        self.run = run
+        self._following = True
+        self._setup_ui()
+        self.model.rowsAboutToBeInserted.connect(self._on_rows_coming)
+        self.model.rowsInserted.connect(self._on_rows_inserted)
+        self.run.output.connect(self._update_status)
+        self.run.node_finished.connect(self._on_node_finished)
+        self.run.finished.connect(self._update_status)
+        self.node_combo.currentIndexChanged.connect(self._on_node_selected)
+        self.cancel_button.clicked.connect(lambda: self.run.cancel())
+        self._update_status()
+
+    def _setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        controls = QHBoxLayout()
+        self.node_combo = QComboBox()
+        self.node_combo.addItem("All nodes", None)
+        for node in self.run.nodes:
+            self.node_combo.addItem(node, node)
+        controls.addWidget(self.node_combo)
+        controls.addStretch()
+        self.cancel_button = QPushButton("Cancel")
+        controls.addWidget(self.cancel_button)
+        layout.addLayout(controls)
+
+        self.model = OutputModel(self.run, self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setWordWrap(False)
+        vertical = self.table.verticalHeader()
+        vertical.hide()
+        # Fixed row heights keep scrolling independent of the line count
+        vertical.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical.setDefaultSectionSize(self.fontMetrics().height() + 6)
+        horizontal = self.table.horizontalHeader()
+        horizontal.setStretchLastSection(True)
+        self.table.setColumnWidth(0, 160)
+        layout.addWidget(self.table)
+
+        self.status = QLabel()
+        layout.addWidget(self.status)
+
+    def _on_rows_coming(self, *args):
+        # Keep following the output unless the user scrolled away
+        scrollbar = self.table.verticalScrollBar()
+        self._following = scrollbar.value() >= scrollbar.maximum()
+
+    def _on_rows_inserted(self, *args):
+        if self._following:
+            self.table.scrollToBottom()
+
+    def _on_node_finished(self, result: NodeResult):
+        if result.error:
+            logger.info("%s on %s: %s", result.state, result.node, result.error)
+        self._update_status()
+
+    def _on_node_selected(self, index: int):
+        self.model.set_node(self.node_combo.itemData(index))
+
+    def _update_status(self, *args):
+        counts = self.run.counts()
+        parts = [f"{counts[state]} {state}" for state in (RUNNING, PENDING, OK, FAILED, TIMEOUT, CANCELLED) if counts.get(state)]
+        self.status.setText(f"{len(self.run.buffer)} lines from {len(self.run.nodes)} nodes: {', '.join(parts)}")
+        self.cancel_button.setEnabled(not self.run.done)
@@ -0,0 +1,667 @@
+import bisect
+from contextlib import contextmanager
+from itertools import compress, count, filterfalse
+from operator import is_not, itemgetter
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+from PyQt6.QtCore import (
+    QAbstractItemModel,
+    QAbstractProxyModel,
+    QAbstractTableModel,
+    QModelIndex,
+    Qt,
+    pyqtSignal,
+)
+from PyQt6.QtWidgets import QAbstractItemView, QHeaderView, QTableView
+
+COLUMNS: Tuple[str, ...] = ("pid", "name", "user", "cpu_percent", "memory_rss", "threads", "status")
+HEADERS = {
+    "pid": "PID",
+    "name": "Name",
+    "user": "User",
+    "cpu_percent": "CPU %",
+    "memory_rss": "Memory",
+    "threads": "Threads",
+    "status": "Status",
+}
+
+SORT_ROLE = Qt.ItemDataRole.UserRole + 1
+
+ProcessRow = Tuple[Any, ...]
+
+
+def _format_bytes(value: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} TB"
+
+
+_FORMATTERS = {
+    "cpu_percent": lambda v: f"{v:.1f}",
+    "memory_rss": _format_bytes,
+}
+
+
+# Changed rows reported with one dataChanged each, up to this many runs;
+# beyond it a single dataChanged covers them all
+MAX_CHANGE_SPANS = 16
+
+
+def _sort_keys(row: ProcessRow) -> Tuple[Any, ...]:
+    return tuple([v.casefold() if type(v) is str else v for v in row])
+
+
+def _haystack(keys: Tuple[Any, ...]) -> str:
+    """The lower-cased text the filter searches in."""
+    return " ".join(str(v) for v in keys if isinstance(v, (str, int)))
+
+
+# 0, 1, 2, ...: tables built from slices of it share these ints
+_row_numbers: List[int] = []
+
+
+def _renumbering(row_count: int, removed: Sequence[int]) -> List[int]:
+    """Old row -> row once `removed` (highest first) are gone; -1 for those."""
+    if len(_row_numbers) < row_count:
+        _row_numbers.extend(range(len(_row_numbers), row_count))
+    table: List[int] = []
+    start = shift = 0
+    for row in reversed(removed):
+        table += _row_numbers[start - shift : row - shift]
+        table.append(-1)
+        shift += 1
+        start = row + 1
+    table += _row_numbers[start - shift : row_count - shift]
+    return table
+
+
+class ProcessTableModel(QAbstractTableModel):
+    """
+    Flat table of processes keyed by PID.
+
+    `update_snapshot` diffs a full snapshot against the current rows and
+    reports only what changed: removed PIDs through `rowsRemoved`, new PIDs
+    through `rowsInserted` and changed cells through `dataChanged`. Sort
+    keys and the filter haystack are computed once per changed row, not on
+    every comparison, and the haystack only once a filter asks for it.
+    `batch_finished` is emitted after each update so proxies can handle
+    all of its changes at once.
+    """
+
+    batch_finished = pyqtSignal()
+
+    def __init__(self, columns: Sequence[str] = COLUMNS, parent=None):
+        super().__init__(parent)
+        self.columns = tuple(columns)
+        self._batch_depth = 0
+        self._rows: List[ProcessRow] = []
+        self._keys: List[Tuple[Any, ...]] = []
+        self._haystacks: List[Optional[str]] = []  # None until first needed
+        self._row_of: Optional[Dict[int, int]] = {}  # None until rebuilt
+        self._by_pid: Dict[int, ProcessRow] = {}
+        # Rows behind a dataChanged spanning scattered rows, while it is emitted
+        self._scattered: Optional[List[int]] = None
+        self._removing: List[int] = []
+
+    # ------------------------------------------------------------------
+    # Qt model interface
+    # ------------------------------------------------------------------
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole:
+            value = self._rows[index.row()][index.column()]
+            formatter = _FORMATTERS.get(self.columns[index.column()])
+            return formatter(value) if formatter else str(value)
+        if role == SORT_ROLE:
+            return self._keys[index.row()][index.column()]
+        if role == Qt.ItemDataRole.TextAlignmentRole and not isinstance(
+            self._rows[index.row()][index.column()], str
+        ):
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return HEADERS.get(self.columns[section], self.columns[section])
+        return None
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+    def pids(self) -> List[int]:
+        return [row[0] for row in self._rows]
+
+    def row_for_pid(self, pid: int) -> Optional[ProcessRow]:
+        return self._by_pid.get(pid)
+
+    def haystack(self, row: int) -> str:
+        haystack = self._haystacks[row]
+        if haystack is None:
+            haystack = self._haystacks[row] = _haystack(self._keys[row])
+        return haystack
+
+    def sort_keys(self) -> List[Tuple[Any, ...]]:
+        return self._keys
+
+    def changed_rows(self, top: int, bottom: int) -> Iterable[int]:
+        """The rows a dataChanged from `top` to `bottom` reports as changed."""
+        scattered = self._scattered
+        return scattered if scattered is not None else range(top, bottom + 1)
+
+    def removing(self) -> List[int]:
+        """Every row the removal under way drops, highest first; empty outside one."""
+        return self._removing
+
+    @property
+    def in_batch(self) -> bool:
+        return self._batch_depth > 0
+
+    @contextmanager
+    def batch(self):
+        """Groups several updates; `batch_finished` fires once at the end."""
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.batch_finished.emit()
+
+    def update_snapshot(self, snapshot: Mapping[int, ProcessRow]):
+        """Replaces the table contents with `snapshot` ({pid: row})."""
+        with self.batch():
+            rows = self._rows
+            gone: List[int] = []
+            changed: List[Tuple[int, ProcessRow]] = []
+            # Scanners hand back the same tuple for an unchanged process,
+            # so most rows are ruled out by identity alone
+            for r in list(compress(count(), map(is_not, rows, map(snapshot.get, map(itemgetter(0), rows))))):
+                new = snapshot.get(rows[r][0])
+                if new is None:
+                    gone.append(r)
+                elif new != rows[r]:
+                    changed.append((r, new))
+            added = []
+            if len(snapshot) > len(rows) - len(gone):
+                added = [snapshot[pid] for pid in filterfalse(self._by_pid.__contains__, snapshot)]
+            self._remove_rows(gone)
+            # Rows behind the removed ones moved up
+            self._set_rows([(r - bisect.bisect_left(gone, r), new) for r, new in changed])
+            self.insert_rows(added)
+
+    def apply_delta(
+        self,
+        removed: Iterable[int],
+        changed: Mapping[int, ProcessRow],
+        added: Mapping[int, ProcessRow],
+    ):
+        """Applies incremental changes, e.g. from a `ProcessScanner` scan."""
+        with self.batch():
+            self.remove_pids(removed)
+            self.update_rows(changed)
+            self.insert_rows(added.values())
+
+    def update_rows(self, rows: Mapping[int, ProcessRow]):
+        """Replaces existing rows and emits one dataChanged per run of rows."""
+        with self.batch():
+            row_of = self._row_index()
+            self._set_rows([(row_of[pid], new) for pid, new in rows.items() if pid in row_of])
+
+    def _set_rows(self, rows: Iterable[Tuple[int, ProcessRow]]):
+        spans: List[Tuple[int, int, int]] = []
+        current, keys, haystacks = self._rows, self._keys, self._haystacks
+        columns = range(len(self.columns))
+        for r, new in rows:
+            changed = [c for c, a, b in zip(columns, current[r], new) if a != b]
+            if not changed:
+                continue
+            current[r] = new
+            self._by_pid[new[0]] = new
+            keys[r] = _sort_keys(new)
+            haystacks[r] = None
+            spans.append((r, changed[0], changed[-1]))
+
+        if len(spans) > MAX_CHANGE_SPANS:
+            # Many scattered rows: one signal for all of them costs the
+            # views a repaint of what they show, not one call per row
+            top = min(span[0] for span in spans)
+            bottom = max(span[0] for span in spans)
+            first = min(span[1] for span in spans)
+            last = max(span[2] for span in spans)
+            self._scattered = [span[0] for span in spans]
+            try:
+                self.dataChanged.emit(self.index(top, first), self.index(bottom, last))
+            finally:
+                self._scattered = None
+            return
+        spans.sort()
+        i = 0
+        while i < len(spans):
+            start, first, last = spans[i]
+            end = start
+            while i + 1 < len(spans) and spans[i + 1][0] == end + 1:
+                i += 1
+                end = spans[i][0]
+                first = min(first, spans[i][1])
+                last = max(last, spans[i][2])
+            self.dataChanged.emit(self.index(start, first), self.index(end, last))
+            i += 1
+
+    def insert_rows(self, rows: Iterable[ProcessRow]):
+        rows = list(rows)
+        if not rows:
+            return
+        start = len(self._rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+        for row in rows:
+            if self._row_of is not None:
+                self._row_of[row[0]] = len(self._rows)
+            self._by_pid[row[0]] = row
+            self._rows.append(row)
+            self._keys.append(_sort_keys(row))
+            self._haystacks.append(None)
+        self.endInsertRows()
+
+    def remove_pids(self, pids: Iterable[int]):
+        """Removes rows by PID; see `_remove_rows`."""
+        row_of = self._row_index()
+        self._remove_rows([row_of[pid] for pid in pids if pid in row_of])
+
+    def _remove_rows(self, rows: List[int]):
+        """
+        Removes rows one contiguous run at a time, starting from the end,
+        so the rows left keep their order and persistent indexes (a
+        view's selection) stay on their process. `removing` lists every
+        row the removal drops while it is under way.
+        """
+        if not rows:
+            return
+        removed = sorted(rows, reverse=True)
+        for r in removed:
+            pid = self._rows[r][0]
+            del self._by_pid[pid]
+            if self._row_of is not None:
+                del self._row_of[pid]
+        self._removing = removed
+        try:
+            i = 0
+            while i < len(removed):
+                last = first = removed[i]
+                i += 1
+                while i < len(removed) and removed[i] == first - 1:
+                    first -= 1
+                    i += 1
+                self.beginRemoveRows(QModelIndex(), first, last)
+                del self._rows[first : last + 1]
+                del self._keys[first : last + 1]
+                del self._haystacks[first : last + 1]
+                self.endRemoveRows()
+        finally:
+            self._removing = []
+        if removed[-1] < len(self._rows):
+            self._row_of = None  # rows were renumbered
+
+    def _row_index(self) -> Dict[int, int]:
+        """PID -> row, rebuilt when removals have renumbered the rows."""
+        if self._row_of is None:
+            self._row_of = dict(zip(map(itemgetter(0), self._rows), count()))
+        return self._row_of
+
+
+class ProcessFilterProxyModel(QAbstractProxyModel):
+    """
+    Sorting and filtering proxy for `ProcessTableModel`.
+
+    The visible source rows are kept in ascending key order in `_order`
+    and sorted with the model's precomputed sort keys, so no comparison
+    calls back into `data()`. Descending order is a reversed view of the
+    same list, and source rows are located by binary search instead of a
+    reverse mapping that would need rebuilding after every change. Cells
+    reported as changed while the model is applying a batch are handled
+    once when the batch finishes: at most one re-sort and one `dataChanged`.
+    """
+
+    # Structural changes larger than this rebuild the proxy instead
+    RESET_THRESHOLD = 512
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._needle = ""
+        self._sort_column = -1
+        self._descending = False
+        self._order: List[int] = []
+        self._pending: set = set()
+        self._pending_columns = (0, -1)
+        self._removing_with_reset = False
+        # Removal under way: `_order` keeps the source rows numbered as
+        # before it and `_renumbered` the same rows numbered as after it.
+        # Also its lowest source row, old row -> new row, the positions of
+        # the rows it drops, the positions dropped and the runs removed
+        self._renumbered: Optional[List[int]] = None
+        self._removal_low = -1
+        self._table: Optional[List[int]] = None
+        self._doomed: Dict[int, int] = {}
+        self._dropped: List[int] = []
+        self._gone: List[Tuple[int, int]] = []
+
+    # ------------------------------------------------------------------
+    # Configuration
+    # ------------------------------------------------------------------
+    def setSourceModel(self, model: "ProcessTableModel"):
+        old = self.sourceModel()
+        if old is not None:
+            for signal, slot in self._source_connections(old):
+                signal.disconnect(slot)
+        self.beginResetModel()
+        super().setSourceModel(model)
+        for signal, slot in self._source_connections(model):
+            signal.connect(slot)
+        self._rebuild()
+        self.endResetModel()
+
+    def _source_connections(self, model):
+        return (
+            (model.dataChanged, self._on_data_changed),
+            (model.batch_finished, self._flush_pending),
+            (model.rowsInserted, self._on_rows_inserted),
+            (model.rowsAboutToBeRemoved, self._on_rows_about_to_be_removed),
+            (model.rowsRemoved, self._on_rows_removed),
+            (model.modelAboutToBeReset, self.beginResetModel),
+            (model.modelReset, self._on_model_reset),
+        )
+
+    def set_filter_text(self, text: str):
+        needle = text.strip().casefold()
+        if needle == self._needle:
+            return
+        self._needle = needle
+        self.beginResetModel()
+        self._rebuild()
+        self.endResetModel()
+
+    def sort_column(self) -> int:
+        return self._sort_column
+
+    def sort_order(self) -> Qt.SortOrder:
+        return Qt.SortOrder.DescendingOrder if self._descending else Qt.SortOrder.AscendingOrder
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder):
+        self._flush_pending()
+        self._sort_column = column
+        self._descending = order == Qt.SortOrder.DescendingOrder
+        self._relayout()
+
+    # ------------------------------------------------------------------
+    # Qt proxy interface
+    # ------------------------------------------------------------------
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._order)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        model = self.sourceModel()
+        return 0 if parent.isValid() or model is None else model.columnCount()
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        if parent.isValid() or not (0 <= row < len(self._order)):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index: QModelIndex = QModelIndex()) -> QModelIndex:
+        return QModelIndex()
+
+    def mapToSource(self, index: QModelIndex) -> QModelIndex:
+        if not index.isValid():
+            return QModelIndex()
+        row = index.row()
+        if self._descending:
+            row = len(self._order) - 1 - row
+        source = self._order[row]
+        if self._gone:
+            # Mid-removal: the runs below this row are gone from the model
+            source -= sum(last - first + 1 for first, last in self._gone if last < source)
+        return self.sourceModel().index(source, index.column())
+
+    def mapFromSource(self, index: QModelIndex) -> QModelIndex:
+        if not index.isValid():
+            return QModelIndex()
+        if self._gone:
+            pos = self._locate_removing(index.row())
+        else:
+            pos = self._locate(index.row())
+        if pos < 0:
+            return QModelIndex()
+        return self.createIndex(self._proxy_row(pos), index.column())
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal:
+            return self.sourceModel().headerData(section, orientation, role)
+        return None
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _accepts(self, source_row: int) -> bool:
+        return not self._needle or self._needle in self.sourceModel().haystack(source_row)
+
+    def _key(self):
+        if self._sort_column < 0:
+            return None
+        keys, column = self.sourceModel().sort_keys(), self._sort_column
+        return lambda row: keys[row][column]
+
+    def _proxy_row(self, pos: int) -> int:
+        return len(self._order) - 1 - pos if self._descending else pos
+
+    def _locate(self, source_row: int) -> int:
+        """Returns the position of `source_row` in `_order`, or -1."""
+        order = self._order
+        key = self._key()
+        if key is None:
+            lo = bisect.bisect_left(order, source_row)
+            if lo < len(order) and order[lo] == source_row:
+                return lo
+        else:
+            value = key(source_row)
+            lo = bisect.bisect_left(order, value, key=key)
+            hi = bisect.bisect_right(order, value, lo=lo, key=key)
+            try:
+                return order.index(source_row, lo, hi)
+            except ValueError:
+                pass
+        # Rows with pending changes may sit where their old key belonged
+        try:
+            return order.index(source_row)
+        except ValueError:
+            return -1
+
+    def _locate_removing(self, source_row: int) -> int:
+        """`_locate` while a removal is under way; rarely needed."""
+        for first, last in sorted(self._gone):
+            if first <= source_row:
+                source_row += last - first + 1
+        try:
+            return self._order.index(source_row)
+        except ValueError:
+            return -1
+
+    def _rebuild(self):
+        model = self.sourceModel()
+        self._pending.clear()
+        self._order = [r for r in range(model.rowCount()) if self._accepts(r)]
+        self._sort_order()
+
+    def _sort_order(self):
+        if self._sort_column < 0:
+            self._order.sort()
+        else:
+            column = self._sort_column
+            keys = [k[column] for k in self.sourceModel().sort_keys()]
+            # Timsort is adaptive, so re-sorting a mostly sorted list is cheap
+            self._order.sort(key=keys.__getitem__)
+
+    def _relayout(self):
+        self.layoutAboutToBeChanged.emit([], QAbstractItemModel.LayoutChangeHint.VerticalSortHint)
+        persistent = self.persistentIndexList()
+        sources = [self.mapToSource(index) for index in persistent]
+        self._sort_order()
+        self.changePersistentIndexList(persistent, [self.mapFromSource(s) for s in sources])
+        self.layoutChanged.emit([], QAbstractItemModel.LayoutChangeHint.VerticalSortHint)
+
+    def _insert(self, source_row: int):
+        key = self._key()
+        if key is None:
+            i = bisect.bisect_right(self._order, source_row)
+        else:
+            i = bisect.bisect_right(self._order, key(source_row), key=key)
+        proxy_row = len(self._order) - i if self._descending else i
+        self.beginInsertRows(QModelIndex(), proxy_row, proxy_row)
+        self._order.insert(i, source_row)
+        self.endInsertRows()
+
+    def _remove_positions(self, positions: Iterable[int]):
+        for pos in sorted(positions, reverse=True):
+            proxy_row = self._proxy_row(pos)
+            self.beginRemoveRows(QModelIndex(), proxy_row, proxy_row)
+            del self._order[pos]
+            self.endRemoveRows()
+
+    def _on_data_changed(self, top_left: QModelIndex, bottom_right: QModelIndex, roles=()):
+        self._pending.update(self.sourceModel().changed_rows(top_left.row(), bottom_right.row()))
+        first, last = self._pending_columns
+        if last < 0:
+            first, last = top_left.column(), bottom_right.column()
+        self._pending_columns = (
+            min(first, top_left.column()), max(last, bottom_right.column())
+        )
+        if not self.sourceModel().in_batch:
+            self._flush_pending()
+
+    def _flush_pending(self, *args):
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, set()
+        first, last = self._pending_columns
+        self._pending_columns = (0, -1)
+
+        present = {r for r in self._order if r in rows} if self._needle else rows
+        if self._needle:
+            hidden = [i for i, r in enumerate(self._order) if r in rows and not self._accepts(r)]
+            self._remove_positions(hidden)
+            for r in sorted(rows - present):
+                if self._accepts(r):
+                    self._insert(r)
+
+        if first <= self._sort_column <= last:
+            self._relayout()
+            # Rows have moved; views repaint what they show either way
+            if self._order:
+                self.dataChanged.emit(self.index(0, first), self.index(len(self._order) - 1, last))
+            return
+
+        visible = [i for i, r in enumerate(self._order) if r in rows]
+        if visible:
+            top, bottom = sorted((self._proxy_row(visible[0]), self._proxy_row(visible[-1])))
+            self.dataChanged.emit(self.index(top, first), self.index(bottom, last))
+
+    def _on_rows_inserted(self, parent: QModelIndex, first: int, last: int):
+        count = last - first + 1
+        if first < self.sourceModel().rowCount() - count:
+            self._order = [r + count if r >= first else r for r in self._order]
+            self._pending = {r + count if r >= first else r for r in self._pending}
+        rows = [r for r in range(first, last + 1) if self._accepts(r)]
+        if len(rows) > self.RESET_THRESHOLD:
+            self.beginResetModel()
+            self._rebuild()
+            self.endResetModel()
+            return
+        for r in rows:
+            self._insert(r)
+
+    def _on_rows_about_to_be_removed(self, parent: QModelIndex, first: int, last: int):
+        if self._renumbered is None:
+            # The model removes rows in runs, highest first: the rows of
+            # all of them are located and renumbered in one pass
+            self._begin_removal(self.sourceModel().removing() or range(last, first - 1, -1))
+        if self._removing_with_reset:
+            return
+        doomed, dropped = self._doomed, self._dropped
+        found = [doomed[r] for r in range(first, last + 1) if r in doomed]
+        # Positions dropped by earlier runs shift the later ones down
+        positions = sorted(p - bisect.bisect_left(dropped, p) for p in found)
+        self._remove_positions(positions)
+        for pos in reversed(positions):
+            del self._renumbered[pos]
+        dropped.extend(found)
+        dropped.sort()
+
+    def _begin_removal(self, rows: Sequence[int]):
+        self._removal_low = rows[-1]
+        self._pending.difference_update(rows)
+        self._dropped = []
+        self._table = table = _renumbering(self.sourceModel().rowCount(), rows)
+        renumbered = list(map(table.__getitem__, self._order))
+        if len(rows) > self.RESET_THRESHOLD:
+            self.beginResetModel()
+            self._order = []
+            self._renumbered = [r for r in renumbered if r >= 0]
+            self._doomed = {}
+            self._removing_with_reset = True
+            return
+        order = self._order
+        found: List[int] = []
+        pos = -1
+        try:
+            # A few rows go at a time, so the scans for them are cheapest
+            for _ in rows:
+                pos = renumbered.index(-1, pos + 1)
+                found.append(pos)
+        except ValueError:
+            pass  # filtered out
+        self._doomed = dict(zip(map(order.__getitem__, found), found))
+        self._renumbered = renumbered
+
+    def _on_rows_removed(self, parent: QModelIndex, first: int, last: int):
+        self._gone.append((first, last))
+        if first != self._removal_low:
+            return
+        self._removal_low = -1
+        self._order, self._renumbered = self._renumbered, None
+        self._pending = set(map(self._table.__getitem__, self._pending))
+        self._table = None
+        self._gone = []
+        self._doomed = {}
+        if self._removing_with_reset:
+            self._removing_with_reset = False
+            self.endResetModel()
+
+    def _on_model_reset(self):
+        self._rebuild()
+        self.endResetModel()
+
+
+class ProcessTableView(QTableView):
+    """A fully virtualized table: fixed row heights, no per-row widgets."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setShowGrid(False)
+        self.setWordWrap(False)
+        self.setSortingEnabled(True)
+
+        vertical = self.verticalHeader()
+        vertical.setVisible(False)
+        vertical.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical.setDefaultSectionSize(22)
+
+        horizontal = self.horizontalHeader()
+        horizontal.setStretchLastSection(True)
+        horizontal.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
@@ -1,113 +1,281 @@
+from typing import Dict, Iterable, List
 from PyQt6.QtWidgets import (
-    QWidget, QLineEdit, QPushButton, 
-    QHBoxLayout, QVBoxLayout, QFrame, QLabel
+    QAbstractItemView, QCompleter, QLineEdit, QListView,
+    QStyle, QStyledItemDelegate, QStyleOptionViewItem, QVBoxLayout, QWidget
 )
-from PyQt6.QtCore import pyqtSignal, Qt
+from PyQt6.QtCore import (
+    QAbstractListModel, QEvent, QModelIndex, QRect, QSize, QStringListModel,
+    Qt, pyqtSignal
+)
+from PyQt6.QtGui import QPainter, QPainterPath, QPalette
+from nodeone.services.theme_manager import set_style_property
 from nodeone.utils.logger import get_logger
+from nodeone.utils.trie import PrefixTrie
 
 logger = get_logger(__name__)
 
-class TagWidget(QFrame):
-    removed = pyqtSignal(str)
-    
-    def __init__(self, text: str, parent=None):
+# Completions shown in the popup; the trie is asked for no more than this
+COMPLETION_LIMIT = 20
+
+
+class TagListModel(QAbstractListModel):
+    """Ordered, duplicate-free list of tags."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._tags: List[str] = []
+        self._rows: Dict[str, int] = {}
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._tags)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return self._tags[index.row()]
+        return None
+
+    def tags(self) -> List[str]:
+        return list(self._tags)
+
+    def __contains__(self, tag: str) -> bool:
+        return tag in self._rows
+
+    def set_tags(self, tags: Iterable[str]):
+        self.beginResetModel()
+        self._tags = list(dict.fromkeys(tags))
+        self._rows = {tag: row for row, tag in enumerate(self._tags)}
+        self.endResetModel()
+
+    def add_tags(self, tags: Iterable[str]) -> List[str]:
+        """Appends the tags not already present; returns those added."""
+        new = [t for t in dict.fromkeys(tags) if t not in self._rows]
+        if new:
+            start = len(self._tags)
+            self.beginInsertRows(QModelIndex(), start, start + len(new) - 1)
+            for tag in new:
+                self._rows[tag] = len(self._tags)
+                self._tags.append(tag)
+            self.endInsertRows()
+        return new
+
+    def remove_tags(self, tags: Iterable[str]) -> List[str]:
+        """Removes the given tags; returns those that were present."""
+        doomed = sorted({self._rows[t] for t in tags if t in self._rows}, reverse=True)
+        if not doomed:
+            return []
+        removed = [self._tags[row] for row in reversed(doomed)]
+        # Remove contiguous runs from the bottom up so indices stay valid
+        i = 0
+        while i < len(doomed):
+            end = start = doomed[i]
+            while i + 1 < len(doomed) and doomed[i + 1] == start - 1:
+                i += 1
+                start = doomed[i]
+            self.beginRemoveRows(QModelIndex(), start, end)
+            del self._tags[start:end + 1]
+            self.endRemoveRows()
+            i += 1
+        self._rows = {tag: row for row, tag in enumerate(self._tags)}
+        return removed
+
+
+class TagDelegate(QStyledItemDelegate):
+    """Paints a tag as a rounded chip with a close mark; no widget per tag."""
+
+    remove_requested = pyqtSignal(str)
+
+    PADDING = 6
+    CLOSE_SIZE = 10
+    RADIUS = 5
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._widths: Dict[str, int] = {}
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        text = index.data()
+        width = self._widths.get(text)
+        if width is None:
+            width = option.fontMetrics.horizontalAdvance(text)
+            self._widths[text] = width
+        return QSize(
+            width + 3 * self.PADDING + self.CLOSE_SIZE,
+            option.fontMetrics.height() + self.PADDING,
+        )
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex):
+        rect = option.rect.adjusted(1, 1, -1, -1)
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        # Colors come from the palette, so theme switches need no restyling
+        palette = option.palette
+        background = palette.color(QPalette.ColorRole.Button)
+        if hovered:
+            background = background.darker(110)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        path = QPainterPath()
+        path.addRoundedRect(rect.toRectF(), self.RADIUS, self.RADIUS)
+        painter.fillPath(path, background)
+
+        painter.setPen(palette.color(QPalette.ColorRole.ButtonText))
+        text_rect = rect.adjusted(self.PADDING, 0, -(2 * self.PADDING + self.CLOSE_SIZE), 0)
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, index.data())
+
+        close = self._close_rect(rect).adjusted(2, 2, -2, -2)
+        painter.drawLine(close.topLeft(), close.bottomRight())
+        painter.drawLine(close.topRight(), close.bottomLeft())
+        painter.restore()
+
+    def editorEvent(self, event, model, option: QStyleOptionViewItem, index: QModelIndex) -> bool:
+        if (
+            event.type() == QEvent.Type.MouseButtonRelease
+            and event.button() == Qt.MouseButton.LeftButton
+            and self._close_rect(option.rect).contains(event.position().toPoint())
+        ):
+            self.remove_requested.emit(index.data())
+            return True
+        return super().editorEvent(event, model, option, index)
+
+    def _close_rect(self, rect: QRect) -> QRect:
+        return QRect(
+            rect.right() - self.PADDING - self.CLOSE_SIZE,
+            rect.center().y() - self.CLOSE_SIZE // 2,
+            self.CLOSE_SIZE,
+            self.CLOSE_SIZE,
+        )
+
+
+class TagListView(QListView):
+    """Wrapping flow of tags; only visible items are laid out and painted."""
+
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self.text = text
-        self.setFrameShape(QFrame.Shape.StyledPanel)
-        self.setFrameShadow(QFrame.Shadow.Raised)
-        
-        layout = QHBoxLayout()
-        layout.setContentsMargins(5, 2, 5, 2)
-        layout.setSpacing(5)
-        
-        # Label for the tag text
-        self.label = QLabel(text)
-        
-        # Button to remove the tag
-        self.remove_button = QPushButton("X")
-        self.remove_button.setFixedSize(20, 20)
-        self.remove_button.clicked.connect(self._on_remove_clicked)
-        
-        layout.addWidget(self.label)
-        layout.addWidget(self.remove_button)
-        
-        self.setLayout(layout)
-        self.setStyleSheet("TagWidget { background-color: #e0e0e0; border-radius: 5px; }")
-        
-    def _on_remove_clicked(self):
-        # Emit the signal so the parent widget can handle removal
-        self.removed.emit(self.text)
-        self.deleteLater() # Safely delete the widget
-        
-        
+        self.setFlow(QListView.Flow.LeftToRight)
+        self.setWrapping(True)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setLayoutMode(QListView.LayoutMode.Batched)
+        self.setBatchSize(200)
+        self.setSpacing(3)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setMouseTracking(True)
+        self.setFrameShape(QListView.Shape.NoFrame)
+
+
 class TagInputWidget(QWidget):
     """A custom component combining a line edit and a list of tags."""
-    
-    # Signal emitted when a new tag is successfully added
+
+    # Emitted when a single tag is added or removed through the UI or add_tag/remove_tag
     tag_added = pyqtSignal(str)
+    tag_removed = pyqtSignal(str)
+    # Emitted once per bulk add_tags/set_tags/remove_tags call
+    tags_added = pyqtSignal(list)
+    tags_removed = pyqtSignal(list)
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        
+        self.completion_trie = PrefixTrie()
         self._setup_ui()
         self._connect_signals()
-        
+
     def _setup_ui(self):
         main_layout = QVBoxLayout()
         main_layout.setSpacing(10)
-        
+
         self.lineEdit = QLineEdit()
         self.lineEdit.setPlaceholderText("Enter a tag and press Enter")
-        # Connect the 'Enter' key press to our handler
-        self.lineEdit.returnPressed.connect(self.add_tag_from_input)
-        
+
+        self._completion_model = QStringListModel(self)
+        self.completer = QCompleter(self._completion_model, self)
+        # The trie already did the filtering; show its results as they are
+        self.completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.lineEdit.setCompleter(self.completer)
+
         main_layout.addWidget(self.lineEdit)
-        
-        # 2. Container for the dynamically created tags
-        # We use a QVBoxLayout to stack tags vertically
-        self.tags_container = QWidget()
-        self.tags_layout = QVBoxLayout()
-        self.tags_layout.setAlignment(Qt.AlignmentFlag.AlignTop) # Align tags to the top
-        self.tags_layout.setContentsMargins(0, 0, 0, 0)
-        self.tags_container.setLayout(self.tags_layout)
-        
-        main_layout.addWidget(self.tags_container)
-        
-        # Add a stretch to push everything to the top visually
-        main_layout.addStretch() 
+
+        self.model = TagListModel(self)
+        self.delegate = TagDelegate(self)
+        self.view = TagListView()
+        self.view.setModel(self.model)
+        self.view.setItemDelegate(self.delegate)
+        main_layout.addWidget(self.view)
 
         self.setLayout(main_layout)
-        self.current_tags = set() # Keep track of existing tags
-        
+
     def _connect_signals(self):
-        pass
+        # Connect the 'Enter' key press to our handler
+        self.lineEdit.returnPressed.connect(self.add_tag_from_input)
+        self.lineEdit.textEdited.connect(self._update_completions)
+        self.lineEdit.textEdited.connect(lambda _: set_style_property(self.lineEdit, "invalid", False))
+        self.delegate.remove_requested.connect(self.remove_tag)
+
+    @property
+    def current_tags(self) -> set:
+        return set(self.model.tags())
+
+    def set_completions(self, labels: Iterable[str]):
+        """Replaces the vocabulary offered by autocompletion."""
+        self.completion_trie = PrefixTrie(labels)
+
+    def add_completions(self, labels: Iterable[str]):
+        self.completion_trie.update(labels)
+
+    def _update_completions(self, text: str):
+        prefix = text.strip()
+        words = self.completion_trie.complete(prefix, COMPLETION_LIMIT) if prefix else []
+        self._completion_model.setStringList([w for w in words if w not in self.model])
 
     def add_tag_from_input(self):
         """Processes text from QLineEdit when Enter is pressed."""
         text = self.lineEdit.text().strip()
-        if text and text not in self.current_tags:
+        if text and text not in self.model:
             self.add_tag(text)
             self.lineEdit.clear()
-        elif text in self.current_tags:
-            # Optional: provide user feedback that tag exists
-            self.lineEdit.setStyleSheet("QLineEdit { border: 1px solid red; }")
-        
+        elif text in self.model:
+            # Flag the duplicate through the theme's QLineEdit[invalid="true"] rule
+            set_style_property(self.lineEdit, "invalid", True)
+
     def add_tag(self, text: str):
-        """Creates and adds a new TagWidget."""
-        tag_widget = TagWidget(text)
-        # Connect the tag's remove signal to our handler
-        tag_widget.removed.connect(self.remove_tag)
-        
-        self.tags_layout.addWidget(tag_widget)
-        self.current_tags.add(text)
-        self.tag_added.emit(text)
+        if self.model.add_tags([text]):
+            self.completion_trie.add(text)
+            self.tag_added.emit(text)
 
     def remove_tag(self, text: str):
-        """Removes a TagWidget and updates the internal list."""
-        self.current_tags.remove(text)
-        # The TagWidget handles its own deletion via deleteLater()
-        logger.debug(f"Removed tag: {text}")
+        if self.model.remove_tags([text]):
+            logger.debug("Removed tag: %s", text)
+            self.tag_removed.emit(text)
+
+    def add_tags(self, tags: Iterable[str]) -> List[str]:
+        """Adds many tags with a single model insert and one `tags_added`."""
+        added = self.model.add_tags(tags)
+        if added:
+            self.completion_trie.update(added)
+            self.tags_added.emit(added)
+        return added
+
+    def remove_tags(self, tags: Iterable[str]) -> List[str]:
+        removed = self.model.remove_tags(tags)
+        if removed:
+            self.tags_removed.emit(removed)
+        return removed
+
+    def set_tags(self, tags: Iterable[str]):
+        """Replaces all tags; emits `tags_removed` and `tags_added` at most once each."""
+        tags = list(dict.fromkeys(tags))
+        before = self.model.tags()
+        keep = set(tags)
+        removed = [t for t in before if t not in keep]
+        added = [t for t in tags if t not in self.model]
+        self.model.set_tags(tags)
+        self.completion_trie.update(added)
+        if removed:
+            self.tags_removed.emit(removed)
+        if added:
+            self.tags_added.emit(added)
 
     def get_all_tags(self) -> list:
         """Returns a list of all current tags."""
-        return list(self.current_tags)
\ No newline at end of file
+        return self.model.tags()
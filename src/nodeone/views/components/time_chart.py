@@ -0,0 +1,332 @@
+import math
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from PyQt6.QtCore import QRect, Qt
+from PyQt6.QtGui import QColor, QPainter, QPen, QPixmap, QPolygonF
+from PyQt6.QtWidgets import QWidget
+from nodeone.services.frame_clock import FrameClock
+from nodeone.utils.decimate import column_minmax
+from nodeone.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+COLORS = (
+    "#4e79a7", "#f28e2b", "#e15759", "#76b7b2", "#59a14f",
+    "#edc948", "#b07aa1", "#ff9da7", "#9c755f", "#bab0ac",
+)
+# Samples kept per series; older ones are dropped as new ones arrive
+DEFAULT_CAPACITY = 1_000_000
+# Auto-scaled ranges leave this fraction of the span free above and below
+HEADROOM = 0.1
+
+
+class _Series:
+    """Sample buffer and drawing state of one chart line."""
+
+    def __init__(self, name: str, color: QColor, capacity: int):
+        self.name = name
+        self.color = color
+        self.pen = QPen(color, 0)
+        self.capacity = capacity
+        # Samples live in t[start:start + size]; appends go after them and
+        # the live region moves back to the front when the buffer runs out
+        self.t = np.empty(0)
+        self.y = np.empty(0)
+        self.start = 0
+        self.size = 0
+        self.total = 0  # samples ever appended
+        self.drawn = 0  # value of `total` when the pixmap last caught up
+        self.last: Optional[Tuple[int, float]] = None  # (column, value) the line continues from
+        self.polygon = QPolygonF()
+
+    def times(self) -> np.ndarray:
+        return self.t[self.start : self.start + self.size]
+
+    def values(self) -> np.ndarray:
+        return self.y[self.start : self.start + self.size]
+
+    def replace(self, t: np.ndarray, y: np.ndarray):
+        t, y = t[-self.capacity :], y[-self.capacity :]
+        n = len(t)
+        alloc = min(max(n + n // 4, 64), self.capacity + self.capacity // 4)
+        self.t, self.y = np.empty(alloc), np.empty(alloc)
+        self.t[:n], self.y[:n] = t, y
+        self.start, self.size = 0, n
+        self.total += n
+
+    def extend(self, t: np.ndarray, y: np.ndarray):
+        n = len(t)
+        if n >= self.capacity:
+            self.replace(t, y)
+            return
+        end = self.start + self.size
+        if end + n > len(self.t):
+            keep = min(self.size, self.capacity - n)
+            alloc = len(self.t)
+            if keep + n > alloc:
+                alloc = min(max(2 * alloc, keep + n, 64), self.capacity + self.capacity // 4)
+                grown_t, grown_y = np.empty(alloc), np.empty(alloc)
+                grown_t[:keep], grown_y[:keep] = self.t[end - keep : end], self.y[end - keep : end]
+                self.t, self.y = grown_t, grown_y
+            else:
+                self.t[:keep], self.y[:keep] = self.t[end - keep : end], self.y[end - keep : end]
+            self.start, self.size = 0, keep
+        elif self.size + n > self.capacity:
+            dropped = self.size + n - self.capacity
+            self.start += dropped
+            self.size -= dropped
+        end = self.start + self.size
+        self.t[end : end + n], self.y[end : end + n] = t, y
+        self.size += n
+        self.total += n
+
+    def points(self, n: int) -> np.ndarray:
+        """Resizes the polygon to `n` points and returns them as an (n, 2) array."""
+        # Shrinking keeps the storage, so after the first full redraw the
+        # polygon is never reallocated
+        self.polygon.resize(n)
+        data = self.polygon.data()
+        data.setsize(n * 16)
+        return np.frombuffer(data, dtype=np.float64).reshape(n, 2)
+
+
+class TimeSeriesChart(QWidget):
+    """
+    Scrolling line chart for large, live time series.
+
+    Each series is reduced with NumPy to the minimum and maximum of every
+    pixel column and drawn as one polyline, written straight into the
+    storage of a `QPolygonF` that is reused from frame to frame, so the
+    cost of a frame depends on the chart's width rather than on how many
+    samples it shows. Lines are drawn into a cached pixmap: when new
+    samples move the newest timestamp forward, the pixmap is scrolled by
+    whole pixel columns and only the samples not drawn yet are reduced
+    and drawn. Resizing, replacing data or rescaling the value axis
+    redraws everything once.
+
+    Timestamps must increase within a series; appended samples that are
+    not newer than the last one are ignored. Without a fixed range the
+    value axis grows to fit the data and never shrinks.
+    """
+
+    def __init__(
+        self,
+        window: float = 60.0,
+        y_range: Optional[Tuple[float, float]] = None,
+        capacity: int = DEFAULT_CAPACITY,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.window = window
+        self.capacity = capacity
+        self._series: Dict[str, _Series] = {}
+        self._fixed_range = y_range is not None
+        self._y_range = tuple(y_range) if y_range is not None else (0.0, 1.0)
+        self._has_range = self._fixed_range
+        self._end: Optional[float] = None  # newest timestamp of any series
+        self._pixmap: Optional[QPixmap] = None
+        self._end_col = 0  # absolute pixel column at the right edge
+        self._stale = True
+        self.setMinimumHeight(80)
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+
+    # ------------------------------------------------------------------
+    # Data
+    # ------------------------------------------------------------------
+    @property
+    def series(self) -> List[str]:
+        return list(self._series)
+
+    @property
+    def y_range(self) -> Tuple[float, float]:
+        return self._y_range
+
+    def add_series(self, name: str, color=None):
+        if name in self._series:
+            raise ValueError(f"series {name!r} already exists")
+        color = QColor(color if color is not None else COLORS[len(self._series) % len(COLORS)])
+        self._series[name] = _Series(name, color, self.capacity)
+        self.update()
+
+    def set_data(self, name: str, t, y):
+        """Replaces the samples of a series."""
+        series = self._series[name]
+        t, y = self._arrays(t, y)
+        series.replace(t, y)
+        if len(t):
+            self._extend_range(y)
+            self._end = max(self._end if self._end is not None else -math.inf, float(t[-1]))
+        self._stale = True
+        self.update()
+
+    def append(self, name: str, t, y):
+        """Adds one sample, or arrays of them, to the end of a series."""
+        series = self._series[name]
+        t, y = self._arrays(t, y)
+        if series.size and len(t) and t[0] <= series.t[series.start + series.size - 1]:
+            newer = t > series.t[series.start + series.size - 1]
+            t, y = t[newer], y[newer]
+        if not len(t):
+            return
+        series.extend(t, y)
+        self._extend_range(y)
+        if self._end is None or t[-1] > self._end:
+            self._end = float(t[-1])
+        self.update()
+
+    def clear(self):
+        for series in self._series.values():
+            series.replace(np.empty(0), np.empty(0))
+        self._end = None
+        if not self._fixed_range:
+            self._has_range = False
+        self._stale = True
+        self.update()
+
+    def set_window(self, seconds: float):
+        self.window = seconds
+        self._stale = True
+        self.update()
+
+    def set_y_range(self, y_range: Optional[Tuple[float, float]]):
+        """Fixes the value axis, or with None scales it to the data again."""
+        self._fixed_range = y_range is not None
+        if y_range is not None:
+            self._y_range = tuple(y_range)
+            self._has_range = True
+        else:
+            self._has_range = False
+            for series in self._series.values():
+                if series.size:
+                    self._extend_range(series.values())
+        self._stale = True
+        self.update()
+
+    @staticmethod
+    def _arrays(t, y) -> Tuple[np.ndarray, np.ndarray]:
+        t = np.atleast_1d(np.asarray(t, dtype=np.float64))
+        y = np.atleast_1d(np.asarray(y, dtype=np.float64))
+        if t.shape != y.shape:
+            raise ValueError("timestamps and values differ in length")
+        return t, y
+
+    def _extend_range(self, y: np.ndarray):
+        if self._fixed_range or not len(y):
+            return
+        lo, hi = float(np.nanmin(y)), float(np.nanmax(y))
+        if self._has_range:
+            low, high = self._y_range
+            if low <= lo and hi <= high:
+                return
+            lo, hi = min(lo, low), max(hi, high)
+        span = (hi - lo) or abs(hi) or 1.0
+        self._y_range = (lo - span * HEADROOM, hi + span * HEADROOM)
+        self._has_range = True
+        self._stale = True
+
+    # ------------------------------------------------------------------
+    # Drawing
+    # ------------------------------------------------------------------
+    def resizeEvent(self, a0):
+        super().resizeEvent(a0)
+        self._stale = True
+
+    def _render(self):
+        """Brings the pixmap up to date with the samples."""
+        width, height = self.width(), self.height()
+        if width <= 0 or height <= 0:
+            return
+        if self._pixmap is None or self._pixmap.size() != self.size():
+            self._pixmap = QPixmap(self.size())
+            self._stale = True
+        if self._end is None:
+            if self._stale:
+                self._pixmap.fill(Qt.GlobalColor.transparent)
+                self._stale = False
+            return
+
+        pps = width / self.window
+        end_col = math.floor(self._end * pps)
+        shift = end_col - self._end_col
+        if self._stale or not 0 <= shift < width:
+            self._pixmap.fill(Qt.GlobalColor.transparent)
+            for series in self._series.values():
+                series.drawn = 0
+                series.last = None
+                series.points(2 * width + 1)  # the most a redraw needs
+            self._stale = False
+        elif shift:
+            self._pixmap.scroll(-shift, 0, self._pixmap.rect())
+            painter = QPainter(self._pixmap)
+            painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Clear)
+            painter.fillRect(QRect(width - shift, 0, shift, height), Qt.GlobalColor.transparent)
+            painter.end()
+        self._end_col = end_col
+
+        low, high = self._y_range
+        scale = (height - 1) / ((high - low) or 1.0)
+        painter = QPainter(self._pixmap)
+        for series in self._series.values():
+            self._draw_new(painter, series, end_col - width + 1, end_col, pps, high, scale)
+        painter.end()
+
+    @staticmethod
+    def _draw_new(painter: QPainter, series: _Series, first_col: int, end_col: int,
+                  pps: float, high: float, scale: float):
+        begin = max(series.drawn - (series.total - series.size), 0)
+        series.drawn = series.total
+        if begin >= series.size:
+            return
+        t, y = series.times()[begin:], series.values()[begin:]
+        c0 = max(math.floor(t[0] * pps), first_col)
+        if c0 > end_col:
+            return
+        cols, mins, maxs = column_minmax(t, y, c0 / pps, 1 / pps, end_col - c0 + 1)
+        if not len(cols):
+            return
+
+        # From where the line ended last time, then down and up each column
+        lead = 1 if series.last is not None else 0
+        points = series.points(lead + 2 * len(cols))
+        if lead:
+            points[0] = (series.last[0] - first_col + 0.5, series.last[1])
+        x = cols + (c0 - first_col + 0.5)
+        points[lead::2, 0] = x
+        points[lead + 1 :: 2, 0] = x
+        points[lead::2, 1] = mins
+        points[lead + 1 :: 2, 1] = maxs
+        points[:, 1] = (high - points[:, 1]) * scale
+        series.last = (c0 + int(cols[-1]), float(y[-1]))
+
+        painter.setPen(series.pen)
+        painter.drawPolyline(series.polygon)
+
+    def paintEvent(self, a0):
+        with FrameClock.instance().measure_paint():
+            self._render()
+            painter = QPainter(self)
+            palette = self.palette()
+            fg = palette.color(palette.ColorRole.WindowText)
+            painter.fillRect(self.rect(), palette.color(palette.ColorRole.Base))
+
+            grid = QColor(fg)
+            grid.setAlpha(40)
+            painter.setPen(grid)
+            for i in range(1, 4):
+                y = round(self.height() * i / 4)
+                painter.drawLine(0, y, self.width(), y)
+            if self._pixmap is not None:
+                painter.drawPixmap(0, 0, self._pixmap)
+
+            painter.setPen(fg)
+            low, high = self._y_range
+            metrics = painter.fontMetrics()
+            painter.drawText(4, metrics.ascent() + 2, f"{high:.4g}")
+            painter.drawText(4, self.height() - metrics.descent() - 2, f"{low:.4g}")
+            x = self.width() - 4
+            for series in reversed(list(self._series.values())):
+                x -= metrics.horizontalAdvance(series.name)
+                painter.setPen(series.color)
+                painter.drawText(x, metrics.ascent() + 2, series.name)
+                x -= 12
+            painter.end()
@@ -1,28 +1,228 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton
-from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QTabWidget
+from PyQt6.QtCore import Qt, QThreadPool, QTimer, pyqtSignal
 from nodeone.services.event_bus import EventBus
+from nodeone.services.frame_clock import FrameStatsOverlay
+from nodeone.services.plugin_manager import BUILTIN_PLUGINS_DIR, PluginManager
+from nodeone.services.registry import ServiceRegistry
 from nodeone.services.theme_manager import ThemeManager
 from nodeone.views.components.navbar import NavButton, Navbar
+from nodeone.utils import startup_profiler
 from nodeone.utils.logger import get_logger
-from nodeone.models.settings import settings
-from nodeone.workers.api_worker import ApiWorker
+from nodeone.models.settings_cache import startup_ui
 
 logger = get_logger(__name__)
 
+# Fetched by the "Call API" button
+API_URL = "https://jsonplaceholder.typicode.com/todos/1"
+
 class MainWindow(QWidget):
+    """
+    Application shell.
+
+    Only what the first frame needs is built in the constructor, using the
+    cached settings snapshot when it is current. The full settings model
+    and the background services (HTTP client, time-series store, metrics
+    collector, fleet poller), whose imports pull in pydantic, requests,
+    NumPy, psutil and asyncio, are deferred until the window has painted.
+    """
+
+    # Emitted from the first paint; deferred startup runs right after it
+    first_frame = pyqtSignal()
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.event_bus = EventBus()
         self.theme_manager = ThemeManager()
+        self.plugin_manager = PluginManager(BUILTIN_PLUGINS_DIR)
+        self.http_client = None
+        self.timeseries = None
+        self.metrics_collector = None
+        self.fleet_poller = None
+        self.alerts = None
+        self.fanout = None
+        self.label_index = None
+        self.settings_watcher = None
+        self.metrics_server = None
+        self.manager = None
+        self.plugin_host = None
+        self.stall_detector = None
+        self._first_frame_seen = False
+
+        self.services = ServiceRegistry()
 
         self._setup_ui()
         self._connect_signals()
-        
-        self.theme_manager.apply_theme(self)
+
+        with startup_profiler.phase("theme"):
+            self.theme_manager.apply_theme(self)
+
+    def _start_services(self):
+        # Imported here so their dependencies stay off the startup path
+        from nodeone.models.settings import get_settings
+        from nodeone.services.alerts import AlertService, collector_source, fleet_source
+        from nodeone.services.fanout import FanOutExecutor
+        from nodeone.services.fleet_poller import FleetPoller
+        from nodeone.services.http_client import HttpClient
+        from nodeone.services.label_index import LabelIndex
+        from nodeone.services.manager import ManagerService
+        from nodeone.services.metrics_collector import MetricsCollector
+        from nodeone.services.plugin_host import PluginHostService
+        from nodeone.services.telemetry import WORKER_QUEUE_DEPTH
+        from nodeone.services.settings_watcher import SettingsWatcher
+        from nodeone.services.timeseries_store import TimeSeriesStore
+
+        settings = get_settings()
+        self.http_client = HttpClient()
+        self.timeseries = TimeSeriesStore()
+        self.metrics_collector = MetricsCollector(
+            self.event_bus,
+            interval=settings.metrics.interval,
+            history=settings.metrics.history,
+            store=self.timeseries,
+        )
+        self.fleet_poller = FleetPoller(
+            settings.agents,
+            event_bus=self.event_bus,
+            interval=settings.poller.interval,
+            concurrency=settings.poller.concurrency,
+            timeout=settings.poller.timeout,
+            max_backoff=settings.poller.max_backoff,
+        )
+        self.services.register("http", self.http_client)
+        self.services.register("metrics", self.metrics_collector)
+        self.services.register("timeseries", self.timeseries)
+        # Local agents; plugins register and start their own
+        self.manager = ManagerService(self.event_bus, parent=self)
+        self.services.register("fleet", self.fleet_poller)
+        # Built from the agent settings; tag edits are written back to them
+        self.label_index = LabelIndex(on_edit=self._save_node_labels)
+        self.label_index.sync({agent.name: agent.labels for agent in settings.agents}, remove_others=True)
+        self.services.register("labels", self.label_index)
+        self.alerts = AlertService(
+            settings.alerts,
+            self.event_bus,
+            sources=[collector_source(self.metrics_collector), fleet_source(self.fleet_poller)],
+            labels={agent.name: agent.labels for agent in settings.agents},
+        )
+        self.services.register("alerts", self.alerts)
+        # Started on its first run
+        self.fanout = FanOutExecutor(labels=self.label_index)
+        self.services.register("fanout", self.fanout)
+        self.services.register("manager", self.manager)
+        # Backends of isolated plugins, supervised by the manager
+        self.plugin_host = PluginHostService(self.manager, self.event_bus, parent=self)
+        self.services.register("plugin_host", self.plugin_host)
+
+        self.metrics_collector.start()
+        if settings.agents:
+            self.fleet_poller.start()
+        self.alerts.start()
+
+        WORKER_QUEUE_DEPTH.labels("thread_pool").set_function(
+            QThreadPool.globalInstance().activeThreadCount
+        )
+        self._start_metrics_server(settings.server_port)
+        self._set_stall_threshold(settings.ui.stall_threshold_ms)
+
+        # Each service only reconfigures for the settings sections it uses
+        self.settings_watcher = SettingsWatcher(self.event_bus, parent=self)
+        self.event_bus.subscribe("settings.ui", self._on_ui_settings, owner=self)
+        self.event_bus.subscribe("settings.metrics", self._on_metrics_settings, owner=self)
+        self.event_bus.subscribe("settings.agents", self._on_agents_settings, owner=self)
+        self.event_bus.subscribe("settings.poller", self._on_poller_settings, owner=self)
+        self.event_bus.subscribe("settings.alerts", self._on_alerts_settings, owner=self)
+        self.event_bus.subscribe("settings.server_port", self._on_server_port, owner=self)
+        self.settings_watcher.start()
+
+    def _start_metrics_server(self, port: int):
+        from nodeone.services.metrics_server import MetricsServer
+
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+            self.metrics_server = None
+        if not port:
+            return
+        server = MetricsServer(port)
+        try:
+            server.start()
+        except OSError as e:
+            logger.warning("Metrics endpoint disabled, cannot bind port %s: %s", port, e)
+            return
+        self.metrics_server = server
+        logger.info("Serving metrics on http://%s:%s/metrics", *server.address)
+
+    def _set_stall_threshold(self, ms: int):
+        from nodeone.services.stall_detector import StallDetector
+
+        if not ms:
+            if self.stall_detector is not None:
+                self.stall_detector.stop()
+            return
+        if self.stall_detector is None:
+            self.stall_detector = StallDetector(parent=self)
+        # Read by the watchdog before each ping
+        self.stall_detector.threshold = ms / 1000
+        self.stall_detector.start()
+
+    def _on_server_port(self, topic, change):
+        self._start_metrics_server(change.new)
+
+    def _on_ui_settings(self, topic, change):
+        ui = change.new
+        if "ui.theme" in change.changed:
+            self.theme_manager.apply_theme(self, ui.theme)
+        if "ui.name" in change.changed:
+            self.setWindowTitle(ui.name)
+        if "ui.width" in change.changed or "ui.height" in change.changed:
+            self.resize(ui.width, ui.height)
+        if "ui.show_fps" in change.changed:
+            if ui.show_fps and self.frame_overlay is None:
+                self.frame_overlay = FrameStatsOverlay(self)
+                self.frame_overlay.show()
+                self._place_frame_overlay()
+            elif not ui.show_fps and self.frame_overlay is not None:
+                self.frame_overlay.clock.stats_enabled = False
+                self.frame_overlay.deleteLater()
+                self.frame_overlay = None
+        if "ui.stall_threshold_ms" in change.changed:
+            self._set_stall_threshold(ui.stall_threshold_ms)
+        if "ui.enabled_tabs" in change.changed:
+            logger.info("Tab changes take effect after a restart")
+
+    def _on_metrics_settings(self, topic, change):
+        # Picked up by the collector after its current wait
+        self.metrics_collector.interval = change.new.interval
+        if "metrics.history" in change.changed:
+            logger.info("Metrics history size changes take effect after a restart")
+
+    def _on_agents_settings(self, topic, change):
+        self.fleet_poller.set_agents(change.new)
+        if change.new and not self.fleet_poller.running:
+            self.fleet_poller.start()
+        labels = {agent.name: agent.labels for agent in change.new}
+        self.label_index.sync(labels, remove_others=True)
+        self.alerts.set_labels(labels)
+
+    def _save_node_labels(self, node: str, labels):
+        from nodeone.models.settings import save_agent_labels
+        try:
+            saved = save_agent_labels(node, labels)
+        except (OSError, ValueError) as e:
+            logger.warning("Could not save the labels of %s: %s", node, e)
+            return
+        if not saved:
+            logger.warning("%s is not an agent in the config file; its labels last until the next reload", node)
+
+    def _on_poller_settings(self, topic, change):
+        self.fleet_poller.reconfigure(**change.new.model_dump())
+
+    def _on_alerts_settings(self, topic, change):
+        self.alerts.set_rules(change.new)
 
     def _setup_ui(self):
-        self.setWindowTitle(settings.ui.name)
-        self.resize(settings.ui.width, settings.ui.height)
+        ui = startup_ui()
+        self.setWindowTitle(ui.name)
+        self.resize(ui.width, ui.height)
 
         layout = QVBoxLayout(self)
 
@@ -34,30 +234,120 @@ class MainWindow(QWidget):
         self.nav.addRight(NavButton("Settings"))
         layout.addWidget(self.nav)
 
-        # Main content filler
-        content = QLabel("Main Content Area")
-        content.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(content)
-        
+        # Plugin tabs; widgets are created when a tab is first shown
+        self.tabs = QTabWidget()
+        self._tab_plugins = {}
+        self.plugin_manager.discover()
+        for name in ui.enabled_tabs:
+            spec = self.plugin_manager.get_spec(name)
+            if spec is None:
+                continue
+            page = QWidget()
+            page_layout = QVBoxLayout(page)
+            page_layout.setContentsMargins(0, 0, 0, 0)
+            placeholder = QLabel(f"Loading {spec.title}...")
+            placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            page_layout.addWidget(placeholder)
+            self.tabs.addTab(page, spec.title)
+            self._tab_plugins[page] = spec
+
+        if self.tabs.count():
+            layout.addWidget(self.tabs)
+        else:
+            # Main content filler
+            content = QLabel("Main Content Area")
+            content.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            layout.addWidget(content)
+
         self.button = QPushButton("Call API")
         self.label = QLabel("Press button to call API")
         layout.addWidget(self.button)
         layout.addWidget(self.label)
-        
+
+        self.frame_overlay = FrameStatsOverlay(self) if ui.show_fps else None
+
+    def resizeEvent(self, a0):
+        super().resizeEvent(a0)
+        self._place_frame_overlay()
+
+    def _place_frame_overlay(self):
+        if self.frame_overlay is not None:
+            self.frame_overlay.move(self.width() - self.frame_overlay.width() - 8, 8)
+
+    def closeEvent(self, a0):
+        # Services do not exist yet if the window closes before its first frame
+        if self.http_client is not None:
+            self.settings_watcher.stop()
+            if self.stall_detector is not None:
+                self.stall_detector.stop()
+            if self.metrics_server is not None:
+                self.metrics_server.stop()
+            self.http_client.shutdown()
+            self.metrics_collector.stop()
+            self.fleet_poller.stop()
+            self.alerts.stop()
+            self.fanout.stop()
+            self.plugin_host.close()
+            self.manager.shutdown(deadline=2.0)
+            self.timeseries.close()
+        super().closeEvent(a0)
+
     def _connect_signals(self):
         self.button.clicked.connect(self.call_api)
-        
+        self.tabs.currentChanged.connect(self._materialize_tab)
+
+    def paintEvent(self, a0):
+        super().paintEvent(a0)
+        if not self._first_frame_seen:
+            self._first_frame_seen = True
+            startup_profiler.mark("first_frame")
+            QTimer.singleShot(0, self._on_first_frame)
+            self.first_frame.emit()
+
+    def _on_first_frame(self):
+        """Runs once the window has painted; starts the deferred work."""
+        self.plugin_manager.warm(spec.name for spec in self._tab_plugins.values())
+        with startup_profiler.phase("services"):
+            self._start_services()
+        with startup_profiler.phase("first tab"):
+            self._materialize_tab(self.tabs.currentIndex())
+        startup_profiler.mark("ready")
+
+    def _materialize_tab(self, index: int):
+        page = self.tabs.widget(index)
+        spec = self._tab_plugins.pop(page, None)
+        if spec is None:
+            return
+        page_layout = page.layout()
+        placeholder = page_layout.itemAt(0).widget()
+        try:
+            widget = spec.create_widget(self.event_bus, self.services)
+        except Exception:
+            logger.exception("Failed to create plugin %s", spec.name)
+            placeholder.setText(f"Failed to load {spec.title}")
+            return
+        page_layout.replaceWidget(placeholder, widget)
+        placeholder.deleteLater()
+
     def call_api(self):
         self.label.setText("Calling API...")
-        
-        self.worker = ApiWorker()
-        self.worker.result_signal.connect(self.handle_response)
-        self.worker.error_signal.connect(self.handle_error)
-        self.worker.start()
-        
-    def handle_response(self, data: dict):
+
+        request = self.http_client.get(API_URL, ttl=30, owner=self)
+        request.finished.connect(self.handle_response)
+        request.failed.connect(self.handle_error)
+
+    def handle_response(self, response):
+        try:
+            data = response.json()
+        except ValueError as e:
+            self.handle_error(f"Invalid JSON response: {e}")
+            return
+        if not isinstance(data, dict):
+            self.handle_error(f"Unexpected response: {type(data).__name__}")
+            return
         self.label.setText(f"Received: {data.get('title')}")
-        logger.info(f"data: {data}")
-        
+        # Formatted on the logging thread, and only if INFO is enabled
+        logger.info("data: %s", data)
+
     def handle_error(self, err: str):
         self.label.setText(f"Error: {err}")
\ No newline at end of file
@@ -0,0 +1,130 @@
+import json
+import os
+import platform
+import statistics
+import time
+from typing import Callable, Dict, List, Optional
+import pytest
+from PyQt6.QtCore import PYQT_VERSION_STR, QT_VERSION_STR
+
+# A benchmark regresses when even its fastest round is slower than the
+# baseline's median round by more than the tolerance. Comparing the fastest
+# round keeps other load on the machine from failing the run.
+# Slowdowns smaller than MIN_DELTA are noise whatever the relative change.
+MIN_DELTA = 0.001
+
+
+class BenchmarkRun:
+    """Collects timings for one pytest session and checks them against the baseline."""
+
+    def __init__(self, config):
+        self.json_path = config.getoption("--benchmark-json")
+        self.baseline_path = config.getoption("--benchmark-baseline")
+        self.tolerance = config.getoption("--benchmark-tolerance")
+        self.save_baseline = config.getoption("--benchmark-save-baseline")
+        self.results: Dict[str, dict] = {}
+        self.baseline: Dict[str, dict] = {}
+        if not self.save_baseline:
+            try:
+                with open(self.baseline_path, "r") as f:
+                    self.baseline = json.load(f).get("results", {})
+            except (OSError, ValueError):
+                pass
+
+    def measure(
+        self,
+        name: str,
+        fn: Callable[[], object],
+        rounds: int = 10,
+        warmup: int = 1,
+        setup: Optional[Callable[[], object]] = None,
+    ) -> dict:
+        """Times `fn` over `rounds` runs, after `warmup` untimed ones."""
+        samples = []
+        for i in range(warmup + rounds):
+            if setup is not None:
+                setup()
+            started = time.perf_counter()
+            fn()
+            elapsed = time.perf_counter() - started
+            if i >= warmup:
+                samples.append(elapsed)
+        return self.record(name, samples)
+
+    def record(self, name: str, samples: List[float]) -> dict:
+        """Stores externally measured samples (seconds) and compares them."""
+        result = {
+            "median": statistics.median(samples),
+            "min": min(samples),
+            "max": max(samples),
+            "rounds": len(samples),
+        }
+        self.results[name] = result
+        base = self.baseline.get(name)
+        if base is not None:
+            current, reference = result["min"], base["median"]
+            if current > reference * (1 + self.tolerance) and current - reference > MIN_DELTA:
+                pytest.fail(
+                    f"{name} regressed: fastest round {current * 1000:.2f} ms, baseline median "
+                    f"{reference * 1000:.2f} ms (+{current / reference - 1:.0%}, "
+                    f"tolerance {self.tolerance:.0%})",
+                    pytrace=False,
+                )
+        return result
+
+    def write(self):
+        data = {
+            "machine": {
+                "platform": platform.platform(),
+                "python": platform.python_version(),
+                "qt": QT_VERSION_STR,
+                "pyqt": PYQT_VERSION_STR,
+                "qpa": os.environ.get("QT_QPA_PLATFORM", ""),
+            },
+            "time": time.time(),
+            "results": dict(sorted(self.results.items())),
+        }
+        paths = [self.json_path] + ([self.baseline_path] if self.save_baseline else [])
+        for path in paths:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(path, "w") as f:
+                json.dump(data, f, indent=2)
+                f.write("\n")
+
+
+_run: Optional[BenchmarkRun] = None
+
+
+@pytest.fixture(scope="session")
+def bench(request):
+    global _run
+    _run = BenchmarkRun(request.config)
+    yield _run
+    _run.write()
+
+
+@pytest.fixture(autouse=True)
+def isolated_home(tmp_path, monkeypatch):
+    # Keep benchmarks off the user's config, caches and log files
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("NODEONE_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("NODEONE_DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.setenv("LOG_FILE_ENABLED", "false")
+
+
+def pytest_terminal_summary(terminalreporter):
+    if _run is None or not _run.results:
+        return
+    write = terminalreporter.write_line
+    terminalreporter.section("benchmarks")
+    write(f"{'benchmark':<40}{'min':>12}{'median':>12}{'baseline':>12}{'change':>9}")
+    for name, result in sorted(_run.results.items()):
+        base = _run.baseline.get(name)
+        line = f"{name:<40}{result['min'] * 1000:>9.2f} ms{result['median'] * 1000:>9.2f} ms"
+        if base is not None:
+            # Median against median, for reading; the check uses the fastest round
+            line += f"{base['median'] * 1000:>9.2f} ms{result['median'] / base['median'] - 1:>+9.0%}"
+        write(line)
+    write(f"results written to {_run.json_path}")
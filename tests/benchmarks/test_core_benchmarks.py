@@ -0,0 +1,217 @@
+import threading
+import time
+import pytest
+from PyQt6.QtCore import QThreadPool
+from nodeone.models.settings import AlertRule
+from nodeone.services.alerts import AlertEngine
+from nodeone.services.event_bus import EventBus
+from nodeone.services.label_index import LabelIndex
+from nodeone.services.manager import Agent, ManagerService
+from nodeone.services.plugin_manager import PluginManager
+from nodeone.services.telemetry import MetricsRegistry
+
+EVENTS = 10_000
+PLUGINS = 200
+SAMPLES = 100_000
+# Budget for recording one telemetry sample
+SAMPLE_BUDGET = 1e-6
+AGENTS = 500
+TICKS = 40
+# One supervisor tick must fit well inside a 60 Hz frame
+TICK_BUDGET = 0.008
+ALERT_RULES = 10_000
+ALERT_NODES = 1_000
+ALERT_METRICS = ("cpu_percent", "mem_percent", "disk_read", "disk_write", "net_sent", "net_recv", "load", "temp")
+ALERT_WINDOWS = ("'1m'", "'5m'", "'15m'")
+# Every node reports once a second, so a tick must take less than that
+ALERT_BUDGET = 1.0
+LABELLED_NODES = 50_000
+SELECTOR = "role=db AND region!=eu AND (zone=z3 OR zone=z7 OR ssd)"
+SELECTOR_BUDGET = 0.001
+
+PLUGIN_SOURCE = '''
+from PyQt6.QtWidgets import QLabel
+
+TAB_TITLE = "Plugin {i}"
+TOPICS = ["metrics.*", "fleet.updated"]
+
+
+def create_plugin(event_bus):
+    return QLabel("plugin {i}")
+'''
+
+
+def _busy_bus():
+    """A bus with exact, prefix and catch-all subscribers plus unrelated topics."""
+    bus = EventBus()
+    counter = [0]
+
+    def handler(name, payload):
+        counter[0] += 1
+
+    for _ in range(5):
+        bus.subscribe("metrics.cpu", handler)
+    for _ in range(3):
+        bus.subscribe("metrics.*", handler)
+    bus.subscribe("*", handler)
+    for i in range(100):
+        bus.subscribe(f"other.topic{i}", handler)
+    return bus, counter
+
+
+def test_event_bus_dispatch(qtbot, bench):
+    bus, counter = _busy_bus()
+
+    def run():
+        for i in range(EVENTS):
+            bus.emit("metrics.cpu", i)
+
+    bench.measure("event_bus.dispatch_10k", run)
+    assert counter[0] == EVENTS * 9 * 11  # nine handlers, warmup plus ten rounds
+
+
+def test_event_bus_cross_thread(qtbot, bench):
+    bus, counter = _busy_bus()
+
+    def run():
+        worker = threading.Thread(target=lambda: [bus.emit("metrics.cpu", i) for i in range(EVENTS)])
+        worker.start()
+        worker.join()
+        bus.flush()
+
+    bench.measure("event_bus.cross_thread_10k", run)
+    assert counter[0] == EVENTS * 9 * 11
+
+
+@pytest.fixture
+def plugin_dir(tmp_path):
+    root = tmp_path / "plugins"
+    for i in range(PLUGINS):
+        directory = root / f"plugin_{i:03d}"
+        directory.mkdir(parents=True)
+        (directory / "plugin.py").write_text(PLUGIN_SOURCE.format(i=i))
+    return root
+
+
+def test_plugin_discover_cold(bench, plugin_dir, tmp_path):
+    index = tmp_path / "index.json"
+
+    def setup():
+        index.unlink(missing_ok=True)
+
+    bench.measure(
+        "plugin_manager.discover_200_cold",
+        lambda: PluginManager(str(plugin_dir), index_path=str(index)).discover(),
+        setup=setup,
+    )
+
+
+def test_plugin_discover_indexed(bench, plugin_dir, tmp_path):
+    index = str(tmp_path / "index.json")
+    assert len(PluginManager(str(plugin_dir), index_path=index).discover()) == PLUGINS
+    bench.measure(
+        "plugin_manager.discover_200_indexed",
+        lambda: PluginManager(str(plugin_dir), index_path=index).discover(),
+    )
+
+
+def test_telemetry_recording_overhead(bench):
+    registry = MetricsRegistry()
+    counter = registry.counter("bench_events", "Events")
+    histogram = registry.histogram("bench_seconds", "Latency", ["topic"])
+
+    def count():
+        inc = counter.inc
+        for _ in range(SAMPLES):
+            inc()
+
+    def observe():
+        for _ in range(SAMPLES):
+            histogram.labels("metrics.cpu").observe(0.0003)
+
+    for name, run in (("counter_inc", count), ("histogram_observe", observe)):
+        result = bench.measure(f"telemetry.{name}_100k", run)
+        # The loop itself is included, so this overstates the cost slightly
+        assert result["min"] / SAMPLES < SAMPLE_BUDGET
+
+
+class _IdleAgent(Agent):
+    interval = 0.0
+
+    def step(self):
+        return None
+
+
+def test_manager_tick_with_500_agents(qtbot, bench):
+    pool = QThreadPool()
+    pool.setMaxThreadCount(4)
+    m = ManagerService(event_bus=EventBus(), pool=pool, max_concurrency=4)
+    for i in range(AGENTS):
+        m.register(f"agent{i}", _IdleAgent())
+    m.start_all()
+    m._timer.stop()  # ticks are driven and timed here instead
+
+    samples = []
+    for _ in range(TICKS):
+        qtbot.wait(5)  # let the pool finish a batch of steps
+        started = time.perf_counter()
+        m._tick()
+        samples.append(time.perf_counter() - started)
+    assert m.shutdown(deadline=5.0)
+    bench.record("manager.tick_500_agents", samples)
+    # A stray pause of the whole process should not fail the run
+    assert sorted(samples)[int(0.95 * len(samples))] < TICK_BUDGET
+
+
+def _alert_rules():
+    rules = []
+    for i in range(ALERT_RULES):
+        metric = ALERT_METRICS[i % len(ALERT_METRICS)]
+        window = ALERT_WINDOWS[i // len(ALERT_METRICS) % len(ALERT_WINDOWS)]
+        aggregate = ("avg", "max", "min", "sum")[i % 4]
+        expr = f"{aggregate}({metric}, {window}) > {50 + i % 50}"
+        if i % 5 == 0:
+            expr += f" and last({ALERT_METRICS[(i + 1) % len(ALERT_METRICS)]}) < 90"
+        labels = [f"group{i % 10}"] if i % 3 == 0 else []
+        rules.append(AlertRule(name=f"rule{i}", expr=expr, labels=labels, hysteresis=2, pending=i % 2 * 30))
+    return rules
+
+
+def test_alert_tick_10k_rules_1k_nodes(bench):
+    labels = {f"node{n}": [f"group{n % 10}", "prod"] for n in range(ALERT_NODES)}
+    engine = AlertEngine(_alert_rules(), labels)
+    assert not engine.errors
+    names = list(labels)
+    clock = [0.0]
+
+    def tick():
+        t = clock[0] = clock[0] + 1.0
+        for n, node in enumerate(names):
+            # Steady levels with some jitter, so alerts near their thresholds change state
+            jitter = (n * t) % 7
+            engine.ingest(node, t, {metric: (n * 37 + m * 13) % 95 + jitter for m, metric in enumerate(ALERT_METRICS)})
+        return engine.evaluate(t)
+
+    # Fill the windows before timing so samples also leave them
+    for _ in range(60):
+        tick()
+    result = bench.measure("alerts.tick_10k_rules_1k_nodes", tick, rounds=5)
+    assert result["median"] < ALERT_BUDGET
+
+
+def test_label_selector_50k_nodes(bench):
+    index = LabelIndex()
+    for n in range(LABELLED_NODES):
+        labels = [f"role={('db', 'web', 'cache', 'queue')[n % 4]}", f"region={('eu', 'us', 'ap')[n % 3]}", f"zone=z{n % 10}"]
+        if n % 7 == 0:
+            labels.append("ssd")
+        index.set_labels(f"node{n}", labels)
+    expected = sum(
+        1 for n in range(LABELLED_NODES)
+        if n % 4 == 0 and n % 3 != 0 and (n % 10 in (3, 7) or n % 7 == 0)
+    )
+    assert len(index.select_ids(SELECTOR)) == expected
+
+    result = bench.measure("label_index.select_50k_nodes", lambda: index.select_ids(SELECTOR), rounds=50)
+    assert result["median"] < SELECTOR_BUDGET
+    bench.measure("label_index.count_50k_nodes", lambda: index.count(SELECTOR), rounds=50)
@@ -0,0 +1,209 @@
+import itertools
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+import random
+import numpy as np
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication, QGridLayout, QLabel, QLineEdit, QPushButton, QWidget
+from nodeone.services.theme_manager import ThemeManager
+from nodeone.views.components.process_table import ProcessFilterProxyModel, ProcessTableModel, ProcessTableView
+from nodeone.views.components.tag_input import TagInputWidget
+
+WIDGETS = 1000
+TAGS = 1000
+STARTUP_RUNS = 3
+PROCESSES = 10_000
+# One process table refresh, sorted and shown, within a third of a frame
+REFRESH_BUDGET = 0.005
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_theme_switch(qtbot, bench):
+    window = QWidget()
+    qtbot.addWidget(window)
+    grid = QGridLayout(window)
+    kinds = itertools.cycle((QPushButton, QLabel, QLineEdit))
+    for i in range(WIDGETS):
+        grid.addWidget(next(kinds)(f"w{i}"), i // 25, i % 25)
+    window.show()
+    qtbot.waitExposed(window)
+
+    manager = ThemeManager()
+    themes = itertools.cycle(("dark", "light"))
+    manager.apply_theme(window, "light")
+
+    def run():
+        manager.apply_theme(window, next(themes))
+        QApplication.processEvents()
+
+    bench.measure("theme_manager.apply_theme_1000_widgets", run)
+
+
+def test_tag_input_bulk_add(qtbot, bench):
+    tags = [f"tag-{i}" for i in range(TAGS)]
+    widgets = []
+
+    def setup():
+        widget = TagInputWidget()
+        qtbot.addWidget(widget)
+        widgets.append(widget)
+
+    def run():
+        widgets[-1].add_tags(tags)
+        QApplication.processEvents()
+
+    bench.measure("tag_input.add_1000_tags", run, rounds=5, setup=setup)
+    assert len(widgets[-1].current_tags) == TAGS
+
+
+def test_process_table_refresh(qtbot, bench):
+    model = ProcessTableModel()
+    proxy = ProcessFilterProxyModel()
+    proxy.setSourceModel(model)
+    view = ProcessTableView()
+    qtbot.addWidget(view)
+    view.setModel(proxy)
+    view.sortByColumn(3, Qt.SortOrder.DescendingOrder)
+    view.show()
+    qtbot.waitExposed(view)
+
+    def row(pid, cpu=0.0):
+        return (pid, f"proc-{pid}", "root", cpu, 1024 * pid, 1, "running")
+
+    snapshot = {pid: row(pid) for pid in range(1, PROCESSES + 1)}
+    model.update_snapshot(snapshot)
+    rng = random.Random(1)
+    pids = itertools.count(PROCESSES + 1)
+    nexts = []
+
+    def setup():
+        # A typical tick: a few processes come and go, a few hundred change CPU
+        QApplication.processEvents()
+        current = dict(nexts[-1] if nexts else snapshot)
+        for pid in rng.sample(sorted(current), 300):
+            current[pid] = row(pid, rng.random() * 100)
+        for pid in rng.sample(sorted(current), 10):
+            del current[pid]
+        for pid in itertools.islice(pids, 10):
+            current[pid] = row(pid)
+        nexts.append(current)
+
+    result = bench.measure(
+        "process_table.refresh_10k_processes", lambda: model.update_snapshot(nexts[-1]), rounds=50, setup=setup
+    )
+    assert model.rowCount() == PROCESSES
+    assert result["min"] < REFRESH_BUDGET
+
+
+def test_main_window_construction(qtbot, bench):
+    from nodeone.views.main_window import MainWindow
+
+    windows = []
+
+    def run():
+        windows.append(MainWindow())
+
+    bench.measure("main_window.construct", run, rounds=5)
+    for window in windows:
+        window.deleteLater()
+
+
+def test_main_window_first_frame(qtbot, bench):
+    from nodeone.views.main_window import MainWindow
+
+    samples = []
+    for _ in range(5):
+        started = time.perf_counter()
+        window = MainWindow()
+        qtbot.addWidget(window)
+        with qtbot.waitSignal(window.first_frame, timeout=5000):
+            window.show()
+        samples.append(time.perf_counter() - started)
+        # Let the deferred services start so that closing stops them
+        qtbot.waitUntil(lambda: window.http_client is not None)
+        window.close()
+    bench.record("main_window.first_frame_warm", samples)
+
+
+def test_startup_first_frame_cold(bench, tmp_path):
+    """Time to first frame of a fresh interpreter, as reported by --profile-startup."""
+    samples = []
+    for _ in range(STARTUP_RUNS):
+        output = subprocess.run(
+            [sys.executable, "-m", "nodeone.app", "--profile-startup"],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=60, check=True,
+        ).stdout
+        match = re.search(r"time to first frame\s+([\d.]+) ms", output)
+        assert match, output
+        samples.append(float(match.group(1)) / 1000)
+    bench.record("startup.first_frame_cold", samples)
+
+
+def test_time_chart_live_frame(qtbot, bench):
+    from nodeone.views.components.time_chart import TimeSeriesChart
+
+    series, points, rate = 50, 1_000_000, 1000.0
+    chart = TimeSeriesChart(window=points / rate)
+    qtbot.addWidget(chart)
+    chart.resize(1200, 400)
+    t = np.arange(points) / rate
+    walk = np.cumsum(np.random.default_rng(0).normal(size=points))
+    for i in range(series):
+        chart.add_series(f"s{i}")
+        chart.set_data(f"s{i}", t, walk + i)
+    chart.show()
+    qtbot.waitExposed(chart)
+    bench.measure("time_chart.full_redraw_50x1M", lambda: (chart.set_window(chart.window), chart.grab()), rounds=3)
+
+    # One frame of live data at 60 fps: 17 new samples per series
+    step = 17
+    frame = [points]
+
+    def run():
+        start = frame[0]
+        frame[0] += step
+        new_t = np.arange(start, start + step) / rate
+        offset = start % (points - step)
+        new_y = walk[offset : offset + step]
+        for i in range(series):
+            chart.append(f"s{i}", new_t, new_y + i)
+        chart.grab()
+
+    result = bench.measure("time_chart.live_frame_50x1M", run, rounds=60)
+    assert result["median"] < 1 / 60
+
+
+def test_fanout_output_live_frame(qtbot, bench):
+    from nodeone.services.fanout import FanOutRun
+    from nodeone.views.components.output_view import FanOutOutputView
+
+    nodes, lines = 500, 4000
+    run = FanOutRun([f"node{i:03d}" for i in range(nodes)])
+    for node in range(nodes):
+        run.buffer.append(node, [b"%d: installing package %d of %d" % (node, i, lines) for i in range(lines)])
+    view = FanOutOutputView(run)
+    qtbot.addWidget(view)
+    view.resize(1200, 800)
+    view.show()
+    qtbot.waitExposed(view)
+    view.table.scrollToBottom()
+
+    # One 16 ms batch: 10 new lines from every node
+    batch = [b"progress line %d" % i for i in range(10)]
+
+    def post():
+        # Done by the executor's thread, not part of the frame
+        for node in range(nodes):
+            for line in batch:
+                run._post_line(node, line)
+
+    def run_frame():
+        run.flush()
+        view.grab()
+
+    result = bench.measure("fanout.output_live_frame_500x4k", run_frame, rounds=30, setup=post)
+    assert len(run.buffer) > nodes * lines
+    assert result["median"] < 1 / 60
@@ -0,0 +1,44 @@
+import os
+import pytest
+
+# Tests and benchmarks run headless; an explicit QT_QPA_PLATFORM still wins
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+BENCHMARK_DIR = os.path.join(os.path.dirname(__file__), "benchmarks")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmark", "NodeOne benchmarks (tests/benchmarks)")
+    group.addoption(
+        "--benchmark", action="store_true", default=False,
+        help="run the benchmarks, which are skipped otherwise",
+    )
+    group.addoption(
+        "--benchmark-json", default=os.path.join(".benchmarks", "latest.json"),
+        help="where to write the results (default: .benchmarks/latest.json)",
+    )
+    group.addoption(
+        "--benchmark-baseline", default=os.path.join(BENCHMARK_DIR, "baseline.json"),
+        help="baseline to compare against (default: tests/benchmarks/baseline.json)",
+    )
+    group.addoption(
+        "--benchmark-tolerance", type=float, default=0.50,
+        help="allowed slowdown over the baseline, as a fraction (default: 0.50)",
+    )
+    group.addoption(
+        "--benchmark-save-baseline", action="store_true", default=False,
+        help="write this run's results to the baseline file instead of comparing",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: performance benchmark, run with --benchmark")
+
+
+def pytest_collection_modifyitems(config, items):
+    skip = pytest.mark.skip(reason="benchmarks run with --benchmark")
+    for item in items:
+        if str(item.path).startswith(BENCHMARK_DIR + os.sep):
+            item.add_marker(pytest.mark.benchmark)
+            if not config.getoption("--benchmark"):
+                item.add_marker(skip)
@@ -0,0 +1,180 @@
+import asyncio
+import threading
+import pytest
+from nodeone.agent.client import AgentStream
+from nodeone.agent.protocol import (
+    FLAG_ZLIB,
+    HEADER,
+    FrameReader,
+    FrameType,
+    FrameWriter,
+    ProtocolError,
+    SampleCodec,
+    read_uvarint,
+    unzigzag,
+    write_uvarint,
+    zigzag,
+)
+from nodeone.agent.server import AgentServer
+from nodeone.models.settings import AgentConfig
+from nodeone.services.fleet_poller import FleetPoller
+
+SCHEMA = [("cpu_percent", 1), ("mem_used", 0), ("net_recv_bps", 0)]
+
+
+class FakeNode:
+    """Sampler whose values move a little with every sample."""
+
+    def __init__(self, node: int):
+        self.node = node
+        self.count = 0
+
+    def __call__(self):
+        self.count += 1
+        return {
+            "cpu_percent": 10.0 + self.node + (self.count % 7) / 10,
+            "mem_used": 8_000_000_000 + 4096 * self.count,
+            "net_recv_bps": 1500 * (self.count % 3),
+        }
+
+
+def test_varints_and_codec_round_trip():
+    out = bytearray()
+    numbers = [0, 1, 127, 128, 300, 2**40, 2**63]
+    for n in numbers:
+        write_uvarint(out, n)
+    pos, decoded = 0, []
+    for _ in numbers:
+        n, pos = read_uvarint(out, pos)
+        decoded.append(n)
+    assert decoded == numbers
+    assert [unzigzag(zigzag(n)) for n in (-3, -1, 0, 1, 2**40, -(2**40))] == [-3, -1, 0, 1, 2**40, -(2**40)]
+    with pytest.raises(ProtocolError):
+        read_uvarint(b"\x80", 0)
+
+    codec = SampleCodec(SCHEMA)
+    sampler = FakeNode(0)
+    first, second = codec.quantize(sampler()), codec.quantize(sampler())
+    key = SampleCodec.encode_keyframe(1, 1_700_000_000_000, first)
+    delta = SampleCodec.encode_delta(2, 1_700_000_001_000, second, 1_700_000_000_000, first)
+    assert len(delta) <= len(key) // 2
+
+    decoder = SampleCodec(SCHEMA)
+    assert decoder.decode(FrameType.KEYFRAME, key).values["mem_used"] == 8_000_004_096
+    sample = decoder.decode(FrameType.DELTA, delta)
+    assert sample.seq == 2 and sample.timestamp == 1_700_000_001.0
+    assert sample.values == {"cpu_percent": 10.2, "mem_used": 8_000_008_192, "net_recv_bps": 3000}
+    with pytest.raises(ProtocolError):
+        decoder.decode(FrameType.DELTA, SampleCodec.encode_delta(4, 0, second, 0, second))
+
+
+def test_frames_compress_with_a_shared_stream():
+    async def scenario():
+        writer = FrameWriter(compress=True)
+        payloads = [b"cpu_percent,mem_used,net_recv_bps;" * 4] * 3 + [b"\x01\x02"]
+        frames = [writer.pack(FrameType.WELCOME, payload) for payload in payloads]
+        assert [HEADER.unpack_from(f)[2] & FLAG_ZLIB for f in frames] == [FLAG_ZLIB] * 3 + [0]
+        # Later frames reuse the earlier ones as their dictionary
+        assert len(frames[1]) < len(frames[0]) < len(payloads[0])
+
+        stream = asyncio.StreamReader()
+        stream.feed_data(b"".join(frames))
+        reader = FrameReader(stream)
+        assert [(await reader.read())[1] for _ in frames] == payloads
+
+    asyncio.run(scenario())
+
+
+def test_several_agents_stream_over_loopback():
+    async def scenario():
+        servers = [AgentServer(FakeNode(i), SCHEMA, interval=0.02, port=0) for i in range(4)]
+        for server in servers:
+            await server.start()
+        streams = [AgentStream(*server.address) for server in servers]
+        try:
+            for i, stream in enumerate(streams):
+                await stream.connect()
+                samples = [await stream.read() for _ in range(10)]
+                seqs = [s.seq for s in samples]
+                assert seqs == list(range(seqs[0], seqs[0] + 10))
+                assert all(10 + i <= s.values["cpu_percent"] < 11 + i for s in samples)
+                # Deltas of slowly moving values stay a few bytes each
+                assert stream.bytes_read < 200 + 10 * (HEADER.size + 10)
+        finally:
+            for stream in streams:
+                stream.close()
+            for server in servers:
+                await server.close()
+
+    asyncio.run(scenario())
+
+
+def test_reconnecting_client_resumes_without_gaps():
+    async def scenario():
+        sampler = FakeNode(0)
+        server = AgentServer(sampler, SCHEMA, interval=3600, port=0, history=5)
+        await server.start()
+        stream = AgentStream(*server.address)
+        try:
+            await stream.connect()
+            assert (await stream.read()).seq == 1
+            stream.close()
+
+            for _ in range(3):
+                server.sample()  # taken while disconnected
+            await stream.connect()
+            server.sample()
+            resumed = [await stream.read() for _ in range(4)]
+            assert [s.seq for s in resumed] == [2, 3, 4, 5]
+            assert not any(s.missed for s in resumed)
+            assert resumed[-1].values == SampleCodec(SCHEMA).decode(
+                FrameType.KEYFRAME, server._keyframe(server.history[-1])
+            ).values
+
+            # Further behind than the history reaches: start over with a keyframe
+            stream.close()
+            for _ in range(8):
+                server.sample()
+            await stream.connect()
+            sample = await stream.read()
+            assert sample.seq == 13 and sample.missed == 7
+        finally:
+            stream.close()
+            await server.close()
+
+        # An agent that restarted has a new session; the old position is ignored
+        restarted = AgentServer(sampler, SCHEMA, interval=3600, port=0)
+        await restarted.start()
+        try:
+            stream.port = restarted.address[1]
+            await stream.connect()
+            assert (await stream.read()).seq == 1
+        finally:
+            stream.close()
+            await restarted.close()
+
+    asyncio.run(scenario())
+
+
+def test_fleet_poller_subscribes_to_streaming_agents(qtbot):
+    loop = asyncio.new_event_loop()
+    servers = [AgentServer(FakeNode(i), SCHEMA, interval=0.05, port=0) for i in range(3)]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    for server in servers:
+        asyncio.run_coroutine_threadsafe(server.start(), loop).result(5)
+
+    configs = [AgentConfig(url=f"nodeone://127.0.0.1:{server.address[1]}") for server in servers]
+    poller = FleetPoller(configs, interval=0.05, timeout=2)
+    poller.start()
+    try:
+        qtbot.waitUntil(lambda: len(poller.store) == 3 and all(s.ok for s in poller.store.snapshot().values()))
+        seen = {name: s.data["cpu_percent"] for name, s in poller.store.snapshot().items()}
+        assert sorted(int(v) for v in seen.values()) == [10, 11, 12]
+        assert all(server.clients == 1 for server in servers)
+    finally:
+        poller.stop()
+        for server in servers:
+            asyncio.run_coroutine_threadsafe(server.close(), loop).result(5)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(5)
@@ -0,0 +1,110 @@
+import math
+import pytest
+from nodeone.models.settings import AlertRule
+from nodeone.services.alerts import FIRING, RESOLVED, AlertEngine, AlertService, _Window, parse_duration
+from nodeone.services.event_bus import EventBus
+
+
+def test_window_aggregates_slide():
+    window = _Window("cpu", 10, capacity=4)
+    window.minmax = True
+    for t, v in enumerate([5.0, 1.0, 9.0, 3.0]):
+        window.add(2, float(t), v)
+    assert (window.sum[2], window.count[2], window.min[2], window.max[2], window.last[2]) == (18, 4, 1, 9, 3)
+
+    # At t=12 the samples from t <= 2 have left the window
+    window.add(2, 12.0, 4.0)
+    assert (window.sum[2], window.count[2], window.min[2], window.max[2]) == (7, 2, 3, 4)
+    assert math.isnan(window.last[0]) and window.count[0] == 0
+
+
+def test_expressions_are_validated():
+    assert parse_duration("5m") == 300 and parse_duration(30) == 30
+    rules = [
+        AlertRule(name="ok", expr="avg(cpu, '1m') > 90 and not max(mem, 30) < 10"),
+        AlertRule(name="call", expr="__import__('os').system('x') > 1"),
+        AlertRule(name="window", expr="avg(cpu) > 1"),
+        AlertRule(name="syntax", expr="cpu >"),
+        AlertRule(name="chain", expr="1 < cpu < 2"),
+    ]
+    engine = AlertEngine(rules)
+    assert engine.rules == ["ok"]
+    assert sorted(engine.errors) == ["call", "chain", "syntax", "window"]
+
+
+def test_transitions_use_pending_and_hysteresis():
+    rule = AlertRule(name="hot", expr="90 < avg(cpu, 2)", hysteresis=5, pending=2)
+    engine = AlertEngine([rule])
+
+    def tick(t, value):
+        engine.ingest("n1", t, {"cpu": value, "other": 1})
+        return [(e.node, e.state, e.value) for e in engine.evaluate(t)]
+
+    assert tick(0, 95) == []  # pending
+    assert tick(1, 95) == []
+    assert tick(2, 95) == [("n1", FIRING, 95)]
+    assert tick(3, 95) == []  # already firing, not repeated
+    assert tick(4, 87) == []  # avg 91, above the threshold
+    assert tick(5, 87) == []  # avg 87, held by the hysteresis
+    assert tick(6, 80) == [("n1", RESOLVED, 83.5)]
+    assert engine.evaluate(7) == []  # no samples, nothing to do
+    assert engine.firing() == []
+
+
+def test_rules_only_see_labelled_nodes(qtbot):
+    bus = EventBus()
+    events = []
+    bus.subscribe("alerts.*", lambda topic, event: events.append((topic, event.node)))
+    samples = [[("web1", 1.0, {"cpu": 99}), ("db1", 1.0, {"cpu": 99})]]
+    service = AlertService(
+        [AlertRule(name="web_cpu", expr="cpu > 90", labels=["web"])],
+        bus,
+        sources=[lambda: samples.pop() if samples else ()],
+        labels={"web1": ["web", "eu"], "db1": ["db"]},
+    )
+    service.run_once()
+    qtbot.waitUntil(lambda: events == [("alerts.web_cpu", "web1")])
+
+    # Relabelled nodes and changed rules keep the state of unchanged rules
+    service.set_labels({"db1": ["db", "web"]})
+    service.set_rules([AlertRule(name="web_cpu", expr="cpu > 90", labels=["web"])])
+    samples.append([("db1", 2.0, {"cpu": 99}), ("web1", 2.0, {"cpu": 99})])
+    service.run_once()
+    qtbot.waitUntil(lambda: len(events) == 2)
+    assert events[1] == ("alerts.web_cpu", "db1")
+    assert sorted(service.engine.firing()) == [("web_cpu", "db1"), ("web_cpu", "web1")]
+
+
+def test_edited_and_removed_rules_resolve_their_alerts():
+    rules = [AlertRule(name="hot", expr="cpu > 90"), AlertRule(name="full", expr="disk > 90")]
+    engine = AlertEngine(rules)
+    engine.ingest("n1", 1.0, {"cpu": 95, "disk": 95})
+    assert len(engine.evaluate(1.0)) == 2
+
+    engine.set_rules([AlertRule(name="hot", expr="cpu > 99")])
+    events = engine.evaluate(2.0)
+    assert sorted((e.rule, e.node, e.state, e.value) for e in events) == [
+        ("full", "n1", RESOLVED, 95),
+        ("hot", "n1", RESOLVED, 95),
+    ]
+    assert engine.firing() == [] and engine.evaluate(3.0) == []
+
+
+def test_rule_scope_uses_label_selectors():
+    rules = [
+        AlertRule(name="db", expr="cpu > 90", selector="role=db AND region!=eu"),
+        AlertRule(name="bad", expr="cpu > 90", selector="role=db AND"),
+    ]
+    labels = {"db1": ["role=db", "region=us"], "db2": ["role=db", "region=eu"], "web1": ["role=web"]}
+    engine = AlertEngine(rules, labels)
+    assert list(engine.errors) == ["bad"]
+    for node in labels:
+        engine.ingest(node, 0, {"cpu": 95})
+    assert [event.node for event in engine.evaluate(0)] == ["db1"]
+
+
+@pytest.mark.parametrize("expr, fires", [("not cpu > 50", False), ("cpu >= 10 or mem < 0", True)])
+def test_boolean_operators(expr, fires):
+    engine = AlertEngine([AlertRule(name="r", expr=expr)])
+    engine.ingest("n", 0, {"cpu": 60, "mem": 1})
+    assert bool(engine.evaluate(0)) is fires
@@ -0,0 +1,77 @@
+import threading
+from PyQt6.QtCore import QObject
+from nodeone.services.event_bus import EventBus
+
+
+def test_exact_and_wildcard_routing(qtbot):
+    bus = EventBus()
+    seen = []
+    bus.subscribe("metrics.cpu", lambda n, p: seen.append(("exact", n, p)))
+    bus.subscribe("metrics.*", lambda n, p: seen.append(("prefix", n, p)))
+    bus.subscribe("*", lambda n, p: seen.append(("all", n, p)))
+
+    bus.emit("metrics.cpu", 1)
+    bus.emit("ping", 2)
+
+    assert seen == [
+        ("exact", "metrics.cpu", 1),
+        ("prefix", "metrics.cpu", 1),
+        ("all", "metrics.cpu", 1),
+        ("all", "ping", 2),
+    ]
+
+
+def test_unsubscribe_and_owner_lifetime(qtbot):
+    bus = EventBus()
+    seen = []
+    sub = bus.subscribe("a", lambda n, p: seen.append(p))
+    bus.emit("a", 1)
+    bus.unsubscribe(sub)
+    bus.emit("a", 2)
+    assert seen == [1]
+
+    owner = QObject()
+    bus.subscribe("b", lambda n, p: seen.append(p), owner=owner)
+    owner.deleteLater()
+    qtbot.waitUntil(lambda: not bus.has_subscribers("b"))
+
+
+def test_legacy_event_signal(qtbot):
+    bus = EventBus()
+    seen = []
+    bus.event_signal.connect(lambda n, p: seen.append((n, p)))
+    bus.emit("ping", {"from": "test"})
+    assert seen == [("ping", {"from": "test"})]
+
+
+def test_coalesced_topic_keeps_latest(qtbot):
+    bus = EventBus()
+    bus.set_coalesced("metrics.*")
+    seen = []
+    bus.subscribe("metrics.cpu", lambda n, p: seen.append(p))
+
+    for i in range(100):
+        bus.emit("metrics.cpu", i)
+    assert seen == []
+    qtbot.waitUntil(lambda: seen == [99])
+
+
+def test_cross_thread_events_are_batched(qtbot):
+    bus = EventBus()
+    seen = []
+    flushes = []
+    bus._flush_requested.connect(lambda: flushes.append(1))
+    bus.subscribe("work.*", lambda n, p: seen.append((p, threading.get_ident())))
+
+    def produce():
+        for i in range(50):
+            bus.emit("work.item", i)
+
+    t = threading.Thread(target=produce)
+    t.start()
+    t.join()
+
+    qtbot.waitUntil(lambda: len(seen) == 50)
+    assert [p for p, _ in seen] == list(range(50))
+    assert {ident for _, ident in seen} == {threading.get_ident()}
+    assert len(flushes) == 1
@@ -0,0 +1,94 @@
+import asyncio
+import sys
+import pytest
+from nodeone.services.fanout import CANCELLED, FAILED, OK, READ_SIZE, TIMEOUT, FanOutExecutor, read_lines
+from nodeone.utils.output_buffer import MAX_LINE, OutputBuffer
+from nodeone.views.components.output_view import FanOutOutputView
+
+# Prints three lines; node "bad" fails and node "slow" hangs
+SCRIPT = """
+import sys, time
+node = sys.argv[1]
+for i in range(3):
+    print(f"{node} line {i}", flush=True)
+if node == "slow":
+    time.sleep(30)
+sys.exit(2 if node == "bad" else 0)
+"""
+
+
+@pytest.fixture
+def executor():
+    executor = FanOutExecutor(concurrency=2)
+    yield executor
+    executor.stop()
+
+
+def test_output_buffer_packs_lines_into_chunks():
+    buffer = OutputBuffer(chunk_size=16)
+    buffer.append(0, [b"first", b"second line", b""])
+    buffer.append(1, [b"x" * 40, b"third"])
+    assert len(buffer) == 5
+    assert [buffer.line(i) for i in range(5)] == [b"first", b"second line", b"", b"x" * 16, b"third"]
+    assert [buffer.node(i) for i in range(5)] == [0, 0, 0, 1, 1]
+    assert buffer.rows(1).tolist() == [3, 4] and buffer.rows(0, 1).tolist() == [1, 2]
+    with pytest.raises(IndexError):
+        buffer.line(5)
+
+
+def test_long_lines_are_cut_while_read():
+    async def read(data):
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        lines = []
+        await read_lines(reader, lines.append)
+        return lines
+
+    long = b"x" * MAX_LINE + b"y" * (10 * READ_SIZE)
+    lines = asyncio.run(read(long + b"\r\nshort\n" + long))
+    assert lines == [b"x" * MAX_LINE, b"short", b"x" * MAX_LINE]
+
+def test_commands_stream_output_with_timeouts(qtbot, executor):
+    nodes = ["a", "bad", "slow", "b"]
+    run = executor.run(nodes, [sys.executable, "-c", SCRIPT, "{node}"], timeout=5)
+    view = FanOutOutputView(run)
+    qtbot.addWidget(view)
+    batches = []
+    run.output.connect(lambda first, last: batches.append((first, last)))
+
+    qtbot.waitUntil(lambda: run.done, timeout=15_000)
+    states = {node: result.state for node, result in run.results.items()}
+    assert states == {"a": OK, "bad": FAILED, "slow": TIMEOUT, "b": OK}
+    assert run.results["bad"].exit_code == 2
+    assert all(first < last for first, last in batches)
+
+    lines = [(run.nodes[run.buffer.node(i)], run.buffer.line(i)) for i in range(len(run.buffer))]
+    assert sorted(lines) == sorted((node, f"{node} line {i}".encode()) for node in nodes for i in range(3))
+    assert view.model.rowCount() == 12
+    view.node_combo.setCurrentIndex(nodes.index("bad") + 1)
+    assert view.model.rowCount() == 3
+    assert view.model.index(2, 1).data() == "bad line 2"
+    assert "2 ok, 1 failed, 1 timeout" in view.status.text()
+    assert not view.cancel_button.isEnabled()
+
+
+def test_cancel_stops_running_and_queued_nodes(qtbot, executor):
+    started = []
+
+    async def operation(node, emit):
+        started.append(node)
+        emit(f"{node} started".encode())
+        await asyncio.sleep(30)
+
+    run = executor.run([f"n{i}" for i in range(5)], operation, concurrency=2)
+    qtbot.waitUntil(lambda: len(run.buffer) == 2)
+    run.cancel("n0")
+    qtbot.waitUntil(lambda: "n0" in run.results)
+    assert run.results["n0"].state == CANCELLED
+    qtbot.waitUntil(lambda: len(started) == 3)  # n2 took the freed slot
+
+    run.cancel()
+    qtbot.waitUntil(lambda: run.done)
+    assert {result.state for result in run.results.values()} == {CANCELLED}
+    assert len(started) == 3
@@ -0,0 +1,146 @@
+import asyncio
+import json
+import threading
+import time
+import pytest
+from nodeone.models.settings import AgentConfig
+from nodeone.services.event_bus import EventBus
+from nodeone.services.fleet_poller import TOPIC, FleetPoller
+
+
+class FakeAgents:
+    """Serves `count` keep-alive HTTP agents from one asyncio loop."""
+
+    def __init__(self, count: int):
+        self.count = count
+        self.ports = []
+        self.requests = 0
+        self.failing = set()
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def __exit__(self, *exc):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
+
+    def _run(self):
+        loop = self._loop
+        asyncio.set_event_loop(loop)
+        servers = []
+        for i in range(self.count):
+            server = loop.run_until_complete(
+                asyncio.start_server(self._make_handler(i), "127.0.0.1", 0)
+            )
+            servers.append(server)
+            self.ports.append(server.sockets[0].getsockname()[1])
+        self._ready.set()
+        loop.run_forever()
+
+        for server in servers:
+            server.close()
+        tasks = asyncio.all_tasks(loop)
+        for task in tasks:
+            task.cancel()
+        loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        loop.run_until_complete(asyncio.sleep(0))
+        loop.close()
+
+    def _make_handler(self, index):
+        async def handle(reader, writer):
+            try:
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    while (await reader.readline()) not in (b"\r\n", b""):
+                        pass
+                    self.requests += 1
+                    if index in self.failing:
+                        writer.close()
+                        return
+                    body = json.dumps({"node": index, "cpu": 1.5}).encode()
+                    writer.write(
+                        b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                        + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                        + body
+                    )
+                    await writer.drain()
+            except ConnectionError:
+                pass
+            finally:
+                writer.close()
+
+        return handle
+
+    def configs(self):
+        return [AgentConfig(url=f"http://127.0.0.1:{port}/status") for port in self.ports]
+
+
+def test_polls_many_agents_concurrently(qtbot):
+    bus = EventBus()
+    updates = []
+    bus.subscribe(TOPIC, lambda n, p: updates.append(p))
+
+    with FakeAgents(200) as agents:
+        poller = FleetPoller(
+            agents.configs(), event_bus=bus, interval=0.2, concurrency=32, timeout=2
+        )
+        poller.start()
+        try:
+            qtbot.waitUntil(lambda: len(poller.store) == 200, timeout=10000)
+            qtbot.waitUntil(lambda: poller.cycle_duration > 0, timeout=10000)
+        finally:
+            poller.stop()
+
+    snapshot = poller.store.snapshot()
+    assert all(s.ok for s in snapshot.values())
+    assert {s.data["node"] for s in snapshot.values()} == set(range(200))
+    assert poller.cycle_duration < 5
+    assert all(latency < 2 for latency in poller.latencies().values())
+    assert updates  # coalesced change notifications reached the GUI thread
+
+
+def test_failing_node_backs_off(qtbot):
+    with FakeAgents(2) as agents:
+        agents.failing.add(1)
+        configs = agents.configs()
+        poller = FleetPoller(configs, interval=0.05, timeout=1, max_backoff=10)
+        poller.start()
+        try:
+            qtbot.waitUntil(lambda: len(poller.store) == 2, timeout=5000)
+            time.sleep(0.5)
+        finally:
+            poller.stop()
+
+    good = poller.store.get(configs[0].name)
+    bad = poller.store.get(configs[1].name)
+    assert good.ok
+    assert not bad.ok and bad.error
+    assert poller._nodes[bad.name].failures >= 1
+    # Exponential backoff keeps the failing node well below the healthy rate
+    assert poller._nodes[bad.name].failures < 8
+
+
+@pytest.mark.parametrize("remove", [True, False])
+def test_set_agents_reconfigures(qtbot, remove):
+    async def fetch(agent):
+        return {"name": agent.name}
+
+    poller = FleetPoller([AgentConfig(url="http://a:1")], interval=0.05, fetch=fetch)
+    poller.start()
+    try:
+        qtbot.waitUntil(lambda: poller.store.get("a:1") is not None)
+        agents = [AgentConfig(url="http://b:2")]
+        if not remove:
+            agents.append(AgentConfig(url="http://a:1"))
+        poller.set_agents(agents)
+        qtbot.waitUntil(lambda: poller.store.get("b:2") is not None)
+    finally:
+        poller.stop()
+    assert (poller.store.get("a:1") is None) == remove
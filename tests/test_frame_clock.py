@@ -0,0 +1,37 @@
+from PyQt6.QtWidgets import QWidget
+from nodeone.services.frame_clock import FrameClock
+from nodeone.views.components.navbar import NavButton
+
+
+def test_one_timer_drives_all_tweens_and_stops(qtbot):
+    clock = FrameClock()
+    widgets = [QWidget() for _ in range(3)]
+    values = {}
+    for i, widget in enumerate(widgets):
+        qtbot.addWidget(widget)
+        widget.show()
+        clock.animate(widget, "x", 0.0, 1.0, 50, lambda v, i=i: values.__setitem__(i, v))
+    assert clock.running
+
+    qtbot.waitUntil(lambda: not clock.running, timeout=2000)
+    assert values == {0: 1.0, 1: 1.0, 2: 1.0}
+
+
+def test_hidden_widgets_finish_without_frames(qtbot):
+    clock = FrameClock()
+    widget = QWidget()
+    qtbot.addWidget(widget)
+    values = []
+    clock.animate(widget, "x", 0.0, 1.0, 1000, values.append)
+    assert values == [1.0]
+    assert not clock.running
+
+
+def test_nav_button_hover_uses_shared_clock(qtbot):
+    button = NavButton("Home")
+    qtbot.addWidget(button)
+    button.show()
+    button._animate_hover(1.0)
+    assert button.clock is FrameClock.instance()
+    qtbot.waitUntil(lambda: button.hover_progress == 1.0, timeout=2000)
+    assert not button.clock.running
@@ -0,0 +1,153 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from PyQt6.QtWidgets import QWidget
+from nodeone.services.http_client import HttpClient
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        server.hits.append(self.path)
+        if self.path.startswith("/slow"):
+            time.sleep(0.2)
+        body = json.dumps({"title": "hello", "path": self.path}).encode()
+        if self.path.startswith("/etag") and self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if self.path.startswith("/etag"):
+            self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.hits = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _url(server, path):
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def test_identical_requests_are_collapsed(qtbot, server):
+    client = HttpClient()
+    results = []
+    for _ in range(5):
+        client.get(_url(server, "/slow")).finished.connect(results.append)
+    assert client.in_flight == 1
+
+    qtbot.waitUntil(lambda: len(results) == 5)
+    assert server.hits == ["/slow"]
+    assert all(r.json()["title"] == "hello" for r in results)
+    client.shutdown()
+
+
+def test_ttl_cache_and_etag_revalidation(qtbot, server):
+    client = HttpClient()
+    results = []
+
+    client.get(_url(server, "/ttl"), ttl=60).finished.connect(results.append)
+    qtbot.waitUntil(lambda: len(results) == 1)
+    client.get(_url(server, "/ttl"), ttl=60).finished.connect(results.append)
+    qtbot.waitUntil(lambda: len(results) == 2)
+    assert server.hits == ["/ttl"]
+
+    client.get(_url(server, "/etag")).finished.connect(results.append)
+    qtbot.waitUntil(lambda: len(results) == 3)
+    client.get(_url(server, "/etag")).finished.connect(results.append)
+    qtbot.waitUntil(lambda: len(results) == 4)
+    assert server.hits == ["/ttl", "/etag", "/etag"]
+    assert results[3].status == 200
+    assert results[3].json()["path"] == "/etag"
+    client.shutdown()
+
+
+def test_requests_with_other_headers_are_not_shared(qtbot, server):
+    client = HttpClient()
+    results = []
+    client.get(_url(server, "/slow"), ttl=60).finished.connect(results.append)
+    client.get(_url(server, "/slow"), headers={"Accept": "text/plain"}, ttl=60).finished.connect(results.append)
+    assert client.in_flight == 2
+    qtbot.waitUntil(lambda: len(results) == 2)
+    client.get(_url(server, "/slow"), headers={"accept": "text/plain"}, ttl=60).finished.connect(results.append)
+    qtbot.waitUntil(lambda: len(results) == 3)
+    assert server.hits == ["/slow", "/slow"]
+    client.shutdown()
+
+
+def test_not_modified_after_eviction_is_fetched_again(qtbot, server):
+    client = HttpClient()
+    results = []
+    client.get(_url(server, "/etag")).finished.connect(results.append)
+    qtbot.waitUntil(lambda: len(results) == 1)
+    client.get(_url(server, "/etag")).finished.connect(results.append)
+    client.clear_cache()  # evicted while the 304 is on its way
+    qtbot.waitUntil(lambda: len(results) == 2)
+    assert server.hits == ["/etag"] * 3
+    assert results[1].status == 200 and results[1].json()["path"] == "/etag"
+    client.shutdown()
+
+
+def test_lru_eviction(qtbot, server):
+    client = HttpClient(cache_size=2)
+    results = []
+    for i, path in enumerate(("/a", "/b", "/c")):
+        client.get(_url(server, path), ttl=60).finished.connect(results.append)
+        qtbot.waitUntil(lambda: len(results) == i + 1)
+    client.get(_url(server, "/a"), ttl=60).finished.connect(results.append)
+    qtbot.waitUntil(lambda: len(results) == 4)
+    assert server.hits == ["/a", "/b", "/c", "/a"]
+    client.shutdown()
+
+
+def test_owner_destruction_cancels(qtbot, server):
+    client = HttpClient()
+    owner = QWidget()
+    results = []
+    request = client.get(_url(server, "/slow"), owner=owner)
+    request.finished.connect(results.append)
+    owner.deleteLater()
+    qtbot.waitUntil(lambda: request.cancelled)
+    qtbot.wait(400)
+    assert results == []
+    client.shutdown()
+
+
+def test_delivery_releases_the_owner(qtbot, server):
+    client = HttpClient()
+    owner = QWidget()
+    qtbot.addWidget(owner)
+    results = []
+    request = client.get(_url(server, "/owner"), owner=owner)
+    request.finished.connect(results.append)
+    qtbot.waitUntil(lambda: len(results) == 1)
+    assert request._owner is None
+    client.shutdown()
+
+
+def test_errors_are_reported(qtbot):
+    client = HttpClient(timeout=1)
+    errors = []
+    client.get("http://127.0.0.1:1/").failed.connect(errors.append)
+    qtbot.waitUntil(lambda: len(errors) == 1)
+    client.shutdown()
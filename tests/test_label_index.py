@@ -0,0 +1,108 @@
+import pytest
+from nodeone.services.label_index import LabelIndex, matches, parse_selector
+from nodeone.views.components.tag_input import TagInputWidget
+
+NODES = {
+    "db1": ["role=db", "region=us", "ssd"],
+    "db2": ["role=db", "region=eu"],
+    "web1": ["role=web", "region=eu"],
+    "edge": ["ssd"],
+}
+
+
+@pytest.fixture
+def index():
+    index = LabelIndex()
+    index.sync(NODES)
+    return index
+
+
+@pytest.mark.parametrize(
+    "selector, expected",
+    [
+        ("role=db AND region!=eu", ["db1"]),
+        ("role==db, !ssd", ["db2"]),
+        ("region != eu", ["db1", "edge"]),
+        ("role", ["db1", "db2", "web1"]),
+        ("NOT role OR role=web and ssd", ["edge"]),
+        ("(role=web || role=db) && region=eu", ["db2", "web1"]),
+        ("role=cache", []),
+    ],
+)
+def test_selectors_match_the_per_node_predicate(index, selector, expected):
+    assert index.select(selector) == expected
+    assert index.count(selector) == len(expected)
+    assert [node for node in NODES if matches(selector, NODES[node])] == expected
+
+
+@pytest.mark.parametrize("selector", ["", "role=db AND", "role=", "(ssd", "a b", "=db", "role=db)"])
+def test_invalid_selectors_raise(selector):
+    with pytest.raises(ValueError):
+        parse_selector(selector)
+
+
+def test_updates_are_incremental(index):
+    index.set_labels("db2", ["role=db", "region=us"])
+    index.remove_node("web1")
+    index.add_labels("new", ["role=web"])  # reuses the number of web1
+    assert index.select("region=us") == ["db1", "db2"]
+    assert index.select("role=web") == ["new"]
+    assert "region=eu" not in index.labels()
+    index.remove_labels("db1", ["ssd"])
+    assert index.select("ssd") == ["edge"]
+    index.sync({"db1": ["role=db"]}, remove_others=True)
+    assert index.nodes == ["db1"] and index.select("role") == ["db1"]
+
+
+def test_index_follows_tag_input(qtbot, index):
+    edits = []
+    index.on_edit = lambda node, labels: edits.append((node, labels))
+    widget = TagInputWidget()
+    qtbot.addWidget(widget)
+    index.bind(widget, "edge")
+    assert widget.get_all_tags() == ["ssd"] and edits == []
+    widget.add_tag("role=cache")
+    widget.add_tags(["region=eu", "gpu"])
+    assert index.select("role=cache AND region=eu") == ["edge"]
+    widget.remove_tag("gpu")
+    widget.remove_tags(["ssd"])
+    assert index.labels("edge") == ["region=eu", "role=cache"]
+    assert edits[-1] == ("edge", ["region=eu", "role=cache"])
+
+
+def test_dashboard_keeps_the_tag_editor_across_agent_reloads(qtbot, index):
+    from nodeone.plugins.dashboard.plugin import DashboardWidget
+    from nodeone.services.event_bus import EventBus
+
+    bus = EventBus()
+    dashboard = DashboardWidget(bus, {"labels": index})
+    qtbot.addWidget(dashboard)
+    dashboard.node_combo.setCurrentText("edge")
+    editor = dashboard.tag_editor
+    # A tag edit saved to the settings comes back as a reload
+    editor.add_tag("gpu")
+    bus.emit("settings.agents", None)
+    assert dashboard.tag_editor is editor and editor.get_all_tags() == ["ssd", "gpu"]
+    # Labels changed in the file are shown in place
+    index.set_labels("edge", ["ssd", "region=us"])
+    bus.emit("settings.agents", None)
+    assert dashboard.tag_editor is editor and sorted(editor.get_all_tags()) == ["region=us", "ssd"]
+    assert index.labels("edge") == ["region=us", "ssd"]
+    # A new editor only once the node is gone
+    index.remove_node("edge")
+    bus.emit("settings.agents", None)
+    assert dashboard.tag_editor is not editor
+    assert dashboard.node_combo.currentText() == "db1"
+
+
+def test_agent_labels_are_written_back(tmp_path, monkeypatch):
+    import json
+    from nodeone.models.settings import AppSettings, save_agent_labels
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    config = tmp_path / "config.json"
+    config.write_text(json.dumps({"agents": ["http://db1:9100", {"url": "http://x", "name": "web1"}]}))
+    assert save_agent_labels("db1:9100", ["role=db"])
+    assert not save_agent_labels("missing", ["role=db"])
+    agents = AppSettings().agents
+    assert [(a.name, a.labels) for a in agents] == [("db1:9100", ["role=db"]), ("web1", [])]
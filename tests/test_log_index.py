@@ -0,0 +1,101 @@
+import json
+import logging
+import os
+import numpy as np
+from nodeone.utils.log_index import LogFileIndex, level_pattern, text_pattern
+from nodeone.utils.logger import DedupFilter, JsonFormatter, RateLimitFilter
+from nodeone.views.components.log_view import LogTableModel
+
+
+def _line(i, level="INFO", msg=None):
+    return json.dumps(
+        {"ts": 1700000000.0 + i, "level": level, "logger": "test", "msg": msg or f"message {i}"},
+        separators=(",", ":"), ensure_ascii=False,
+    )
+
+
+def _write(path, lines, mode="a"):
+    with open(path, mode, encoding="utf-8") as f:
+        for line in lines:
+            f.write(line + "\n")
+
+
+def test_index_tails_and_rebuilds(tmp_path):
+    path = tmp_path / "log.jsonl"
+    index = LogFileIndex(str(path))
+    assert not index.refresh() and len(index) == 0
+
+    _write(path, [_line(i) for i in range(3)])
+    with open(path, "a") as f:
+        f.write('{"partial": ')  # not indexed until the newline arrives
+    assert not index.refresh()
+    assert len(index) == 3
+    assert json.loads(index.line(2))["msg"] == "message 2"
+
+    with open(path, "a") as f:
+        f.write('1}\n')
+    index.refresh()
+    assert len(index) == 4 and index.line(3) == b'{"partial": 1}'
+
+    # Rotation replaces the file: the index starts over
+    os.rename(path, tmp_path / "log.jsonl.1")
+    _write(path, [_line(10)])
+    assert index.refresh()
+    assert len(index) == 1 and json.loads(index.line(0))["msg"] == "message 10"
+
+
+def test_search_combines_patterns(tmp_path):
+    path = tmp_path / "log.jsonl"
+    levels = ["INFO", "ERROR", "WARNING"]
+    _write(path, [_line(i, levels[i % 3], f"disk {i} ünïcode") for i in range(3000)])
+    index = LogFileIndex(str(path))
+    index.refresh()
+
+    errors = index.search([level_pattern("error")])
+    assert np.array_equal(errors, np.arange(1, 3000, 3))
+    matches = index.search([level_pattern("ERROR"), text_pattern("DISK 7")], first=10, last=100)
+    assert matches.tolist() == [70, 73, 76, 79]
+    assert len(index.search([text_pattern("üNïCODE")])) == 3000
+    assert index.search([], first=5, last=8).tolist() == [5, 6, 7]
+
+
+def test_model_filters_and_follows(qtbot, tmp_path):
+    path = tmp_path / "log.jsonl"
+    _write(path, [_line(i, "ERROR" if i % 10 == 0 else "INFO") for i in range(100)])
+    model = LogTableModel(LogFileIndex(str(path)))
+    model.tail()
+    assert model.rowCount() == 100
+    assert model.index(5, 3).data() == "message 5"
+
+    with qtbot.waitSignal(model.filtering, check_params_cb=lambda busy: not busy):
+        model.set_filter(level="ERROR")
+    assert model.rowCount() == 10
+
+    _write(path, [_line(100, "ERROR"), _line(101)])
+    model.tail()
+    assert model.rowCount() == 11
+    assert model.index(10, 3).data() == "message 100"
+
+    model.set_filter()
+    assert model.rowCount() == 102
+
+
+def test_filters_collapse_repeats_and_bursts():
+    dedup = DedupFilter(window=60)
+    limit = RateLimitFilter(rate=0.001, burst=3)
+
+    def record(msg, *args):
+        return logging.LogRecord("test", logging.INFO, __file__, 1, msg, args, None)
+
+    passed = [r for r in (record("same %s", 1) for _ in range(5)) if dedup.filter(r)]
+    assert len(passed) == 1
+    last = record("other")
+    assert dedup.filter(last) and last.repeated == 4
+    assert dedup.filter(record("data: %s", {"n": 1})) and dedup.filter(record("data: %s", {"n": 2}))
+    assert dedup.filter(record("data: %s", {"n": 2}))
+
+    passed = [r for r in (record("burst %d", i) for i in range(10)) if limit.filter(r)]
+    assert len(passed) == 3
+
+    entry = json.loads(JsonFormatter().format(last))
+    assert entry["msg"] == "other" and entry["repeated"] == 4
@@ -1,10 +1,103 @@
-import pytest
-from nodeone.services.manager import ManagerService
+import sys
+import threading
+import time
+from nodeone.services import manager
+from nodeone.services.event_bus import EventBus
+from nodeone.services.manager import Agent, AgentState, ManagerService, ProcessAgent
 
 def test_register_and_start_local_agent(qtbot):
     m = ManagerService()
     assert "local" in m.agents
     m.start_agent("local")
-    import time
     time.sleep(0.2)
     m.stop_agent("local")
+
+
+class _Flaky(Agent):
+    interval = 0.01
+
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+        self.setups = 0
+        self.teardowns = 0
+
+    def setup(self):
+        self.setups += 1
+
+    def step(self):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("boom")
+        return "ok"
+
+    def teardown(self):
+        self.teardowns += 1
+
+
+class _Slow(Agent):
+    interval = 0.01
+
+    def __init__(self, running, peak):
+        super().__init__()
+        self.running = running
+        self.peak = peak
+
+    def step(self):
+        with self.running:
+            self.running.count += 1
+            self.peak[0] = max(self.peak[0], self.running.count)
+        time.sleep(0.02)
+        with self.running:
+            self.running.count -= 1
+
+
+def test_failed_agent_restarts_with_backoff_and_publishes_status(qtbot, monkeypatch):
+    monkeypatch.setattr(manager, "BACKOFF_BASE", 0.01)
+    bus = EventBus()
+    states = []
+    bus.subscribe("manager.agent.*", lambda topic, status: states.append(status.state))
+    m = ManagerService(bus)
+    agent = _Flaky(failures=2)
+    m.register("flaky", agent)
+
+    m.start_agent("flaky")
+    qtbot.waitUntil(lambda: m.status("flaky").state == AgentState.RUNNING, timeout=3000)
+    status = m.status("flaky")
+    assert status.restarts == 2 and status.error is None
+    assert m.agents["flaky"].result == "ok"
+    assert agent.setups == 3 and agent.teardowns == 2
+
+    m.stop_agent("flaky")
+    qtbot.waitUntil(lambda: m.status("flaky").state == AgentState.STOPPED, timeout=3000)
+    assert agent.teardowns == 3
+    assert states == [
+        AgentState.STARTING, AgentState.BACKOFF, AgentState.RUNNING, AgentState.STOPPING, AgentState.STOPPED
+    ]
+
+
+def test_concurrency_is_bounded(qtbot):
+    running, peak = threading.Condition(), [0]
+    running.count = 0
+    m = ManagerService(max_concurrency=3)
+    for i in range(20):
+        m.register(f"slow{i}", _Slow(running, peak))
+    m.start_all()
+    assert m.in_flight <= 3
+    qtbot.waitUntil(lambda: all(a.result is not None or a.last_heartbeat for a in m.agents.values()), timeout=5000)
+    assert peak[0] <= 3
+    assert m.shutdown(deadline=2.0)
+    assert all(a.state == AgentState.STOPPED for a in m.agents.values())
+
+
+def test_process_agent_is_restarted_after_missing_heartbeats(qtbot, monkeypatch):
+    monkeypatch.setattr(manager, "BACKOFF_BASE", 0.01)
+    monkeypatch.setattr(manager, "HEALTH_INTERVAL", 0.05)
+    script = "import time\nprint('up', flush=True)\ntime.sleep(30)"
+    m = ManagerService()
+    m.register("heavy", ProcessAgent(sys.executable, ["-c", script], heartbeat_timeout=0.3))
+    m.start_agent("heavy")
+    qtbot.waitUntil(lambda: m.status("heavy").restarts >= 1, timeout=5000)
+    assert m.agents["heavy"].result == "up"
+    assert m.shutdown(deadline=2.0)
+    assert m.status("heavy").state == AgentState.STOPPED
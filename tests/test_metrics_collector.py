@@ -0,0 +1,46 @@
+from nodeone.services.event_bus import EventBus
+from nodeone.services.metrics_collector import SYSTEM_METRICS, TOPIC, MetricsCollector
+from nodeone.utils.ring_buffer import RingTable
+
+
+def test_ring_table_wraps_without_growing():
+    table = RingTable(("a", "b"), capacity=3)
+    for i in range(5):
+        table.append(float(i), (i, i * 10))
+    assert len(table) == 3
+    assert list(table.times()) == [2.0, 3.0, 4.0]
+    assert list(table.column("b")) == [20.0, 30.0, 40.0]
+    assert list(table.column("a", last=2)) == [3.0, 4.0]
+    assert table.latest() == {"a": 4.0, "b": 40.0, "timestamp": 4.0}
+
+
+def test_sample_publishes_only_changes(qtbot):
+    bus = EventBus()
+    seen = []
+    bus.subscribe(TOPIC, lambda n, p: seen.append(p))
+    collector = MetricsCollector(bus, history=4)
+
+    first = collector.sample_once()
+    assert set(first) == set(SYSTEM_METRICS)
+    assert seen == [first]
+
+    second = collector.sample_once()
+    assert set(second) <= set(SYSTEM_METRICS)
+    assert len(collector.history) == 2
+
+
+def test_background_sampling(qtbot):
+    bus = EventBus()
+    seen = []
+    bus.subscribe(TOPIC, lambda n, p: seen.append(p))
+    collector = MetricsCollector(bus, interval=0.01, history=8)
+    collector.start()
+    try:
+        qtbot.waitUntil(lambda: len(collector.history) >= 8)
+        qtbot.waitUntil(lambda: collector.overhead > 0)
+    finally:
+        collector.stop()
+    assert not collector.running
+    assert len(collector.history) == 8
+    assert seen
+    assert collector.overhead < 0.5
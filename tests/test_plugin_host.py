@@ -0,0 +1,98 @@
+import numpy as np
+from PyQt6.QtWidgets import QLabel
+from nodeone.services.event_bus import EventBus
+from nodeone.services.manager import AgentState, ManagerService
+from nodeone.services.plugin_host import PluginHostService
+from nodeone.services.plugin_manager import PluginManager
+from nodeone.services.registry import ServiceRegistry
+
+VIEW_SOURCE = '''
+from PyQt6.QtWidgets import QLabel
+
+TAB_TITLE = "Isolated"
+ISOLATED = True
+
+def create_plugin(event_bus, backend):
+    label = QLabel("isolated")
+    label.backend = backend
+    return label
+'''
+
+BACKEND_SOURCE = '''
+import os
+import numpy as np
+
+class Backend:
+    def __init__(self, host):
+        self.host = host
+        host.subscribe("ping")
+
+    def add(self, a, b):
+        return a + b
+
+    def series(self, n):
+        return self.host.publish("series", np.arange(n, dtype=np.float64))
+
+    def crash(self):
+        os._exit(3)
+
+    def on_event(self, topic, payload):
+        self.host.emit("pong", payload + 1)
+
+def create_backend(host):
+    return Backend(host)
+'''
+
+
+def test_isolated_plugin_runs_in_a_restarted_host(qtbot, tmp_path):
+    plugin_dir = tmp_path / "plugins" / "isolated"
+    plugin_dir.mkdir(parents=True)
+    (plugin_dir / "plugin.py").write_text(VIEW_SOURCE)
+    (plugin_dir / "backend.py").write_text(BACKEND_SOURCE)
+    plugins = PluginManager(str(tmp_path / "plugins"), index_path=str(tmp_path / "index.json"))
+    plugins.discover()
+    spec = plugins.get_spec("isolated")
+    assert spec.isolated
+
+    bus = EventBus()
+    manager = ManagerService(bus)
+    host = PluginHostService(manager, bus)
+    services = ServiceRegistry()
+    services.register("plugin_host", host)
+    try:
+        widget = spec.create_widget(bus, services)
+        qtbot.addWidget(widget)
+        assert isinstance(widget, QLabel)
+        proxy = widget.backend
+        results = []
+        # Queued until the host connects
+        proxy.call("add", 2, 3, callback=lambda ok, value: results.append((ok, value)))
+        qtbot.waitUntil(lambda: results == [(True, 5)], timeout=10_000)
+        first_pid = proxy.pid
+        assert first_pid is not None and manager.status("plugin.isolated").state == AgentState.RUNNING
+
+        arrays = []
+        proxy.array_ready.connect(lambda name, view: arrays.append((name, view.copy())))
+        proxy.call("series", 100_000)
+        qtbot.waitUntil(lambda: len(arrays) == 1)
+        assert arrays[0][0] == "series" and np.array_equal(arrays[0][1], np.arange(100_000))
+        assert not proxy.array("series").flags.writeable
+
+        pongs = []
+        bus.subscribe("pong", lambda topic, payload: pongs.append(payload))
+        bus.emit("ping", 41)
+        qtbot.waitUntil(lambda: pongs == [42])
+
+        # A crashed host fails the call in flight and is restarted
+        proxy.call("crash", callback=lambda ok, value: results.append((ok, value)))
+        qtbot.waitUntil(lambda: len(results) == 2)
+        assert results[1] == (False, "plugin host exited")
+        qtbot.waitUntil(lambda: proxy.is_connected, timeout=10_000)
+        assert proxy.pid != first_pid and manager.status("plugin.isolated").restarts == 1
+        proxy.call("add", 1, 1, callback=lambda ok, value: results.append((ok, value)))
+        qtbot.waitUntil(lambda: results[-1] == (True, 2))
+        bus.emit("ping", 1)
+        qtbot.waitUntil(lambda: pongs == [42, 2])
+    finally:
+        host.close()
+        assert manager.shutdown(deadline=5.0)
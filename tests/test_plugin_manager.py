@@ -0,0 +1,113 @@
+import os
+from PyQt6.QtWidgets import QLabel
+from nodeone.services.plugin_manager import PluginManager, read_manifest
+
+PLUGIN_SOURCE = '''
+from PyQt6.QtWidgets import QLabel
+
+TAB_TITLE = "Heavy"
+TOPICS = ["metrics.*"]
+IMPORTED = True
+
+def create_plugin(event_bus):
+    return QLabel("heavy")
+'''
+
+
+def _write_plugin(root, name, source=PLUGIN_SOURCE):
+    plugin_dir = root / name
+    plugin_dir.mkdir()
+    path = plugin_dir / "plugin.py"
+    path.write_text(source)
+    return path
+
+
+def test_read_manifest_does_not_import(tmp_path):
+    path = _write_plugin(tmp_path, "heavy", PLUGIN_SOURCE + "\nraise SystemExit\n")
+    manifest = read_manifest(str(path))
+    assert manifest == {
+        "entry_point": "create_plugin",
+        "title": "Heavy",
+        "topics": ["metrics.*"],
+    }
+
+
+def test_discover_is_lazy_and_indexed(qtbot, tmp_path, monkeypatch):
+    plugins = tmp_path / "plugins"
+    plugins.mkdir()
+    _write_plugin(plugins, "heavy")
+    index = tmp_path / "index.json"
+
+    manager = PluginManager(str(plugins), index_path=str(index))
+    assert manager.discover() == ["heavy"]
+    spec = manager.get_spec("heavy")
+    assert spec.title == "Heavy"
+    assert spec.topics == ["metrics.*"]
+    assert not spec.is_loaded
+    assert index.is_file()
+
+    # A second discovery reuses the index instead of parsing the file again
+    calls = []
+    monkeypatch.setattr(
+        "nodeone.services.plugin_manager.read_manifest",
+        lambda path: calls.append(path) or {},
+    )
+    again = PluginManager(str(plugins), index_path=str(index))
+    assert again.discover() == ["heavy"]
+    assert calls == []
+
+    # Touching the file invalidates its entry
+    path = plugins / "heavy" / "plugin.py"
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    PluginManager(str(plugins), index_path=str(index)).discover()
+    assert calls == [os.path.abspath(path)]
+
+    widget = spec.create_widget(event_bus=None)
+    qtbot.addWidget(widget)
+    assert isinstance(widget, QLabel)
+    assert spec.module.IMPORTED
+
+
+def test_warm_imports_in_background(tmp_path):
+    plugins = tmp_path / "plugins"
+    plugins.mkdir()
+    _write_plugin(plugins, "heavy")
+    manager = PluginManager(str(plugins), index_path=str(tmp_path / "index.json"))
+    manager.discover()
+
+    manager.warm(["heavy", "missing"]).join(5)
+    assert manager.get_spec("heavy").is_loaded
+
+
+def test_factories_get_services_only_by_name(qtbot, tmp_path):
+    plugins = tmp_path / "plugins"
+    plugins.mkdir()
+    _write_plugin(plugins, "parented", '''
+from PyQt6.QtWidgets import QLabel
+
+def create_plugin(event_bus, parent=None):
+    return QLabel(str(parent))
+''')
+    _write_plugin(plugins, "widget", '''
+from PyQt6.QtWidgets import QLabel
+
+class Plugin(QLabel):
+    def __init__(self, event_bus, parent=None):
+        super().__init__("widget", parent)
+''')
+    _write_plugin(plugins, "services", '''
+from PyQt6.QtWidgets import QLabel
+
+def create_plugin(event_bus, services=None):
+    return QLabel(str(services))
+''')
+    manager = PluginManager(str(plugins), index_path=str(tmp_path / "index.json"))
+    services = {"name": "registry"}
+
+    widgets = {name: manager.get_spec(name).create_widget(None, services) for name in manager.discover()}
+    for widget in widgets.values():
+        qtbot.addWidget(widget)
+    assert widgets["parented"].text() == "None"
+    assert widgets["widget"].parent() is None
+    assert widgets["services"].text() == str(services)
@@ -0,0 +1,132 @@
+import os
+import pytest
+from nodeone.services.process_scanner import MAX_SKIP, ProcessScanner
+from nodeone.views.components.process_table import ProcessTableModel
+
+TICKS = os.sysconf("SC_CLK_TCK")
+PAGE = os.sysconf("SC_PAGE_SIZE")
+
+
+class FakeProc:
+    """A /proc tree with hand-written stat files."""
+
+    def __init__(self, root):
+        self.root = root
+        (root / "stat").write_text("cpu  1 2 3\nbtime 1700000000\n")
+
+    def set(self, pid, comm="worker", state="S", cpu_ticks=0, threads=1, rss_pages=100, start=500, cmdline=None):
+        directory = self.root / str(pid)
+        directory.mkdir(exist_ok=True)
+        fields = [state, "1", str(pid), str(pid), "0", "-1", "4194304", "0", "0", "0", "0",
+                  str(cpu_ticks), "0", "0", "0", "20", "0", str(threads), "0", str(start),
+                  "1000000", str(rss_pages)]
+        (directory / "stat").write_text(f"{pid} ({comm}) {' '.join(fields)} 0 0 0\n")
+        if cmdline is not None:
+            (directory / "cmdline").write_bytes(b"\0".join(a.encode() for a in cmdline) + b"\0")
+
+    def remove(self, pid):
+        directory = self.root / str(pid)
+        for child in directory.iterdir():
+            child.unlink()
+        directory.rmdir()
+
+
+@pytest.fixture
+def proc(tmp_path):
+    return FakeProc(tmp_path)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_scan_reports_added_changed_and_removed(proc, monkeypatch):
+    proc.set(1, "init", cmdline=["/sbin/init"])
+    proc.set(2, "a-very-long-nam", cmdline=["/usr/bin/a-very-long-name", "--flag"])
+    proc.set(3, "busy", state="R")
+    clock = Clock()
+    scanner = ProcessScanner(str(proc.root), clock=clock)
+
+    reads = []
+    read_info = scanner._read_info
+    monkeypatch.setattr(scanner, "_read_info", lambda *a: reads.append(a[0]) or read_info(*a))
+
+    delta = scanner.scan()
+    assert sorted(delta.added) == [1, 2, 3] and not delta.changed and not delta.removed
+    assert delta.added[2][1] == "a-very-long-name"
+    assert delta.added[3][5:] == (1, "running")
+    info = scanner.info(2)
+    assert info.cmdline == ["/usr/bin/a-very-long-name", "--flag"]
+    assert info.create_time == 1700000000 + 500 / TICKS
+
+    # One second later process 3 used half a core and process 1 exited
+    clock.now += 1
+    proc.set(3, "busy", state="R", cpu_ticks=TICKS // 2, rss_pages=200)
+    proc.remove(1)
+    delta = scanner.scan(full=True)
+    assert delta.removed == [1] and not delta.added
+    assert list(delta.changed) == [3]
+    assert delta.changed[3][3] == 50.0 and delta.changed[3][4] == 200 * PAGE
+
+    # PID 2 was reused by a new process: reported as removed and added again
+    clock.now += 1
+    proc.set(2, "other", start=900, cmdline=["other"])
+    delta = scanner.scan(full=True)
+    assert delta.removed == [2] and delta.added[2][1] == "other"
+    # Static attributes are read once per process lifetime
+    assert sorted(reads) == [1, 2, 2, 3]
+
+    model = ProcessTableModel()
+    model.update_snapshot({1: (1, "init", "", 0.0, 0, 1, "sleeping"), 2: (2, "old", "", 0.0, 0, 1, "sleeping")})
+    model.apply_delta(delta.removed + [1], delta.changed, delta.added)
+    assert model.pids() == [2] and model.row_for_pid(2)[1] == "other"
+
+
+def test_idle_processes_are_sampled_less_often(proc):
+    for pid in range(1, 11):
+        proc.set(pid)
+    clock = Clock()
+    scanner = ProcessScanner(str(proc.root), clock=clock)
+    scanner.scan()
+
+    sampled = []
+    busy_ticks = 0
+    for _ in range(32):
+        clock.now += 1
+        busy_ticks += TICKS
+        proc.set(1, state="R", cpu_ticks=busy_ticks)
+        sampled.append(scanner.scan().sampled)
+
+    # The busy process is read every scan, the idle ones every MAX_SKIP / 2
+    # to MAX_SKIP scans, and not all in the same one
+    assert MAX_SKIP + 9 <= sum(sampled[-MAX_SKIP:]) <= MAX_SKIP + 2 * 9
+    assert max(sampled[-MAX_SKIP:]) < 10
+    assert scanner.rows()[1][3] == 100.0
+
+
+def test_scans_this_machine():
+    scanner = ProcessScanner()
+    delta = scanner.scan()
+    assert os.getpid() in delta.added
+    row = delta.added[os.getpid()]
+    assert row[4] > 0 and row[5] >= 1
+    assert scanner.info(os.getpid()).exe
+
+
+def test_failed_scan_does_not_stop_the_widget(qtbot, monkeypatch):
+    from nodeone.plugins.processes.plugin import ProcessesWidget
+    from nodeone.services.event_bus import EventBus
+
+    def fail(self):
+        raise OSError("proc unavailable")
+
+    monkeypatch.setattr(ProcessScanner, "scan", fail)
+    widget = ProcessesWidget(EventBus())
+    qtbot.addWidget(widget)
+    widget.timer.stop()
+    qtbot.waitUntil(lambda: not widget._busy)
+    assert widget.model.rowCount() == 0
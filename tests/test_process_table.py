@@ -0,0 +1,118 @@
+import random
+import time
+from PyQt6.QtCore import Qt
+from nodeone.views.components.process_table import (
+    ProcessFilterProxyModel,
+    ProcessTableModel,
+    ProcessTableView,
+)
+
+
+def _row(pid, name="proc", cpu=0.0):
+    return (pid, name, "root", cpu, 1024 * pid, 1, "running")
+
+
+def _snapshot(n, cpu=0.0):
+    return {pid: _row(pid, f"proc-{pid}", cpu) for pid in range(1, n + 1)}
+
+
+def test_model_is_consistent(qtmodeltester):
+    model = ProcessTableModel()
+    model.update_snapshot(_snapshot(50))
+    qtmodeltester.check(model)
+
+
+def test_diff_reports_only_changes(qtbot):
+    model = ProcessTableModel()
+    model.update_snapshot({1: _row(1), 2: _row(2), 3: _row(3), 4: _row(4)})
+
+    events = []
+    model.rowsRemoved.connect(lambda _, a, b: events.append(("removed", a, b)))
+    model.rowsInserted.connect(lambda _, a, b: events.append(("inserted", a, b)))
+    model.dataChanged.connect(
+        lambda tl, br: events.append(("changed", tl.row(), br.row(), tl.column(), br.column()))
+    )
+
+    model.update_snapshot({1: _row(1), 2: _row(2, cpu=5.0), 3: _row(3, cpu=7.0), 5: _row(5)})
+    assert events == [
+        ("removed", 3, 3),
+        ("changed", 1, 2, 3, 3),
+        ("inserted", 3, 3),
+    ]
+    assert model.pids() == [1, 2, 3, 5]
+    assert model.row_for_pid(3)[3] == 7.0
+
+
+def test_proxy_sorts_and_filters(qtbot):
+    model = ProcessTableModel()
+    model.update_snapshot({1: _row(1, "Zeta", 1.0), 2: _row(2, "alpha", 9.0), 3: _row(3, "beta", 5.0)})
+    proxy = ProcessFilterProxyModel()
+    proxy.setSourceModel(model)
+
+    proxy.sort(1, Qt.SortOrder.AscendingOrder)
+    names = [proxy.index(r, 1).data() for r in range(proxy.rowCount())]
+    assert names == ["alpha", "beta", "Zeta"]
+
+    proxy.sort(3, Qt.SortOrder.DescendingOrder)
+    assert [proxy.index(r, 0).data() for r in range(3)] == ["2", "3", "1"]
+
+    proxy.set_filter_text("ZE")
+    assert proxy.rowCount() == 1
+    assert proxy.index(0, 1).data() == "Zeta"
+
+
+
+def test_selection_follows_the_process_through_removals(qtbot):
+    model = ProcessTableModel()
+    proxy = ProcessFilterProxyModel()
+    proxy.setSourceModel(model)
+    view = ProcessTableView()
+    qtbot.addWidget(view)
+    view.setModel(proxy)
+    snapshot = {pid: _row(pid, f"proc-{pid}", cpu=pid % 4) for pid in range(1, 13)}
+    model.update_snapshot(snapshot)
+
+    def pids():
+        return [int(proxy.index(r, 0).data()) for r in range(proxy.rowCount())]
+
+    for column, order in ((-1, Qt.SortOrder.AscendingOrder), (3, Qt.SortOrder.DescendingOrder)):
+        proxy.sort(column, order)
+        view.selectRow(pids().index(10))
+        expected = [pid for pid in pids() if pid not in (3, 4, 7, 12)]
+        for pid in (3, 4, 7, 12):
+            del snapshot[pid]
+        model.update_snapshot(snapshot)
+
+        assert pids() == expected
+        assert [int(index.data()) for index in view.selectionModel().selectedRows()] == [10]
+        assert int(view.currentIndex().siblingAtColumn(0).data()) == 10
+        assert model.pids() == sorted(snapshot)
+        snapshot.update({pid: _row(pid, f"proc-{pid}") for pid in (3, 4, 7, 12)})
+        model.update_snapshot(snapshot)
+
+def test_refresh_of_10k_processes_is_fast(qtbot):
+    model = ProcessTableModel()
+    proxy = ProcessFilterProxyModel()
+    proxy.setSourceModel(model)
+    view = ProcessTableView()
+    qtbot.addWidget(view)
+    view.setModel(proxy)
+    view.sortByColumn(3, Qt.SortOrder.DescendingOrder)
+
+    snapshot = _snapshot(10_000)
+    model.update_snapshot(snapshot)
+
+    rng = random.Random(1)
+    # A typical tick: a few processes come and go, a few hundred change CPU
+    for pid in rng.sample(sorted(snapshot), 300):
+        snapshot[pid] = _row(pid, f"proc-{pid}", rng.random() * 100)
+    for pid in rng.sample(sorted(snapshot), 10):
+        del snapshot[pid]
+    for pid in range(20_000, 20_010):
+        snapshot[pid] = _row(pid)
+
+    started = time.perf_counter()
+    model.update_snapshot(snapshot)
+    elapsed = time.perf_counter() - started
+    assert model.rowCount() == 10_000
+    assert elapsed < 0.25  # generous bound for CI; typically a few ms
@@ -0,0 +1,70 @@
+import json
+import pytest
+from nodeone.models import settings as settings_module
+from nodeone.models.settings import AppSettings, get_settings
+from nodeone.services.event_bus import EventBus
+from nodeone.services.settings_watcher import SettingsWatcher, diff_settings
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("NODEONE_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(settings_module, "_settings", None)
+    path = tmp_path / "config.json"
+
+    def write(data):
+        path.write_text(json.dumps(data))
+
+    write({"ui": {"theme": "dark"}, "agents": ["http://a:1"]})
+    return write
+
+
+def test_diff_reports_changed_sections():
+    old = AppSettings(ui={"theme": "dark"}, agents=["http://a:1"])
+    new = AppSettings(ui={"theme": "light", "width": 1200}, agents=["http://a:1"], poller={"interval": 2})
+    assert diff_settings(old, new) == {
+        "ui": ["ui.theme", "ui.width"],
+        "poller": ["poller.interval"],
+    }
+    assert diff_settings(old, old.model_copy(deep=True)) == {}
+
+
+def test_watcher_publishes_only_changed_sections(qtbot, config, monkeypatch):
+    assert get_settings().ui.theme == "dark"
+    reads = []
+    read = settings_module.read_config_file
+    monkeypatch.setattr(settings_module, "read_config_file", lambda *a, **k: reads.append(1) or read(*a, **k))
+    bus = EventBus()
+    events = []
+    bus.subscribe("settings.*", lambda topic, change: events.append((topic, change)))
+    watcher = SettingsWatcher(bus, debounce_ms=20)
+    watcher.start()
+
+    with qtbot.waitSignal(watcher.reloaded, timeout=3000):
+        config({"ui": {"theme": "light"}, "agents": ["http://a:1", "http://b:2"]})
+    assert sorted(topic for topic, _ in events) == ["settings.agents", "settings.ui"]
+    ui = dict(events)["settings.ui"]
+    assert (ui.old.theme, ui.new.theme, ui.changed) == ("dark", "light", ["ui.theme"])
+    assert get_settings().ui.theme == "light"
+    assert reads == []  # built from the data the watcher parsed, not read again
+
+    # A broken file leaves the current settings in place
+    events.clear()
+    with qtbot.assertNotEmitted(watcher.reloaded, wait=300):
+        (settings_module.config_file()).write_text('{"ui": {"theme": ')
+    assert events == [] and get_settings().ui.theme == "light"
+    watcher.stop()
+
+
+def test_watcher_reads_the_file_it_watches(qtbot, config, tmp_path):
+    assert get_settings().ui.theme == "dark"
+    other = tmp_path / "other.json"
+    watcher = SettingsWatcher(EventBus(), path=str(other), debounce_ms=20)
+    watcher.start()
+
+    with qtbot.waitSignal(watcher.reloaded, timeout=3000) as blocker:
+        other.write_text(json.dumps({"ui": {"theme": "light"}, "agents": ["http://a:1"]}))
+    assert blocker.args == [{"ui": ["ui.theme"]}]
+    assert get_settings().ui.theme == "light"
+    watcher.stop()
@@ -0,0 +1,70 @@
+import time
+from PyQt6.QtCore import QTimer
+from nodeone.services.stall_detector import STALLS, StallDetector
+
+
+def _slow_handler():
+    time.sleep(0.3)
+
+
+def _short_stall():
+    time.sleep(0.15)
+
+
+def test_stall_is_sampled_and_written_as_collapsed_stacks(qtbot, tmp_path):
+    path = tmp_path / "stalls.folded"
+    detector = StallDetector(threshold=0.05, path=str(path))
+    detector.start()
+    try:
+        qtbot.wait(200)
+        assert not detector.stalls
+        before = STALLS.value
+
+        QTimer.singleShot(0, _slow_handler)
+        qtbot.waitUntil(lambda: len(detector.stalls) == 1, timeout=2000)
+        stall = detector.stalls[0]
+        assert 0.2 <= stall.duration < 1.0
+        assert stall.samples >= 10
+        assert stall.stack.rsplit(";", 1)[-1].startswith("_slow_handler (test_stall_detector.py:")
+        assert STALLS.value == before + 1
+
+        lines = path.read_text().splitlines()
+        stack, count = lines[0].rsplit(" ", 1)
+        assert stack == stall.stack and int(count) >= 10
+    finally:
+        detector.stop()
+    assert not detector.running
+
+
+def test_every_stall_over_the_threshold_is_caught(qtbot, tmp_path):
+    detector = StallDetector(threshold=0.1, path=str(tmp_path / "stalls.folded"))
+    detector.start()
+    try:
+        # Stalls starting at different points between two pings
+        for gap in (130, 170, 110, 190, 150):
+            qtbot.wait(gap)
+            QTimer.singleShot(0, _short_stall)
+        qtbot.waitUntil(lambda: len(detector.stalls) == 5, timeout=2000)
+        assert all(0.1 <= stall.duration < 0.3 for stall in detector.stalls)
+    finally:
+        detector.stop()
+
+
+def test_a_block_shorter_than_the_threshold_is_not_recorded(qtbot, tmp_path):
+    detector = StallDetector(threshold=0.2, path=str(tmp_path / "stalls.folded"))
+    # Right after answering two pings the loop blocks for 170 ms, then for
+    # 160 ms: the second ping is sampled, but no block passes the threshold
+    blocks = [0.17, 0.16]
+
+    def block():
+        if blocks:
+            time.sleep(blocks.pop(0))
+
+    detector._ping.connect(block)
+    detector.start()
+    try:
+        qtbot.waitUntil(lambda: not blocks, timeout=2000)
+        qtbot.wait(300)
+        assert not detector.stalls
+    finally:
+        detector.stop()
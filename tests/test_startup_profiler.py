@@ -0,0 +1,57 @@
+import importlib
+import json
+import subprocess
+import sys
+from nodeone.models import settings_cache
+from nodeone.utils.startup_profiler import StartupProfiler
+
+
+def test_phases_imports_and_history(tmp_path, monkeypatch):
+    (tmp_path / "slow_module_for_profiler.py").write_text("import time\ntime.sleep(0.02)\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    profiler = StartupProfiler(trace_imports=True)
+    with profiler.phase("imports"):
+        importlib.import_module("slow_module_for_profiler")
+    profiler.mark("first_frame")
+    profiler.stop()
+    sys.modules.pop("slow_module_for_profiler", None)
+
+    assert profiler.phases["imports"] >= 0.02
+    name, own, total = profiler.slowest_imports(1, before="first_frame")[0]
+    assert name == "slow_module_for_profiler" and own >= 0.02
+
+    history = str(tmp_path / "history.jsonl")
+    profiler.save(history)
+    profiler.save(history)
+    records = profiler.load_history(history)
+    assert len(records) == 2
+    assert "median of last 2" in profiler.report(records)
+
+
+
+def test_profiler_imports_nothing_it_would_time():
+    # app.main imports the profiler before it starts timing
+    code = "import sys, nodeone.utils.startup_profiler; print(*sorted(m for m in sys.modules if 'nodeone' in m))"
+    modules = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert modules.split() == ["nodeone", "nodeone.utils", "nodeone.utils.startup_profiler"]
+
+def test_settings_snapshot_tracks_config_and_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("NODEONE_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.delenv("UI__WIDTH", raising=False)
+    config = tmp_path / "config.json"
+    config.write_text(json.dumps({"ui": {"width": 640}}))
+
+    settings_cache.write_snapshot({"ui": {"width": 640}}, ["ui"])
+    assert settings_cache.read_snapshot() == {"ui": {"width": 640}}
+    assert settings_cache.startup_ui().width == 640
+
+    # Changing a relevant environment variable invalidates the snapshot
+    monkeypatch.setenv("UI__WIDTH", "800")
+    assert settings_cache.read_snapshot() is None
+    monkeypatch.delenv("UI__WIDTH")
+    assert settings_cache.read_snapshot() is not None
+
+    config.write_text(json.dumps({"ui": {"width": 1024}}))
+    assert settings_cache.read_snapshot() is None
@@ -0,0 +1,40 @@
+from nodeone.views.components.tag_input import TagInputWidget
+
+
+def test_bulk_apis_emit_once_per_batch(qtbot):
+    widget = TagInputWidget()
+    qtbot.addWidget(widget)
+    added, removed, single = [], [], []
+    widget.tags_added.connect(added.append)
+    widget.tags_removed.connect(removed.append)
+    widget.tag_added.connect(single.append)
+
+    widget.add_tags(f"tag-{i}" for i in range(500))
+    widget.add_tags(["tag-1", "tag-500"])
+    assert [len(batch) for batch in added] == [500, 1]
+    assert single == []
+
+    widget.set_tags(["tag-2", "tag-3", "new"])
+    assert removed == [[t for t in (f"tag-{i}" for i in range(501)) if t not in ("tag-2", "tag-3")]]
+    assert added[-1] == ["new"]
+    assert widget.get_all_tags() == ["tag-2", "tag-3", "new"]
+
+
+def test_input_adds_tags_and_completes_from_trie(qtbot):
+    widget = TagInputWidget()
+    qtbot.addWidget(widget)
+    widget.set_completions(["env=prod", "env=dev", "region=eu"])
+    single = []
+    widget.tag_added.connect(single.append)
+
+    widget.lineEdit.setText("env=dev")
+    widget.add_tag_from_input()
+    assert single == ["env=dev"]
+    assert widget.lineEdit.text() == ""
+
+    widget._update_completions("ENV")
+    # Tags already present are not offered again
+    assert widget.completer.model().stringList() == ["env=prod"]
+
+    widget.remove_tag("env=dev")
+    assert widget.get_all_tags() == []
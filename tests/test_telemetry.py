@@ -0,0 +1,71 @@
+import threading
+import urllib.request
+from nodeone.services.metrics_server import CONTENT_TYPE, MetricsServer
+from nodeone.services.telemetry import FOLD_BATCH, MetricsRegistry
+
+
+def test_counters_and_histograms_sum_across_threads():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests", "Requests")
+    latency = registry.histogram("latency_seconds", "Latency", ["route"], buckets=(0.1, 1.0))
+
+    def work():
+        for i in range(FOLD_BATCH * 3 + 7):
+            requests.inc()
+            latency.labels("/a").observe(0.5 if i % 2 else 0.05)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    per_thread = FOLD_BATCH * 3 + 7
+    assert requests.value == 4 * per_thread
+    cumulative, total, count = latency.labels("/a").snapshot()
+    assert count == 4 * per_thread
+    assert cumulative == [4 * (per_thread // 2 + 1), count]
+    assert registry.histogram("latency_seconds", "Latency", ["route"]) is latency
+    # The exited threads' cells were folded away without losing anything
+    assert not requests._unlabelled._cells and not latency.labels("/a")._cells
+    assert latency.labels("/a").snapshot() == (cumulative, total, count)
+
+
+def test_render_prometheus_text():
+    registry = MetricsRegistry()
+    registry.counter("events", "Events seen").inc(3)
+    depth = registry.gauge("depth", "Queue depth", ["queue"])
+    depth.labels('we"ird').set(2)
+    depth.labels("pool").set_function(lambda: 5)
+    registry.histogram("paint_seconds", "Paint", buckets=(0.01,)).observe(0.002)
+
+    assert registry.render().splitlines() == [
+        "# HELP depth Queue depth",
+        "# TYPE depth gauge",
+        'depth{queue="pool"} 5',
+        'depth{queue="we\\"ird"} 2',
+        "# HELP events Events seen",
+        "# TYPE events counter",
+        "events_total 3",
+        "# HELP paint_seconds Paint",
+        "# TYPE paint_seconds histogram",
+        'paint_seconds_bucket{le="0.01"} 1',
+        'paint_seconds_bucket{le="+Inf"} 1',
+        "paint_seconds_sum 0.002",
+        "paint_seconds_count 1",
+    ]
+
+
+def test_server_serves_registry():
+    registry = MetricsRegistry()
+    registry.counter("hits", "Hits").inc()
+    server = MetricsServer(0, registry=registry)
+    server.start()
+    try:
+        host, port = server.address
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as response:
+            assert response.headers["Content-Type"] == CONTENT_TYPE
+            assert "hits_total 1" in response.read().decode()
+    finally:
+        server.stop()
+    assert not server.running
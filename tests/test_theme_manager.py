@@ -0,0 +1,45 @@
+import pytest
+from PyQt6.QtGui import QPalette
+from PyQt6.QtWidgets import QLineEdit, QWidget
+from nodeone.services.theme_manager import ThemeManager, compile_theme, set_style_property
+
+TEMPLATE = "QLineEdit { border: 1px solid @accent; } /* @ignored */"
+
+
+def test_compile_resolves_variables_and_palette():
+    theme = compile_theme(
+        "t",
+        {"palette": {"window": "#101010", "highlight": "#0078d4"}, "variables": {"accent": "@highlight"}},
+        TEMPLATE,
+    )
+    assert theme.stylesheet.strip() == "QLineEdit { border: 1px solid #0078d4; }"
+    assert theme.palette.color(QPalette.ColorRole.Window).name() == "#101010"
+
+    with pytest.raises(KeyError):
+        compile_theme("t", {"variables": {}}, TEMPLATE)
+    with pytest.raises(ValueError):
+        compile_theme("t", {"variables": {"a": "@b", "b": "@a"}}, "")
+
+
+def test_builtin_themes_switch_without_replacing_stylesheet(qtbot):
+    window = QWidget()
+    qtbot.addWidget(window)
+    manager = ThemeManager()
+    assert {"dark", "light"} <= set(manager.themes)
+
+    manager.apply_theme(window, "dark")
+    stylesheet = window.styleSheet()
+    dark_window = window.palette().color(QPalette.ColorRole.Window).name()
+
+    manager.apply_theme(window, "light")
+    assert window.styleSheet() == stylesheet
+    assert window.palette().color(QPalette.ColorRole.Window).name() != dark_window
+    assert manager.compiled("light") is manager.compiled("light")
+
+
+def test_style_property_repolishes_only_on_change(qtbot):
+    edit = QLineEdit()
+    qtbot.addWidget(edit)
+    assert set_style_property(edit, "invalid", True)
+    assert not set_style_property(edit, "invalid", True)
+    assert edit.property("invalid") is True
@@ -0,0 +1,62 @@
+import numpy as np
+from PyQt6.QtGui import QColor
+from nodeone.utils.decimate import column_minmax
+from nodeone.views.components.time_chart import TimeSeriesChart
+
+
+def test_column_minmax_matches_a_plain_loop():
+    rng = np.random.default_rng(1)
+    t = np.sort(rng.uniform(0, 100, 5000))
+    t[(t > 40) & (t < 45)] += 10  # leaves a few columns empty
+    t.sort()
+    y = rng.normal(size=t.size)
+
+    cols, mins, maxs = column_minmax(t, y, 20.0, 0.5, 100)
+    expected = []
+    for c in range(100):
+        inside = (t >= 20 + c * 0.5) & (t < 20.5 + c * 0.5)
+        if inside.any():
+            expected.append((c, y[inside].min(), y[inside].max()))
+    assert [c for c, _, _ in expected] == cols.tolist() and len(cols) < 100
+    assert np.allclose(mins, [lo for _, lo, _ in expected])
+    assert np.allclose(maxs, [hi for _, _, hi in expected])
+    assert not len(column_minmax(t, y, 200.0, 1.0, 10)[0])
+
+
+def test_series_buffer_keeps_the_newest_samples(qtbot):
+    chart = TimeSeriesChart(capacity=100)
+    qtbot.addWidget(chart)
+    chart.add_series("a")
+    series = chart._series["a"]
+    for start in range(0, 1000, 30):
+        chart.append("a", np.arange(start, start + 30), np.arange(start, start + 30) * 2)
+    chart.append("a", 5.0, 1.0)  # older than the last sample: ignored
+    assert series.size == 100 and len(series.t) <= 125
+    assert series.times().tolist() == list(range(920, 1020))
+    assert series.values()[-1] == 2038
+
+
+def test_live_updates_draw_only_new_columns(qtbot):
+    chart = TimeSeriesChart(window=100.0, y_range=(0, 10))
+    qtbot.addWidget(chart)
+    chart.resize(200, 100)
+    chart.add_series("cpu", "#ff0000")
+    t = np.linspace(0, 100, 1_000_000, endpoint=False)
+    chart.set_data("cpu", t, np.full(t.size, 1.0))
+    chart.show()
+    qtbot.waitExposed(chart)
+    chart.grab()
+    series = chart._series["cpu"]
+    assert series.polygon.size() <= 2 * chart.width() + 1
+
+    # One second more scrolls by two columns, drawn with a few points
+    chart.append("cpu", np.linspace(100, 101, 10, endpoint=False), np.full(10, 9.0))
+    chart.grab()
+    assert series.polygon.size() <= 2 * 3 + 1
+
+    image = chart._pixmap.toImage()
+    red = QColor("#ff0000").rgb()
+    top = int((10 - 9.0) * 99 / 10)
+    bottom = int((10 - 1.0) * 99 / 10)
+    assert image.pixel(199, top) == red
+    assert image.pixel(100, bottom) == red and image.pixel(100, top) != red
@@ -0,0 +1,71 @@
+import time
+import numpy as np
+from nodeone.services.timeseries_store import DEFAULT_TIERS, Tier, TimeSeriesStore
+
+SMALL_TIERS = (Tier("raw", 0, 10), Tier("1m", 60, 10), Tier("1h", 3600, 10))
+
+
+def test_rollups_and_zero_copy_queries(tmp_path):
+    store = TimeSeriesStore(str(tmp_path), tiers=SMALL_TIERS)
+    for i in range(8):
+        store.append("node-1", "cpu", 30.0 * i, float(i))
+
+    raw = store.query("node-1", "cpu", 0, 1e9, tier="raw")
+    assert list(raw["v"]) == [float(i) for i in range(8)]
+    ring = store.series("node-1", "cpu").rings["raw"]
+    assert np.shares_memory(raw, ring.records)
+
+    # Samples at 0..210s close buckets 0, 60, 120 and 180 (the last one is open)
+    minute = store.query("node-1", "cpu", 0, 1e9, tier="1m")
+    assert list(minute["t"]) == [0.0, 60.0, 120.0]
+    assert list(minute["min"]) == [0.0, 2.0, 4.0]
+    assert list(minute["max"]) == [1.0, 3.0, 5.0]
+    assert list(minute["avg"]) == [0.5, 2.5, 4.5]
+    store.close()
+
+
+def test_ring_wraps_and_auto_tier(tmp_path):
+    store = TimeSeriesStore(str(tmp_path), tiers=SMALL_TIERS)
+    for i in range(25):
+        store.append("n", "cpu", 60.0 * i, float(i))
+
+    raw = store.query("n", "cpu", 0, 1e9, tier="raw")
+    assert list(raw["t"]) == [60.0 * i for i in range(15, 25)]
+    # The raw ring no longer reaches t=0, so the coarser tier answers
+    auto = store.query("n", "cpu", 0, 1e9)
+    assert auto.dtype.names[:4] == ("t", "min", "max", "avg")
+    store.close()
+
+
+def test_reopen_continues_history(tmp_path):
+    store = TimeSeriesStore(str(tmp_path), tiers=SMALL_TIERS)
+    for i in range(3):
+        store.append("n", "mem", 10.0 * i, 1.0)
+    store.close()
+
+    store = TimeSeriesStore(str(tmp_path), tiers=SMALL_TIERS)
+    store.append("n", "mem", 30.0, 3.0)
+    store.append("n", "mem", 60.0, 5.0)
+    assert list(store.query("n", "mem", 0, 1e9, tier="raw")["t"]) == [0, 10, 20, 30, 60]
+    # The open minute bucket was rebuilt from raw samples after the restart
+    minute = store.query("n", "mem", 0, 1e9, tier="1m")
+    assert list(minute["avg"]) == [1.5]
+    store.close()
+
+
+def test_week_of_history_opens_quickly(tmp_path):
+    store = TimeSeriesStore(str(tmp_path))
+    series = store.series("n", "cpu")
+    minutes = DEFAULT_TIERS[1].capacity
+    ring = series.rings["1m"]
+    ring.records[:] = [(60.0 * i, 0.0, 1.0, 0.5, 60.0) for i in range(minutes)]
+    ring._header["count"] = minutes
+    store.close()
+
+    started = time.perf_counter()
+    store = TimeSeriesStore(str(tmp_path))
+    week = store.query("n", "cpu", 0, 60.0 * minutes, tier="1m")
+    elapsed = time.perf_counter() - started
+    assert len(week) == minutes
+    assert elapsed < 0.1
+    store.close()
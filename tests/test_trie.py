@@ -0,0 +1,31 @@
+import time
+from nodeone.utils.trie import PrefixTrie
+
+
+def test_complete_is_ordered_and_case_insensitive():
+    trie = PrefixTrie(["env=prod", "env=dev", "Env=Staging", "region=eu", "en"])
+    assert trie.complete("ENV=") == ["env=dev", "env=prod", "Env=Staging"]
+    assert trie.complete("en", limit=2) == ["en", "env=dev"]
+    assert trie.complete("zone") == []
+    assert "ENV=PROD" in trie
+    assert not trie.add("env=PROD")
+    assert len(trie) == 5
+
+
+def test_discard_keeps_siblings():
+    trie = PrefixTrie(["rack-1", "rack-10", "rack-2"])
+    assert trie.discard("rack-1")
+    assert not trie.discard("rack-1")
+    assert trie.complete("rack") == ["rack-10", "rack-2"]
+    assert trie.discard("rack-10")
+    assert list(trie) == ["rack-2"]
+
+
+def test_completion_over_100k_labels_is_fast():
+    trie = PrefixTrie(f"host-{i:06d}" for i in range(100_000))
+    started = time.perf_counter()
+    for i in range(100):
+        results = trie.complete(f"host-0{i % 10}", limit=20)
+    elapsed = time.perf_counter() - started
+    assert results == [f"host-09{j:04d}" for j in range(20)]
+    assert elapsed < 0.1